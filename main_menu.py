@@ -285,7 +285,7 @@ def _start_quick_match():
         ui.set_opponent_champion(opp_champ.get('name', 'Unknown'), opp_champ_ability)
         
         # Request initial state
-        network.sio.emit('request_initial_state', {'room_id': network.room_id})
+        network.request_initial_state()
         
         # Log match info
         ui.log_action(f"🎮 Quick Match started!")
@@ -478,7 +478,7 @@ def _find_custom_match(deck_data: list, champion_data: dict):
         ui.set_opponent_champion(opp_champ.get('name', 'Unknown'), opp_champ_ability)
         
         # Request initial state
-        network.sio.emit('request_initial_state', {'room_id': network.room_id})
+        network.request_initial_state()
         
         # Log match info
         ui.log_action(f"🎨 Custom Match started!")
@@ -763,7 +763,8 @@ def _update_ui_from_state(ui, state: dict):
             attack=card_data.get('damage', 0),
             defense=card_data.get('health', 0),
             card_type=card_data.get('card_type', 'Troop'),
-            abilities=abilities_list
+            abilities=abilities_list,
+            uid=card_data.get('uid')
         ))
     ui.update_my_hand(hand_cards)
     
@@ -800,7 +801,8 @@ def _update_ui_from_state(ui, state: dict):
             abilities=abilities_list,
             can_attack=card_data.get('ready', False),
             is_tapped=not card_data.get('ready', True),
-            has_activated_ability=has_activated
+            has_activated_ability=has_activated,
+            uid=card_data.get('uid')
         ))
     # Capture previous state for animations
     prev_my_active = list(getattr(ui, 'my_active', []))
@@ -840,7 +842,8 @@ def _update_ui_from_state(ui, state: dict):
             card_type=card_data.get('card_type', 'Troop'),
             abilities=abilities_list,
             can_attack=False,
-            is_tapped=not card_data.get('ready', True)
+            is_tapped=not card_data.get('ready', True),
+            uid=card_data.get('uid')
         ))
     ui.update_opponent_active(opp_active)
     
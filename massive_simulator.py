@@ -3,10 +3,13 @@ Massive Game Simulator with Complete Logging
 Simula 10,000 partidas de TODOS los matchups posibles guardando logs completos
 """
 
+import argparse
+import os
 import random
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
 import time
 
@@ -20,7 +23,8 @@ from src.cards import TROOP_TEMPLATES, SPELL_TEMPLATES
 class MassiveSimulator:
     """Simulador masivo con logging completo de todas las partidas."""
     
-    def __init__(self, games_per_matchup: int | None = None, total_target: int = 1_000_000):
+    def __init__(self, games_per_matchup: int | None = None, total_target: int = 1_000_000,
+                 workers: int = 1, seed: Optional[int] = None):
         # If games_per_matchup is None, compute it to reach approximately total_target games
         self.total_target = total_target
         if games_per_matchup is None:
@@ -34,17 +38,25 @@ class MassiveSimulator:
         self._card_stats_path = None
         self.total_games = 0
         self.game_count = 0
+        # Procesos para el modo paralelo (1 = secuencial como siempre)
+        self.workers = max(1, int(workers))
+        self.seed = seed
         # Estadísticas agregadas por carta
         self.card_stats: Dict[str, Dict[str, int]] = {}
         
-    def setup_logging(self):
-        """Configura el archivo de logging masivo."""
+    def setup_logging(self, timestamp: Optional[str] = None, suffix: str = ''):
+        """Configura el archivo de logging masivo.
+
+        En modo paralelo cada worker llama con el timestamp común y su propio
+        sufijo de shard (``_shard003``), así cada proceso escribe su log y CSV.
+        """
         data_path = Path('data')
         data_path.mkdir(exist_ok=True)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_path = data_path / f'MASSIVE_LOGS_{timestamp}.txt'
-        summary_path = data_path / f'MASSIVE_SUMMARY_{timestamp}.csv'
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_path = data_path / f'MASSIVE_LOGS_{timestamp}{suffix}.txt'
+        summary_path = data_path / f'MASSIVE_SUMMARY_{timestamp}{suffix}.csv'
         card_stats_path = data_path / f'MASSIVE_CARD_STATS_{timestamp}.csv'
         
         self.log_file = open(log_path, 'w', encoding='utf-8', buffering=8192*16)  # Buffer grande
@@ -487,8 +499,44 @@ class MassiveSimulator:
         
         return actions
     
+    def close_logging(self):
+        """Cierra los archivos de log y resumen."""
+        if self.log_file:
+            self.log_file.close()
+            self.log_file = None
+        if self.summary_file:
+            self.summary_file.close()
+            self.summary_file = None
+
+    def _build_shards(self, num_shards: int) -> List[List[tuple]]:
+        """Reparte todas las partidas en shards contiguos de tamaño similar.
+
+        Cada shard es una lista de segmentos (i, j, primera_partida, última_partida)
+        sobre los índices de CHAMPION_LIST, así un matchup grande puede quedar
+        partido entre varios workers.
+        """
+        matchups = [(i, j) for i in range(len(CHAMPION_LIST)) for j in range(i + 1, len(CHAMPION_LIST))]
+        total = len(matchups) * self.games_per_matchup
+        shards = []
+        for k in range(num_shards):
+            lo = k * total // num_shards
+            hi = (k + 1) * total // num_shards
+            segments = []
+            pos = lo
+            while pos < hi:
+                m, offset = divmod(pos, self.games_per_matchup)
+                take = min(hi - pos, self.games_per_matchup - offset)
+                i, j = matchups[m]
+                segments.append((i, j, offset + 1, offset + take))
+                pos += take
+            if segments:
+                shards.append(segments)
+        return shards
+
     def run_massive_simulation(self):
         """Ejecuta la simulación masiva completa."""
+        if self.workers > 1:
+            return self.run_parallel_simulation()
         print(f"\n🎮 SIMULADOR MASIVO - {self.total_games:,} PARTIDAS CON LOGS COMPLETOS")
         print("="*100)
         
@@ -565,17 +613,10 @@ class MassiveSimulator:
         self._log(f"Velocidad promedio: {self.total_games/elapsed:.1f} partidas/segundo")
         self._log(f"{'='*120}")
         
-        if self.log_file:
-            self.log_file.close()
-        if self.summary_file:
-            self.summary_file.close()
+        self.close_logging()
 
         # Guardar CSV agregado de estadísticas por carta
-        if self._card_stats_path:
-            with open(self._card_stats_path, 'w', encoding='utf-8') as f:
-                f.write('card,drawn,played,destroyed\n')
-                for name, stats in sorted(self.card_stats.items()):
-                    f.write(f"{name},{stats.get('drawn',0)},{stats.get('played',0)},{stats.get('destroyed',0)}\n")
+        self._write_card_stats()
         
         print(f"\n\n{'='*100}")
         print(f"✅ SIMULACIÓN MASIVA COMPLETADA")
@@ -601,15 +642,159 @@ class MassiveSimulator:
         
         print(f"{'='*100}\n")
 
+    def run_parallel_simulation(self):
+        """Ejecuta la simulación repartida en un pool de procesos.
+
+        Cada shard escribe su propio log y CSV; al final se fusionan card_stats
+        y los resultados por matchup en el proceso principal.
+        """
+        num_matchups = len(CHAMPION_LIST) * (len(CHAMPION_LIST) - 1) // 2
+        self.total_games = num_matchups * self.games_per_matchup
+        # Varios shards por worker para repartir carga y tener progreso
+        shards = self._build_shards(self.workers * 4)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._card_stats_path = Path('data') / f'MASSIVE_CARD_STATS_{timestamp}.csv'
+
+        print(f"\n🎮 SIMULADOR MASIVO PARALELO - {self.total_games:,} PARTIDAS")
+        print("="*100)
+        print(f"⚙️  Workers: {self.workers} | Shards: {len(shards)} | Partidas por matchup: {self.games_per_matchup}")
+        print(f"\n¿Deseas continuar? (Presiona Ctrl+C para cancelar en 5 segundos)\n")
+
+        try:
+            time.sleep(5)
+        except KeyboardInterrupt:
+            print("\n❌ Simulación cancelada")
+            return
+
+        print(f"\n🚀 INICIANDO SIMULACIÓN MASIVA PARALELA...\n")
+        start_time = time.time()
+        results: Dict[str, Dict] = {}
+        shard_files = []
+        tasks = []
+        for shard_id, segments in enumerate(shards):
+            shard_seed = None if self.seed is None else self.seed + shard_id
+            tasks.append((shard_id, segments, self.games_per_matchup, self.total_target, timestamp, shard_seed))
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_simulate_shard, task) for task in tasks]
+            for future in as_completed(futures):
+                shard = future.result()
+                self.game_count += shard['games']
+                shard_files.append((shard['log_path'], shard['summary_path']))
+                _merge_card_stats(self.card_stats, shard['card_stats'])
+                for key, entry in shard['results'].items():
+                    merged = results.setdefault(key, {name: 0 for name in entry['champions']})
+                    for name in entry['champions']:
+                        merged[name] += entry[name]
+                    merged['turns_total'] = merged.get('turns_total', 0) + entry['turns_total']
+                    merged['games'] = merged.get('games', 0) + entry['games']
+
+                elapsed = time.time() - start_time
+                rate = self.game_count / elapsed if elapsed > 0 else 0
+                remaining = (self.total_games - self.game_count) / rate if rate > 0 else 0
+                print(f"   Shard {shard['shard_id']:03d} listo | "
+                      f"Total: {self.game_count:,}/{self.total_games:,} ({self.game_count*100//self.total_games}%) | "
+                      f"Velocidad: {rate:.1f} p/s | ETA: {remaining/60:.1f} min")
+
+        elapsed = time.time() - start_time
+
+        # Resumen por matchup en el orden habitual
+        for i, champ1 in enumerate(CHAMPION_LIST):
+            for champ2 in CHAMPION_LIST[i+1:]:
+                entry = results.get(f"{champ1.name} vs {champ2.name}")
+                if not entry or not entry['games']:
+                    continue
+                wins_c1, wins_c2 = entry[champ1.name], entry[champ2.name]
+                print(f"   ✅ {champ1.name} {wins_c1}-{wins_c2} {champ2.name} "
+                      f"({wins_c1/entry['games']*100:.1f}% WR) | {entry['turns_total']/entry['games']:.1f} turnos")
+
+        self._write_card_stats()
+
+        print(f"\n\n{'='*100}")
+        print(f"✅ SIMULACIÓN MASIVA PARALELA COMPLETADA")
+        print(f"{'='*100}")
+        print(f"📊 Total de partidas: {self.game_count:,}")
+        print(f"⏱️  Tiempo total: {elapsed/60:.1f} minutos ({elapsed/3600:.2f} horas)")
+        print(f"⚡ Velocidad promedio: {self.game_count/elapsed:.1f} partidas/segundo")
+        print(f"\n📝 Shards de logs/CSV ({len(shard_files)}):")
+        total_size = 0
+        for log_path, summary_path in sorted(shard_files):
+            total_size += Path(log_path).stat().st_size
+            print(f"   • {log_path} | {summary_path}")
+        print(f"🧮 Estadísticas de cartas: {self._card_stats_path}")
+        print(f"📦 Tamaño total de logs: {total_size / (1024 * 1024):.2f} MB")
+        print(f"{'='*100}\n")
+        return results
+
+    def _write_card_stats(self):
+        """Guarda el CSV agregado de estadísticas por carta."""
+        if self._card_stats_path:
+            with open(self._card_stats_path, 'w', encoding='utf-8') as f:
+                f.write('card,drawn,played,destroyed\n')
+                for name, stats in sorted(self.card_stats.items()):
+                    f.write(f"{name},{stats.get('drawn',0)},{stats.get('played',0)},{stats.get('destroyed',0)}\n")
+
+
+def _merge_card_stats(into: Dict[str, Dict[str, int]], other: Dict[str, Dict[str, int]]):
+    """Suma las estadísticas por carta de un shard en el acumulado."""
+    for name, stats in other.items():
+        d = into.setdefault(name, {'drawn': 0, 'played': 0, 'destroyed': 0})
+        for key, value in stats.items():
+            d[key] = d.get(key, 0) + value
+
+
+def _simulate_shard(task) -> Dict:
+    """Worker: simula un shard de partidas con su propio log y CSV."""
+    shard_id, segments, games_per_matchup, total_target, timestamp, seed = task
+    # Reseed: con fork todos los procesos heredarían el mismo estado del RNG
+    random.seed(seed)
+
+    sim = MassiveSimulator(games_per_matchup=games_per_matchup, total_target=total_target)
+    log_path = sim.setup_logging(timestamp=timestamp, suffix=f'_shard{shard_id:03d}')
+    results = {}
+    games = 0
+    for i, j, first_game, last_game in segments:
+        champ1, champ2 = CHAMPION_LIST[i], CHAMPION_LIST[j]
+        key = f"{champ1.name} vs {champ2.name}"
+        entry = results.setdefault(key, {'champions': (champ1.name, champ2.name),
+                                         champ1.name: 0, champ2.name: 0, 'turns_total': 0, 'games': 0})
+        sim._log(f"\n\n{'#'*120}")
+        sim._log(f"⚔️  SHARD {shard_id}: {key} partidas {first_game}-{last_game}")
+        sim._log(f"{'#'*120}")
+        for game_num in range(first_game, last_game + 1):
+            result = sim.simulate_match(champ1, champ2, game_num)
+            entry[result['winner']] += 1
+            entry['turns_total'] += result['turns']
+            entry['games'] += 1
+            games += 1
+    sim.close_logging()
+    return {
+        'shard_id': shard_id,
+        'games': games,
+        'results': results,
+        'card_stats': sim.card_stats,
+        'log_path': str(log_path),
+        'summary_path': str(sim._summary_path),
+    }
+
 
 def main():
     """Función principal."""
+    parser = argparse.ArgumentParser(description='Simulador masivo de partidas')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Procesos en paralelo (1 = secuencial)')
+    parser.add_argument('--games-per-matchup', type=int, default=None)
+    parser.add_argument('--total', type=int, default=1_000_000, help='Objetivo total de partidas')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
     print("\n" + "="*100)
     print("🎮 MINI TCG - SIMULADOR MASIVO CON LOGS COMPLETOS")
     print("="*100)
     
     # Por requerimiento: simular ~1,000,000 partidas en total (ajustado por matchups)
-    simulator = MassiveSimulator()
+    simulator = MassiveSimulator(games_per_matchup=args.games_per_matchup, total_target=args.total,
+                                 workers=args.workers, seed=args.seed)
     simulator.run_massive_simulation()
 
 
@@ -6,12 +6,19 @@ El servidor mantiene el estado completo del juego y valida todas las acciones
 # type: ignore - Flask-SocketIO adds request.sid at runtime
 
 from flask import Flask, request  # type: ignore
-from flask_socketio import SocketIO, emit, join_room, leave_room  # type: ignore
+from flask_socketio import SocketIO, join_room, leave_room  # type: ignore
 from gevent import monkey  # type: ignore
+from gevent.threadpool import ThreadPoolExecutor  # type: ignore
 import time
 import random
 import sys
 import os
+import socket
+import functools
+import hmac
+import secrets
+import tempfile
+import types
 
 # Añadir el directorio raíz al path para importar módulos del juego
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,10 +27,21 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 monkey.patch_all()
 
 # Importar componentes del juego
-from src.models import Player, Card
+from src.models import Card
 from src.game_logic import Game
 from src.cards import build_random_deck
 from src.champions import CHAMPION_LIST
+from src.zobrist import card_uid
+from src.state_delta import DeltaEncoder
+from src.card_catalog import CardCatalog
+from src.binary_wire import (VERSION as BINARY_VERSION, is_binary, pack_blockers, pack_state,
+                             state_cards, unpack_action)
+from src.structured_log import DEBUG, get_logger
+from src.room_backend import create_backend
+from src.scheduler import TimerHeap
+from src.match_journal import JournalWriter, apply_action, match_header, new_match_game, prune_journals
+from src.bot_player import BotPlayer, BotPool, face_attackers
+from src.spectators import FanoutStats, SpectatorFeed, spectator_view
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'mini-tcg-secret-2025'
@@ -44,8 +62,146 @@ socketio = SocketIO(
 
 # Almacenamiento de salas activas
 active_rooms = {}  # {room_id: {'players': [sid1, sid2], 'game': Game, 'player_map': {sid: 'player'/'ai'}, 'mode': 'quick'/'custom'}}
-waiting_players = []  # Lista de jugadores esperando matchmaking: [{'sid': str, 'mode': str, 'deck': list, 'champion': dict}]
-waiting_custom_players = []  # Jugadores esperando con mazos custom
+# Estado compartible entre workers (ROOM_BACKEND=memory|sqlite, ROOM_DB=ruta del fichero):
+# colas de matchmaking, directorio sala -> worker y buzón de cada worker
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}'
+room_backend = create_backend(os.environ.get('ROOM_BACKEND', 'memory'), WORKER_ID, os.environ.get('ROOM_DB'))
+# Colas de matchmaking por modo (tickets por sid, bandas de rating que se ensanchan con la espera)
+matchmaker = room_backend.matchmaker
+MATCHMAKING_SWEEP_INTERVAL = float(os.environ.get('MATCHMAKING_SWEEP_INTERVAL', 2.0))
+ROOM_BROKER_POLL = float(os.environ.get('ROOM_BROKER_POLL', 0.02))  # lectura del buzón (s)
+WORKER_TIMEOUT = 30  # sin latido en este tiempo, las filas del worker se purgan
+# Cada sala vive en un worker; un jugador conectado a otro worker se atiende por el buzón
+remote_players = {}   # {sid: worker} jugadores de salas de este worker conectados a otro (emits por buzón)
+relayed_players = {}  # {sid: worker} jugadores conectados aquí cuya sala vive en otro worker (eventos por buzón)
+_room_handlers = {}   # {evento: handler} para ejecutar eventos reenviados por otro worker
+_background_tasks_started = False
+# Estados enviados/confirmados por sid: los clientes que lo piden reciben parches en vez del estado completo
+state_encoder = DeltaEncoder()
+# Plantillas de carta numeradas: los clientes que lo piden reciben id de plantilla + campos dinámicos
+card_catalog = CardCatalog()
+# Clientes con codificación binaria (struct) para game_state_update, request_blockers y game_action
+binary_clients = set()
+# Log estructurado con buffer: nivel con LOG_LEVEL, traza DEBUG por sala en /admin/logging.
+# Su hilo de volcado es un greenlet con monkey.patch_all: la escritura a stdout va a un hilo real
+log = get_logger()
+log.use_writer_pool(ThreadPoolExecutor(max_workers=1))
+# Temporizadores de mantenimiento en el hub de gevent: turnos AFK, salas inactivas y cola de espera
+TURN_TIMEOUT = float(os.environ.get('TURN_TIMEOUT', 90))  # sin acciones en la sala: se pasa el turno
+AFK_MAX_STRIKES = int(os.environ.get('AFK_MAX_STRIKES', 3))  # turnos perdidos seguidos: abandono
+ROOM_IDLE_TIMEOUT = float(os.environ.get('ROOM_IDLE_TIMEOUT', 600))  # sala sin actividad: se cierra
+PRIVATE_ROOM_TIMEOUT = float(os.environ.get('PRIVATE_ROOM_TIMEOUT', 300))  # sala privada sin rival
+QUEUE_TIMEOUT = float(os.environ.get('QUEUE_TIMEOUT', 300))  # espera máxima en matchmaking
+MAX_ROOMS = int(os.environ.get('MAX_ROOMS', 0))  # límite de salas por worker (0 = sin límite)
+TIMER_TICK = 0.5  # espera máxima entre comprobaciones (s)
+# Asiento guardado tras una desconexión: el cliente vuelve con otro sid y el token de match_found
+RECONNECT_GRACE = float(os.environ.get('RECONNECT_GRACE', 60))  # 0 = cerrar la sala al desconectar
+# Bots en Quick Match: tras BOT_FILL_AFTER s en cola el rival es un bot (DataDrivenAI de nivel BOT_LEVEL).
+# Sus decisiones se calculan en un pool de BOT_WORKERS hilos, fuera del hub de gevent
+BOT_FILL_AFTER = float(os.environ.get('BOT_FILL_AFTER', 30))  # 0 = sin bots
+BOT_LEVEL = int(os.environ.get('BOT_LEVEL', 5))  # 11 = MCTS (busca sobre una copia completa de la partida,
+# todas las búsquedas de una decisión en BOT_DECISION_TIMEOUT / 2)
+BOT_WORKERS = int(os.environ.get('BOT_WORKERS', 2))
+BOT_MAX_SEATS = int(os.environ.get('BOT_MAX_SEATS', 100))  # partidas con bot a la vez en este worker
+BOT_DECISION_TIMEOUT = float(os.environ.get('BOT_DECISION_TIMEOUT', 2.0))  # tarde: pasa turno / no bloquea
+BOT_ACTION_DELAY = float(os.environ.get('BOT_ACTION_DELAY', 0.4))  # pausa entre acciones del bot (s)
+bot_seats = {}  # {sid ficticio del bot: BotPlayer}
+bot_pool = BotPool(ThreadPoolExecutor(max_workers=max(1, BOT_WORKERS)), timeout=BOT_DECISION_TIMEOUT)
+# Espectadores: una vista sin manos por cambio de estado y un solo emit a la sala '<room_id>:spectators'
+# (un mensaje de buzón por worker con espectadores). SPECTATOR_DELAY retrasa lo que ven (s, torneos)
+SPECTATOR_DELAY = float(os.environ.get('SPECTATOR_DELAY', 0))
+MAX_SPECTATORS = int(os.environ.get('MAX_SPECTATORS', 5000))  # por partida (0 = sin límite)
+spectating = {}  # {sid: (room_id, worker de la sala o None)} espectadores conectados a este worker
+spectator_fanout = FanoutStats()  # coste de cada difusión (construir la vista, emit a la sala)
+timers = TimerHeap(on_error=lambda key, e: log.error('timer_failed', '%s', e, timer=str(key)))
+# Diario por sala (semilla, mazos y acciones validadas) para reproducir partidas: tools/replay_journal.py
+# JOURNAL_DIR=off lo desactiva
+JOURNAL_DIR = os.environ.get('JOURNAL_DIR', os.path.join(tempfile.gettempdir(), 'mini_tcg_journals'))
+if JOURNAL_DIR.strip().lower() in ('', 'off', 'none', '0'):
+    JOURNAL_DIR = None
+# Cada JOURNAL_PRUNE_INTERVAL s se borran los diarios más antiguos que los JOURNAL_KEEP últimos
+# (0 = se guardan todos), en un hilo aparte: el hub no espera al disco
+JOURNAL_KEEP = int(os.environ.get('JOURNAL_KEEP', 2000))
+JOURNAL_PRUNE_INTERVAL = float(os.environ.get('JOURNAL_PRUNE_INTERVAL', 600))
+journal_pool = ThreadPoolExecutor(max_workers=1)
+
+def _local_emit(sid, event, data=None, **kwargs):
+    args = () if data is None else (data,)
+    socketio.emit(event, *args, to=sid, namespace='/', **kwargs)  # type: ignore
+
+def emit(event, data=None, to=None, room=None, **kwargs):
+    """emit de flask_socketio que también llega a jugadores conectados a otro worker
+    
+    Sin destino va al cliente de la request actual, como el original.
+    """
+    target = to or room or request.sid  # type: ignore
+    if target in bot_seats:
+        return  # el bot lee la partida directamente
+    worker = remote_players.get(target)
+    if worker is not None:
+        room_backend.post(worker, ('emit', target, event, data))
+    else:
+        _local_emit(target, event, data, **kwargs)
+
+def room_event(event):
+    """Registra un evento de sala: si la sala del jugador vive en otro worker se reenvía allí"""
+    def decorator(handler):
+        _room_handlers[event] = handler
+        
+        @functools.wraps(handler)
+        def wrapper(data=None):
+            worker = relayed_players.get(request.sid)  # type: ignore
+            if worker is not None:
+                room_backend.post(worker, ('dispatch', request.sid, event, data))  # type: ignore
+                return
+            return handler(data)
+        return socketio.on(event)(wrapper)
+    return decorator
+
+def _dispatch(sid, event, data):
+    """Ejecuta un evento reenviado por otro worker como si el cliente estuviera conectado aquí"""
+    handler = _room_handlers.get(event)
+    if handler is None:
+        return
+    with app.test_request_context('/'):
+        request.sid = sid  # type: ignore
+        request.namespace = '/'  # type: ignore
+        handler(data)
+
+def _broker_message(message):
+    """Un mensaje del buzón. attach / detach llevan el worker de la sala: un detach tardío de
+    una sala vieja no suelta el relé de una partida nueva en otro worker"""
+    kind, sid = message[0], message[1]
+    try:
+        if kind == 'emit':
+            _local_emit(sid, message[2], message[3])
+        elif kind == 'attach':
+            relayed_players[sid] = message[2]
+        elif kind == 'detach':
+            if relayed_players.get(sid) == message[2]:
+                del relayed_players[sid]
+        elif kind == 'dispatch':
+            _dispatch(sid, message[2], message[3])
+    except Exception as e:
+        log.error('broker_message_failed', '%s', e, kind=kind, sid=sid)
+
+def _broker_loop():
+    """Buzón de este worker: emits para clientes conectados aquí y eventos de salas alojadas aquí"""
+    while True:
+        socketio.sleep(ROOM_BROKER_POLL)
+        for message in room_backend.fetch():
+            _broker_message(message)
+
+def _ensure_background_tasks():
+    global _background_tasks_started
+    if not _background_tasks_started:
+        _background_tasks_started = True
+        socketio.start_background_task(_matchmaking_loop)
+        socketio.start_background_task(_timer_loop)
+        if room_backend.shared:
+            socketio.start_background_task(_broker_loop)
+        if JOURNAL_DIR and JOURNAL_KEEP:
+            timers.schedule(('journal_prune',), 0, _prune_journals)
 
 @app.route('/')
 def index():
@@ -54,49 +210,484 @@ def index():
         'status': 'online',
         'message': 'Mini TCG Multiplayer Server',
         'active_rooms': len(active_rooms),
-        'waiting_players': len(waiting_players)
+        'waiting_players': matchmaker.depth(),
+        'matchmaking': matchmaker.metrics(),
+        'worker': WORKER_ID,
+        'rooms_by_worker': room_backend.room_counts(),
+        'max_rooms': MAX_ROOMS or None,
+        'bots': {'seats': len(bot_seats), **bot_pool.stats()},
+        'spectators': {'watching': sum(len(room.get('spectators', ())) for room in active_rooms.values()),
+                       **spectator_fanout.stats()}
     }
 
+@app.route('/admin/rooms')
+def admin_rooms():
+    """Salas por tipo, memoria aproximada por sala y temporizadores (para fijar MAX_ROOMS)
+    
+    Parámetros: token (= ADMIN_TOKEN del entorno), sample = salas medidas (20).
+    """
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    if not admin_token:
+        return {'error': 'not found'}, 404
+    if request.args.get('token') != admin_token:
+        return {'error': 'forbidden'}, 403
+    return room_stats(request.args.get('sample', 20, type=int))
+
+@app.route('/admin/logging', methods=['GET', 'POST'])
+def admin_logging():
+    """Nivel de log y traza por sala en caliente; últimas líneas del buffer
+    
+    Parámetros: token (= ADMIN_TOKEN del entorno), level, trace / untrace (id de sala),
+    room y limit para filtrar las líneas recientes. Sin ADMIN_TOKEN la ruta no existe.
+    """
+    admin_token = os.environ.get('ADMIN_TOKEN')
+    if not admin_token:
+        return {'error': 'not found'}, 404
+    if request.args.get('token') != admin_token:
+        return {'error': 'forbidden'}, 403
+    if request.args.get('level'):
+        log.set_level(request.args['level'])
+    if request.args.get('trace'):
+        log.trace_room(request.args['trace'])
+    if request.args.get('untrace'):
+        log.trace_room(request.args['untrace'], enabled=False)
+    limit = request.args.get('limit', 200, type=int)
+    return {**log.stats(), 'recent': log.recent(request.args.get('room'), limit)}
+
 @socketio.on('connect')
 def handle_connect():
     """Cliente conectado"""
-    print(f'✅ Cliente conectado: {request.sid}')  # type: ignore
+    log.info('connect', sid=request.sid)  # type: ignore
+    _ensure_background_tasks()
     emit('connected', {'sid': request.sid, 'message': 'Conexión exitosa al servidor'})  # type: ignore
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Cliente desconectado"""
-    print(f'❌ Cliente desconectado: {request.sid}')  # type: ignore
+    log.info('disconnect', sid=request.sid)  # type: ignore
     
-    # Remover de jugadores en espera
-    waiting_players[:] = [p for p in waiting_players if p['sid'] != request.sid]  # type: ignore
-    waiting_custom_players[:] = [p for p in waiting_custom_players if p['sid'] != request.sid]  # type: ignore
+    # Remover de la cola de matchmaking
+    matchmaker.cancel(request.sid)  # type: ignore
+    timers.cancel(('queue', request.sid))  # type: ignore
+    timers.cancel(('bot', request.sid))  # type: ignore
+    _stop_spectating(request.sid)  # type: ignore
+    
+    # Su sala vive en otro worker: que la cierre allí
+    worker = relayed_players.pop(request.sid, None)  # type: ignore
+    if worker is not None:
+        room_backend.post(worker, ('dispatch', request.sid, 'disconnect', None))  # type: ignore
+        return
+    _player_left(request.sid)  # type: ignore
+
+def _player_left(sid):
+    """Olvida el estado por sid y cierra su sala avisando al rival
+    (en partida se guarda el asiento RECONNECT_GRACE segundos)"""
+    state_encoder.drop(sid)
+    card_catalog.drop(sid)
+    binary_clients.discard(sid)
     
     # Notificar al oponente si está en una sala
     for room_id, room_data in list(active_rooms.items()):
-        if request.sid in room_data['players']:  # type: ignore
-            print(f'📢 Jugador {request.sid} desconectado de sala {room_id}')  # type: ignore
+        if sid in room_data['players']:
+            log.info('player_left', room=room_id, sid=sid)
+            if _hold_seat(room_id, sid):
+                break
             
-            # Notificar al otro jugador ANTES de eliminar la sala
-            other_player = [p for p in room_data['players'] if p != request.sid]  # type: ignore
-            if other_player:
-                print(f'📤 Enviando opponent_disconnected a {other_player[0]}')
-                socketio.emit('opponent_disconnected', room=other_player[0])  # type: ignore
+            # Notificar al otro jugador ANTES de eliminar la sala (no si la partida ya terminó:
+            # puede estar ya en la cola o en otra partida)
+            other_player = [p for p in room_data['players'] if p != sid]
+            if other_player and not room_data.get('finished'):
+                log.debug('opponent_disconnected', room=room_id, to=other_player[0])
+                emit('opponent_disconnected', to=other_player[0])
                 
                 # Dar tiempo para que el mensaje llegue antes de eliminar la sala
                 socketio.sleep(0.5)
             
-            # Eliminar sala después de notificar (usar pop para evitar KeyError si ya se eliminó)
-            if room_id in active_rooms:
-                del active_rooms[room_id]
-                print(f'🗑️ Sala eliminada: {room_id}')
+            # Eliminar sala después de notificar (si no se eliminó ya ni la reemplazó otra con el mismo id)
+            if active_rooms.get(room_id) is room_data:
+                close_room(room_id, reason='game_over' if room_data.get('finished') else 'disconnect')
             
             # Solo procesar la primera sala encontrada y salir
             break
 
+_room_handlers['disconnect'] = lambda data: _player_left(request.sid)  # type: ignore
+
+def _hold_seat(room_id, sid):
+    """Partida en curso: el asiento de `sid` espera RECONNECT_GRACE a que vuelva con su token.
+    False si no hay nada que guardar (sala privada, partida terminada, RECONNECT_GRACE=0)"""
+    room_data = active_rooms[room_id]
+    game = room_data.get('game')
+    if not RECONNECT_GRACE or game is None or game.winner is not None or room_data.get('finished') or \
+            'tokens' not in room_data:
+        return False
+    role = room_data['player_map'][sid]
+    remote_players.pop(sid, None)  # su worker ya lo olvidó
+    away = room_data.setdefault('away', {})
+    away[role] = sid
+    timers.schedule(('reconnect', room_id, role), RECONNECT_GRACE, _reconnect_expired, room_id, role)
+    for other_sid, other_role in room_data['player_map'].items():
+        if other_role not in away:
+            emit('opponent_reconnecting', {'grace': RECONNECT_GRACE}, to=other_sid)
+    log.info('seat_held', room=room_id, role=role, grace=RECONNECT_GRACE)
+    return True
+
+def _reconnect_expired(room_id, role):
+    """No volvió a tiempo: se cierra la sala como en una desconexión normal"""
+    room_data = active_rooms.get(room_id)
+    if room_data is None or role not in room_data.get('away', {}):
+        return
+    log.info('seat_expired', room=room_id, role=role)
+    for other_sid, other_role in room_data['player_map'].items():
+        if other_role not in room_data['away']:
+            emit('opponent_disconnected', to=other_sid)
+    close_room(room_id, reason='disconnect')
+
+@socketio.on('resume_session')
+def handle_resume_session(data):
+    """El cliente se reconectó (nuevo sid) y pide volver a su asiento con el token de match_found"""
+    data = dict(data) if isinstance(data, dict) else {}
+    data.pop('worker', None)  # solo lo añade el reenvío entre workers
+    room_id = data.get('room_id')
+    if room_id and room_id not in active_rooms:
+        # La sala vive en otro worker: el cliente queda relevado allí, como un invitado remoto
+        worker = room_backend.room_worker(room_id)
+        if worker is not None and worker != WORKER_ID:
+            relayed_players[request.sid] = worker  # type: ignore
+            room_backend.post(worker, ('dispatch', request.sid, 'resume_session', dict(data, worker=WORKER_ID)))  # type: ignore
+            return
+    _resume_session(request.sid, data)  # type: ignore
+
+_room_handlers['resume_session'] = lambda data: _resume_session(request.sid, data)  # type: ignore
+
+def _seat_for_token(room_data, token):
+    """Rol cuyo token es `token` (comparación en tiempo constante), o None"""
+    if not isinstance(token, str):
+        return None
+    for role, seat_token in room_data.get('tokens', {}).items():
+        if hmac.compare_digest(seat_token.encode(), token.encode()):
+            return role
+    return None
+
+def _resume_session(sid, data):
+    """Reasigna el asiento al nuevo sid y le manda un único snapshot para ponerse al día
+    
+    data['worker'] (solo en reenvíos) es el worker donde está conectado el cliente.
+    """
+    room_id = data.get('room_id')
+    origin = data.get('worker')
+    room_data = active_rooms.get(room_id) if room_id else None
+    role = _seat_for_token(room_data, data.get('token')) if room_data is not None else None
+    if role is None or room_data['game'].winner is not None:
+        failure = {'message': 'No se puede volver a la partida'}
+        if origin is not None:
+            room_backend.post(origin, ('emit', sid, 'resume_failed', failure))
+            room_backend.post(origin, ('detach', sid, WORKER_ID))
+        else:
+            emit('resume_failed', failure, to=sid)
+        log.info('resume_failed', room=room_id, sid=sid[:8])
+        return
+    
+    player_map = room_data['player_map']
+    old_sid = next(s for s, r in player_map.items() if r == role)
+    if old_sid != sid:
+        # El sid anterior puede seguir "conectado" hasta que venza su ping: deja de contar
+        room_data['players'][room_data['players'].index(old_sid)] = sid
+        del player_map[old_sid]
+        player_map[sid] = role
+        state_encoder.drop(old_sid)
+        card_catalog.drop(old_sid)
+        binary_clients.discard(old_sid)
+        worker = remote_players.pop(old_sid, None)
+        if worker is not None:
+            room_backend.post(worker, ('detach', old_sid, WORKER_ID))
+        else:
+            leave_room(room_id, sid=old_sid, namespace='/')
+    if origin is not None and origin != WORKER_ID:
+        remote_players[sid] = origin
+    else:
+        join_room(room_id, sid=sid, namespace='/')
+    room_data.get('away', {}).pop(role, None)
+    timers.cancel(('reconnect', room_id, role))
+    room_data['last_activity'] = time.monotonic()
+    
+    # Un solo snapshot (con las opciones de codificación de la reconexión) y, si le toca, los bloqueos
+    _negotiate_state(sid, data)
+    emit('session_resumed', {'room_id': room_id, 'is_host': role == 'player', 'mode': room_data.get('mode')}, to=sid)
+    send_game_state_to_players(room_id, sids=[sid])
+    pending = room_data.get('pending_attacks')
+    if pending and pending['attacker'] != role:
+        _request_blockers(sid, pending)
+    for other_sid, other_role in player_map.items():
+        if other_role != role and other_role not in room_data.get('away', {}):
+            emit('opponent_reconnected', to=other_sid)
+    log.info('session_resumed', room=room_id, role=role, worker=origin or 'local')
+
+def close_room(room_id, reason):
+    """Elimina la sala, su entrada en el directorio y los relés de sus jugadores remotos"""
+    room_data = active_rooms.pop(room_id, None)
+    if room_data is None:
+        return
+    room_backend.release_room(room_id)
+    timers.cancel(('afk', room_id))
+    timers.cancel(('idle', room_id))
+    for role in room_data.get('away', ()):
+        timers.cancel(('reconnect', room_id, role))
+    bot_seats.pop(room_data.get('bot'), None)
+    if room_data.get('journal') is not None:
+        try:
+            room_data['journal'].close(reason, room_data['game'].winner)
+        except OSError as e:
+            log.warning('journal_failed', '%s', e, room=room_id)
+    for sid in room_data['players']:
+        if any(sid in other['players'] for other in active_rooms.values()):
+            continue  # ya juega otra partida de este worker (revancha antes del cierre): su relé sigue
+        worker = remote_players.pop(sid, None)
+        if worker is not None:
+            room_backend.post(worker, ('detach', sid, WORKER_ID))
+    if room_data.get('spectators'):
+        # Con SPECTATOR_DELAY los espectadores ven el final con el mismo retraso: el temporizador
+        # suelta lo retenido y después avisa del cierre
+        room_data['spectate_end'] = {'room_id': room_id, 'reason': reason, 'winner': room_data['game'].winner}
+        feed = room_data.get('spectator_feed')
+        if feed is None or feed.next_release() is None:
+            _end_spectating(room_id, room_data)
+    log.info('room_deleted', room=room_id, reason=reason)
+
+def touch_room(room_id):
+    """Actividad en la sala: reinicia el plazo AFK del turno y aplaza el cierre por inactividad"""
+    room_data = active_rooms.get(room_id)
+    if room_data is None:
+        return
+    room_data['last_activity'] = time.monotonic()
+    if 'game' in room_data and room_data['game'].winner is None:
+        timers.schedule(('afk', room_id), TURN_TIMEOUT, _afk_timeout, room_id)
+
+def _journal(room_id, role, action, origin=None):
+    """Anota una acción ya aplicada en el diario de la sala; si el disco falla se deja de anotar"""
+    room_data = active_rooms.get(room_id)
+    journal = room_data.get('journal') if room_data is not None else None
+    if journal is None:
+        return
+    try:
+        journal.record(role, action, sys=origin)
+    except OSError as e:
+        room_data['journal'] = None
+        log.warning('journal_failed', '%s', e, room=room_id)
+        try:
+            journal.close('journal_failed')  # suelta el descriptor
+        except OSError:
+            pass
+
+def _prune_journals():
+    """Temporizador: lanza la poda de JOURNAL_DIR y se vuelve a programar"""
+    timers.schedule(('journal_prune',), JOURNAL_PRUNE_INTERVAL, _prune_journals)
+    socketio.start_background_task(_prune_journals_task)
+
+def _prune_journals_task():
+    try:
+        removed = journal_pool.submit(prune_journals, JOURNAL_DIR, JOURNAL_KEEP).result()
+    except OSError as e:
+        log.warning('journal_prune_failed', '%s', e)
+        return
+    if removed:
+        log.info('journals_pruned', removed=removed, keep=JOURNAL_KEEP)
+
+def _player_acted(room_id, role, action=None):
+    """Acción válida: el jugador no está AFK y la acción (si se da) va al diario"""
+    room_data = active_rooms.get(room_id)
+    if room_data is not None:
+        if action is not None:
+            _journal(room_id, role, action)
+        room_data.get('afk_strikes', {}).pop(role, None)
+        touch_room(room_id)
+        _bot_wake(room_id)
+
+def watch_room(room_id, timeout):
+    """Cierre por inactividad: al vencer se mira last_activity (sin reprogramar en cada acción)"""
+    timers.schedule(('idle', room_id), timeout, _idle_timeout, room_id, timeout)
+
+def _idle_timeout(room_id, timeout):
+    room_data = active_rooms.get(room_id)
+    if room_data is None:
+        return
+    idle = time.monotonic() - room_data.get('last_activity', 0)
+    if idle < timeout:
+        watch_room(room_id, timeout - idle)
+        return
+    for sid in room_data['players']:
+        emit('error', {'message': 'Sala cerrada por inactividad'}, to=sid)
+    close_room(room_id, reason='idle')
+
+def _afk_timeout(room_id):
+    """Nadie actuó en TURN_TIMEOUT: quien bloquea la partida pierde el turno (o el bloqueo);
+    tras AFK_MAX_STRIKES seguidos se rinde"""
+    room_data = active_rooms.get(room_id)
+    if room_data is None or 'game' not in room_data:
+        return
+    game = room_data['game']
+    pending = room_data.pop('pending_attacks', None)
+    if pending:
+        # El defensor no respondió: ataques sin bloqueadores
+        idle_role = 'ai' if pending['attacker'] == 'player' else 'player'
+        action = {'action': 'declare_blockers', 'blockers': {}}
+    else:
+        idle_role = game.turn
+        action = {'action': 'end_turn'}
+    apply_action(game, idle_role, action, pending)
+    _journal(room_id, idle_role, action, origin='afk')
+    strikes = room_data.setdefault('afk_strikes', {})
+    strikes[idle_role] = strikes.get(idle_role, 0) + 1
+    log.info('afk_timeout', room=room_id, role=idle_role, strikes=strikes[idle_role])
+    if strikes[idle_role] >= AFK_MAX_STRIKES:
+        # Abandono: igual que 'surrender'
+        action = {'action': 'surrender'}
+        apply_action(game, idle_role, action)
+        _journal(room_id, idle_role, action, origin='afk')
+    send_game_state_to_players(room_id)
+    if game.winner is None:
+        timers.schedule(('afk', room_id), TURN_TIMEOUT, _afk_timeout, room_id)
+        _bot_wake(room_id)
+
+def _bot_wake(room_id):
+    """Si la sala tiene bot y no está ya jugando, lanza su greenlet (le toque o no: lo decide él)"""
+    room_data = active_rooms.get(room_id)
+    if room_data is None or room_data.get('bot') is None or room_data.get('bot_busy'):
+        return
+    room_data['bot_busy'] = True
+    socketio.start_background_task(_bot_play, room_id)
+
+def _bot_play(room_id):
+    """Greenlet del bot de una sala: mientras le toque actuar (su turno o bloquear) decide en
+    bot_pool y juega por el mismo camino que un cliente (game_action: validación, diario, estados)"""
+    room_data = active_rooms.get(room_id)
+    if room_data is None:
+        return
+    try:
+        while active_rooms.get(room_id) is room_data and room_data['game'].winner is None:
+            game = room_data['game']
+            bot_sid = room_data['bot']
+            role = room_data['player_map'][bot_sid]
+            pending = room_data.get('pending_attacks')
+            blocking = bool(pending) and pending['attacker'] != role
+            if game.turn != role and not blocking:
+                room_data['bot_turn'] = False
+                return
+            if pending and not blocking:
+                return  # espera los bloqueos del rival
+            if not blocking and not room_data.get('bot_turn'):
+                room_data['bot_turn'] = True
+                bot_seats[bot_sid].new_turn()
+            socketio.sleep(BOT_ACTION_DELAY)
+            if active_rooms.get(room_id) is not room_data:
+                return
+            action = _bot_decide(room_data, role, blocking)
+            if active_rooms.get(room_id) is not room_data:
+                return
+            _dispatch(bot_sid, 'game_action', dict(action, room_id=room_id))
+    except Exception as e:
+        log.error('bot_failed', '%s', e, room=room_id)
+    finally:
+        room_data['bot_busy'] = False
+
+def _bot_decide(room_data, role, blocking):
+    """Acción del bot calculada en el pool sobre copias (el hub sigue atendiendo mientras piensa)"""
+    game = room_data['game']
+    bot = bot_seats[room_data['bot']]
+    view = game.clone() if bot.config.uses_mcts else None
+    source = view or game
+    me, opponent = (source.player, source.ai) if role == 'player' else (source.ai, source.player)
+    if view is None:
+        me, opponent = me.clone(), opponent.clone()
+    if blocking:
+        pending = room_data['pending_attacks']
+        attackers = face_attackers(opponent, pending['attackers'], pending['targets'])
+        candidates = {i: game.block_candidates(card, pending['attacker']) for i, card in attackers}
+        return bot_pool.decide(bot.choose_blockers, me, attackers, candidates, view,
+                               fallback={'action': 'declare_blockers', 'blockers': {}})
+    # El hilo decide sobre una copia del bot: si vence el plazo, su progreso del turno no se mezcla
+    # con el de la sala (el hilo abandonado sigue calculando en segundo plano)
+    worker = bot.fork()
+    fallback = {'action': 'end_turn'}
+    action = bot_pool.decide(worker.next_action, me, opponent, view, fallback=fallback)
+    if action is not fallback and room_data['bot'] in bot_seats:  # la sala puede haberse cerrado mientras
+        bot_seats[room_data['bot']] = worker
+    return action
+
+def _timer_loop():
+    """Dispara los temporizadores vencidos; duerme hasta el siguiente (como mucho TIMER_TICK)"""
+    while True:
+        deadline = timers.next_deadline()
+        delay = TIMER_TICK if deadline is None else min(TIMER_TICK, max(0.0, deadline - time.monotonic()))
+        socketio.sleep(delay)
+        with app.app_context():  # callbacks fuera de un handler (start_match de _fill_with_bot)
+            timers.run_due()
+
+_SIZE_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def _deep_sizeof(obj):
+    """Bytes aproximados del grafo de objetos de `obj` (dicts, listas, objetos con __dict__/__slots__)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SIZE_SKIP):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        else:
+            if hasattr(item, '__dict__'):
+                stack.append(item.__dict__)
+            for slot in getattr(type(item), '__slots__', ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+def room_stats(sample=20):
+    """Salas de este worker por tipo y memoria aproximada por sala (muestra de `sample` partidas)"""
+    games = [room for room in active_rooms.values() if 'game' in room]
+    by_mode = {}
+    for room in games:
+        by_mode[room.get('mode', 'quick')] = by_mode.get(room.get('mode', 'quick'), 0) + 1
+    sizes = [_deep_sizeof(room) for room in games[:max(0, sample)]]
+    now = time.monotonic()
+    return {
+        'rooms': len(active_rooms),
+        'games': len(games),
+        'private_rooms': len(active_rooms) - len(games),
+        'by_mode': by_mode,
+        'max_rooms': MAX_ROOMS or None,
+        'bytes_per_room': {
+            'sampled': len(sizes),
+            'mean': round(sum(sizes) / len(sizes)) if sizes else None,
+            'max': max(sizes, default=None)
+        },
+        'oldest_idle': round(max((now - room.get('last_activity', now) for room in active_rooms.values()),
+                                 default=0.0), 1),
+        'waiting_players': matchmaker.depth(),
+        'timers': timers.stats(),
+        'bots': {'seats': len(bot_seats), **bot_pool.stats()},
+        'spectators': {
+            'total': sum(len(room.get('spectators', ())) for room in games),
+            'max_per_game': max((len(room.get('spectators', ())) for room in games), default=0),
+            'delay': SPECTATOR_DELAY,
+            **spectator_fanout.stats()
+        }
+    }
+
+def at_capacity():
+    """True si este worker ya aloja MAX_ROOMS salas"""
+    return bool(MAX_ROOMS) and len(active_rooms) >= MAX_ROOMS
+
 def serialize_card(card: Card) -> dict:
     """Serializa una carta para enviar al cliente"""
     return {
+        'uid': card_uid(card),  # identidad estable: el cliente actualiza el widget de la carta en sitio
         'name': card.name,
         'cost': card.cost,
         'damage': card.damage,
@@ -109,7 +700,8 @@ def serialize_card(card: Card) -> dict:
         'ability_type': card.ability_type,
         'spell_target': card.spell_target,
         'spell_effect': card.spell_effect,
-        'description': card.description
+        'description': card.description,
+        'frozen_turns': card.frozen_turns
     }
 
 def get_game_state_for_player(game: Game, player_sid: str, player_map: dict) -> dict:
@@ -121,6 +713,8 @@ def get_game_state_for_player(game: Game, player_sid: str, player_map: dict) ->
     else:
         my_player = game.ai
         opponent_player = game.player
+    # Cartas compactas (id de plantilla + campos dinámicos) si el cliente tiene el catálogo
+    encode_card = card_catalog.encode_card if player_sid in card_catalog else serialize_card
     
     return {
         'my_state': {
@@ -128,8 +722,8 @@ def get_game_state_for_player(game: Game, player_sid: str, player_map: dict) ->
             'max_life': getattr(my_player, 'max_life', my_player.life),
             'mana': my_player.mana,
             'max_mana': my_player.max_mana,
-            'hand': [serialize_card(c) for c in my_player.hand],
-            'active_zone': [serialize_card(c) for c in my_player.active_zone],
+            'hand': [encode_card(c) for c in my_player.hand],
+            'active_zone': [encode_card(c) for c in my_player.active_zone],
             'deck_count': len(my_player.deck.cards),
             'graveyard_count': len(my_player.graveyard)
         },
@@ -139,7 +733,7 @@ def get_game_state_for_player(game: Game, player_sid: str, player_map: dict) ->
             'mana': opponent_player.mana,
             'max_mana': opponent_player.max_mana,
             'hand_count': len(opponent_player.hand),  # Solo cantidad, no cartas
-            'active_zone': [serialize_card(c) for c in opponent_player.active_zone],
+            'active_zone': [encode_card(c) for c in opponent_player.active_zone],
             'deck_count': len(opponent_player.deck.cards),
             'graveyard_count': len(opponent_player.graveyard)
         },
@@ -147,8 +741,8 @@ def get_game_state_for_player(game: Game, player_sid: str, player_map: dict) ->
         'is_my_turn': (player_map[player_sid] == game.turn) or (game.turn == 'player' and player_map[player_sid] == 'player') or (game.turn == 'ai' and player_map[player_sid] == 'ai')
     }
 
-def send_game_state_to_players(room_id: str):
-    """Envía el estado actualizado del juego a ambos jugadores"""
+def send_game_state_to_players(room_id: str, sids=None):
+    """Envía el estado actualizado del juego a ambos jugadores (o solo a `sids`)"""
     if room_id not in active_rooms:
         return
     
@@ -156,17 +750,98 @@ def send_game_state_to_players(room_id: str):
     game = room_data['game']
     player_map = room_data['player_map']
     
-    print(f'📤 Enviando estado actualizado de {room_id}')
+    trace = log.enabled(DEBUG, room_id)
     
-    for player_sid in room_data['players']:
+    for player_sid in (room_data['players'] if sids is None else sids):
+        if player_sid in bot_seats:
+            continue
+        if player_sid in binary_clients:
+            # Binario: se empaqueta directamente desde el Game, sin dicts ni JSON
+            role = player_map[player_sid]
+            payload = pack_state(game, role, card_catalog)
+            if payload is not None:
+                templates = card_catalog.pending_cards(player_sid, state_cards(game, role))
+                if templates:
+                    emit('card_catalog', templates, to=player_sid)
+                emit('game_state_update', payload, to=player_sid)
+                if trace:
+                    log.debug('state_sent', room=room_id, sid=player_sid[:8], turn=game.turn,
+                              encoding='binary', bytes=len(payload))
+                continue
         state = get_game_state_for_player(game, player_sid, player_map)
-        emit('game_state_update', state, to=player_sid)
-        hand_count = len(state['my_state']['hand'])
-        active_count = len(state['my_state']['active_zone'])
-        opp_hand_count = state['opponent_state']['hand_count']
-        print(f'   ✅ Estado enviado a {player_sid[:8]}: Turn={state["turn"]}, MyTurn={state["is_my_turn"]}, MyHand={hand_count}, OppHand={opp_hand_count}, Active={active_count}')
+        if player_sid in card_catalog:
+            # Plantillas que este cliente aún no tiene: van antes que el estado que las usa
+            templates = card_catalog.pending(player_sid, state)
+            if templates:
+                emit('card_catalog', templates, to=player_sid)
+        if player_sid in state_encoder:
+            # Cliente con delta: parche contra su último estado confirmado (o snapshot si no hay)
+            emit('game_state_update', state_encoder.encode(player_sid, state), to=player_sid)
+        else:
+            emit('game_state_update', state, to=player_sid)
+        if trace:
+            log.debug('state_sent', room=room_id, sid=player_sid[:8], turn=state['turn'],
+                      my_turn=state['is_my_turn'], hand=len(state['my_state']['hand']),
+                      opp_hand=state['opponent_state']['hand_count'],
+                      active=len(state['my_state']['active_zone']))
+    if sids is None:
+        broadcast_to_spectators(room_id)
+
+def spectator_room(room_id):
+    """Sala Socket.IO de los espectadores de una partida (una por worker que tenga espectadores)"""
+    return f'{room_id}:spectators'
+
+def _spectator_emit(room_id, room_data, event, data):
+    """Un emit a los espectadores conectados aquí y un mensaje de buzón por cada otro worker con espectadores
+    (python-socketio codifica el paquete una vez y lo escribe en cada socket de la sala)"""
+    workers = set(room_data.get('spectators', {}).values())
+    if None in workers:
+        _local_emit(spectator_room(room_id), event, data)
+        workers.discard(None)
+    for worker in workers:
+        room_backend.post(worker, ('emit', spectator_room(room_id), event, data))
+
+def broadcast_to_spectators(room_id):
+    """Vista de espectador del estado actual: se construye una vez para todos y sale en un solo emit
+    (con SPECTATOR_DELAY queda retenida y la suelta un temporizador)"""
+    room_data = active_rooms.get(room_id)
+    if room_data is None or not room_data.get('spectators'):
+        return
+    feed = room_data.setdefault('spectator_feed', SpectatorFeed(SPECTATOR_DELAY))
+    start = time.perf_counter()
+    view = spectator_view(room_data['game'], serialize_card)
+    view['room_id'] = room_id
+    views = feed.publish(view)
+    _release_spectator_views(room_id, room_data, views, time.perf_counter() - start)
+
+def _release_spectator_views(room_id, room_data, views=None, built=None):
+    """Envía las vistas ya liberadas (las vencidas si no se dan) y programa la siguiente retenida
+    (la sala puede estar ya cerrada: se termina de emitir lo retenido y se avisa del cierre)"""
+    feed = room_data['spectator_feed']
+    for view in (feed.due() if views is None else views):
+        start = time.perf_counter()
+        _spectator_emit(room_id, room_data, 'spectator_state', view)
+        spectator_fanout.record(built, time.perf_counter() - start, len(room_data['spectators']))
+        built = None
+    release = feed.next_release()
+    if release is not None:
+        if ('spectate', room_id) not in timers:
+            timers.schedule(('spectate', room_id), max(0.0, release - time.monotonic()),
+                            _release_spectator_views, room_id, room_data)
+    elif 'spectate_end' in room_data:
+        _end_spectating(room_id, room_data)
 
-def create_server_game(player1_sid, player2_sid, mode='quick', custom_data=None):
+def _end_spectating(room_id, room_data):
+    """Partida cerrada y vistas entregadas: aviso de fin y fuera de las salas de espectadores"""
+    _spectator_emit(room_id, room_data, 'spectate_ended', room_data.pop('spectate_end'))
+    for sid, worker in room_data['spectators'].items():
+        if worker is None:
+            _spectator_removed(sid, room_id)
+        else:
+            room_backend.post(worker, ('dispatch', sid, 'spectator_removed', {'room_id': room_id}))
+    room_data['spectators'].clear()
+
+def create_server_game(player1_sid, player2_sid, mode='quick', custom_data=None, room_id=None):
     """Crea una instancia de juego completa en el servidor
     
     Args:
@@ -174,6 +849,7 @@ def create_server_game(player1_sid, player2_sid, mode='quick', custom_data=None)
         player2_sid: Session ID del jugador 2
         mode: 'quick' para mazos aleatorios, 'custom' para mazos personalizados
         custom_data: {'player1': {'deck': [...], 'champion': {...}}, 'player2': {...}}
+        room_id: sala, para la cabecera del diario
     """
     try:
         if mode == 'custom' and custom_data:
@@ -188,7 +864,7 @@ def create_server_game(player1_sid, player2_sid, mode='quick', custom_data=None)
             
             # Validar que los campeones existan
             if not champion1 or not champion2:
-                print(f'❌ Campeones inválidos: {champion1_name}, {champion2_name}')
+                log.warning('game_create_failed', 'Campeones inválidos: %s, %s', champion1_name, champion2_name)
                 return None
             
             # Reconstruir mazos desde datos
@@ -199,7 +875,7 @@ def create_server_game(player1_sid, player2_sid, mode='quick', custom_data=None)
             deck1 = Deck([Card(**card_dict) for card_dict in deck1_data])
             deck2 = Deck([Card(**card_dict) for card_dict in deck2_data])
             
-            print(f'🎨 Modo CUSTOM: {champion1.name} ({len(deck1.cards)} cards) vs {champion2.name} ({len(deck2.cards)} cards)')
+            log.debug('game_decks', mode='custom', deck1=len(deck1.cards), deck2=len(deck2.cards))
         else:
             # Generar campeones y mazos aleatorios (Quick Match)
             champion1 = random.choice(CHAMPION_LIST)
@@ -209,43 +885,17 @@ def create_server_game(player1_sid, player2_sid, mode='quick', custom_data=None)
             deck1 = build_random_deck(size=40, spell_ratio=0.3)
             deck2 = build_random_deck(size=40, spell_ratio=0.3)
             
-            print(f'⚡ Modo QUICK MATCH: {champion1.name} vs {champion2.name}')
-        
-        # Crear jugadores con sus mazos
-        player1 = Player(name="Player1", deck=deck1, champion=champion1)
-        player2 = Player(name="Player2", deck=deck2, champion=champion2)
-        
-        # Barajar
-        random.shuffle(player1.deck.cards)
-        random.shuffle(player2.deck.cards)
-        
-        # Robar cartas iniciales
-        for _ in range(5):
-            if player1.deck.cards:
-                player1.hand.append(player1.deck.cards.pop(0))
-            if player2.deck.cards:
-                player2.hand.append(player2.deck.cards.pop(0))
-        
-        # Crear instancia de juego (sin UI)
-        def dummy_update():
-            pass
+            log.debug('game_decks', mode='quick', deck1=len(deck1.cards), deck2=len(deck2.cards))
         
-        game = Game(player1, player2, on_update=dummy_update)
-        game.game_started = True  # Marcar como iniciado
-        game.turn = 'player'  # Player1 (HOST) empieza
-        game.server_mode = True  # Activar modo servidor para que ambos lados roben al iniciar turno
+        # Barajar con una semilla, robar 5 cartas y preparar el maná (Player1/HOST empieza con 1).
+        # La cabecera del diario guarda los mazos antes de barajar: semilla + acciones reproducen la partida
+        seed = random.getrandbits(32)
+        header = match_header(room_id, mode, seed, deck1, deck2, champion1, champion2)
+        game = new_match_game(deck1, deck2, champion1, champion2, seed)
+        player1, player2 = game.player, game.ai
         
-        # Inicializar maná para ambos jugadores
-        # Player1 empieza con 1 maná (turno 1)
-        # Player2 empieza con 0 maná (para que su primer turno tenga 1 maná)
-        player1.max_mana = 1
-        player1.mana = 1
-        player2.max_mana = 0
-        player2.mana = 0
-        
-        print(f'🎮 Juego creado en servidor: {champion1.name} vs {champion2.name}')
-        print(f'   Player1 hand: {len(player1.hand)} cards, life: {player1.life}')
-        print(f'   Player2 hand: {len(player2.hand)} cards, life: {player2.life}')
+        log.debug('game_created', champion1=champion1.name, champion2=champion2.name,
+                  hand1=len(player1.hand), hand2=len(player2.hand), life1=player1.life, life2=player2.life)
         
         return {
             'game': game,
@@ -254,121 +904,203 @@ def create_server_game(player1_sid, player2_sid, mode='quick', custom_data=None)
                 player2_sid: 'ai'  # player2_sid controla game.ai
             },
             'champion1': champion1,
-            'champion2': champion2
+            'champion2': champion2,
+            'journal_header': header
         }
     except Exception as e:
-        print(f'❌ Error creando juego: {e}')
         import traceback
-        traceback.print_exc()
+        log.error('game_create_failed', 'Error creando juego: %s', e, traceback=traceback.format_exc())
         return None
 
-@socketio.on('find_match')
-def handle_find_match(data):
-    """Buscar partida - Quick Match (mazos aleatorios)"""
-    player_name = data.get('player_name', 'Jugador')
-    print(f'🔍 [QUICK MATCH] {player_name} ({request.sid}) busca partida')  # type: ignore
+def _champion_info(champion) -> dict:
+    """Datos del campeón para match_found"""
+    return {
+        'name': champion.name,
+        'title': champion.title,
+        'passive_name': champion.passive_name,
+        'passive_description': champion.passive_description,
+        'ability_type': champion.ability_type,
+        'ability_value': champion.ability_value,
+        'starting_life': champion.starting_life
+    }
+
+def start_match(host_sid, guest_sid, mode='quick', custom_data=None, guest_worker=None):
+    """Crear sala y juego para dos jugadores emparejados y avisar a ambos
     
-    # Buscar otro jugador en Quick Match
-    matching_player = None
-    for i, waiting in enumerate(waiting_players):
-        if waiting['mode'] == 'quick':
-            matching_player = waiting_players.pop(i)
-            break
+    Funciona dentro y fuera de un handler (el barrido periódico de la cola
+    empareja sin contexto de request): emite y une a la sala por sid.
+    La sala vive en este worker; si el invitado está conectado a otro
+    (guest_worker), su tráfico pasa por el buzón de ese worker.
+    """
+    room_id = f'game_{host_sid[:8]}'
+    if guest_worker is not None and guest_worker != WORKER_ID:
+        # Antes del primer emit: los mensajes del buzón llegan en orden
+        remote_players[guest_sid] = guest_worker
+        room_backend.post(guest_worker, ('attach', guest_sid, WORKER_ID))
     
-    if matching_player:
-        # Hay alguien esperando - crear partida COMPLETA en servidor
-        opponent_sid = matching_player['sid']
-        room_id = f'game_{request.sid[:8]}'  # type: ignore
-        
-        # Crear juego completo en el servidor (modo quick)
-        game_data = create_server_game(request.sid, opponent_sid, mode='quick')  # type: ignore
-        if not game_data:
-            # Error creando juego
-            emit('error', {'message': 'Error al crear la partida'}, to=request.sid)  # type: ignore
-            emit('error', {'message': 'Error al crear la partida'}, to=opponent_sid)
-            return
-        
-        # Crear sala con el juego
-        active_rooms[room_id] = {
-            'players': [request.sid, opponent_sid],  # type: ignore
-            'ready': [],
-            'game': game_data['game'],
-            'player_map': game_data['player_map']
-        }
-        
-        # Ambos jugadores se unen a la sala
-        join_room(room_id, sid=request.sid)  # type: ignore
-        join_room(room_id, sid=opponent_sid)
-        
-        # Enviar estado INICIAL a los clientes (solo para UI)
-        champion1 = game_data['champion1']
-        champion2 = game_data['champion2']
-        
-        emit('match_found', {
-            'room_id': room_id,
-            'is_host': True,
-            'my_champion': {
-                'name': champion1.name,
-                'title': champion1.title,
-                'passive_name': champion1.passive_name,
-                'passive_description': champion1.passive_description,
-                'ability_type': champion1.ability_type,
-                'ability_value': champion1.ability_value,
-                'starting_life': champion1.starting_life
-            },
-            'opponent_champion': {
-                'name': champion2.name,
-                'title': champion2.title,
-                'passive_name': champion2.passive_name,
-                'passive_description': champion2.passive_description,
-                'ability_type': champion2.ability_type,
-                'ability_value': champion2.ability_value,
-                'starting_life': champion2.starting_life
-            },
-            'my_life': champion1.starting_life,
-            'opponent_life': champion2.starting_life
-        }, room=request.sid)  # type: ignore
-        
+    # Crear juego completo en el servidor
+    game_data = create_server_game(host_sid, guest_sid, mode=mode, custom_data=custom_data, room_id=room_id)
+    if not game_data:
+        # Error creando juego
+        emit('error', {'message': 'Error al crear la partida'}, to=host_sid)
+        emit('error', {'message': 'Error al crear la partida'}, to=guest_sid)
+        worker = remote_players.pop(guest_sid, None)
+        if worker is not None:
+            room_backend.post(worker, ('detach', guest_sid, WORKER_ID))
+        return None
+    
+    # Crear sala con el juego
+    active_rooms[room_id] = {
+        'players': [host_sid, guest_sid],
+        'ready': [],
+        'game': game_data['game'],
+        'player_map': game_data['player_map'],
+        'mode': mode,
+        'journal': None,
+        # Token por asiento para volver tras una desconexión (resume_session)
+        'tokens': {'player': secrets.token_urlsafe(16), 'ai': secrets.token_urlsafe(16)}
+    }
+    if JOURNAL_DIR:
+        try:
+            active_rooms[room_id]['journal'] = JournalWriter.create(JOURNAL_DIR, game_data['journal_header'])
+        except OSError as e:
+            log.warning('journal_failed', '%s', e, room=room_id)
+    game_data['game'].log_room = room_id  # traza DEBUG de esta sala (execute_spell...)
+    room_backend.assign_room(room_id, WORKER_ID)
+    touch_room(room_id)
+    watch_room(room_id, ROOM_IDLE_TIMEOUT)
+    
+    # Los jugadores conectados a este worker se unen a la sala; si seguían relevados a la sala
+    # anterior en otro worker (que aún no la ha cerrado), sus eventos ya son de esta
+    for sid in (host_sid, guest_sid):
+        if sid not in remote_players and sid not in bot_seats:
+            relayed_players.pop(sid, None)
+            join_room(room_id, sid=sid, namespace='/')
+    
+    # Enviar estado INICIAL a los clientes (solo para UI)
+    champion1 = _champion_info(game_data['champion1'])
+    champion2 = _champion_info(game_data['champion2'])
+    tokens = active_rooms[room_id]['tokens']
+    for sid, is_host, mine, theirs in ((host_sid, True, champion1, champion2),
+                                       (guest_sid, False, champion2, champion1)):
         emit('match_found', {
             'room_id': room_id,
-            'is_host': False,
-            'my_champion': {
-                'name': champion2.name,
-                'title': champion2.title,
-                'passive_name': champion2.passive_name,
-                'passive_description': champion2.passive_description,
-                'ability_type': champion2.ability_type,
-                'ability_value': champion2.ability_value,
-                'starting_life': champion2.starting_life
-            },
-            'opponent_champion': {
-                'name': champion1.name,
-                'title': champion1.title,
-                'passive_name': champion1.passive_name,
-                'passive_description': champion1.passive_description,
-                'ability_type': champion1.ability_type,
-                'ability_value': champion1.ability_value,
-                'starting_life': champion1.starting_life
-            },
-            'my_life': champion2.starting_life,
-            'opponent_life': champion1.starting_life
-        }, to=opponent_sid)
-        
-        print(f'🎮 Partida creada: {room_id}')
-        print(f'   Player 1 (HOST): {champion1.name}')
-        print(f'   Player 2 (GUEST): {champion2.name}')
-        
-        # NO enviar estado inmediatamente - el cliente lo pedirá cuando esté listo
-        # send_game_state_to_players(room_id)
+            'is_host': is_host,
+            'mode': mode,
+            'my_champion': mine,
+            'opponent_champion': theirs,
+            'my_life': mine['starting_life'],
+            'opponent_life': theirs['starting_life'],
+            'session_token': tokens['player' if is_host else 'ai'],
+            'reconnect_grace': RECONNECT_GRACE
+        }, to=sid)
+    
+    log.info('match_created', room=room_id, mode=mode, host=champion1['name'], guest=champion2['name'],
+             guest_worker=remote_players.get(guest_sid, 'local'))
+    # NO enviar estado inmediatamente - el cliente lo pedirá cuando esté listo
+    return room_id
+
+def _custom_match_data(host_payload, guest_payload):
+    """custom_data de create_server_game con los mazos de los dos tickets"""
+    return {
+        'player1': {'deck': host_payload['deck'], 'champion': host_payload['champion']},
+        'player2': {'deck': guest_payload['deck'], 'champion': guest_payload['champion']}
+    }
+
+def _start_queued_match(waiting, newcomer):
+    """Partida para un par de la cola: el último en llegar es el host (como antes),
+    salvo que esté conectado a otro worker: el host siempre es de este worker"""
+    host, guest = newcomer, waiting
+    if newcomer.worker not in (None, WORKER_ID):
+        host, guest = waiting, newcomer
+    for sid in (host.sid, guest.sid):
+        # si es de otro worker, sus temporizadores vencerán sin efecto
+        timers.cancel(('queue', sid))
+        timers.cancel(('bot', sid))
+    custom_data = None
+    if host.mode == 'custom':
+        custom_data = _custom_match_data(host.payload, guest.payload)
+    return start_match(host.sid, guest.sid, mode=host.mode, custom_data=custom_data, guest_worker=guest.worker)
+
+def _parse_rating(data):
+    """Rating opcional del cliente (número); None = empareja con cualquiera"""
+    rating = data.get('rating')
+    if isinstance(rating, bool) or not isinstance(rating, (int, float)):
+        return None
+    return float(rating)
+
+def _matchmaking_loop():
+    """Barrido periódico: empareja tickets cuya ventana de rating se ha ensanchado,
+    renueva el latido de este worker y purga los workers caídos"""
+    while True:
+        socketio.sleep(MATCHMAKING_SWEEP_INTERVAL)
+        try:
+            with app.app_context():  # join_room (start_match) necesita la app fuera de un handler
+                for waiting, newcomer in matchmaker.sweep():
+                    _start_queued_match(waiting, newcomer)
+            room_backend.heartbeat()
+            for worker in room_backend.purge_stale(WORKER_TIMEOUT):
+                log.warning('worker_purged', worker=worker)
+                # Sus salas ya no existen: avisar a los jugadores que jugaban allí
+                for sid in [s for s, w in relayed_players.items() if w == worker]:
+                    relayed_players.pop(sid, None)
+                    _local_emit(sid, 'opponent_disconnected')
+                # Y cerrar las salas de aquí cuyo invitado estaba conectado allí
+                for sid in [s for s, w in remote_players.items() if w == worker]:
+                    _player_left(sid)
+        except Exception as e:
+            log.error('matchmaking_sweep_failed', '%s', e)
+
+def _fill_with_bot(sid):
+    """Demasiado tiempo en la cola de Quick Match: partida contra un bot"""
+    if at_capacity() or len(bot_seats) >= BOT_MAX_SEATS:
+        return  # sigue en cola
+    ticket = matchmaker.cancel(sid, counted=False)
+    if ticket is None:
+        return  # ya emparejado o fuera de la cola
+    timers.cancel(('queue', sid))
+    bot_sid = f'bot:{secrets.token_hex(6)}'
+    bot_seats[bot_sid] = BotPlayer(BOT_LEVEL, decision_budget=BOT_DECISION_TIMEOUT / 2)
+    room_id = start_match(sid, bot_sid, mode='quick')
+    if room_id is None:
+        bot_seats.pop(bot_sid, None)
+        return
+    active_rooms[room_id]['bot'] = bot_sid
+    log.info('bot_seat', room=room_id, level=BOT_LEVEL, waited=round(matchmaker.clock() - ticket.enqueued_at, 1))
+
+def _queue_timeout(sid):
+    """Demasiado tiempo en cola: se saca al jugador y se le avisa"""
+    ticket = matchmaker.cancel(sid)
+    if ticket is not None:
+        log.info('dequeued', mode=ticket.mode, sid=sid, reason='timeout')
+        emit('error', {'message': 'No se encontró oponente. Inténtalo de nuevo.'}, to=sid)
+
+def _enqueue(mode, data, payload, waiting_message):
+    """Emparejar o encolar al jugador de la request actual"""
+    if at_capacity():
+        emit('error', {'message': 'Servidor lleno. Inténtalo más tarde.'})
+        log.warning('capacity_reached', rooms=len(active_rooms), mode=mode)
+        return
+    # Su partida anterior (si vivía en otro worker) ya no es la suya, aunque aún no se haya cerrado
+    relayed_players.pop(request.sid, None)  # type: ignore
+    pair = matchmaker.enqueue(request.sid, mode, _parse_rating(data), payload)  # type: ignore
+    if pair:
+        # Hay alguien esperando - crear partida COMPLETA en servidor
+        _start_queued_match(*pair)
     else:
-        # Nadie esperando - añadir a cola
-        waiting_players.append({
-            'sid': request.sid,  # type: ignore
-            'mode': 'quick',
-            'player_name': player_name
-        })
-        emit('waiting_for_opponent', {'message': 'Buscando oponente...'})
-        print(f'⏳ {player_name} añadido a cola de espera (Quick Match)')
+        # Nadie compatible esperando - queda en cola (con plazo)
+        timers.schedule(('queue', request.sid), QUEUE_TIMEOUT, _queue_timeout, request.sid)  # type: ignore
+        if mode == 'quick' and BOT_FILL_AFTER:
+            timers.schedule(('bot', request.sid), BOT_FILL_AFTER, _fill_with_bot, request.sid)  # type: ignore
+        emit('waiting_for_opponent', {'message': waiting_message})
+        log.info('queued', mode=mode, player=payload['player_name'], depth=matchmaker.depth(mode))
+
+@socketio.on('find_match')
+def handle_find_match(data):
+    """Buscar partida - Quick Match (mazos aleatorios)"""
+    player_name = data.get('player_name', 'Jugador')
+    log.info('find_match', mode='quick', player=player_name, sid=request.sid)  # type: ignore
+    _enqueue('quick', data, {'player_name': player_name}, 'Buscando oponente...')
 
 @socketio.on('find_custom_match')
 def handle_find_custom_match(data):
@@ -377,8 +1109,8 @@ def handle_find_custom_match(data):
     deck_data = data.get('deck', [])
     champion_data = data.get('champion', {})
     
-    print(f'🔍 [CUSTOM MATCH] {player_name} ({request.sid}) busca partida con mazo custom')  # type: ignore
-    print(f'   Mazo: {len(deck_data)} cartas, Campeón: {champion_data.get("name", "Unknown")}')
+    log.info('find_match', mode='custom', player=player_name, sid=request.sid,  # type: ignore
+             deck=len(deck_data), champion=champion_data.get('name', 'Unknown'))
     
     # Validar datos del mazo
     if not deck_data or len(deck_data) < 30:
@@ -389,121 +1121,17 @@ def handle_find_custom_match(data):
         emit('error', {'message': 'Campeón inválido'}, to=request.sid)  # type: ignore
         return
     
-    # Buscar otro jugador en Custom Match
-    matching_player = None
-    for i, waiting in enumerate(waiting_players):
-        if waiting['mode'] == 'custom':
-            matching_player = waiting_players.pop(i)
-            break
-    
-    if matching_player:
-        # Hay alguien esperando con mazo custom - crear partida
-        opponent_sid = matching_player['sid']
-        room_id = f'game_{request.sid[:8]}'  # type: ignore
-        
-        # Preparar datos de mazos personalizados
-        custom_data = {
-            'player1': {
-                'deck': deck_data,
-                'champion': champion_data
-            },
-            'player2': {
-                'deck': matching_player['deck'],
-                'champion': matching_player['champion']
-            }
-        }
-        
-        # Crear juego con mazos personalizados
-        game_data = create_server_game(request.sid, opponent_sid, mode='custom', custom_data=custom_data)  # type: ignore
-        if not game_data:
-            # Error creando juego
-            emit('error', {'message': 'Error al crear la partida'}, to=request.sid)  # type: ignore
-            emit('error', {'message': 'Error al crear la partida'}, to=opponent_sid)
-            return
-        
-        # Crear sala con el juego
-        active_rooms[room_id] = {
-            'players': [request.sid, opponent_sid],  # type: ignore
-            'ready': [],
-            'game': game_data['game'],
-            'player_map': game_data['player_map'],
-            'mode': 'custom'
-        }
-        
-        # Ambos jugadores se unen a la sala
-        join_room(room_id, sid=request.sid)  # type: ignore
-        join_room(room_id, sid=opponent_sid)
-        
-        # Enviar estado INICIAL a los clientes
-        champion1 = game_data['champion1']
-        champion2 = game_data['champion2']
-        
-        emit('match_found', {
-            'room_id': room_id,
-            'is_host': True,
-            'mode': 'custom',
-            'my_champion': {
-                'name': champion1.name,
-                'title': champion1.title,
-                'passive_name': champion1.passive_name,
-                'passive_description': champion1.passive_description,
-                'ability_type': champion1.ability_type,
-                'ability_value': champion1.ability_value,
-                'starting_life': champion1.starting_life
-            },
-            'opponent_champion': {
-                'name': champion2.name,
-                'title': champion2.title,
-                'passive_name': champion2.passive_name,
-                'passive_description': champion2.passive_description,
-                'ability_type': champion2.ability_type,
-                'ability_value': champion2.ability_value,
-                'starting_life': champion2.starting_life
-            },
-            'my_life': champion1.starting_life,
-            'opponent_life': champion2.starting_life
-        }, room=request.sid)  # type: ignore
-        
-        emit('match_found', {
-            'room_id': room_id,
-            'is_host': False,
-            'mode': 'custom',
-            'my_champion': {
-                'name': champion2.name,
-                'title': champion2.title,
-                'passive_name': champion2.passive_name,
-                'passive_description': champion2.passive_description,
-                'ability_type': champion2.ability_type,
-                'ability_value': champion2.ability_value,
-                'starting_life': champion2.starting_life
-            },
-            'opponent_champion': {
-                'name': champion1.name,
-                'title': champion1.title,
-                'passive_name': champion1.passive_name,
-                'passive_description': champion1.passive_description,
-                'ability_type': champion1.ability_type,
-                'ability_value': champion1.ability_value,
-                'starting_life': champion1.starting_life
-            },
-            'my_life': champion2.starting_life,
-            'opponent_life': champion1.starting_life
-        }, to=opponent_sid)
-        
-        print(f'🎮 Partida CUSTOM creada: {room_id}')
-        print(f'   Player 1 (HOST): {champion1.name} - {len(deck_data)} cards')
-        print(f'   Player 2 (GUEST): {champion2.name} - {len(matching_player["deck"])} cards')
-    else:
-        # Nadie esperando - añadir a cola
-        waiting_players.append({
-            'sid': request.sid,  # type: ignore
-            'mode': 'custom',
-            'player_name': player_name,
-            'deck': deck_data,
-            'champion': champion_data
-        })
-        emit('waiting_for_opponent', {'message': 'Buscando oponente con mazo custom...'})
-        print(f'⏳ {player_name} añadido a cola de espera (Custom Match)')
+    _enqueue('custom', data, {'player_name': player_name, 'deck': deck_data, 'champion': champion_data},
+             'Buscando oponente con mazo custom...')
+
+@socketio.on('cancel_matchmaking')
+def handle_cancel_matchmaking(data=None):
+    """Salir de la cola de matchmaking"""
+    ticket = matchmaker.cancel(request.sid)  # type: ignore
+    timers.cancel(('queue', request.sid))  # type: ignore
+    timers.cancel(('bot', request.sid))  # type: ignore
+    if ticket:
+        log.info('dequeued', mode=ticket.mode, sid=request.sid, reason='cancel')  # type: ignore
 
 @socketio.on('create_room')
 def handle_create_room(data):
@@ -519,39 +1147,79 @@ def handle_create_room(data):
         emit('error', {'message': 'Esta sala ya existe'})
         return
     
-    # Crear sala privada
+    if at_capacity():
+        emit('error', {'message': 'Servidor lleno. Inténtalo más tarde.'})
+        return
+    
+    # El código se reserva en el directorio compartido: otro worker puede tenerlo ya
+    if not room_backend.claim_room(room_code):
+        emit('error', {'message': 'Esta sala ya existe'})
+        return
+    
+    # Crear sala privada (se cierra si nadie se une en PRIVATE_ROOM_TIMEOUT)
     active_rooms[room_code] = {
         'players': [request.sid],  # type: ignore
         'ready': [],
-        'host': request.sid  # type: ignore
+        'host': request.sid,  # type: ignore
+        'last_activity': time.monotonic()
     }
+    watch_room(room_code, PRIVATE_ROOM_TIMEOUT)
     
     join_room(room_code)
     emit('room_created', {
         'room_code': room_code,
         'message': 'Sala creada. Esperando oponente...'
     })
-    print(f'🏠 Sala privada creada: {room_code} por {player_name}')
+    log.info('private_room_created', room=room_code, player=player_name)
 
 @socketio.on('join_room')
 def handle_join_room(data):
     """Unirse a sala privada"""
+    data = dict(data) if isinstance(data, dict) else {}
+    data.pop('worker', None)  # solo lo añade el reenvío entre workers
     room_code = data.get('room_code', '').upper()
-    player_name = data.get('player_name', 'Jugador')
-    
     if room_code not in active_rooms:
-        emit('error', {'message': 'Sala no encontrada'})
-        return
+        # La sala vive en otro worker: el invitado queda relevado allí
+        worker = room_backend.room_worker(room_code)
+        if worker is not None and worker != WORKER_ID:
+            relayed_players[request.sid] = worker  # type: ignore
+            room_backend.post(worker, ('dispatch', request.sid, 'join_room', dict(data, worker=WORKER_ID)))  # type: ignore
+            return
+    _join_private_room(request.sid, data)  # type: ignore
+
+_room_handlers['join_room'] = lambda data: _join_private_room(request.sid, data)  # type: ignore
+
+def _join_private_room(sid, data):
+    """Mete a `sid` en la sala privada de este worker
     
-    room_data = active_rooms[room_code]
+    data['worker'] (solo en reenvíos) es el worker donde está conectado el invitado.
+    """
+    room_code = data.get('room_code', '').upper()
+    player_name = data.get('player_name', 'Jugador')
+    origin = data.get('worker')
+    room_data = active_rooms.get(room_code)
     
-    if len(room_data['players']) >= 2:
-        emit('error', {'message': 'Sala llena'})
+    failure = None
+    if room_data is None:
+        failure = 'Sala no encontrada'
+    elif len(room_data['players']) >= 2:
+        failure = 'Sala llena'
+    if failure is not None:
+        if origin is not None:
+            room_backend.post(origin, ('emit', sid, 'error', {'message': failure}))
+            room_backend.post(origin, ('detach', sid, WORKER_ID))
+        else:
+            emit('error', {'message': failure}, to=sid)
         return
     
     # Unirse a la sala
-    room_data['players'].append(request.sid)  # type: ignore
-    join_room(room_code)
+    room_data['players'].append(sid)
+    if origin is not None and origin != WORKER_ID:
+        remote_players[sid] = origin
+    else:
+        join_room(room_code, sid=sid, namespace='/')
+    touch_room(room_code)
+    watch_room(room_code, ROOM_IDLE_TIMEOUT)
     
     # Notificar a ambos jugadores
     host_sid = room_data['host']
@@ -565,13 +1233,19 @@ def handle_join_room(data):
         'room_code': room_code,
         'you_start': False,
         'message': 'Conectado a la sala'
-    })
+    }, to=sid)
     
-    print(f'👥 {player_name} se unió a sala {room_code}')
+    log.info('private_room_joined', room=room_code, player=player_name, worker=origin or 'local')
 
-@socketio.on('game_action')
+@room_event('game_action')
 def handle_game_action(data):
     """Ejecuta acción en el servidor y envía estado actualizado"""
+    if is_binary(data):
+        try:
+            data = unpack_action(data)
+        except ValueError as e:
+            emit('error', {'message': f'Acción binaria inválida: {e}'})
+            return
     room_id = data.get('room_id')
     action = data.get('action')
     
@@ -594,7 +1268,7 @@ def handle_game_action(data):
         emit('error', {'message': 'Error de mapeo de jugador'})
         return
     
-    print(f'🎮 [{room_id[:12]}] Acción: {action} de {player_role}')
+    log.debug('game_action', room=room_id, action=action, role=player_role)
     
     try:
         # VALIDAR Y EJECUTAR ACCIÓN EN EL SERVIDOR
@@ -605,76 +1279,41 @@ def handle_game_action(data):
             # Validar turno
             if game.turn != player_role:
                 emit('error', {'message': 'No es tu turno'}, to=request.sid)  # type: ignore
-                print(f'   ❌ No es turno de {player_role}')
+                log.warning('action_rejected', room=room_id, action=action, role=player_role, reason='not_your_turn')
                 return
             
             # Ejecutar en el servidor
-            if player_role == 'player':
-                if card_index < len(game.player.hand):
-                    card_name = game.player.hand[card_index].name
-                    hand_before = len(game.player.hand)
-                    active_before = len(game.player.active_zone)
-                    print(f'   🃏 Player juega: {card_name} (spell_target={spell_target})')
-                    print(f'      Antes: Hand={hand_before}, Active={active_before}')
-                    game.play_card(card_index, spell_target_idx=spell_target)
-                    print(f'      Después: Hand={len(game.player.hand)}, Active={len(game.player.active_zone)}')
-                else:
-                    emit('error', {'message': 'Índice de carta inválido'}, to=request.sid)  # type: ignore
-                    return
-            else:  # 'ai'
-                if card_index < len(game.ai.hand):
-                    card_name = game.ai.hand[card_index].name
-                    hand_before = len(game.ai.hand)
-                    active_before = len(game.ai.active_zone)
-                    print(f'   🃏 AI juega: {card_name}')
-                    print(f'      Antes: Hand={hand_before}, Active={active_before}')
-                    game.play_card_ai(card_index, spell_target_idx=spell_target)
-                    print(f'      Después: Hand={len(game.ai.hand)}, Active={len(game.ai.active_zone)}')
-                else:
-                    emit('error', {'message': 'Índice de carta inválido'}, to=request.sid)  # type: ignore
-                    return
+            me = game.player if player_role == 'player' else game.ai
+            if card_index < len(me.hand):
+                card_name = me.hand[card_index].name
+                hand_before = len(me.hand)
+                active_before = len(me.active_zone)
+                apply_action(game, player_role, data)
+                log.debug('card_played', room=room_id, role=player_role, card=card_name,
+                          spell_target=spell_target, hand=f'{hand_before}->{len(me.hand)}',
+                          active=f'{active_before}->{len(me.active_zone)}')
+            else:
+                emit('error', {'message': 'Índice de carta inválido'}, to=request.sid)  # type: ignore
+                return
         
         elif action == 'end_turn':
             # Validar turno
             if game.turn != player_role:
                 emit('error', {'message': 'No es tu turno'}, to=request.sid)  # type: ignore
-                print(f'   ❌ No es turno de {player_role}')
+                log.warning('action_rejected', room=room_id, action=action, role=player_role, reason='not_your_turn')
                 return
             
-            print(f'   🔄 {player_role} termina turno')
             # Cambiar turno
-            if player_role == 'player':
-                game.turn = 'ai'
-                game.start_turn('ai')
-            else:
-                game.turn = 'player'
-                game.start_turn('player')
+            apply_action(game, player_role, data)
         
         elif action == 'declare_attacks':
-            attackers = data.get('attackers', [])
-            targets = data.get('targets', [])
-            
             # Validar turno
             if game.turn != player_role:
                 emit('error', {'message': 'No es tu turno'}, to=request.sid)  # type: ignore
                 return
             
-            # Procesar objetivos
-            processed_targets = []
-            for target in targets:
-                if target == "player":
-                    processed_targets.append("player")
-                elif isinstance(target, dict) and target.get("type") == "card":
-                    processed_targets.append(("card", target.get("index", 0)))
-                else:
-                    processed_targets.append("player")
-            
-            # SIEMPRE guardar datos de ataque pendiente y solicitar bloqueadores
-            room_data['pending_attacks'] = {
-                'attackers': attackers,
-                'targets': processed_targets,
-                'attacker': player_role
-            }
+            # SIEMPRE guardar datos de ataque pendiente (objetivos normalizados) y solicitar bloqueadores
+            pending = room_data['pending_attacks'] = apply_action(game, player_role, data)
             
             # Solicitar bloqueadores al defensor
             defender_role = 'ai' if player_role == 'player' else 'player'
@@ -686,78 +1325,97 @@ def handle_game_action(data):
             
             if defender_sid:
                 # Enviar solicitud de bloqueadores
-                emit('request_blockers', {
-                    'attackers': attackers,
-                    'targets': processed_targets
-                }, to=defender_sid)
+                _request_blockers(defender_sid, pending)
                 
-                print(f'   ⚔️ {player_role} declara {len(attackers)} ataques - esperando bloqueadores')
+                log.debug('attacks_declared', room=room_id, role=player_role, attackers=len(pending['attackers']))
+                _player_acted(room_id, player_role, data)
                 
                 # NO enviar estado todavía - esperar respuesta de bloqueadores
                 return
         
         elif action == 'declare_blockers':
-            # El defensor declara bloqueadores
-            blockers = data.get('blockers', {})  # {attacker_idx: blocker_idx}
-            
+            # El defensor declara bloqueadores {attacker_idx: blocker_idx}
             # Recuperar ataque pendiente
             pending = room_data.get('pending_attacks')
             if not pending:
                 emit('error', {'message': 'No hay ataques pendientes'}, to=request.sid)  # type: ignore
                 return
             
-            attackers = pending['attackers']
-            targets = pending['targets']
-            attacker_role = pending['attacker']
-            
-            print(f'   🛡️ {player_role} declara {len(blockers)} bloqueadores')
+            log.debug('blockers_declared', room=room_id, role=player_role, blockers=len(data.get('blockers', {})))
             
             # Ejecutar ataques con bloqueadores
-            game.declare_attacks_with_blockers(attackers, targets, blockers, owner=attacker_role)
+            apply_action(game, player_role, data, pending)
             
             # Limpiar ataque pendiente
             room_data.pop('pending_attacks', None)
         
         elif action == 'activate_ability':
-            card_index = data.get('card_index', 0)
-            
             # Validar turno
             if game.turn != player_role:
                 emit('error', {'message': 'No es tu turno'}, to=request.sid)  # type: ignore
                 return
             
-            print(f'   ✨ {player_role} activa habilidad')
-            game.activate_ability(card_index, owner=player_role)
+            apply_action(game, player_role, data)
         
         elif action == 'surrender':
-            print(f'   🏳️ {player_role} se rinde')
-            if player_role == 'player':
-                game.player.life = 0
-            else:
-                game.ai.life = 0
-            game.check_end()
+            log.info('surrender', room=room_id, role=player_role)
+            apply_action(game, player_role, data)
         
         else:
-            print(f'   ⚠️ Acción no implementada: {action}')
+            log.warning('action_unknown', room=room_id, action=action, role=player_role)
+            data = None  # no va al diario
         
+        _player_acted(room_id, player_role, data)
         # Enviar estado actualizado a ambos jugadores
         send_game_state_to_players(room_id)
         
     except Exception as e:
-        print(f'   ❌ Error ejecutando acción: {e}')
         import traceback
-        traceback.print_exc()
+        log.error('action_failed', 'Error ejecutando acción: %s', e, room=room_id, action=action,
+                  traceback=traceback.format_exc())
         emit('error', {'message': f'Error: {str(e)}'}, to=request.sid)  # type: ignore
 
-@socketio.on('request_initial_state')
+def _request_blockers(sid, pending):
+    """Pide al defensor sus bloqueadores para el ataque pendiente"""
+    payload = pack_blockers(pending['attackers'], pending['targets']) if sid in binary_clients else None
+    emit('request_blockers', payload if payload is not None else {
+        'attackers': pending['attackers'],
+        'targets': pending['targets']
+    }, to=sid)
+
+def _negotiate_state(sid, data):
+    """Opciones de codificación que ofrece el cliente; el próximo estado que reciba es completo"""
+    if data.get('delta'):
+        # Acepta parches: empieza (o reinicia tras un hueco de versión) con un snapshot completo
+        state_encoder.reset(sid)
+    if data.get('templates'):
+        # Cartas compactas: el catálogo se vuelve a mandar con este estado
+        card_catalog.reset(sid)
+    if data.get('binary') == BINARY_VERSION:
+        # Binario: cartas por id de plantilla, sin parches delta (el snapshot ya es pequeño)
+        binary_clients.add(sid)
+        card_catalog.reset(sid)
+        state_encoder.drop(sid)
+
+@room_event('request_initial_state')
 def handle_request_initial_state(data):
     """Cliente pide el estado inicial cuando está listo"""
     room_id = data.get('room_id')
     if room_id and room_id in active_rooms:
-        print(f'📥 Cliente {request.sid[:8]} pide estado inicial de {room_id}')  # type: ignore
+        active_rooms[room_id]['last_activity'] = time.monotonic()
+        log.debug('initial_state_requested', room=room_id, sid=request.sid[:8],  # type: ignore
+                  delta=bool(data.get('delta')), templates=bool(data.get('templates')), binary=data.get('binary'))
+        _negotiate_state(request.sid, data)  # type: ignore
         send_game_state_to_players(room_id)
 
-@socketio.on('chat_message')
+@room_event('state_ack')
+def handle_state_ack(data):
+    """El cliente confirma la versión de estado que aplicó (base de los próximos parches)"""
+    version = data.get('v')
+    if isinstance(version, int):
+        state_encoder.ack(request.sid, version)  # type: ignore
+
+@room_event('chat_message')
 def handle_chat_message(data):
     """Envía mensaje de chat a ambos jugadores en la sala"""
     room_id = data.get('room_id')
@@ -781,7 +1439,8 @@ def handle_chat_message(data):
     sender_role = player_map[sender_sid]
     sender_name = "Player 1" if sender_role == 'player' else "Player 2"
     
-    print(f'💬 [{room_id[:12]}] {sender_name}: {message}')
+    log.debug('chat', message, room=room_id, sender=sender_name)
+    room_data['last_activity'] = time.monotonic()  # el chat no cuenta para el AFK del turno
     
     # Enviar a ambos jugadores
     for player_sid in room_data['players']:
@@ -792,7 +1451,7 @@ def handle_chat_message(data):
             'is_me': is_sender
         }, to=player_sid)
 
-@socketio.on('game_over')
+@room_event('game_over')
 def handle_game_over(data):
     """Sincroniza fin de partida: broadcast del ganador y cierre de sala."""
     room_id = data.get('room_id')
@@ -802,17 +1461,117 @@ def handle_game_over(data):
         # Broadcast directo a todos (fallback)
         emit('game_over', {'winner': winner})
         return
-    print(f'🏁 [{room_id[:12]}] game_over recibido, winner={winner}')
+    log.info('game_over', room=room_id, winner=winner)
     room_data = active_rooms[room_id]
+    room_data['finished'] = True  # quien se vaya antes del cierre ya no deja al rival esperando
     # Avisar a ambos jugadores
     for player_sid in room_data['players']:
         emit('game_over', {'winner': winner}, to=player_sid)
     # Dar un pequeño tiempo por si los clientes necesitan limpiar
     socketio.sleep(0.5)
-    # Eliminar la sala
-    if room_id in active_rooms:
-        del active_rooms[room_id]
-        print(f'🗑️ Sala eliminada tras game_over: {room_id}')
+    # Eliminar la sala (si sigue siendo esta: el id sale del sid del anfitrión y una revancha lo reutiliza)
+    if active_rooms.get(room_id) is room_data:
+        close_room(room_id, reason='game_over')
+
+@socketio.on('spectate')
+def handle_spectate(data):
+    """Ver una partida en curso: vista sin manos (con SPECTATOR_DELAY de retraso) por 'spectator_state'"""
+    data = dict(data) if isinstance(data, dict) else {}
+    data.pop('worker', None)  # solo lo añade el reenvío entre workers
+    _stop_spectating(request.sid)  # type: ignore
+    room_id = data.get('room_id')
+    if room_id and room_id not in active_rooms:
+        # La partida vive en otro worker: el espectador entra en la sala Socket.IO de este worker
+        # y el de la partida le manda aquí cada vista por el buzón
+        worker = room_backend.room_worker(room_id)
+        if worker is not None and worker != WORKER_ID:
+            spectating[request.sid] = (room_id, worker)  # type: ignore
+            join_room(spectator_room(room_id))
+            room_backend.post(worker, ('dispatch', request.sid, 'spectate', dict(data, worker=WORKER_ID)))  # type: ignore
+            return
+    _spectate(request.sid, data)  # type: ignore
+
+_room_handlers['spectate'] = lambda data: _spectate(request.sid, data)  # type: ignore
+
+def _spectate(sid, data):
+    """Apunta a `sid` como espectador de la partida y le manda la última vista liberada
+    
+    data['worker'] (solo en reenvíos) es el worker donde está conectado el espectador.
+    """
+    room_id = data.get('room_id')
+    origin = data.get('worker')
+    if origin == WORKER_ID:
+        origin = None
+    room_data = active_rooms.get(room_id) if room_id else None
+    spectators = room_data.setdefault('spectators', {}) if room_data is not None and 'game' in room_data else None
+    if spectators is None:
+        failure = 'Partida no encontrada'
+    elif sid in room_data['players']:
+        failure = 'Ya juegas en esta partida'
+    elif MAX_SPECTATORS and len(spectators) >= MAX_SPECTATORS:
+        failure = 'La partida no admite más espectadores'
+    else:
+        failure = None
+    
+    def reply(event, payload):
+        if origin is not None:
+            room_backend.post(origin, ('emit', sid, event, payload))
+        else:
+            _local_emit(sid, event, payload)
+    
+    if failure is not None:
+        reply('spectate_failed', {'room_id': room_id, 'message': failure})
+        if origin is not None:
+            room_backend.post(origin, ('dispatch', sid, 'spectator_removed', {'room_id': room_id}))
+        return
+    spectators[sid] = origin
+    if origin is None:
+        spectating[sid] = (room_id, None)
+        join_room(spectator_room(room_id), sid=sid, namespace='/')
+    reply('spectate_started', {'room_id': room_id, 'mode': room_data.get('mode'), 'delay': SPECTATOR_DELAY,
+                               'spectators': len(spectators)})
+    feed = room_data.get('spectator_feed')
+    if feed is not None and feed.latest is not None:
+        reply('spectator_state', feed.latest)
+    elif not SPECTATOR_DELAY:
+        broadcast_to_spectators(room_id)  # primer espectador: aún no hay vista construida
+    log.info('spectator_joined', room=room_id, sid=sid[:8], spectators=len(spectators), worker=origin or 'local')
+
+@socketio.on('stop_spectating')
+def handle_stop_spectating(data=None):
+    """Dejar de ver la partida"""
+    _stop_spectating(request.sid)  # type: ignore
+
+def _spectator_removed(sid, room_id=None):
+    """Olvida al espectador en el worker donde está conectado (sale de la sala Socket.IO);
+    con `room_id` solo si sigue viendo esa partida (el aviso puede llegar tarde)"""
+    entry = spectating.get(sid)
+    if entry is None or (room_id is not None and entry[0] != room_id):
+        return None
+    del spectating[sid]
+    # Puede llegar desde un temporizador (cierre de sala), fuera de una request
+    socketio.server.leave_room(sid, spectator_room(entry[0]), namespace='/')
+    return entry
+
+_room_handlers['spectator_removed'] = lambda data: _spectator_removed(request.sid, (data or {}).get('room_id'))  # type: ignore
+
+def _stop_spectating(sid):
+    """El espectador se va (o se desconecta): se borra aquí y en el worker de la partida"""
+    entry = _spectator_removed(sid)
+    if entry is None:
+        return
+    room_id, worker = entry
+    if worker is not None:
+        room_backend.post(worker, ('dispatch', sid, 'spectator_left', {'room_id': room_id}))
+    else:
+        _spectator_left(sid, room_id)
+
+def _spectator_left(sid, room_id):
+    room_data = active_rooms.get(room_id)
+    if room_data is not None:
+        room_data.get('spectators', {}).pop(sid, None)
+
+_room_handlers['spectator_left'] = lambda data: _spectator_left(request.sid, (data or {}).get('room_id'))  # type: ignore
 
 @socketio.on('ping')
 def handle_ping(data):
@@ -822,6 +1581,5 @@ def handle_ping(data):
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 5000))
-    print(f'🚀 Servidor Socket.IO iniciado en http://0.0.0.0:{port}')
-    print('📡 Esperando conexiones...')
+    log.info('server_start', 'Servidor Socket.IO iniciado en http://0.0.0.0:%s', port)
     socketio.run(app, host='0.0.0.0', port=port, debug=os.environ.get('DEBUG', 'False') == 'True')
@@ -10,15 +10,33 @@ __author__ = "Mini TCG Team"
 _LAZY_MODULES = [
     'models',
     'cards',
+    'asset_index',
+    'image_cache',
+    'ui_reconciler',
+    'state_delta',
+    'card_catalog',
+    'binary_wire',
+    'structured_log',
+    'matchmaking',
+    'room_backend',
+    'scheduler',
+    'match_journal',
+    'bot_player',
+    'spectators',
     'champions',
     'game_logic',
+    'headless',
+    'mcts_ai',
+    'combat_solver',
+    'zobrist',
     'ai_engine',
     'ai_player',
     'ai_difficulty',
     'difficulty_selector',
     'game_gui',
     'deck_builder',
-    'game_analysis'
+    'game_analysis',
+    'batch_simulator'
 ]
 
 def __getattr__(name):
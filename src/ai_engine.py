@@ -8,6 +8,7 @@ Based on 1,000,020 game analysis (COMPLETE_ANALYSIS_20251128_100314)
 - Level 5-6: Good cards (Berserker/Wolf/Knight), decent champions
 - Level 7-8: Top cards + Furia ability focus, strong champions
 - Level 9-10: Elite champions (Mystara/Ragnar/Brutus), matchup knowledge, optimal deck
+- Level 11: Monte Carlo Tree Search over the real Game rules (src/mcts_ai.py)
 """
 
 import random
@@ -21,10 +22,12 @@ if __name__ == '__main__':
     from src.models import Card, Deck, Player
     from src.cards import TROOP_TEMPLATES, SPELL_TEMPLATES, create_card
     from src.champions import CHAMPION_LIST, Champion, get_champion_by_name
+    from src.combat_solver import enforce_taunt, solve_blocks
 else:
     from .models import Card, Deck, Player
     from .cards import TROOP_TEMPLATES, SPELL_TEMPLATES, create_card
     from .champions import CHAMPION_LIST, Champion, get_champion_by_name
+    from .combat_solver import enforce_taunt, solve_blocks
 
 
 # ==================== DATA FROM 1M GAME ANALYSIS ====================
@@ -89,6 +92,8 @@ COUNTER_MATCHUPS = {
 
 # ==================== AI DIFFICULTY CONFIGURATION ====================
 
+MCTS_LEVEL = 11  # Search-based tier above the greedy levels 1-10
+
 class AIConfig:
     """Configuration for AI difficulty level."""
     
@@ -102,6 +107,8 @@ class AIConfig:
         self.uses_matchup_knowledge = level >= 9
         self.uses_ability_priority = level >= 7
         self.deck_optimization = min(1.0, level * 0.1)  # 0.1 to 1.0
+        self.uses_mcts = level >= MCTS_LEVEL
+        self.search_time_budget = 0.5  # seconds per decision (MCTS tier)
     
     def _get_name(self) -> str:
         names = {
@@ -114,7 +121,8 @@ class AIConfig:
             7: "🔴 Maestro - Domina Habilidades",
             8: "🔴 Gran Maestro - Meta Game",
             9: "⚫ Leyenda - Elite",
-            10: "💀 Imposible - Perfección"
+            10: "💀 Imposible - Perfección",
+            11: "🧠 Monte Carlo - Búsqueda"
         }
         return names.get(self.level, "Unknown")
     
@@ -396,6 +404,26 @@ class DataDrivenAI:
         # Medium/high - block with weakest
         return min(ready, key=lambda i: defender_zone[i].cost)
     
+    def choose_blockers(self, attackers: List[Tuple[int, Card]], candidates: Dict[int, List[int]],
+                        defender_zone: List[Card], my_life: int) -> Dict[int, int]:
+        """Assign blockers to all incoming attackers at once: {attacker_idx: blocker_idx}.
+
+        High quality levels solve the whole combat jointly; lower levels (or a
+        mistake roll) decide attacker by attacker, each defender used once.
+        Either way Taunt defenders that can block do block.
+        """
+        if self.config.play_quality >= 0.7 and random.random() >= self.config.mistake_chance:
+            return solve_blocks(attackers, defender_zone, my_life, candidates)
+        blocks = {}
+        used = set()
+        for atk_idx, attacker in attackers:
+            available = [i for i in candidates.get(atk_idx, []) if i not in used]
+            choice = self.choose_blocker(attacker, available, defender_zone, my_life)
+            if choice is not None:
+                blocks[atk_idx] = choice
+                used.add(choice)
+        return enforce_taunt(blocks, attackers, defender_zone, candidates)
+
     def choose_attackers(self, active_zone: List[Card]) -> List[int]:
         """Choose which creatures attack."""
         ready = [i for i, c in enumerate(active_zone) if getattr(c, 'ready', False)]
@@ -470,7 +498,104 @@ class DataDrivenAI:
         
         # Default: go face
         return (True, None)
-    
+
+    def choose_spell_to_cast(self, available_mana: int, my_zone: List[Card], enemy_zone: List[Card],
+                             my_life: int, enemy_life: int) -> Optional[Tuple[Card, int, object]]:
+        """Choose a spell from hand: (spell, hand_index, target) or None.
+
+        target uses the Game.execute_spell convention: 'player', a troop
+        index, or None for untargeted spells.
+        """
+        candidates = []
+        for idx, spell in enumerate(self.player.hand):
+            if spell.card_type != 'spell' or spell.cost > available_mana:
+                continue
+            choice = self._spell_target(spell, my_zone, enemy_zone, my_life, enemy_life)
+            if choice is not None:
+                score, target = choice
+                candidates.append((score, idx, spell, target))
+
+        if not candidates:
+            return None
+
+        # Mistake chance - hold the spell or cast a random one
+        if random.random() < self.config.mistake_chance:
+            if random.random() < 0.5:
+                return None
+            _, idx, spell, target = random.choice(candidates)
+            return (spell, idx, target)
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        _, idx, spell, target = candidates[0]
+        return (spell, idx, target)
+
+    def _spell_target(self, spell: Card, my_zone: List[Card], enemy_zone: List[Card],
+                      my_life: int, enemy_life: int) -> Optional[Tuple[float, object]]:
+        """Score a spell and pick its target. None means not worth casting now."""
+        effect = spell.spell_effect
+        target_kind = spell.spell_target
+        enemies = list(range(len(enemy_zone)))
+
+        if effect == 'damage':
+            if target_kind == 'all_enemies':
+                kills = sum(1 for c in enemy_zone if c.current_health <= spell.damage)
+                if len(enemy_zone) >= 2 or kills:
+                    return (kills * 3 + len(enemy_zone), None)
+                return None
+            if target_kind == 'enemy_or_player' and spell.damage >= enemy_life:
+                return (100.0, 'player')
+            killable = [i for i in enemies if enemy_zone[i].current_health <= spell.damage]
+            if killable:
+                best = max(killable, key=lambda i: enemy_zone[i].damage)
+                return (enemy_zone[best].damage * 2, best)
+            if target_kind == 'enemy_or_player':
+                return (spell.damage, 'player')
+            if enemies:
+                best = max(enemies, key=lambda i: enemy_zone[i].damage)
+                return (spell.damage, best)
+            return None
+
+        if effect == 'heal':
+            if target_kind == 'friendly':
+                hurt = [i for i, c in enumerate(my_zone) if c.current_health < c.health]
+                if hurt:
+                    best = max(hurt, key=lambda i: my_zone[i].health - my_zone[i].current_health)
+                    return (my_zone[best].health - my_zone[best].current_health, best)
+                return None
+            missing = self.player.max_life - my_life
+            if missing >= min(spell.damage, 3):
+                return (min(missing, spell.damage), None)
+            return None
+
+        if effect == 'destroy':
+            if spell.name == 'Aniquilar':
+                enemies = [i for i in enemies if enemy_zone[i].current_health < enemy_zone[i].health]
+            if enemies:
+                best = max(enemies, key=lambda i: enemy_zone[i].damage + enemy_zone[i].current_health)
+                return (enemy_zone[best].damage + enemy_zone[best].current_health, best)
+            return None
+
+        if effect == 'freeze':
+            ready = [i for i in enemies if enemy_zone[i].ready]
+            if ready:
+                best = max(ready, key=lambda i: enemy_zone[i].damage)
+                return (enemy_zone[best].damage, best)
+            return None
+
+        if effect == 'draw':
+            if self.player.deck.count() > 0 and len(self.player.hand) <= 4:
+                return (2.0, None)
+            return None
+
+        if effect == 'sacrifice':
+            # Only sacrifice tokens / chaff for the cards and mana
+            fodder = [i for i, c in enumerate(my_zone) if c.cost <= 1]
+            if fodder and self.player.deck.count() > 0:
+                return (1.0, min(fodder, key=lambda i: my_zone[i].damage))
+            return None
+
+        return None
+
     def should_use_champion_ability(self, current_mana: int, mana_cost: int, 
                                    my_cards: List[Card], enemy_cards: List[Card]) -> bool:
         """Decide if champion ability should be used."""
@@ -525,6 +650,7 @@ def get_difficulty_info(level: int, as_dict: bool = False):
             'mistake_rate': config.mistake_chance,
             'uses_ability_priority': config.uses_ability_priority,
             'uses_matchup_knowledge': config.uses_matchup_knowledge,
+            'uses_mcts': config.uses_mcts,
             'avg_champion_wr': champion_avg_wr
         }
     
@@ -542,6 +668,8 @@ def get_difficulty_info(level: int, as_dict: bool = False):
         info += f"\n✓ Prioriza habilidad Furia (51.5% WR)\n"
     if config.uses_matchup_knowledge:
         info += f"✓ Usa conocimiento de matchups\n"
+    if config.uses_mcts:
+        info += f"✓ Busca jugadas con MCTS ({config.search_time_budget:.1f}s por decisión)\n"
     
     return info
 
@@ -569,8 +697,8 @@ def create_ai_opponent(difficulty_level: int = 5) -> Tuple[Champion, Deck, AICon
 
 
 def print_all_difficulties():
-    """Print info for all 10 difficulty levels."""
-    for level in range(1, 11):
+    """Print info for all difficulty levels (1-10 plus the MCTS tier)."""
+    for level in range(1, MCTS_LEVEL + 1):
         print(get_difficulty_info(level))
 
 
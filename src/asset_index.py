@@ -0,0 +1,161 @@
+"""
+Card image index.
+Scans the card asset folder once and maps normalized card names to image
+files, so card creation and the UIs resolve images with a dict lookup instead
+of listing the folder for every card.
+
+File names follow utils/generate_assets.py and utils/generate_spell_assets.py:
+'<name>.png', '<name>_<variant>.png' and '<name>_<variant>_icon.png', with
+spaces or underscores between words. Files regenerated while a client runs
+are picked up by refresh_if_changed(), which game_gui's make_ui calls for
+every new game screen (one stat of the folder); invalidate_asset_index() is
+for code that changes the files from the same process.
+"""
+
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional
+
+_VARIANT_SUFFIX = re.compile(r'_\d+$')
+
+
+def normalize_card_name(name: str) -> str:
+    """Lowercase, NFC, underscores as spaces, single spaces: 'Bola_de  Fuego' -> 'bola de fuego'."""
+    name = unicodedata.normalize('NFC', name).lower().replace('_', ' ')
+    return ' '.join(name.split())
+
+
+def default_asset_dirs() -> List[str]:
+    """Asset folders in lookup order: project assets/cards, then src/assets/cards."""
+    here = os.path.dirname(__file__)
+    return [os.path.join(os.path.dirname(here), 'assets', 'cards'),
+            os.path.join(here, 'assets', 'cards')]
+
+
+class CardAssetIndex:
+    """Lazy, thread-safe index of card images keyed by normalized card name."""
+
+    def __init__(self, asset_dirs: Optional[List[str]] = None):
+        self.asset_dirs = asset_dirs if asset_dirs is not None else default_asset_dirs()
+        self._lock = threading.Lock()
+        self._images: Optional[Dict[str, List[str]]] = None
+        self._icons: Dict[str, List[str]] = {}
+        self._paths: set = set()
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._dir_mtime: Optional[float] = None
+        self.scans = 0
+
+    def _asset_dir(self) -> Optional[str]:
+        for path in self.asset_dirs:
+            if os.path.isdir(path):
+                return path
+        return None
+
+    def _scan(self):
+        images: Dict[str, List[str]] = {}
+        icons: Dict[str, List[str]] = {}
+        asset_dir = self._asset_dir()
+        mtime = None
+        if asset_dir is not None:
+            try:
+                mtime = os.stat(asset_dir).st_mtime
+                names = sorted(os.listdir(asset_dir))
+            except OSError:
+                names = []
+            for fname in names:
+                stem, ext = os.path.splitext(fname)
+                if ext.lower() != '.png':
+                    continue
+                target = images
+                if stem.lower().endswith('_icon'):
+                    stem, target = stem[:-5], icons
+                key = normalize_card_name(_VARIANT_SUFFIX.sub('', stem))
+                target.setdefault(key, []).append(os.path.join(asset_dir, fname))
+        self._images, self._icons = images, icons
+        self._paths = {p for paths in images.values() for p in paths}
+        self._resolved = {}
+        self._dir_mtime = mtime
+        self.scans += 1
+
+    def _index(self) -> Dict[str, List[str]]:
+        images = self._images
+        if images is None:
+            with self._lock:
+                if self._images is None:
+                    self._scan()
+                images = self._images
+        return images
+
+    def invalidate(self):
+        """Forget the scan; the next lookup re-reads the folder."""
+        with self._lock:
+            self._images = None
+            self._icons = {}
+            self._paths = set()
+            self._resolved = {}
+
+    def refresh_if_changed(self) -> bool:
+        """Re-scan if the folder changed since the last scan (one stat call)."""
+        asset_dir = self._asset_dir()
+        try:
+            mtime = os.stat(asset_dir).st_mtime if asset_dir else None
+        except OSError:
+            mtime = None
+        if self._images is not None and mtime == self._dir_mtime:
+            return False
+        self.invalidate()
+        return True
+
+    def image_for(self, name: str) -> Optional[str]:
+        """Full-size image for a card name, or None.
+
+        Exact name first (first variant in file-name order); otherwise the
+        first file whose name starts with the card name, as create_card did.
+        """
+        images = self._index()
+        key = normalize_card_name(name)
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+        paths = images.get(key)
+        if paths is None:
+            paths = next((images[k] for k in sorted(images) if k.startswith(key)), None) if key else None
+        path = paths[0] if paths else None
+        self._resolved[key] = path
+        return path
+
+    def icon_for(self, name: str) -> Optional[str]:
+        """Small icon variant if one exists, else the full image."""
+        self._index()
+        paths = self._icons.get(normalize_card_name(name))
+        return paths[0] if paths else self.image_for(name)
+
+    def image_for_card(self, card) -> Optional[str]:
+        """The card's own image_path if it is indexed, else a lookup by name."""
+        path = getattr(card, 'image_path', None)
+        self._index()
+        if path and path in self._paths:
+            return path
+        return self.image_for(card.name)
+
+    def card_back(self) -> Optional[str]:
+        return self.image_for('card_back')
+
+    def __len__(self) -> int:
+        return sum(len(paths) for paths in self._index().values())
+
+
+_default_index = CardAssetIndex()
+
+
+def get_asset_index() -> CardAssetIndex:
+    """The shared index used by create_card, deck loading and the UIs."""
+    return _default_index
+
+
+def invalidate_asset_index():
+    """Call after adding, renaming or regenerating card images from this process."""
+    _default_index.invalidate()
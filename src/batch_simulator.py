@@ -0,0 +1,345 @@
+"""
+Lockstep batch simulator for champion-vs-champion sweeps.
+Advances thousands of games at once with NumPy struct-of-arrays buffers and
+reproduces the rules of GameSimulator._simulate_turn (src/game_analysis.py),
+so win-rate tables match run_tournament at a much higher rate.
+
+NumPy is an optional dependency, only needed for this module
+(requirements-sim.txt; the server installs requirements.txt without it).
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only the batch simulator needs it
+    np = None
+
+# Permitir imports relativos y absolutos
+if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from src.champions import CHAMPION_LIST, Champion
+    from src.cards import TROOP_TEMPLATES, SPELL_TEMPLATES
+else:
+    from .champions import CHAMPION_LIST, Champion
+    from .cards import TROOP_TEMPLATES, SPELL_TEMPLATES
+
+
+DECK_SIZE = 40
+SPELL_RATIO = 0.3
+MAX_TURNS = 50
+MAX_CARDS_PER_TURN = 4
+# Troops from the deck plus one Mystara token per turn
+BOARD_SLOTS = DECK_SIZE + MAX_TURNS + 6
+
+# Spell effect codes (only the effects GameSimulator resolves)
+EFFECT_NONE, EFFECT_DAMAGE, EFFECT_HEAL, EFFECT_DESTROY, EFFECT_DRAW = range(5)
+_EFFECT_CODES = {'damage': EFFECT_DAMAGE, 'heal': EFFECT_HEAL, 'destroy': EFFECT_DESTROY, 'draw': EFFECT_DRAW}
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("BatchGameSimulator requires numpy (pip install numpy)")
+
+
+def build_card_tables() -> Dict[str, 'np.ndarray']:
+    """Template-index tables: ids [0, len(TROOP_TEMPLATES)) are troops, then spells."""
+    _require_numpy()
+    costs, damages, is_spell, furia, prisa, effect = [], [], [], [], [], []
+    for name, cost, dmg, ability, _desc, _atype in TROOP_TEMPLATES:
+        costs.append(cost)
+        damages.append(dmg)
+        is_spell.append(False)
+        furia.append(ability == 'Furia')
+        prisa.append(ability == 'Prisa')
+        effect.append(EFFECT_NONE)
+    for name, cost, dmg, _target, spell_effect, _desc in SPELL_TEMPLATES:
+        costs.append(cost)
+        damages.append(dmg)
+        is_spell.append(True)
+        furia.append(False)
+        prisa.append(False)
+        effect.append(_EFFECT_CODES.get(spell_effect, EFFECT_NONE))
+    return {
+        'cost': np.array(costs, dtype=np.int16),
+        'damage': np.array(damages, dtype=np.int16),
+        'is_spell': np.array(is_spell, dtype=bool),
+        'furia': np.array(furia, dtype=bool),
+        'prisa': np.array(prisa, dtype=bool),
+        'effect': np.array(effect, dtype=np.int8),
+    }
+
+
+class BatchGameSimulator:
+    """Vectorized equivalent of GameSimulator for large tournaments."""
+
+    def __init__(self, batch_size: int = 4096, seed: Optional[int] = None):
+        _require_numpy()
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.cards = build_card_tables()
+        self.num_troops = len(TROOP_TEMPLATES)
+        self.num_spells = len(SPELL_TEMPLATES)
+        self.champion_stats = {champ.name: {"wins": 0, "losses": 0, "total_turns": 0, "games": 0}
+                               for champ in CHAMPION_LIST}
+        self.matchup_results: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Deck generation
+    # ------------------------------------------------------------------
+
+    def random_decks(self, games: int) -> Tuple['np.ndarray', 'np.ndarray']:
+        """Random quick_deck-style decks: (ids, health), shape (games, 2, DECK_SIZE), in draw order."""
+        num_spells = int(DECK_SIZE * SPELL_RATIO)
+        num_troops = DECK_SIZE - num_spells
+        troop_ids = self.rng.integers(0, self.num_troops, size=(games, 2, num_troops), dtype=np.int16)
+        spell_ids = self.rng.integers(0, self.num_spells, size=(games, 2, num_spells), dtype=np.int16)
+        spell_ids += self.num_troops
+        ids = np.concatenate([troop_ids, spell_ids], axis=2)
+        health = self.cards['damage'][ids] + self.rng.integers(0, 3, size=ids.shape, dtype=np.int16)
+        health[..., num_troops:] = 0
+        # Shuffle each deck independently
+        order = np.argsort(self.rng.random(ids.shape), axis=2)
+        ids = np.take_along_axis(ids, order, axis=2)
+        health = np.take_along_axis(health, order, axis=2)
+        return ids, health
+
+    # ------------------------------------------------------------------
+    # Lockstep simulation
+    # ------------------------------------------------------------------
+
+    def simulate_decks(self, champ1: Champion, champ2: Champion,
+                       deck_ids: 'np.ndarray', deck_health: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """Play one game per row. Returns (p1_won, turns) arrays."""
+        games = deck_ids.shape[0]
+        champs = (champ1, champ2)
+        state = {
+            'deck_ids': deck_ids,
+            'deck_health': deck_health,
+            'deck_pos': np.zeros((games, 2), dtype=np.int16),
+            'deck_len': np.full((games, 2), deck_ids.shape[2], dtype=np.int16),
+            'hand_ids': np.zeros((games, 2, deck_ids.shape[2]), dtype=np.int16),
+            'hand_health': np.zeros((games, 2, deck_ids.shape[2]), dtype=np.int16),
+            'hand_len': np.zeros((games, 2), dtype=np.int16),
+            'board': np.zeros((games, 2, BOARD_SLOTS), dtype=np.int16),
+            'board_head': np.zeros((games, 2), dtype=np.int16),
+            'board_tail': np.zeros((games, 2), dtype=np.int16),
+            'power': np.zeros((games, 2), dtype=np.int32),  # attack of ready troops
+            'life': np.array([[champ1.starting_life, champ2.starting_life]] * games, dtype=np.int32),
+            'max_mana': np.zeros((games, 2), dtype=np.int16),
+            'mana': np.zeros((games, 2), dtype=np.int16),
+        }
+        life = state['life']
+        turns = np.zeros(games, dtype=np.int16)
+        running = np.ones(games, dtype=bool)
+
+        for _ in range(MAX_TURNS):
+            g = np.nonzero(running & (life[:, 0] > 0) & (life[:, 1] > 0))[0]
+            if g.size == 0:
+                break
+            turns[g] += 1
+            self._simulate_turn(state, g, 0, champs[0])
+            g = g[life[g, 1] > 0]
+            running[:] = False
+            running[g] = True
+            if g.size:
+                self._simulate_turn(state, g, 1, champs[1])
+
+        return life[:, 0] > 0, turns
+
+    def _draw(self, state, g: 'np.ndarray', side: int):
+        """Draw one card for each game in g (empty decks draw nothing)."""
+        pos = state['deck_pos'][g, side]
+        has = pos < state['deck_len'][g, side]
+        g = g[has]
+        pos = pos[has]
+        slot = state['hand_len'][g, side]
+        state['hand_ids'][g, side, slot] = state['deck_ids'][g, side, pos]
+        state['hand_health'][g, side, slot] = state['deck_health'][g, side, pos]
+        state['hand_len'][g, side] += 1
+        state['deck_pos'][g, side] += 1
+
+    def _push_board(self, state, g: 'np.ndarray', side: int, power: 'np.ndarray'):
+        tail = state['board_tail'][g, side]
+        state['board'][g, side, tail] = power
+        state['board_tail'][g, side] += 1
+
+    def _simulate_turn(self, state, g: 'np.ndarray', side: int, champion: Champion):
+        """Vectorized GameSimulator._simulate_turn for side `side` in games g."""
+        opp = 1 - side
+        cards = self.cards
+        ability = champion.ability_type if champion else None
+        life = state['life']
+
+        # Draw (Tacticus draws 2)
+        for _ in range(2 if ability == 'card_draw' else 1):
+            self._draw(state, g, side)
+
+        # Mana
+        state['max_mana'][g, side] = np.minimum(state['max_mana'][g, side] + 1, 10)
+        state['mana'][g, side] = state['max_mana'][g, side]
+
+        # Troops that join the ready pool at end of turn / attack right now (Prisa)
+        joining = np.zeros(g.size, dtype=np.int32)
+        attack_now = np.zeros(g.size, dtype=np.int32)
+
+        # Mystara token (Lumina's heal never changes an outcome here: troops take no damage)
+        if ability == 'summon_token':
+            self._push_board(state, g, side, np.ones(g.size, dtype=np.int16))
+            joining += 1
+
+        # Play phase: walk the hand snapshot in order, up to 4 cards
+        snapshot_len = state['hand_len'][g, side].copy()
+        played = np.zeros((g.size, state['hand_ids'].shape[2]), dtype=bool)
+        plays = np.zeros(g.size, dtype=np.int16)
+        rows = np.arange(g.size)
+        max_len = int(snapshot_len.max()) if g.size else 0
+        for pos in range(max_len):
+            cid = state['hand_ids'][g, side, pos]
+            spell = cards['is_spell'][cid]
+            cost = cards['cost'][cid]
+            if ability == 'spell_discount':
+                cost = np.where(spell, np.maximum(1, cost - champion.ability_value), cost)
+            ok = (pos < snapshot_len) & (plays < MAX_CARDS_PER_TURN) & (cost <= state['mana'][g, side])
+            if not ok.any():
+                continue
+            gg = g[ok]
+            state['mana'][gg, side] -= cost[ok]
+            played[rows[ok], pos] = True
+            plays[ok] += 1
+
+            troop = ok & ~spell
+            if troop.any():
+                t_cid = cid[troop]
+                dmg = cards['damage'][t_cid].astype(np.int32)
+                furia = cards['furia'][t_cid].copy()
+                prisa = cards['prisa'][t_cid].copy()
+                if ability == 'troop_buff_attack':
+                    dmg += champion.ability_value
+                elif ability == 'cheap_troop_buff':
+                    buffed = cards['cost'][t_cid] <= 3
+                    dmg += buffed
+                    prisa |= buffed
+                    furia &= ~buffed  # ability is replaced by 'Prisa'
+                elif ability == 'big_troop_buff':
+                    dmg += state['hand_health'][g[troop], side, pos] >= 4
+                elif ability == 'all_furia':
+                    furia[:] = True
+                    prisa[:] = False
+                power = dmg * (1 + furia)
+                self._push_board(state, g[troop], side, power.astype(np.int16))
+                joining[troop] += power
+                attack_now[troop] += np.where(prisa, power, 0)
+
+            if not spell[ok].any():
+                continue
+            effect = np.where(ok & spell, cards['effect'][cid], EFFECT_NONE)
+            amount = cards['damage'][cid]
+            hit = effect == EFFECT_DAMAGE
+            life[g[hit], opp] -= amount[hit]
+            heal = effect == EFFECT_HEAL
+            life[g[heal], side] += amount[heal]
+            destroy = effect == EFFECT_DESTROY
+            if destroy.any():
+                gd = g[destroy]
+                gd = gd[state['board_tail'][gd, opp] > state['board_head'][gd, opp]]
+                head = state['board_head'][gd, opp]
+                state['power'][gd, opp] -= state['board'][gd, opp, head]
+                state['board_head'][gd, opp] += 1
+            draw = effect == EFFECT_DRAW
+            if draw.any():
+                for _ in range(int(amount[draw].max())):
+                    self._draw(state, g[draw], side)
+
+        # Attack: every ready troop plus Prisa troops hit face
+        life[g, opp] -= state['power'][g, side] + attack_now
+        state['power'][g, side] += joining
+
+        # Remove played cards, keeping hand order
+        if max_len:
+            order = np.argsort(played, axis=1, kind='stable')
+            state['hand_ids'][g, side] = np.take_along_axis(state['hand_ids'][g, side], order, axis=1)
+            state['hand_health'][g, side] = np.take_along_axis(state['hand_health'][g, side], order, axis=1)
+            state['hand_len'][g, side] -= plays
+
+    # ------------------------------------------------------------------
+    # Tournament API (same tables as GameSimulator.run_tournament)
+    # ------------------------------------------------------------------
+
+    def simulate_matchup(self, champ1: Champion, champ2: Champion, games: int) -> Dict[str, int]:
+        """Simulate `games` matches between two champions, in batches."""
+        result = {champ1.name: 0, champ2.name: 0, 'turns': 0}
+        done = 0
+        while done < games:
+            n = min(self.batch_size, games - done)
+            ids, health = self.random_decks(n)
+            p1_won, turns = self.simulate_decks(champ1, champ2, ids, health)
+            wins1 = int(p1_won.sum())
+            result[champ1.name] += wins1
+            result[champ2.name] += n - wins1
+            result['turns'] += int(turns.sum())
+            done += n
+        return result
+
+    def run_tournament(self, matches_per_pair: int = 10000):
+        """Run a full tournament with all champion combinations."""
+        start_time = time.time()
+        print("🏆 INICIANDO TORNEO DE CAMPEONES (SIMULADOR POR LOTES) 🏆\n")
+        print("=" * 80)
+        total_matches = 0
+        for i, champ1 in enumerate(CHAMPION_LIST):
+            for champ2 in CHAMPION_LIST[i+1:]:
+                result = self.simulate_matchup(champ1, champ2, matches_per_pair)
+                self.matchup_results[(champ1.name, champ2.name)] = result
+                for champ, other in ((champ1, champ2), (champ2, champ1)):
+                    stats = self.champion_stats[champ.name]
+                    stats['wins'] += result[champ.name]
+                    stats['losses'] += result[other.name]
+                    stats['total_turns'] += result['turns']
+                    stats['games'] += matches_per_pair
+                total_matches += matches_per_pair
+                win_rate = result[champ1.name] / matches_per_pair * 100
+                print(f"  ✓ {champ1.name} vs {champ2.name}: {result[champ1.name]}-{result[champ2.name]} ({win_rate:.1f}%)")
+
+        elapsed = time.time() - start_time
+        print(f"\n✅ {total_matches} partidas simuladas en {elapsed/60:.1f} minutos")
+        print(f"⚡ Velocidad promedio: {total_matches/elapsed:.0f} partidas/segundo\n")
+
+    def print_statistics(self):
+        """Print tournament statistics (same ranking table as GameSimulator)."""
+        print("\n" + "=" * 80)
+        print("📊 ESTADÍSTICAS DEL TORNEO - RESULTADOS FINALES")
+        print("=" * 80 + "\n")
+        sorted_champions = sorted(
+            self.champion_stats.items(),
+            key=lambda x: x[1]['wins'] / x[1]['games'] if x[1]['games'] else 0,
+            reverse=True
+        )
+        print(f"{'Rank':<6} {'Campeón':<15} {'Victorias':<10} {'Derrotas':<10} {'WR%':<10} {'Turnos Avg':<12}")
+        print("-" * 80)
+        for rank, (champ_name, stats) in enumerate(sorted_champions, 1):
+            win_rate = stats['wins'] / stats['games'] * 100 if stats['games'] else 0
+            avg_turns = stats['total_turns'] / stats['games'] if stats['games'] else 0
+            print(f"{rank:<6} {champ_name:<15} {stats['wins']:<10} {stats['losses']:<10} {win_rate:<9.1f}% {avg_turns:<11.1f}")
+        print("\n" + "=" * 80)
+
+
+def main():
+    """Run a batched tournament from the command line."""
+    import argparse
+    parser = argparse.ArgumentParser(description='Torneo de campeones con el simulador por lotes')
+    parser.add_argument('--matches', type=int, default=100000, help='Partidas por matchup')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = BatchGameSimulator(batch_size=args.batch_size, seed=args.seed)
+    simulator.run_tournament(matches_per_pair=args.matches)
+    simulator.print_statistics()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""
+Compact binary encoding for Socket.IO game traffic.
+Clients that negotiate it receive game_state_update and request_blockers as
+bytes (sent by Socket.IO as binary attachments) and send game_action as
+bytes; everything else, and every peer that did not negotiate, stays JSON.
+
+Layouts are fixed struct records, little-endian. Every message starts with
+a tag byte and the protocol version:
+
+    state     header (sides' life/mana/counts, turn flags), then three card
+              zones (my hand, my active zone, opponent's active zone):
+              H count + count * (I uid, H template id, h damage, h health,
+              h current_health, B ready | frozen_turns << 1)
+    blockers  H n, n * H attacker; H n, n * h target (-1 = player)
+    action    B action code, B len + room id (UTF-8), then per action:
+              play_card H card_index, h spell_target (NONE_TARGET = None);
+              activate_ability H card_index; declare_attacks attackers and
+              targets as in blockers; declare_blockers H n, n * (H, H);
+              end_turn / surrender nothing
+
+Cards travel as template ids (see card_catalog): the server must send the
+'card_catalog' entries first and the client expands states with its cache.
+Actions with fields outside these layouts are sent as JSON instead.
+"""
+
+import struct
+from typing import Any, Dict, Iterable, List, Optional
+
+from .zobrist import card_uid
+
+VERSION = 1
+
+TAG_STATE = 1
+TAG_BLOCKERS = 2
+TAG_ACTION = 3
+
+NONE_TARGET = -32768
+
+_PREFIX = struct.Struct('<BB')
+_STATE = struct.Struct('<BBB' + 'hhhhHH' + 'hhhhHHH')
+_COUNT = struct.Struct('<H')
+_CARD = struct.Struct('<IHhhhB')
+_PLAY = struct.Struct('<Hh')
+
+ACTIONS = ('play_card', 'end_turn', 'declare_attacks', 'declare_blockers', 'activate_ability', 'surrender')
+_ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+_ACTION_KEYS = {
+    'play_card': {'action', 'room_id', 'card_index', 'spell_target'},
+    'end_turn': {'action', 'room_id'},
+    'declare_attacks': {'action', 'room_id', 'attackers', 'targets'},
+    'declare_blockers': {'action', 'room_id', 'blockers'},
+    'activate_ability': {'action', 'room_id', 'card_index'},
+    'surrender': {'action', 'room_id'},
+}
+
+
+def is_binary(payload) -> bool:
+    return isinstance(payload, (bytes, bytearray, memoryview))
+
+
+def _check(data: bytes, tag: int):
+    if len(data) < _PREFIX.size:
+        raise ValueError('truncated message')
+    got, version = _PREFIX.unpack_from(data)
+    if got != tag or version != VERSION:
+        raise ValueError(f'unexpected message tag/version {got}/{version}')
+
+
+# ----------------------------------------------------------------------------
+# Game state
+# ----------------------------------------------------------------------------
+
+def _pack_zone(cards, template_id) -> bytes:
+    values: List[int] = []
+    for card in cards:
+        values += (card_uid(card), template_id(card), card.damage, card.health, card.current_health,
+                   bool(card.ready) | min(card.frozen_turns, 127) << 1)
+    return struct.pack('<H' + 'IHhhhB' * len(cards), len(cards), *values)
+
+
+def pack_state(game, side: str, catalog) -> Optional[bytes]:
+    """Binary game_state_update for the player controlling `side` ('player'/'ai').
+
+    Read straight from the Game: no intermediate dicts. `catalog` is the
+    server's CardCatalog. Returns None if a value does not fit the layout
+    (send JSON then).
+    """
+    me, opp = (game.player, game.ai) if side == 'player' else (game.ai, game.player)
+    flags = (game.turn == 'ai') | (game.turn == side) << 1
+    try:
+        return b''.join((
+            _STATE.pack(TAG_STATE, VERSION, flags,
+                        me.life, getattr(me, 'max_life', me.life), me.mana, me.max_mana,
+                        len(me.deck.cards), len(me.graveyard),
+                        opp.life, getattr(opp, 'max_life', opp.life), opp.mana, opp.max_mana,
+                        len(opp.hand), len(opp.deck.cards), len(opp.graveyard)),
+            _pack_zone(me.hand, catalog.template_id),
+            _pack_zone(me.active_zone, catalog.template_id),
+            _pack_zone(opp.active_zone, catalog.template_id),
+        ))
+    except struct.error:
+        return None
+
+
+def state_cards(game, side: str) -> Iterable:
+    """Cards a pack_state() for `side` sends (for CardCatalog.pending_cards)."""
+    me, opp = (game.player, game.ai) if side == 'player' else (game.ai, game.player)
+    return me.hand + me.active_zone + opp.active_zone
+
+
+def _unpack_zone(data: bytes, offset: int, cache, zone: List[dict]) -> int:
+    count, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    end = offset + count * _CARD.size
+    if end > len(data):
+        raise ValueError('truncated card zone')
+    for uid, tid, damage, health, current_health, flags in _CARD.iter_unpack(data[offset:end]):
+        entry = cache.get(tid)
+        if entry is None:
+            raise KeyError(tid)
+        card = {'uid': uid}
+        card.update(entry)
+        card.update(damage=damage, health=health, current_health=current_health,
+                    ready=bool(flags & 1), frozen_turns=flags >> 1)
+        zone.append(card)
+    return end
+
+
+def unpack_state(data: bytes, cache) -> Optional[Dict[str, Any]]:
+    """Full state dict (same as the JSON path after expanding) from pack_state() bytes.
+
+    `cache` is the client's CatalogCache. Returns None if a card's template
+    is missing from it (ask for a full state); raises ValueError on bad data.
+    """
+    _check(data, TAG_STATE)
+    try:
+        (_, _, flags, life, max_life, mana, max_mana, deck, graveyard,
+         o_life, o_max_life, o_mana, o_max_mana, o_hand, o_deck, o_graveyard) = _STATE.unpack_from(data)
+        hand: List[dict] = []
+        active: List[dict] = []
+        opp_active: List[dict] = []
+        offset = _STATE.size
+        for zone in (hand, active, opp_active):
+            offset = _unpack_zone(data, offset, cache, zone)
+    except struct.error as e:
+        raise ValueError(f'truncated state: {e}')
+    except KeyError:
+        cache.missing += 1
+        return None
+    return {
+        'my_state': {'life': life, 'max_life': max_life, 'mana': mana, 'max_mana': max_mana,
+                     'hand': hand, 'active_zone': active, 'deck_count': deck, 'graveyard_count': graveyard},
+        'opponent_state': {'life': o_life, 'max_life': o_max_life, 'mana': o_mana, 'max_mana': o_max_mana,
+                           'hand_count': o_hand, 'active_zone': opp_active, 'deck_count': o_deck,
+                           'graveyard_count': o_graveyard},
+        'turn': 'ai' if flags & 1 else 'player',
+        'is_my_turn': bool(flags & 2),
+    }
+
+
+# ----------------------------------------------------------------------------
+# request_blockers / game_action
+# ----------------------------------------------------------------------------
+
+def _pack_ints(fmt: str, values: List[int]) -> bytes:
+    return struct.pack('<H' + fmt * len(values), len(values), *values)
+
+
+def _unpack_ints(fmt: str, data: bytes, offset: int):
+    count, = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    values = struct.unpack_from('<' + fmt * count, data, offset)
+    return list(values), offset + struct.calcsize('<' + fmt * count)
+
+
+def _target_index(target) -> int:
+    """-1 for the player, the card index for ('card', i) / {'type': 'card', 'index': i}."""
+    if target == 'player':
+        return -1
+    if isinstance(target, dict) and target.get('type') == 'card':
+        return int(target.get('index', 0))
+    if isinstance(target, (tuple, list)) and len(target) == 2 and target[0] == 'card':
+        return int(target[1])
+    raise ValueError(f'unsupported target {target!r}')
+
+
+def pack_blockers(attackers: List[int], targets: List) -> Optional[bytes]:
+    """Binary request_blockers; targets are 'player' or ('card', index)."""
+    try:
+        return b''.join((_PREFIX.pack(TAG_BLOCKERS, VERSION), _pack_ints('H', attackers),
+                         _pack_ints('h', [_target_index(t) for t in targets])))
+    except (struct.error, ValueError, TypeError):
+        return None
+
+
+def unpack_blockers(data: bytes) -> Dict[str, Any]:
+    """request_blockers payload as the JSON path delivers it (targets 'player' / ['card', i])."""
+    _check(data, TAG_BLOCKERS)
+    try:
+        attackers, offset = _unpack_ints('H', data, _PREFIX.size)
+        indexes, _ = _unpack_ints('h', data, offset)
+    except struct.error as e:
+        raise ValueError(f'truncated request_blockers: {e}')
+    return {'attackers': attackers, 'targets': ['player' if i < 0 else ['card', i] for i in indexes]}
+
+
+def pack_action(action: Dict[str, Any]) -> Optional[bytes]:
+    """Binary game_action, or None if the action does not fit a layout (send JSON)."""
+    name = action.get('action')
+    if name not in _ACTION_CODES or not set(action) <= _ACTION_KEYS[name]:
+        return None
+    try:
+        room = str(action.get('room_id') or '').encode('utf-8')
+        parts = [_PREFIX.pack(TAG_ACTION, VERSION), bytes((_ACTION_CODES[name], len(room))), room]
+        if name == 'play_card':
+            target = action.get('spell_target')
+            parts.append(_PLAY.pack(action.get('card_index', 0), NONE_TARGET if target is None else target))
+        elif name == 'activate_ability':
+            parts.append(_COUNT.pack(action.get('card_index', 0)))
+        elif name == 'declare_attacks':
+            parts.append(_pack_ints('H', action.get('attackers', [])))
+            parts.append(_pack_ints('h', [_target_index(t) for t in action.get('targets', [])]))
+        elif name == 'declare_blockers':
+            pairs = [int(v) for item in action.get('blockers', {}).items() for v in item]
+            parts.append(struct.pack('<H' + 'HH' * (len(pairs) // 2), len(pairs) // 2, *pairs))
+        return b''.join(parts)
+    except (struct.error, ValueError, TypeError):
+        return None
+
+
+def unpack_action(data: bytes) -> Dict[str, Any]:
+    """game_action dict from pack_action() bytes (blocker keys come back as ints)."""
+    _check(data, TAG_ACTION)
+    try:
+        code, room_len = data[_PREFIX.size], data[_PREFIX.size + 1]
+        offset = _PREFIX.size + 2
+        action: Dict[str, Any] = {'action': ACTIONS[code],
+                                  'room_id': bytes(data[offset:offset + room_len]).decode('utf-8')}
+        offset += room_len
+        name = action['action']
+        if name == 'play_card':
+            card_index, target = _PLAY.unpack_from(data, offset)
+            action.update(card_index=card_index, spell_target=None if target == NONE_TARGET else target)
+        elif name == 'activate_ability':
+            action['card_index'], = _COUNT.unpack_from(data, offset)
+        elif name == 'declare_attacks':
+            action['attackers'], offset = _unpack_ints('H', data, offset)
+            indexes, _ = _unpack_ints('h', data, offset)
+            action['targets'] = ['player' if i < 0 else {'type': 'card', 'index': i} for i in indexes]
+        elif name == 'declare_blockers':
+            pairs, _ = _unpack_ints('HH', data, offset)
+            action['blockers'] = dict(zip(pairs[::2], pairs[1::2]))
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f'bad game_action: {e}')
+    return action
@@ -0,0 +1,185 @@
+"""
+Bot seat for server matches: turns DataDrivenAI decisions into the same
+game_action dicts a networked client sends ('play_card', 'declare_attacks',
+'declare_blockers', 'end_turn'), so a bot can drive a room through the
+server's normal action path (or match_journal.apply_action).
+
+The bot is called once per action with the current state of its side:
+next_action() returns one action, the caller applies it and asks again
+until the bot ends its turn. It only looks at what its seat can see (own
+hand and board, the opponent's board and life). Level 11 (MCTS) needs the
+Game itself and is only used when one is passed in; all the searches of one
+next_action() share `decision_budget` seconds.
+
+BotPool runs decisions on a bounded executor (the server uses gevent's
+thread pool, so a slow decision never blocks the hub) with a per-decision
+timeout and a safe fallback, and keeps think-time statistics.
+"""
+
+import time
+from collections import deque
+from concurrent.futures import TimeoutError as DecisionTimeout
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .models import Card, Player
+from .ai_engine import AIConfig, DataDrivenAI
+
+Attackers = List[Tuple[int, Card]]
+
+
+def attack_target(target) -> object:
+    """Wire form of an attack target: 'player' or {'type': 'card', 'index': i}."""
+    return 'player' if target is None else {'type': 'card', 'index': target}
+
+
+class BotPlayer:
+    """Plays one seat at a given AIConfig level, one game_action at a time."""
+
+    # Actions the server may ignore (e.g. a spell whose champion-adjusted cost
+    # is above the mana left) would otherwise be retried forever
+    MAX_ACTIONS_PER_TURN = 20
+
+    def __init__(self, level: int = 5, decision_budget: float = 1.0):
+        self.config = AIConfig(level)
+        self.decision_budget = decision_budget
+        self._turn_actions = 0
+        self._attacked = False
+
+    def fork(self) -> 'BotPlayer':
+        """Copy with the same turn progress: a decision computed on it only affects
+        the original if the caller keeps it (a timed-out worker cannot touch the seat)."""
+        other = BotPlayer.__new__(BotPlayer)
+        other.__dict__.update(self.__dict__)
+        return other
+
+    @property
+    def level(self) -> int:
+        return self.config.level
+
+    def _brain(self, me: Player, game=None) -> DataDrivenAI:
+        if self.config.uses_mcts and game is not None:
+            from .mcts_ai import MCTSAI
+            return MCTSAI(me, self.config, game=game)
+        return DataDrivenAI(me, self.config)
+
+    def _share(self, brain: DataDrivenAI, deadline: float, parts: int):
+        """Search time of the next MCTS call: an equal part of what is left of the decision budget."""
+        if hasattr(brain, 'time_budget'):
+            left = max(0.0, deadline - time.perf_counter())
+            brain.time_budget = min(self.config.search_time_budget, left / max(1, parts))
+
+    def new_turn(self):
+        """Call when the bot's turn starts."""
+        self._turn_actions = 0
+        self._attacked = False
+
+    def next_action(self, me: Player, opponent: Player, game=None) -> dict:
+        """Next action of the bot's turn: spells, then troops, then one attack
+        declaration, then end_turn."""
+        if self._turn_actions >= self.MAX_ACTIONS_PER_TURN:
+            return {'action': 'end_turn'}
+        self._turn_actions += 1
+        deadline = time.perf_counter() + self.decision_budget
+        brain = self._brain(me, game)
+
+        # Up to three kinds of search (spells, troops, attack targets)
+        self._share(brain, deadline, 3)
+        spell = brain.choose_spell_to_cast(me.mana, me.active_zone, opponent.active_zone, me.life, opponent.life)
+        if spell is not None:
+            _, index, target = spell
+            return {'action': 'play_card', 'card_index': index, 'spell_target': target}
+
+        self._share(brain, deadline, 2)
+        troops = [c for c in brain.choose_cards_to_play(me.mana) if c.card_type != 'spell']
+        if troops:
+            index = next(i for i, c in enumerate(me.hand) if c is troops[0])
+            return {'action': 'play_card', 'card_index': index}
+
+        if not self._attacked:
+            self._attacked = True
+            attackers = [i for i in brain.choose_attackers(me.active_zone)
+                         if not getattr(me.active_zone[i], 'frozen_turns', 0) > 0]
+            declared, targets = [], []
+            for k, i in enumerate(attackers):
+                self._share(brain, deadline, len(attackers) - k)
+                face, index = brain.choose_attack_target(me.active_zone[i], opponent.active_zone, opponent.life)
+                if not face and index is None:
+                    continue  # (False, None): the search keeps this attacker home
+                declared.append(i)
+                targets.append(attack_target(None if face else index))
+            if declared:
+                return {'action': 'declare_attacks', 'attackers': declared, 'targets': targets}
+
+        return {'action': 'end_turn'}
+
+    def choose_blockers(self, me: Player, attackers: Attackers, candidates: Dict[int, List[int]],
+                        game=None) -> dict:
+        """declare_blockers answer to attackers [(attacker_idx, Card)] hitting the
+        bot's player; candidates {attacker_idx: [legal blocker indexes]}."""
+        blocks = self._brain(me, game).choose_blockers(attackers, candidates, me.active_zone, me.life)
+        return {'action': 'declare_blockers', 'blockers': blocks}
+
+
+def face_attackers(attacking: Player, attackers: List[int], targets: List) -> Attackers:
+    """The declared attackers that hit the player (the only ones that can be blocked)."""
+    result = []
+    for i, index in enumerate(attackers):
+        target = targets[i] if i < len(targets) else 'player'
+        if target == 'player' and 0 <= index < len(attacking.active_zone):
+            result.append((index, attacking.active_zone[index]))
+    return result
+
+
+class BotPool:
+    """Bot decisions on a bounded executor, with think-time statistics.
+
+    `executor` is anything with concurrent.futures' submit() (its size is
+    the bound). decide() waits for the result, up to `timeout` seconds, and
+    returns `fallback` when the decision is late or raises.
+    """
+
+    def __init__(self, executor, timeout: Optional[float] = None, history: int = 1000,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.executor = executor
+        self.timeout = timeout
+        self.clock = clock
+        self._think: Deque[float] = deque(maxlen=history)  # computing (s)
+        self._wait: Deque[float] = deque(maxlen=history)   # submit to result, queueing included (s)
+        self.decisions = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def _timed(self, fn: Callable, args: tuple):
+        start = self.clock()
+        result = fn(*args)
+        return result, self.clock() - start
+
+    def decide(self, fn: Callable, *args, fallback: Any = None) -> Any:
+        submitted = self.clock()
+        self.in_flight += 1
+        try:
+            result, think = self.executor.submit(self._timed, fn, args).result(self.timeout)
+        except DecisionTimeout:
+            self.timeouts += 1  # the worker finishes in the background; the pool bound still holds
+            return fallback
+        except Exception:
+            self.errors += 1
+            return fallback
+        finally:
+            self.in_flight -= 1
+        self.decisions += 1
+        self._think.append(think)
+        self._wait.append(self.clock() - submitted)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        def summary(values) -> Dict[str, Optional[float]]:
+            values = sorted(values)
+            if not values:
+                return {'p50': None, 'p95': None, 'max': None}
+            pick = lambda p: round(values[min(len(values) - 1, int(p * len(values)))] * 1000, 3)
+            return {'p50': pick(0.5), 'p95': pick(0.95), 'max': round(values[-1] * 1000, 3)}
+
+        return {'decisions': self.decisions, 'timeouts': self.timeouts, 'errors': self.errors,
+                'in_flight': self.in_flight, 'think_ms': summary(self._think), 'wait_ms': summary(self._wait)}
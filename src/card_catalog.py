@@ -0,0 +1,176 @@
+"""
+Template-id wire encoding for cards in server payloads.
+A card's static texts (name, ability and spell descriptions...) never change
+during a match, so the server numbers each distinct card template once and
+sends cards as {'uid', 't': template_id} plus the play fields that differ
+from the template's defaults (a card fresh in hand is just its uid and id).
+The template entries themselves travel in a 'card_catalog' event, at most
+once per connection, and the client caches them to expand compact cards
+back into the full dicts the UI code reads.
+
+Compact card:  {'uid': 12, 't': 3, 'current_health': 1, 'ready': True}
+Catalog event: {'templates': {'3': {'name': ..., 'cost': ..., 'damage': 2, 'health': 3,
+                                    'current_health': 3, 'ready': False, 'frozen_turns': 0, ...}}}
+(JSON object keys are strings; both sides accept either.)
+"""
+
+from typing import Any, Dict, Iterable, Optional, Set
+
+from .zobrist import card_uid
+
+# Fields fixed per template (cost included: nothing changes it during play)
+WIRE_TEMPLATE_FIELDS = ('name', 'cost', 'card_type', 'ability', 'ability_desc', 'ability_type',
+                        'spell_target', 'spell_effect', 'description')
+# Fields that change during play, sent when they differ from the template defaults
+WIRE_DYNAMIC_FIELDS = ('damage', 'health', 'current_health', 'ready', 'frozen_turns')
+
+
+def full_card(card) -> Dict[str, Any]:
+    """Plain (uncompressed) wire dict of a card: what expanding its compact form gives."""
+    data = {'uid': card_uid(card)}
+    for name in WIRE_TEMPLATE_FIELDS + WIRE_DYNAMIC_FIELDS:
+        data[name] = getattr(card, name)
+    return data
+
+
+def _iter_compact(value) -> Iterable[dict]:
+    """Compact card dicts anywhere inside a state."""
+    if isinstance(value, dict):
+        if 't' in value and 'uid' in value:
+            yield value
+            return
+        for item in value.values():
+            yield from _iter_compact(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _iter_compact(item)
+
+
+class CardCatalog:
+    """Server side: template ids and what each connection (sid) already has.
+
+    Ids are process-wide and never reused; a connection only receives the
+    entries of templates that actually appear in its states.
+    """
+
+    def __init__(self):
+        self._ids: Dict[tuple, int] = {}
+        self._entries: Dict[int, Dict[str, Any]] = {}
+        self._known: Dict[str, Set[int]] = {}
+        self.entries_sent = 0
+
+    def template_id(self, card) -> int:
+        key = (card.template, card.cost, card.card_type, card.ability)
+        tid = self._ids.get(key)
+        if tid is None:
+            tid = self._ids[key] = len(self._ids) + 1
+            entry = {name: getattr(card, name) for name in WIRE_TEMPLATE_FIELDS}
+            # Defaults for the play fields: the card as it comes out of the deck
+            entry.update(damage=card.damage, health=card.health, current_health=card.health,
+                         ready=False, frozen_turns=0)
+            self._entries[tid] = entry
+        return tid
+
+    def entry(self, tid: int) -> Dict[str, Any]:
+        return self._entries[tid]
+
+    def encode_card(self, card) -> Dict[str, Any]:
+        """Compact wire dict: uid, template id and the play fields off their defaults."""
+        tid = self.template_id(card)
+        entry = self._entries[tid]
+        data = {'uid': card_uid(card), 't': tid}
+        for name in WIRE_DYNAMIC_FIELDS:
+            value = getattr(card, name)
+            if value != entry[name]:
+                data[name] = value
+        return data
+
+    def reset(self, sid: str):
+        """Start (or restart, on resync) compact cards for `sid`: entries are sent again."""
+        self._known[sid] = set()
+
+    def drop(self, sid: str):
+        self._known.pop(sid, None)
+
+    def __len__(self) -> int:
+        """Number of templates numbered so far."""
+        return len(self._entries)
+
+    def __contains__(self, sid: str) -> bool:
+        """True if `sid` negotiated compact cards (see reset)."""
+        return sid in self._known
+
+    def pending(self, sid: str, state) -> Optional[Dict[str, Any]]:
+        """'card_catalog' payload with the templates used in `state` that `sid` lacks, or None.
+
+        The entries are marked as sent: emit the payload before the state.
+        """
+        return self._pending(sid, (card['t'] for card in _iter_compact(state)))
+
+    def pending_cards(self, sid: str, cards: Iterable) -> Optional[Dict[str, Any]]:
+        """Same as pending(), for the Card objects about to be sent to `sid`."""
+        return self._pending(sid, (self.template_id(card) for card in cards))
+
+    def _pending(self, sid: str, tids: Iterable[int]) -> Optional[Dict[str, Any]]:
+        known = self._known.setdefault(sid, set())
+        new = {}
+        for tid in tids:
+            if tid not in known:
+                known.add(tid)
+                new[str(tid)] = self._entries[tid]
+        if not new:
+            return None
+        self.entries_sent += len(new)
+        return {'templates': new}
+
+
+class CatalogCache:
+    """Client side: cached template entries; expands compact cards in states.
+
+    expand() returns None when a card names a template the cache does not
+    have (e.g. the catalog event was missed): ask the server for a full state.
+    Clear the cache on every new connection, ids are only valid per server.
+    """
+
+    def __init__(self):
+        self._templates: Dict[int, Dict[str, Any]] = {}
+        self.missing = 0
+
+    def update(self, payload: Dict[str, Any]):
+        for tid, entry in (payload or {}).get('templates', {}).items():
+            self._templates[int(tid)] = entry
+
+    def get(self, tid: int) -> Optional[Dict[str, Any]]:
+        """Template entry for `tid`, or None if it was never received."""
+        return self._templates.get(tid)
+
+    def clear(self):
+        self._templates.clear()
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def _expand(self, value):
+        if isinstance(value, dict):
+            if 't' in value and 'uid' in value:
+                entry = self._templates.get(value['t'])
+                if entry is None:
+                    raise KeyError(value['t'])
+                card = {'uid': value['uid']}
+                card.update(entry)
+                for name, field in value.items():
+                    if name not in ('uid', 't'):
+                        card[name] = field
+                return card
+            return {key: self._expand(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._expand(item) for item in value]
+        return value
+
+    def expand(self, state):
+        """Copy of `state` with every compact card expanded (plain states come back equal)."""
+        try:
+            return self._expand(state)
+        except KeyError:
+            self.missing += 1
+            return None
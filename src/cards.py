@@ -3,10 +3,10 @@ Card definitions and deck building for the TCG game.
 Contains all card templates and deck generation functions.
 """
 
-import os
 import random
 from typing import Optional
 from .models import Card, Deck
+from .asset_index import get_asset_index
 
 
 # Card templates with thematic abilities
@@ -95,6 +95,8 @@ def create_card(name: str, cost: int, damage: int, health: Optional[int] = None,
         health=health,
         current_health=health,
         card_type=card_type,
+        # Image resolved through the shared index (one folder scan per process)
+        image_path=get_asset_index().image_for(name),
         ability=ability,
         ability_desc=ability_desc,
         ability_type=ability_type,
@@ -103,25 +105,6 @@ def create_card(name: str, cost: int, damage: int, health: Optional[int] = None,
         description=description
     )
     
-    # Try to attach an image path if assets exist
-    # First try root assets folder (TGCTest/assets/cards/)
-    project_root = os.path.dirname(os.path.dirname(__file__))
-    assets_dir = os.path.join(project_root, 'assets', 'cards')
-    
-    # Fallback to src/assets/cards if not found
-    if not os.path.isdir(assets_dir):
-        assets_dir = os.path.join(os.path.dirname(__file__), 'assets', 'cards')
-    
-    if os.path.isdir(assets_dir):
-        try:
-            for fname in os.listdir(assets_dir):
-                if fname.lower().startswith(name.lower()) and fname.lower().endswith('.png'):
-                    card.image_path = os.path.join(assets_dir, fname)
-                    break
-        except Exception:
-            # If assets folder has issues, just skip images
-            pass
-    
     return card
 
 
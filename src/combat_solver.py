@@ -0,0 +1,184 @@
+"""
+Joint combat solver for blocker assignment.
+Given every declared attacker and every ready defender, finds the blocker map
+{attacker_idx: blocker_idx} that maximizes the defender's outcome: creatures
+killed minus creatures lost minus life taken, never accepting lethal damage
+when any assignment avoids it. Each defender blocks at most one attacker,
+the same shape declare_attacks_with_blockers consumes.
+
+Taunt is a rule, not a preference: every Taunt defender that can legally
+block one of the attackers blocks (as many of them as the attackers allow),
+before any other consideration, lethal included.
+
+Depth-first search over attackers with memoization on
+(attacker position, used-defender mask, damage taken) and optimistic-bound
+pruning, so 7+ creatures per side resolve in milliseconds.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .models import Card
+
+LETHAL_PENALTY = 1000.0
+TAUNT_PENALTY = 100 * LETHAL_PENALTY  # per Taunt defender left idle though it could block
+
+
+def is_taunt(card: Card) -> bool:
+    """Taunt defenders (Guardian, Wall, Guardian del Bosque...) must block first."""
+    return bool(card.ability) and 'Taunt' in card.ability
+
+
+def enforce_taunt(blocks: Dict[int, int], attackers: Sequence[Tuple[int, Card]], defenders: List[Card],
+                  candidates: Dict[int, List[int]]) -> Dict[int, int]:
+    """Make idle Taunt defenders block: an unblocked attacker they can block, else
+    one held by a non-Taunt blocker (which steps aside). For plans made without
+    solve_blocks (lower AI levels); returns a new map."""
+    blocks = dict(blocks)
+    for taunt in [i for i, d in enumerate(defenders) if is_taunt(d)]:
+        if taunt in blocks.values():
+            continue
+        legal = [atk_idx for atk_idx, _ in attackers if taunt in candidates.get(atk_idx, ())]
+        free = [atk_idx for atk_idx in legal if atk_idx not in blocks]
+        taken = [atk_idx for atk_idx in legal if atk_idx in blocks and not is_taunt(defenders[blocks[atk_idx]])]
+        if free or taken:
+            blocks[(free or taken)[0]] = taunt
+    return blocks
+
+
+def card_value(card: Card) -> float:
+    """Board value of a creature (same weights as DataDrivenAI._score_card base stats)."""
+    return card.damage * 2 + card.current_health
+
+
+def life_weight(life: int) -> float:
+    """Value of one life point; grows as the defender gets low."""
+    return 1.0 + 5.0 / max(1, life)
+
+
+def block_gain(attacker: Card, blocker: Card) -> float:
+    """Defender's gain when `blocker` blocks `attacker` (one exchange of damage)."""
+    gain = 0.0
+    if blocker.damage >= attacker.current_health:
+        gain += card_value(attacker)
+    if attacker.damage >= blocker.current_health:
+        gain -= card_value(blocker)
+    return gain
+
+
+def evaluate_blocks(blocks: Dict[int, int], attackers: Sequence[Tuple[int, Card]],
+                    defenders: List[Card], life: int) -> float:
+    """Score a blocker map from the defender's side."""
+    weight = life_weight(life)
+    value = 0.0
+    damage = 0
+    for atk_idx, attacker in attackers:
+        blocker_idx = blocks.get(atk_idx)
+        if blocker_idx is None:
+            damage += attacker.damage
+            value -= weight * attacker.damage
+        else:
+            value += block_gain(attacker, defenders[blocker_idx])
+    if damage >= life:
+        value -= LETHAL_PENALTY
+    return value
+
+
+def solve_blocks(attackers: Sequence[Tuple[int, Card]], defenders: List[Card], life: int,
+                 candidates: Optional[Dict[int, List[int]]] = None) -> Dict[int, int]:
+    """Optimal joint blocker map.
+
+    attackers: (attacker_idx, Card) pairs attacking the defending player.
+    defenders: the defender's active zone.
+    candidates: {attacker_idx: [blocker_idx, ...]} legal blockers per attacker
+        (e.g. from Game.legal_blockers); defaults to every ready, unfrozen defender.
+    """
+    if not attackers:
+        return {}
+    if candidates is None:
+        ready = [i for i, d in enumerate(defenders) if d.ready and not getattr(d, 'frozen_turns', 0) > 0]
+        candidates = {atk_idx: ready for atk_idx, _ in attackers}
+
+    weight = life_weight(life)
+    # Taunt defenders that can block something must end up blocking
+    taunt_mask = 0
+    for atk_idx, _ in attackers:
+        for b in candidates.get(atk_idx, []):
+            if b is not None and is_taunt(defenders[b]):
+                taunt_mask |= 1 << b
+    # Biggest threats first: tighter bounds early
+    order = sorted(attackers, key=lambda pair: pair[1].damage, reverse=True)
+    options = []  # per attacker: [(gain, blocker_idx, bit)], best first, no-block last
+    for atk_idx, attacker in order:
+        opts = [(block_gain(attacker, defenders[b]), b, 1 << b)
+                for b in candidates.get(atk_idx, []) if b is not None]
+        opts.sort(key=lambda o: o[0], reverse=True)
+        opts.append((-weight * attacker.damage, None, 0))
+        options.append(opts)
+    damages = [attacker.damage for _, attacker in order]
+    if sum(damages) < life:
+        damages = [0] * len(order)  # lethal is out of reach: damage taken need not be tracked
+
+    # Interchangeable defenders (same stats, same legality everywhere): only the
+    # lowest-index unused one of each group is tried
+    membership = {}
+    for atk_idx, _ in order:
+        for b in candidates.get(atk_idx, []):
+            if b is not None:
+                membership.setdefault(b, set()).add(atk_idx)
+    lower_twins = {}
+    for b, atk_set in membership.items():
+        mask = 0
+        for t, t_set in membership.items():
+            if t < b and t_set == atk_set and \
+                    (defenders[t].damage, defenders[t].current_health, is_taunt(defenders[t])) == \
+                    (defenders[b].damage, defenders[b].current_health, is_taunt(defenders[b])):
+                mask |= 1 << t
+        lower_twins[b] = mask
+
+    # Optimistic value of attackers i.. (ignores defender conflicts and lethal)
+    optimistic = [0.0] * (len(order) + 1)
+    for i in range(len(order) - 1, -1, -1):
+        optimistic[i] = optimistic[i + 1] + max(o[0] for o in options[i])
+
+    memo: Dict[Tuple[int, int, int], Tuple[float, Optional[int]]] = {}
+
+    def best(i: int, used: int, damage: int) -> float:
+        if i == len(order):
+            idle_taunts = bin(taunt_mask & ~used).count('1')
+            return (-LETHAL_PENALTY if damage >= life else 0.0) - TAUNT_PENALTY * idle_taunts
+        key = (i, used, damage)
+        hit = memo.get(key)
+        if hit is not None:
+            return hit[0]
+        best_value = float('-inf')
+        best_choice = None
+        for gain, blocker_idx, bit in options[i]:
+            if used & bit:
+                continue
+            if blocker_idx is not None and lower_twins[blocker_idx] & ~used:
+                continue  # an identical defender is still free
+            if gain + optimistic[i + 1] <= best_value:
+                continue  # cannot beat what we already have here
+            if blocker_idx is None:
+                value = gain + best(i + 1, used, min(life, damage + damages[i]))
+            else:
+                value = gain + best(i + 1, used | bit, damage)
+            if value > best_value:
+                best_value = value
+                best_choice = blocker_idx
+        memo[key] = (best_value, best_choice)
+        return best_value
+
+    best(0, 0, 0)
+
+    # Walk the memo to rebuild the chosen assignment
+    blocks = {}
+    used, damage = 0, 0
+    for i, (atk_idx, _) in enumerate(order):
+        choice = memo[(i, used, damage)][1]
+        if choice is None:
+            damage = min(life, damage + damages[i])
+        else:
+            blocks[atk_idx] = choice
+            used |= 1 << choice
+    return blocks
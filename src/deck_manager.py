@@ -92,7 +92,7 @@ def load_deck(deck_name: str) -> Optional[Dict]:
         with open(filepath, 'r', encoding='utf-8') as f:
             deck_data = json.load(f)
         
-        # Reconstruir las cartas
+        # Reconstruir las cartas (create_card resuelve la imagen con el índice de assets compartido)
         cards = []
         for card_dict in deck_data['cards']:
             card = create_card(
@@ -3,25 +3,56 @@ Main GUI for the TCG minigame.
 Refactored to use modular components.
 """
 
-import os
 import tkinter as tk
 from tkinter import messagebox
-from typing import List, Optional, Dict, Union, Tuple
+from typing import Any, List, NamedTuple, Optional, Dict, Union, Tuple
 
 # Import game components
-from .models import Card, Player, CardWidget
+from .models import Card, Player
 from .game_logic import Game
 from .cards import build_random_deck
+from .asset_index import get_asset_index
+from .image_cache import ImageCache, get_image_cache
+from .ui_reconciler import KeyedZone
 
-# Optional Pillow support for nicer images
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except Exception:
-    PIL_AVAILABLE = False
+# Optional Pillow support for nicer images (decoded once, in image_cache)
+PIL_AVAILABLE = ImageCache.available()
+
+# Card image sizes on the board/hand and for the AI's hidden hand
+HAND_SIZE = (64, 96)
+BACK_SIZE = (48, 72)
+
+# Board zones wrap to a new grid row after this many cards
+CARDS_PER_ROW = 8
+
+# Destroy and rebuild every card widget on each update_ui (the pre-reconciler
+# behaviour; tools/bench_ui_render.py flips it to compare frame times)
+REBUILD_EVERY_FRAME = False
+
+
+class HandCardSpec(NamedTuple):
+    """What a hand card button shows (compared between refreshes)."""
+    index: int
+    text: str
+    photo: Any
+
+
+class BoardCardSpec(NamedTuple):
+    """What a card on the board shows (compared between refreshes)."""
+    index: int
+    text: str
+    photo: Any
+    ready: bool
+    selected: bool
+    ability: bool
 
 
 def make_ui(game: Game):
+    # Card images: one folder scan, re-done only if the asset folder changed
+    asset_index = get_asset_index()
+    if asset_index.refresh_if_changed():
+        get_image_cache().clear()
+    image_cache = get_image_cache()
     selected_attackers = set()
     attack_targets: Dict[int, Union[str, Tuple[str, int]]] = {}  # Maps attacker index -> 'player' or ('card', card_index)
     # image caches to keep PhotoImage references (avoid attaching dynamic attrs to tk widgets)
@@ -195,9 +226,8 @@ def make_ui(game: Game):
                 return
             idx = idx_list.pop(0)
             # get widget for attacker (calculate row/col from index)
-            cards_per_row = 8
-            row = idx // cards_per_row
-            col = idx % cards_per_row
+            row = idx // CARDS_PER_ROW
+            col = idx % CARDS_PER_ROW
             slaves = player_active_frame.grid_slaves(row=row, column=col)
             if not slaves:
                 # skip animation if widget missing
@@ -221,6 +251,108 @@ def make_ui(game: Game):
             animate_move(photo, ax, ay, target_x, target_y, duration=160, steps=8, on_done=lambda: animate_move(photo, target_x, target_y, ax, ay, duration=160, steps=8, on_done=after_move_back))
         animate_one(ids)
 
+    # Keyed widget zones: a card's widget lives as long as the card stays in
+    # its zone and is only re-configured where its spec changed
+    button_bg = None  # default tk.Button background, read from the first board button
+
+    def card_photo(card: Card, size, rotate=0):
+        image_path = asset_index.image_for_card(card)
+        if PIL_AVAILABLE and image_path:
+            return image_cache.get_photo(image_path, size, rotate)
+        return None
+
+    def bind_tooltip(widget, card: Card):
+        widget.bind('<Enter>', lambda e, c=card, w=widget: (hide_tooltip(), show_tooltip(w, c)))
+        widget.bind('<Leave>', hide_tooltip)
+
+    def update_card_face(widget, old, spec, width, height):
+        # image with caption when the picture is available, fixed-size text box otherwise
+        if old is None or old.photo is not spec.photo:
+            if spec.photo is not None:
+                widget.config(image=spec.photo, text=spec.text, compound='top', width=0, height=0)
+            else:
+                widget.config(image='', text=spec.text, compound='none', width=width, height=height)
+        elif old.text != spec.text:
+            widget.config(text=spec.text)
+
+    def create_hand_card(card: Card, spec, position):
+        btn = tk.Button(hand_frame)
+        # Color code spell cards
+        if card.card_type == 'spell':
+            btn.config(bg='#9c27b0', fg='white')
+        bind_tooltip(btn, card)
+        return update_hand_card(btn, card, None, spec, position)
+
+    def update_hand_card(btn, card: Card, old, spec, position):
+        update_card_face(btn, old, spec, 20, 5)
+        if old is None or old.index != spec.index:
+            btn.config(command=lambda idx=spec.index: on_play(idx))
+        return btn
+
+    def create_card_back(card: Card, spec, position):
+        photo, = spec
+        if photo is not None:
+            lbl = tk.Label(ai_hand_frame, image=photo, bg='#ddd')
+        else:
+            lbl = tk.Label(ai_hand_frame, text='[Back]', bg='#666', fg='white', width=6, height=3)
+        # associate widget with card object for animations
+        lbl.card = card
+        return lbl
+
+    def update_card_back(lbl, card: Card, old, spec, position):
+        lbl.destroy()
+        return create_card_back(card, spec, position)
+
+    def create_ai_board_card(card: Card, spec, position):
+        lbl = tk.Label(ai_active_frame, relief='ridge')
+        bind_tooltip(lbl, card)
+        return update_ai_board_card(lbl, card, None, spec, position)
+
+    def update_ai_board_card(lbl, card: Card, old, spec, position):
+        update_card_face(lbl, old, spec, 10, 5)
+        return lbl
+
+    def create_player_board_card(card: Card, spec, position):
+        nonlocal button_bg
+        # holder keeps the card button and its (optional) ability button together
+        holder = tk.Frame(player_active_frame, bg='#c8c8f0')
+        btn = tk.Button(holder)
+        btn.pack()
+        tk.Button(holder, text='⚡', width=3, bg='#ffeb3b', font=('Arial', 10, 'bold'))
+        if button_bg is None:
+            button_bg = btn.cget('bg')
+        bind_tooltip(btn, card)
+        return update_player_board_card(holder, card, None, spec, position)
+
+    def update_player_board_card(holder, card: Card, old, spec, position):
+        btn, ability_btn = holder.winfo_children()
+        update_card_face(btn, old, spec, 10, 5)
+        if old is None or old.ready != spec.ready:
+            # tapped cards look pressed; toggle_attacker ignores them
+            btn.config(relief='raised' if spec.ready else 'sunken')
+        if old is None or old.index != spec.index:
+            btn.config(command=lambda idx=spec.index: toggle_attacker(idx))
+            ability_btn.config(command=lambda idx=spec.index: on_activate_ability(idx))
+        if old is None or old.selected != spec.selected:
+            # highlight if selected
+            btn.config(bg='lightgreen' if spec.selected else button_bg)
+        if old is None or old.ability != spec.ability:
+            if spec.ability:
+                ability_btn.pack()
+            else:
+                ability_btn.pack_forget()
+        return holder
+
+    def grid_on_board(widget, position):
+        widget.grid(row=position // CARDS_PER_ROW, column=position % CARDS_PER_ROW, padx=4, pady=2)
+
+    hand_zone = KeyedZone(create_hand_card, update_hand_card,
+                          lambda w, i: w.grid(row=0, column=i, padx=4, pady=4))
+    ai_hand_zone = KeyedZone(create_card_back, update_card_back, lambda w, i: w.grid(row=0, column=i, padx=2))
+    ai_active_zone = KeyedZone(create_ai_board_card, update_ai_board_card, grid_on_board)
+    player_active_zone = KeyedZone(create_player_board_card, update_player_board_card, grid_on_board)
+    shown_log: List[str] = []
+
     def update_ui():
         p = game.player
         a = game.ai
@@ -243,10 +375,11 @@ def make_ui(game: Game):
             ai_deck_var.set(f'Deck: {a.deck.count()}')
         except Exception:
             ai_deck_var.set(f'Deck: {len(getattr(a.deck, "cards", []))}')
-        for widget in hand_frame.winfo_children():
-            widget.destroy()
-        # Preload images if possible for player's hand
-        hand_images.clear()
+        if REBUILD_EVERY_FRAME:
+            for zone in (hand_zone, ai_hand_zone, ai_active_zone, player_active_zone):
+                zone.clear()
+        # Player hand
+        entries = []
         for i, card in enumerate(p.hand):
             if card.card_type == 'spell':
                 # Show adjusted cost for spells if champion has discount
@@ -255,173 +388,63 @@ def make_ui(game: Game):
                 text = f"⚡ {card.name} (Cost:{cost_text})\n{card.description or ''}"
             else:
                 text = f"{card.name} (Cost:{card.cost} Dmg:{card.damage})"
-            image_path = getattr(card, 'image_path', None)
-            if PIL_AVAILABLE and image_path and os.path.isfile(image_path):
-                try:
-                    img = Image.open(image_path).resize((64, 96))
-                    photo = ImageTk.PhotoImage(img)
-                    hand_images.append(photo)
-                    btn = tk.Button(hand_frame, image=photo, text=text, compound='top', command=lambda idx=i: on_play(idx))
-                except Exception:
-                    btn = tk.Button(hand_frame, text=text, command=lambda idx=i: on_play(idx), width=30)
-            else:
-                btn = tk.Button(hand_frame, text=text, command=lambda idx=i: on_play(idx), width=20, height=5)
-            # Color code spell cards
-            if card.card_type == 'spell':
-                try:
-                    btn.config(bg='#9c27b0', fg='white')
-                except Exception:
-                    pass
-            # attach tooltip for ability
-            btn.bind('<Enter>', lambda e, c=card, w=btn: (hide_tooltip(), show_tooltip(w, c)))
-            btn.bind('<Leave>', hide_tooltip)
-            # place hand cards using grid to keep layout stable inside the canvas window
-            btn.grid(row=0, column=i, padx=4, pady=4)
-        # update canvas scrollregion to encompass new content
-        try:
-            hand_frame.update_idletasks()
-            hand_canvas.config(scrollregion=hand_canvas.bbox('all'))
-        except Exception:
-            pass
+            entries.append((id(card), card, HandCardSpec(i, text, card_photo(card, HAND_SIZE))))
+        stats = hand_zone.render(entries)
+        hand_images[:] = [spec.photo for spec in hand_zone.specs()]
+        # update canvas scrollregion only if the content changed
+        if stats.changed:
+            try:
+                hand_frame.update_idletasks()
+                hand_canvas.config(scrollregion=hand_canvas.bbox('all'))
+            except Exception:
+                pass
         # Update AI hand (show backs)
-        for widget in ai_hand_frame.winfo_children():
-            widget.destroy()
-        ai_hand_images.clear()
-        back_path = os.path.join(os.path.dirname(__file__), '..', 'assets', 'cards', 'card_back.png')
-        for i in range(len(a.hand)):
-            lbl = None
-            if PIL_AVAILABLE and os.path.isfile(back_path):
-                try:
-                    img = Image.open(back_path).resize((48, 72))
-                    photo = ImageTk.PhotoImage(img)
-                    ai_hand_images.append(photo)
-                    lbl = CardWidget(ai_hand_frame, image=photo, bg='#ddd')
-                    # associate widget with card object for animations
-                    try:
-                        lbl.card = a.hand[i]
-                    except Exception:
-                        pass
-                except Exception as e:
-                    print(f"⚠️ Error loading card back: {e}")
-                    lbl = CardWidget(ai_hand_frame, text='[Back]', bg='#666', fg='white', width=6, height=3)
-            else:
-                lbl = CardWidget(ai_hand_frame, text='[Back]', bg='#666', fg='white', width=6, height=3)
-            
-            if lbl:
-                lbl.grid(row=0, column=i, padx=2)
+        back_photo = None
+        back_path = asset_index.card_back()
+        if PIL_AVAILABLE and back_path:
+            back_photo = image_cache.get_photo(back_path, BACK_SIZE)
+        ai_hand_zone.render([(id(card), card, (back_photo,)) for card in a.hand])
+        ai_hand_images[:] = [back_photo] * len(a.hand)
         # Rest zone removed: cards now enter `active_zone` tapped, so no rest UI
 
         # Update active areas (try to show images when available)
-        for widget in ai_active_frame.winfo_children():
-            widget.destroy()
-        ai_active_images.clear()
-        cards_per_row = 8
-        for i, card in enumerate(game.ai.active_zone):
-            row = i // cards_per_row
-            col = i % cards_per_row
-            txt = f"{card.name}\nATK: {card.damage}  HP: {card.current_health}"
-            image_path = getattr(card, 'image_path', None)
-            if PIL_AVAILABLE and image_path and os.path.isfile(image_path):
-                try:
-                    img = Image.open(image_path)
-                    # if tapped (not ready) show rotated image
-                    if not card.ready:
-                        img = img.rotate(90, expand=True)
-                    img = img.resize((64, 96))
-                    photo = ImageTk.PhotoImage(img)
-                    ai_active_images.append(photo)
-                    lbl = tk.Label(ai_active_frame, image=photo, text=f"{card.name}\nATK: {card.damage}  HP: {card.current_health}", compound='top', relief='ridge')
-                except Exception:
-                    lbl = tk.Label(ai_active_frame, text=txt, relief='ridge', width=10, height=5)
-            else:
-                lbl = tk.Label(ai_active_frame, text=txt, relief='ridge', width=10, height=5)
-            lbl.bind('<Enter>', lambda e, c=card, w=lbl: (hide_tooltip(), show_tooltip(w, c)))
-            lbl.bind('<Leave>', hide_tooltip)
-            lbl.grid(row=row, column=col, padx=4, pady=2)
-        # update AI active canvas scrollregion
-        try:
-            ai_active_frame.update_idletasks()
-            ai_active_canvas.config(scrollregion=ai_active_canvas.bbox('all'))
-        except Exception:
-            pass
-
-        for widget in player_active_frame.winfo_children():
-            widget.destroy()
-        player_active_images.clear()
-        cards_per_row = 8
-        for i, card in enumerate(game.player.active_zone):
-            row = i // cards_per_row
-            col = i % cards_per_row
-            txt = f"{card.name}\nATK: {card.damage}  HP: {card.current_health}"
-            image_path = getattr(card, 'image_path', None)
-            if PIL_AVAILABLE and image_path and os.path.isfile(image_path):
-                try:
-                    img = Image.open(image_path)
-                    # if tapped (not ready) show rotated image
-                    if not card.ready:
-                        img = img.rotate(90, expand=True)
-                    img = img.resize((64, 96))
-                    photo = ImageTk.PhotoImage(img)
-                    player_active_images.append(photo)
-                    if card.ready:
-                        # Check if card has activated ability
-                        if card.ability and card.ability_type == 'activated':
-                            # Create frame to hold both buttons
-                            card_frame = tk.Frame(player_active_frame, bg='#c8c8f0')
-                            btn = tk.Button(card_frame, image=photo, text=f"{card.name}\nATK: {card.damage}  HP: {card.current_health}", compound='top', relief='raised', command=lambda idx=i: toggle_attacker(idx))
-                            btn.pack()
-                            ability_btn = tk.Button(card_frame, text='⚡', command=lambda idx=i: on_activate_ability(idx), width=3, bg='#ffeb3b', font=('Arial', 10, 'bold'))
-                            ability_btn.pack()
-                            btn = card_frame
-                        else:
-                            btn = tk.Button(player_active_frame, image=photo, text=f"{card.name}\nATK: {card.damage}  HP: {card.current_health}", compound='top', relief='raised', command=lambda idx=i: toggle_attacker(idx))
-                    else:
-                        btn = tk.Label(player_active_frame, image=photo, text=f"{card.name}\nATK: {card.damage}  HP: {card.current_health}", compound='top', relief='sunken')
-                except Exception:
-                    if card.ready:
-                        if card.ability and card.ability_type == 'activated':
-                            card_frame = tk.Frame(player_active_frame, bg='#c8c8f0')
-                            btn = tk.Button(card_frame, text=txt, relief='raised', command=lambda idx=i: toggle_attacker(idx), width=10, height=5)
-                            btn.pack()
-                            ability_btn = tk.Button(card_frame, text='⚡', command=lambda idx=i: on_activate_ability(idx), width=3, bg='#ffeb3b')
-                            ability_btn.pack()
-                            btn = card_frame
-                        else:
-                            btn = tk.Button(player_active_frame, text=txt, relief='raised', command=lambda idx=i: toggle_attacker(idx), width=10, height=5)
-                    else:
-                        btn = tk.Label(player_active_frame, text=txt, relief='sunken', width=10, height=5)
-            else:
-                if card.ready:
-                    if card.ability and card.ability_type == 'activated':
-                        card_frame = tk.Frame(player_active_frame, bg='#c8c8f0')
-                        btn = tk.Button(card_frame, text=txt, relief='raised', command=lambda idx=i: toggle_attacker(idx), width=10, height=5)
-                        btn.pack()
-                        ability_btn = tk.Button(card_frame, text='⚡', command=lambda idx=i: on_activate_ability(idx), width=3, bg='#ffeb3b')
-                        ability_btn.pack()
-                        btn = card_frame
-                    else:
-                        btn = tk.Button(player_active_frame, text=txt, relief='raised', command=lambda idx=i: toggle_attacker(idx), width=10, height=5)
-                else:
-                    btn = tk.Label(player_active_frame, text=txt, relief='sunken', width=10, height=5)
-            # highlight if selected
-            if card.ready and i in selected_attackers:
-                try:
-                    btn.config(bg='lightgreen')
-                except Exception:
-                    pass
-            btn.bind('<Enter>', lambda e, c=card, w=btn: (hide_tooltip(), show_tooltip(w, c)))
-            btn.bind('<Leave>', hide_tooltip)
-            btn.grid(row=row, column=col, padx=4, pady=2)
-        # update player active canvas scrollregion
-        try:
-            player_active_frame.update_idletasks()
-            player_active_canvas.config(scrollregion=player_active_canvas.bbox('all'))
-        except Exception:
-            pass
-        # Update action log
-        log_listbox.delete(0, tk.END)
-        for entry in game.action_log[-30:]:
-            log_listbox.insert(tk.END, entry)
+        entries = []
+        for i, card in enumerate(a.active_zone):
+            text = f"{card.name}\nATK: {card.damage}  HP: {card.current_health}"
+            # if tapped (not ready) show rotated image
+            photo = card_photo(card, HAND_SIZE, 0 if card.ready else 90)
+            entries.append((id(card), card, BoardCardSpec(i, text, photo, card.ready, False, False)))
+        stats = ai_active_zone.render(entries)
+        ai_active_images[:] = [spec.photo for spec in ai_active_zone.specs()]
+        if stats.changed:
+            try:
+                ai_active_frame.update_idletasks()
+                ai_active_canvas.config(scrollregion=ai_active_canvas.bbox('all'))
+            except Exception:
+                pass
+
+        entries = []
+        for i, card in enumerate(p.active_zone):
+            text = f"{card.name}\nATK: {card.damage}  HP: {card.current_health}"
+            photo = card_photo(card, HAND_SIZE, 0 if card.ready else 90)
+            has_ability = bool(card.ready and card.ability and card.ability_type == 'activated')
+            selected = card.ready and i in selected_attackers
+            entries.append((id(card), card, BoardCardSpec(i, text, photo, card.ready, selected, has_ability)))
+        stats = player_active_zone.render(entries)
+        player_active_images[:] = [spec.photo for spec in player_active_zone.specs()]
+        if stats.changed:
+            try:
+                player_active_frame.update_idletasks()
+                player_active_canvas.config(scrollregion=player_active_canvas.bbox('all'))
+            except Exception:
+                pass
+        # Update action log (only when new entries arrived)
+        log_tail = game.action_log[-30:]
+        if REBUILD_EVERY_FRAME or log_tail != shown_log:
+            log_listbox.delete(0, tk.END)
+            for entry in log_tail:
+                log_listbox.insert(tk.END, entry)
+            shown_log[:] = log_tail
         status_var.set(f"Turn: {game.turn}")
 
     def on_play(index):
@@ -867,6 +890,15 @@ def make_ui(game: Game):
     hint = tk.Label(footer, text='Select attackers (click) then use the Controls panel to declare attacks or end turn.', font=('Arial', 9))
     hint.pack()
 
+    # Decode every image this game can show up front: refreshes never touch the disk
+    if PIL_AVAILABLE:
+        requests = [(asset_index.card_back(), BACK_SIZE, 0)]
+        for p in (game.player, game.ai):
+            for card in p.deck.cards + p.hand + p.active_zone:
+                path = asset_index.image_for_card(card)
+                requests += [(path, HAND_SIZE, 0), (path, HAND_SIZE, 90)]
+        image_cache.warm_up(dict.fromkeys(requests))
+
     game.on_update = update_ui
     update_ui()
 
@@ -3,7 +3,7 @@ Game logic for the TCG game.
 Contains the Game class with all turn management, combat, and AI logic.
 """
 
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable, NamedTuple, Tuple
 # Headless-safe import: tkinter may be unavailable on server runtimes
 try:
     from tkinter import messagebox  # type: ignore
@@ -20,16 +20,56 @@ except Exception:
     messagebox = _MessageBoxStub()
 from .models import Card, Player
 from .ai_engine import DataDrivenAI
+from .combat_solver import is_taunt
+from .zobrist import ZobristHasher, turn_key, winner_key
+from .structured_log import DEBUG, get_logger
+
+_log = get_logger()
+
+
+class Action(NamedTuple):
+    """One legal move, as listed by Game.legal_actions().
+
+    kind: 'play' (index = hand index, target = spell target),
+          'ability' (index = active-zone index),
+          'attack' (index = attacker index, target = 'player' or ('card', idx),
+                    blocker = defender index chosen from Game.legal_blockers())
+    """
+    kind: str
+    owner: str
+    index: int
+    target: object = None
+    blocker: Optional[int] = None
+
+
+class GameSnapshot(NamedTuple):
+    """Restorable game state taken by Game.snapshot()."""
+    player: Player
+    ai: Player
+    turn: str
+    winner: Optional[str]
+    game_started: bool
+    action_log: List[str]
+    ai_played: List[Card]
+    player_played: List[Card]
 
 
 class Game:
     """Main game logic controller."""
     
-    def __init__(self, player: Player, ai: Player, on_update):
+    def __init__(self, player: Player, ai: Player, on_update: Optional[Callable[[], None]] = None,
+                 headless: bool = False):
         self.player = player
         self.ai = ai
         self.turn = 'player'
-        self.on_update = on_update
+        # Headless mode (authoritative server, batch simulation, AI rollouts):
+        # no UI callbacks, no dialogs, no debug prints and no log text unless
+        # someone turns log_enabled back on.
+        self.headless = headless
+        self.on_update = None if headless else on_update
+        self.log_enabled = not headless
+        self.log_room: Optional[str] = None  # server room id: per-room DEBUG tracing (structured_log)
+        self.winner: Optional[str] = None  # 'player' / 'ai' once check_end sees a dead side
         self.action_log: List[str] = []
         # track recent played cards for both sides for UI
         self.ai_played: List[Card] = []
@@ -41,7 +81,11 @@ class Game:
         self.game_started = False  # Prevents check_end during initialization
         
         # AI decision maker - DataDrivenAI expects ai_config
-        if ai.ai_config:
+        if ai.ai_config and getattr(ai.ai_config, 'uses_mcts', False):
+            # Search tier: same interface as DataDrivenAI, but needs the game
+            from .mcts_ai import MCTSAI
+            self.ai_brain = MCTSAI(ai, ai.ai_config, game=self)
+        elif ai.ai_config:
             self.ai_brain = DataDrivenAI(ai, ai.ai_config)
         else:
             # Default to medium difficulty if no config
@@ -50,6 +94,10 @@ class Game:
             self.ai_brain = DataDrivenAI(ai, default_config)
         # Server authoritative mode flag (multiplayer server sets this True)
         self.server_mode = False
+        # make_action()/unmake_action() undo records
+        self._undo_stack: list = []
+        # Incremental state hash (see enable_hashing)
+        self.zobrist = None
 
     def start(self):
         """Initialize the game state."""
@@ -69,12 +117,215 @@ class Game:
         
         # Log champion abilities
         if self.player.champion:
-            self.log_action(f"Player Champion: {self.player.champion.name} - {self.player.champion.passive_name}")
+            self.log_action("Player Champion: %s - %s", self.player.champion.name, self.player.champion.passive_name)
         if self.ai.champion:
-            self.log_action(f"AI Champion: {self.ai.champion.name} - {self.ai.champion.passive_name}")
+            self.log_action("AI Champion: %s - %s", self.ai.champion.name, self.ai.champion.passive_name)
         
         self.game_started = True  # Game is now fully initialized
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
+
+    def clone(self, headless: bool = True) -> 'Game':
+        """Independent copy of the current state for look-ahead search.
+
+        Zones, mana, life, frozen_turns and attacked_count are reproduced
+        exactly; UI hooks (on_update, ask_blocker, root) are not carried over.
+        """
+        new = object.__new__(self.__class__)
+        new.__dict__ = self.__dict__.copy()
+        new.player = self.player.clone()
+        new.ai = self.ai.clone()
+        # Clones always get the greedy brain: they are what search AIs roll out
+        new.ai_brain = DataDrivenAI(new.ai, self.ai_brain.config)
+        new.action_log = self.action_log[:]
+        new.ai_played = self.ai_played[:]
+        new.player_played = self.player_played[:]
+        new.ask_blocker = None
+        new.root = None
+        new._undo_stack = []
+        new.zobrist = None
+        if self.zobrist is not None:
+            new.enable_hashing()
+        if headless:
+            new.headless = True
+            new.on_update = None
+            new.log_enabled = False
+            new.log_room = None
+        return new
+
+    def snapshot(self) -> GameSnapshot:
+        """Capture the current state; restore() can rewind to it any number of times."""
+        return GameSnapshot(self.player.clone(), self.ai.clone(), self.turn, self.winner, self.game_started,
+                            self.action_log[:], self.ai_played[:], self.player_played[:])
+
+    def restore(self, snapshot: GameSnapshot):
+        """Rewind to a snapshot taken from this game."""
+        self.player = snapshot.player.clone()
+        self.ai = snapshot.ai.clone()
+        self.ai_brain.player = self.ai
+        self.turn = snapshot.turn
+        self.winner = snapshot.winner
+        self.game_started = snapshot.game_started
+        self.action_log = snapshot.action_log[:]
+        self.ai_played = snapshot.ai_played[:]
+        self.player_played = snapshot.player_played[:]
+        self._undo_stack = []
+        if self.zobrist is not None:
+            self.enable_hashing()
+
+    def enable_hashing(self) -> int:
+        """Start keeping an incremental Zobrist hash of this game's state.
+
+        From here on every zone move, card stat change, mana change and life
+        change updates the hash; state_hash() reads it in O(1).
+        """
+        self.zobrist = ZobristHasher(self)
+        return self.state_hash()
+
+    def state_hash(self) -> int:
+        """64-bit hash of the position (enables hashing on first use)."""
+        if self.zobrist is None:
+            return self.enable_hashing()
+        return self.zobrist.value ^ turn_key(self.turn) ^ winner_key(self.winner)
+
+    # ------------------------------------------------------------------
+    # Move generation (search AIs, validation)
+    # ------------------------------------------------------------------
+
+    def spell_targets(self, spell: Card, owner: str = 'player') -> List:
+        """Targets execute_spell resolves for `spell` cast by `owner`.
+
+        [None] means the spell needs no target; [] means it has nothing to
+        hit right now. Same index conventions as the UI target dialog.
+        """
+        caster = self.player if owner == 'player' else self.ai
+        enemy = self.ai if owner == 'player' else self.player
+        target = spell.spell_target
+        effect = spell.spell_effect
+        if target in ('all_enemies', 'self') or effect == 'draw':
+            return [None]
+        if target == 'enemy_or_player':
+            return ['player'] + list(range(len(enemy.active_zone)))
+        if target == 'enemy':
+            if spell.name == 'Aniquilar':
+                return [i for i, c in enumerate(enemy.active_zone) if c.current_health < c.health]
+            return list(range(len(enemy.active_zone)))
+        if target == 'friendly':
+            return list(range(len(caster.active_zone)))
+        return [None]
+
+    def block_candidates(self, attacker: Card, owner: str = 'player') -> List[int]:
+        """Defenders that may block `attacker` (owned by `owner`) hitting the player.
+
+        Defenders must be ready and not frozen; Volar attackers can only be
+        blocked by Volar; a Ragnar defender cannot block at all. This is the
+        per-attacker pool of a joint block: the Taunt rule spans all the
+        attackers and is applied by solve_blocks / enforce_taunt.
+        """
+        defender = self.ai if owner == 'player' else self.player
+        if defender.champion and defender.champion.ability_type == 'all_furia':
+            return []
+        available = [i for i, c in enumerate(defender.active_zone)
+                     if c.ready and not getattr(c, 'frozen_turns', 0) > 0]
+        if attacker.ability and 'Volar' in attacker.ability:
+            available = [i for i in available if defender.active_zone[i].ability == 'Volar']
+        return available
+
+    def legal_blockers(self, attacker: Card, owner: str = 'player') -> List[Optional[int]]:
+        """Blocking options against `attacker` attacking alone.
+
+        block_candidates() with the Taunt rule: if a Taunt defender can
+        block, only Taunt defenders are offered; otherwise None (no block)
+        comes first.
+        """
+        available = self.block_candidates(attacker, owner)
+        defenders = (self.ai if owner == 'player' else self.player).active_zone
+        taunts = [i for i in available if is_taunt(defenders[i])]
+        return taunts or [None] + available
+
+    def legal_actions(self, owner: Optional[str] = None, with_blocks: bool = False) -> List[Action]:
+        """List the moves `owner` (default: side to move) can make right now.
+
+        Covers card plays (one Action per spell target), activated
+        abilities and single-attacker attack declarations. Attacks on the
+        player come with blocker=None unless with_blocks is set, in which
+        case every legal blocker assignment is listed as its own Action.
+        Spells with no valid target are left out; outside `owner`'s turn
+        there is nothing to list.
+        """
+        owner = owner or self.turn
+        if self.winner is not None or owner != self.turn:
+            return []
+        p = self.player if owner == 'player' else self.ai
+        enemy = self.ai if owner == 'player' else self.player
+        actions = []
+
+        for idx, card in enumerate(p.hand):
+            if card.card_type == 'spell':
+                if self.get_spell_cost(card, p) > p.mana:
+                    continue
+                for target in self.spell_targets(card, owner):
+                    actions.append(Action('play', owner, idx, target))
+            elif card.cost <= p.mana:
+                actions.append(Action('play', owner, idx))
+
+        for idx, card in enumerate(p.active_zone):
+            if not card.ready or getattr(card, 'frozen_turns', 0) > 0:
+                continue
+            if card.ability and card.ability_type == 'activated':
+                actions.append(Action('ability', owner, idx))
+            blockers = self.legal_blockers(card, owner) if with_blocks else [None]
+            for blocker in blockers:
+                actions.append(Action('attack', owner, idx, 'player', blocker))
+            for target_idx in range(len(enemy.active_zone)):
+                actions.append(Action('attack', owner, idx, ('card', target_idx)))
+        return actions
+
+    def make_action(self, action: Action):
+        """Apply an Action through the normal rules, recording how to undo it."""
+        saved_players = []
+        saved_cards = []
+        for p in (self.player, self.ai):
+            saved_players.append((p, p.life, p.max_life, p.mana, p.max_mana, p.hand[:],
+                                  p.active_zone[:], p.graveyard[:], p.deck.cards[:]))
+            for c in p.active_zone:
+                saved_cards.append((c, c.get_state()))
+        owner_player = self.player if action.owner == 'player' else self.ai
+        if action.kind == 'play' and 0 <= action.index < len(owner_player.hand):
+            card = owner_player.hand[action.index]
+            saved_cards.append((card, card.get_state()))
+        zhash = self.zobrist.value if self.zobrist is not None else None
+        self._undo_stack.append((self.winner, saved_players, saved_cards, zhash))
+
+        if action.kind == 'play':
+            if action.owner == 'player':
+                self.play_card(action.index, spell_target_idx=action.target)
+            else:
+                self.play_card_ai(action.index, spell_target_idx=action.target)
+        elif action.kind == 'ability':
+            self.activate_ability(action.index, action.owner)
+        elif action.kind == 'attack':
+            blockers = {action.index: action.blocker} if action.blocker is not None else {}
+            self.declare_attacks_with_blockers([action.index], [action.target], blockers, action.owner)
+
+    def unmake_action(self):
+        """Undo the last make_action()."""
+        winner, saved_players, saved_cards, zhash = self._undo_stack.pop()
+        self.winner = winner
+        for p, life, max_life, mana, max_mana, hand, active_zone, graveyard, deck_cards in saved_players:
+            p.life = life
+            p.max_life = max_life
+            p.mana = mana
+            p.max_mana = max_mana
+            p.hand = hand
+            p.active_zone = active_zone
+            p.graveyard = graveyard
+            p.deck.cards = deck_cards
+        for card, state in saved_cards:
+            card.set_state(state)
+        if zhash is not None:
+            # Card states were swapped back wholesale, bypassing the per-field updates
+            self.zobrist.value = zhash
 
     def start_turn(self, who: str):
         """Start a turn for the specified player."""
@@ -94,7 +345,7 @@ class Game:
         if who == 'player' or self.server_mode:
             for _ in range(draw_count):
                 p.draw_card()
-            self.log_action(f"{p.name} draws {draw_count} card(s) (turn start).")
+            self.log_action("%s draws %s card(s) (turn start).", p.name, draw_count)
         
         # move rest_zone -> active_zone, set ready True
         self.activate_rest_zone(p)
@@ -103,7 +354,7 @@ class Game:
         if p.champion and p.champion.ability_type == 'summon_token':
             token = Card('Token 1/1', 0, 1, health=1, current_health=1, ready=False, in_play=True)
             p.active_zone.append(token)
-            self.log_action(f"{p.champion.passive_name}: {p.name} summons a 1/1 Token!")
+            self.log_action("%s: %s summons a 1/1 Token!", p.champion.passive_name, p.name)
         
         # Apply champion passive: heal troops
         if p.champion and p.champion.ability_type == 'heal_troops':
@@ -113,10 +364,11 @@ class Game:
                     card.current_health = min(card.health, card.current_health + p.champion.ability_value)
                     healed += 1
             if healed > 0:
-                self.log_action(f"{p.champion.passive_name}: Heals {healed} troop(s)!")
+                self.log_action("%s: Heals %s troop(s)!", p.champion.passive_name, healed)
         
-        self.log_action(f"{p.name} start turn. {len(p.active_zone)} active cards.")
-        self.on_update()
+        self.log_action("%s start turn. %s active cards.", p.name, len(p.active_zone))
+        if self.on_update is not None:
+            self.on_update()
 
     def activate_rest_zone(self, p: Player):
         """Untap existing active cards and handle special abilities."""
@@ -125,12 +377,12 @@ class Game:
             if hasattr(c, 'frozen_turns') and c.frozen_turns > 0:
                 c.frozen_turns -= 1
                 if c.frozen_turns > 0:
-                    self.log_action(f"{c.name} is frozen ({c.frozen_turns} turns remaining)")
+                    self.log_action("%s is frozen (%s turns remaining)", c.name, c.frozen_turns)
                     c.ready = False
                     c.attacked_count = 0
                     continue
                 else:
-                    self.log_action(f"{c.name} is no longer frozen!")
+                    self.log_action("%s is no longer frozen!", c.name)
 
             # Untap and reset attack counter
             c.ready = True
@@ -141,7 +393,7 @@ class Game:
                 old_health = c.current_health
                 c.current_health = min(c.current_health + 1, c.health)
                 if c.current_health > old_health:
-                    self.log_action(f"{c.name} regenerates 1 health ({old_health} -> {c.current_health})")
+                    self.log_action("%s regenerates 1 health (%s -> %s)", c.name, old_health, c.current_health)
     
     def apply_champion_passive_to_card(self, card: Card, player: Player):
         """Apply champion passive abilities to a card when played."""
@@ -208,7 +460,7 @@ class Game:
             # Spell goes to graveyard
             del self.player.hand[card_index]
             self.player.graveyard.append(card)
-            self.log_action(f"Player casts {card.name} (Cost {actual_cost}).")
+            self.log_action("Player casts %s (Cost %s).", card.name, actual_cost)
             
             # Trigger Ladrón de Almas ability for opponent
             self.trigger_absorb_magic(self.ai)
@@ -223,16 +475,17 @@ class Game:
             
             self.player.active_zone.append(card)
             del self.player.hand[card_index]
-            self.log_action(f"Player plays {card.name} to board (tapped) (Cost {card.cost}).")
+            self.log_action("Player plays %s to board (tapped) (Cost %s).", card.name, card.cost)
             
             # Trigger on_play abilities
             if card.ability_type == 'on_play':
                 if 'Curacion al Entrar' in card.ability:
                     before = self.player.life
                     self.player.life = min(self.player.life + 3, self.player.max_life)
-                    self.log_action(f"{card.name} heals player for {self.player.life - before} life!")
+                    self.log_action("%s heals player for %s life!", card.name, self.player.life - before)
         
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
     
     def play_card_ai(self, card_index: int, spell_target_idx: Optional[int] = None):
         """AI/Opponent plays a card (used by multiplayer to apply opponent's action)."""
@@ -254,7 +507,7 @@ class Game:
             self.execute_spell(card, 'ai', spell_target_idx)
             del self.ai.hand[card_index]
             self.ai.graveyard.append(card)
-            self.log_action(f"Opponent casts {card.name} (Cost {actual_cost}).")
+            self.log_action("Opponent casts %s (Cost %s).", card.name, actual_cost)
             
             # Trigger Ladrón de Almas ability for opponent
             self.trigger_absorb_magic(self.player)
@@ -265,16 +518,17 @@ class Game:
             self.apply_champion_passive_to_card(card, self.ai)
             self.ai.active_zone.append(card)
             del self.ai.hand[card_index]
-            self.log_action(f"Opponent plays {card.name} to board (tapped) (Cost {card.cost}).")
+            self.log_action("Opponent plays %s to board (tapped) (Cost %s).", card.name, card.cost)
             
             # Trigger on_play abilities
             if card.ability_type == 'on_play':
                 if 'Curacion al Entrar' in card.ability:
                     before = self.ai.life
                     self.ai.life = min(self.ai.life + 3, self.ai.max_life)
-                    self.log_action(f"{card.name} heals opponent for {self.ai.life - before} life!")
+                    self.log_action("%s heals opponent for %s life!", card.name, self.ai.life - before)
         
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
 
     def activate_ability(self, card_index: int, owner: str = 'player'):
         """Activate a card's ability by tapping it."""
@@ -288,17 +542,20 @@ class Game:
         if card.ability == 'Invocar Aliado':
             token = Card('Token 1/1', 0, 1, health=1, current_health=1, ready=False, in_play=True)
             p.active_zone.append(token)
-            self.log_action(f"{p.name} activates {card.name}: summons a 1/1 Token!")
+            self.log_action("%s activates %s: summons a 1/1 Token!", p.name, card.name)
         # Tap the card after using ability
         card.ready = False
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
 
     def execute_spell(self, spell: Card, caster: str, target_idx = None):
         """Execute a spell's effect. target_idx can be int (troop index) or 'player' string."""
         caster_player = self.player if caster == 'player' else self.ai
         target_player = self.ai if caster == 'player' else self.player
         
-        print(f"DEBUG execute_spell: name={spell.name}, spell_effect={spell.spell_effect}, spell_target={spell.spell_target}, target_idx={target_idx}")
+        if _log.enabled(DEBUG, self.log_room):
+            _log.debug('execute_spell', room=self.log_room, caster=caster, spell=spell.name,
+                       effect=spell.spell_effect, target=spell.spell_target, target_idx=target_idx)
         
         if spell.spell_effect == 'damage':
             if spell.spell_target == 'enemy_or_player':
@@ -306,12 +563,12 @@ class Game:
                 if target_idx == 'player':
                     # Damage to enemy player
                     target_player.life -= spell.damage
-                    self.log_action(f"{spell.name} deals {spell.damage} damage to enemy player!")
+                    self.log_action("%s deals %s damage to enemy player!", spell.name, spell.damage)
                 elif target_idx is not None and isinstance(target_idx, int) and 0 <= target_idx < len(target_player.active_zone):
                     # Damage to troop
                     target = target_player.active_zone[target_idx]
                     target.current_health -= spell.damage
-                    self.log_action(f"{spell.name} deals {spell.damage} damage to enemy {target.name}!")
+                    self.log_action("%s deals %s damage to enemy %s!", spell.name, spell.damage, target.name)
                     if target.current_health <= 0:
                         self.destroy_card(target_player, target_idx)
             elif spell.spell_target == 'enemy':
@@ -319,7 +576,7 @@ class Game:
                 if target_idx is not None and isinstance(target_idx, int) and 0 <= target_idx < len(target_player.active_zone):
                     target = target_player.active_zone[target_idx]
                     target.current_health -= spell.damage
-                    self.log_action(f"{spell.name} deals {spell.damage} damage to enemy {target.name}!")
+                    self.log_action("%s deals %s damage to enemy %s!", spell.name, spell.damage, target.name)
                     if target.current_health <= 0:
                         self.destroy_card(target_player, target_idx)
             elif spell.spell_target == 'all_enemies':
@@ -328,7 +585,7 @@ class Game:
                 for card in target_player.active_zone:
                     card.current_health -= spell.damage
                     damaged.append(card.name)
-                self.log_action(f"{spell.name} deals {spell.damage} damage to all enemy troops!")
+                self.log_action("%s deals %s damage to all enemy troops!", spell.name, spell.damage)
                 # Remove dead cards
                 target_player.active_zone = [c for c in target_player.active_zone if c.current_health > 0]
         
@@ -338,12 +595,12 @@ class Game:
                 if target_idx is not None and 0 <= target_idx < len(caster_player.active_zone):
                     target = caster_player.active_zone[target_idx]
                     target.current_health = min(target.current_health + spell.damage, target.health)
-                    self.log_action(f"{spell.name} heals {target.name} for {spell.damage}!")
+                    self.log_action("%s heals %s for %s!", spell.name, target.name, spell.damage)
             elif spell.spell_target == 'self':
                 # Heal caster player (cap to max life)
                 before = caster_player.life
                 caster_player.life = min(caster_player.life + spell.damage, caster_player.max_life)
-                self.log_action(f"{spell.name} heals {caster_player.name} for {caster_player.life - before}!")
+                self.log_action("%s heals %s for %s!", spell.name, caster_player.name, caster_player.life - before)
         
         elif spell.spell_effect == 'destroy':
             if spell.name == 'Aniquilar':
@@ -351,15 +608,15 @@ class Game:
                 if target_idx is not None and 0 <= target_idx < len(target_player.active_zone):
                     target = target_player.active_zone[target_idx]
                     if target.current_health < target.health:
-                        self.log_action(f"{spell.name} destroys {target.name}!")
+                        self.log_action("%s destroys %s!", spell.name, target.name)
                         self.destroy_card(target_player, target_idx)
                     else:
-                        self.log_action(f"{spell.name} has no effect (target not damaged).")
+                        self.log_action("%s has no effect (target not damaged).", spell.name)
             else:
                 # Destierro: Destroy any enemy troop
                 if target_idx is not None and 0 <= target_idx < len(target_player.active_zone):
                     target = target_player.active_zone[target_idx]
-                    self.log_action(f"{spell.name} destroys {target.name}!")
+                    self.log_action("%s destroys %s!", spell.name, target.name)
                     self.destroy_card(target_player, target_idx)
         elif spell.spell_effect == 'draw':
             # Draw cards
@@ -370,7 +627,7 @@ class Game:
                     if drawn is not None:
                         caster_player.hand.append(drawn)
                         cards_drawn += 1
-            self.log_action(f"{caster_player.name} draws {cards_drawn} cards!")
+            self.log_action("%s draws %s cards!", caster_player.name, cards_drawn)
         
         elif spell.spell_effect == 'freeze':
             # Prisión de Luz: Freeze enemy troop
@@ -378,21 +635,21 @@ class Game:
                 target = target_player.active_zone[target_idx]
                 target.frozen_turns = 2
                 target.ready = False  # Immediately tap
-                self.log_action(f"{spell.name} freezes {target.name} for 2 turns!")
+                self.log_action("%s freezes %s for 2 turns!", spell.name, target.name)
         
         elif spell.spell_effect == 'sacrifice':
             # Pacto de Sangre: Sacrifice friendly troop
             # Handle negative indices from UI (friendly targets sent as negative)
-            print(f"DEBUG sacrifice: target_idx={target_idx}, active_zone size={len(caster_player.active_zone)}")
             actual_idx = target_idx
             if target_idx is not None and target_idx < 0:
                 actual_idx = -(target_idx + 1)
-                print(f"DEBUG sacrifice: converted negative index to actual_idx={actual_idx}")
+            if _log.enabled(DEBUG, self.log_room):
+                _log.debug('sacrifice', room=self.log_room, target_idx=target_idx, actual_idx=actual_idx,
+                           zone_size=len(caster_player.active_zone))
             
             if actual_idx is not None and 0 <= actual_idx < len(caster_player.active_zone):
                 target = caster_player.active_zone[actual_idx]
-                print(f"DEBUG sacrifice: sacrificing {target.name}")
-                self.log_action(f"{spell.name} sacrifices {target.name}!")
+                self.log_action("%s sacrifices %s!", spell.name, target.name)
                 self.destroy_card(caster_player, actual_idx)
                 
                 # Draw 2 cards
@@ -406,7 +663,7 @@ class Game:
                 
                 # Gain +2 mana this turn
                 caster_player.mana += 2
-                self.log_action(f"Draws {cards_drawn} cards and gains +2 mana this turn!")
+                self.log_action("Draws %s cards and gains +2 mana this turn!", cards_drawn)
 
         # Clamp life values so they never go below 0 and check end after any spell resolution
         if self.player.life < 0:
@@ -430,7 +687,7 @@ class Game:
                 card.damage += 1
                 card.health += 1
                 card.current_health += 1
-                self.log_action(f"{card.name} absorbs magic! Now {card.damage}/{card.current_health}")
+                self.log_action("%s absorbs magic! Now %s/%s", card.name, card.damage, card.current_health)
 
     def end_turn(self):
         """End player turn."""
@@ -453,17 +710,7 @@ class Game:
         # AI decides which cards to play (troops only first)
         troops_to_play = [c for c in self.ai_brain.choose_cards_to_play(self.ai.mana) if c.card_type != 'spell']
         for card in troops_to_play:
-            self.ai.mana -= card.cost
-            card.in_play = True
-            card.current_health = card.health if card.health > 0 else card.damage
-            card.ready = False
-            
-            # Apply champion passive abilities
-            self.apply_champion_passive_to_card(card, self.ai)
-            
-            self.ai.active_zone.append(card)
-            self.log_action(f"AI plays {card.name} to board (tapped) (Cost {card.cost}).")
-            self.ai.hand.remove(card)
+            self._ai_play_troop(card)
         
         # AI considers casting spells
         while True:
@@ -479,10 +726,7 @@ class Game:
             
             spell, spell_idx, target_idx = spell_decision
             if spell_idx < len(self.ai.hand) and self.ai.hand[spell_idx] == spell:
-                self.execute_spell(spell, 'ai', target_idx)
-                self.ai.mana -= spell.cost
-                self.ai.hand.remove(spell)
-                self.ai.graveyard.append(spell)
+                self._ai_cast_spell(spell, target_idx)
             else:
                 break
         
@@ -492,65 +736,101 @@ class Game:
                 continue
             
             # AI decides target
-            target = self.ai_brain.choose_attack_target(card, self.player.active_zone, self.player.life)
+            self._ai_resolve_attack(card, self._ai_attack_target(card))
+        
+        self.check_end()
+        self.turn = 'player'
+        self.start_turn('player')
+        for c in self.player.active_zone:
+            c.blocked_this_combat = False
+        if self.on_update is not None:
+            self.on_update()
+
+    def _ai_play_troop(self, card: Card):
+        """AI plays a troop from hand to the board (tapped)."""
+        self.ai.mana -= card.cost
+        card.in_play = True
+        card.current_health = card.health if card.health > 0 else card.damage
+        card.ready = False
+        
+        # Apply champion passive abilities
+        self.apply_champion_passive_to_card(card, self.ai)
+        
+        self.ai.active_zone.append(card)
+        self.log_action("AI plays %s to board (tapped) (Cost %s).", card.name, card.cost)
+        self.ai.hand.remove(card)
+
+    def _ai_cast_spell(self, spell: Card, target_idx):
+        """AI casts a spell from hand."""
+        self.execute_spell(spell, 'ai', target_idx)
+        self.ai.mana -= spell.cost
+        self.ai.hand.remove(spell)
+        self.ai.graveyard.append(spell)
+
+    def _ai_resolve_attack(self, card: Card, target):
+        """Resolve one AI attack: 'player' (blockable via ask_blocker) or ('card', idx)."""
+        if target == 'player':
+            # Attack player - can be blocked (unless player is Ragnar with 'all_furia')
+            can_block = (self.player.champion is None or 
+                        self.player.champion.ability_type != 'all_furia')
             
-            if target == 'player':
-                # Attack player - can be blocked (unless player is Ragnar with 'all_furia')
-                can_block = (self.player.champion is None or 
-                            self.player.champion.ability_type != 'all_furia')
-                
-                if self.player.active_zone and callable(self.ask_blocker) and can_block:
-                    choice = self.ask_blocker(card)
-                    if choice is None:
-                        self.player.life -= card.damage
-                        self.log_action(f"AI {card.name} attacks player for {card.damage}")
-                        card.ready = False
-                    elif 0 <= choice < len(self.player.active_zone):
-                        defender = self.player.active_zone[choice]
-                        defender.blocked_this_combat = True
-                        defender.current_health -= card.damage
-                        card.current_health -= defender.damage
-                        self.log_action(f"AI {card.name} attacks player but {defender.name} blocks: {card.damage} vs {defender.damage}")
-                        if defender.current_health <= 0:
-                            self.log_action(f"{defender.name} dies")
-                            self.player.active_zone.remove(defender)
-                            self.player.graveyard.append(defender)
-                        if card.current_health <= 0:
-                            self.log_action(f"{card.name} dies")
-                            self.ai.active_zone.remove(card)
-                            self.ai.graveyard.append(card)
-                        else:
-                            card.ready = False
-                else:
+            if self.player.active_zone and callable(self.ask_blocker) and can_block:
+                choice = self.ask_blocker(card)
+                if choice is None:
                     self.player.life -= card.damage
-                    self.log_action(f"AI {card.name} attacks player for {card.damage}")
+                    self.log_action("AI %s attacks player for %s", card.name, card.damage)
                     card.ready = False
-            
-            elif isinstance(target, tuple) and target[0] == 'card':
-                # Direct attack to player card
-                _, target_idx = target
-                if target_idx is not None and isinstance(target_idx, int) and 0 <= target_idx < len(self.player.active_zone):
-                    defender = self.player.active_zone[target_idx]
+                elif 0 <= choice < len(self.player.active_zone):
+                    defender = self.player.active_zone[choice]
+                    defender.blocked_this_combat = True
                     defender.current_health -= card.damage
                     card.current_health -= defender.damage
-                    self.log_action(f"AI {card.name} attacks {defender.name}: {card.damage} vs {defender.damage}")
+                    self.log_action("AI %s attacks player but %s blocks: %s vs %s", card.name, defender.name, card.damage, defender.damage)
                     if defender.current_health <= 0:
-                        self.log_action(f"{defender.name} dies")
+                        self.log_action("%s dies", defender.name)
                         self.player.active_zone.remove(defender)
                         self.player.graveyard.append(defender)
                     if card.current_health <= 0:
-                        self.log_action(f"{card.name} dies")
+                        self.log_action("%s dies", card.name)
                         self.ai.active_zone.remove(card)
                         self.ai.graveyard.append(card)
                     else:
                         card.ready = False
+            else:
+                self.player.life -= card.damage
+                self.log_action("AI %s attacks player for %s", card.name, card.damage)
+                card.ready = False
         
-        self.check_end()
-        self.turn = 'player'
-        self.start_turn('player')
-        for c in self.player.active_zone:
-            c.blocked_this_combat = False
-        self.on_update()
+        elif isinstance(target, tuple) and target[0] == 'card':
+            # Direct attack to player card
+            _, target_idx = target
+            if target_idx is not None and isinstance(target_idx, int) and 0 <= target_idx < len(self.player.active_zone):
+                defender = self.player.active_zone[target_idx]
+                defender.current_health -= card.damage
+                card.current_health -= defender.damage
+                self.log_action("AI %s attacks %s: %s vs %s", card.name, defender.name, card.damage, defender.damage)
+                if defender.current_health <= 0:
+                    self.log_action("%s dies", defender.name)
+                    self.player.active_zone.remove(defender)
+                    self.player.graveyard.append(defender)
+                if card.current_health <= 0:
+                    self.log_action("%s dies", card.name)
+                    self.ai.active_zone.remove(card)
+                    self.ai.graveyard.append(card)
+                else:
+                    card.ready = False
+
+    def _ai_attack_target(self, card: Card):
+        """Ask the AI brain for a target as 'player' or ('card', idx).
+
+        DataDrivenAI answers (attack_player, target_idx); convert it to the
+        form the turn loops below expect.
+        """
+        target = self.ai_brain.choose_attack_target(card, self.player.active_zone, self.player.life)
+        if isinstance(target, tuple) and len(target) == 2 and isinstance(target[0], bool):
+            attack_player, target_idx = target
+            return 'player' if attack_player else ('card', target_idx)
+        return target
 
     def ai_turn_steps(self):
         """Generator that performs the AI turn step-by-step for animations."""
@@ -560,11 +840,11 @@ class Game:
         self.ai.max_mana = min(10, self.ai.max_mana + 1)
         self.ai.mana = self.ai.max_mana
         self.ai.draw_card()
-        self.log_action(f"AI draws a card.")
+        self.log_action("AI draws a card.")
         yield
         
         self.activate_rest_zone(self.ai)
-        self.log_action(f"AI activates rest zone -> {len(self.ai.active_zone)} active cards.")
+        self.log_action("AI activates rest zone -> %s active cards.", len(self.ai.active_zone))
         yield
         
         # AI decides which cards to play (troops only first)
@@ -583,7 +863,7 @@ class Game:
             except Exception:
                 pass
             self.ai.active_zone.append(card)
-            self.log_action(f"AI plays {card.name} to rest zone (Cost {card.cost}).")
+            self.log_action("AI plays %s to rest zone (Cost %s).", card.name, card.cost)
             self.ai.hand.remove(card)
             yield
         
@@ -615,7 +895,7 @@ class Game:
                 continue
             
             # AI decides target
-            target = self.ai_brain.choose_attack_target(card, self.player.active_zone, self.player.life)
+            target = self._ai_attack_target(card)
             
             if target == 'player':
                 # Attack player - can be blocked (unless player is Ragnar with 'all_furia')
@@ -626,7 +906,7 @@ class Game:
                     choice = self.ask_blocker(card)
                     if choice is None:
                         self.player.life -= card.damage
-                        self.log_action(f"AI {card.name} attacks player for {card.damage}")
+                        self.log_action("AI %s attacks player for %s", card.name, card.damage)
                         card.attacked_count += 1
                         if card.ability == 'Furia' and card.attacked_count < 2:
                             pass
@@ -638,15 +918,15 @@ class Game:
                         defender.blocked_this_combat = True
                         defender.current_health -= card.damage
                         card.current_health -= defender.damage
-                        self.log_action(f"AI {card.name} attacks player but {defender.name} blocks: {card.damage} vs {defender.damage}")
+                        self.log_action("AI %s attacks player but %s blocks: %s vs %s", card.name, defender.name, card.damage, defender.damage)
                         yield
                         if defender.current_health <= 0:
-                            self.log_action(f"{defender.name} dies")
+                            self.log_action("%s dies", defender.name)
                             self.player.active_zone.remove(defender)
                             self.player.graveyard.append(defender)
                             yield
                         if card.current_health <= 0:
-                            self.log_action(f"{card.name} dies")
+                            self.log_action("%s dies", card.name)
                             self.ai.active_zone.remove(card)
                             self.ai.graveyard.append(card)
                             yield
@@ -658,7 +938,7 @@ class Game:
                                 card.ready = False
                 else:
                     self.player.life -= card.damage
-                    self.log_action(f"AI {card.name} attacks player for {card.damage}")
+                    self.log_action("AI %s attacks player for %s", card.name, card.damage)
                     card.attacked_count += 1
                     if card.ability == 'Furia' and card.attacked_count < 2:
                         pass
@@ -673,15 +953,15 @@ class Game:
                     defender = self.player.active_zone[target_idx]
                     defender.current_health -= card.damage
                     card.current_health -= defender.damage
-                    self.log_action(f"AI {card.name} attacks {defender.name}: {card.damage} vs {defender.damage}")
+                    self.log_action("AI %s attacks %s: %s vs %s", card.name, defender.name, card.damage, defender.damage)
                     yield
                     if defender.current_health <= 0:
-                        self.log_action(f"{defender.name} dies")
+                        self.log_action("%s dies", defender.name)
                         self.player.active_zone.remove(defender)
                         self.player.graveyard.append(defender)
                         yield
                     if card.current_health <= 0:
-                        self.log_action(f"{card.name} dies")
+                        self.log_action("%s dies", card.name)
                         self.ai.active_zone.remove(card)
                         self.ai.graveyard.append(card)
                         yield
@@ -708,13 +988,24 @@ class Game:
             self.ai.life = 0
 
         if self.player.life == 0 or self.ai.life == 0:
+            self.winner = 'ai' if self.player.life <= 0 else 'player'
+            if self.headless:
+                return
             winner = 'AI' if self.player.life <= 0 else 'Player'
             messagebox.showinfo('Game Over', f'{winner} wins!')
             if self.root:
                 self.root.quit()
 
-    def log_action(self, text: str):
-        """Add an action to the log."""
+    def log_action(self, text: str, *args):
+        """Add an action to the log.
+
+        Arguments are %-formatted lazily, so callers pay for the text only
+        when log_enabled is set (always outside headless mode).
+        """
+        if not self.log_enabled:
+            return
+        if args:
+            text = text % args
         self.action_log.append(text)
         if len(self.action_log) > 50:
             self.action_log.pop(0)
@@ -729,24 +1020,25 @@ class Game:
         if target_kind == 'face':
             self.ai.life -= attacker.damage
             attacker.ready = False
-            self.log_action(f"Player {attacker.name} attacks AI face for {attacker.damage}")
+            self.log_action("Player %s attacks AI face for %s", attacker.name, attacker.damage)
         elif target_kind == 'ai_card' and target_idx is not None and 0 <= target_idx < len(self.ai.active_zone):
             defender = self.ai.active_zone[target_idx]
             defender.current_health -= attacker.damage
             attacker.current_health -= defender.damage
-            self.log_action(f"Player {attacker.name} attacks {defender.name}: {attacker.damage} vs {defender.damage}")
+            self.log_action("Player %s attacks %s: %s vs %s", attacker.name, defender.name, attacker.damage, defender.damage)
             if defender.current_health <= 0:
-                self.log_action(f"{defender.name} dies")
+                self.log_action("%s dies", defender.name)
                 self.ai.active_zone.remove(defender)
                 self.ai.graveyard.append(defender)
             if attacker.current_health <= 0:
-                self.log_action(f"{attacker.name} dies")
+                self.log_action("%s dies", attacker.name)
                 self.player.active_zone.remove(attacker)
                 self.player.graveyard.append(attacker)
             else:
                 attacker.ready = False
         self.check_end()
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
 
     def player_choose_blocker(self, attacker: Card, available_defenders: List[int]):
         """Player auto-blocking heuristic (not used in current UI)."""
@@ -798,6 +1090,13 @@ class Game:
             return None  # No AI brain - don't block
         return self.ai_brain.choose_blocker(attacker, available_defenders, self.ai.active_zone, self.ai.life)
 
+    def ai_choose_blockers(self, attackers: List[Tuple[int, Card]]) -> Dict[int, int]:
+        """Plan the AI's blocks against several attackers at once: {attacker_idx: blocker_idx}."""
+        if not self.ai_brain or not attackers:
+            return {}
+        candidates = {atk_idx: self.block_candidates(attacker, 'player') for atk_idx, attacker in attackers}
+        return self.ai_brain.choose_blockers(attackers, candidates, self.ai.active_zone, self.ai.life)
+
     def declare_attacks_v2(self, attacker_indices: List[int], targets: List, owner: str = 'player'):
         """
         Process attacks with explicit targets.
@@ -820,7 +1119,7 @@ class Game:
             
             # Frozen cards cannot attack
             if hasattr(attacker, 'frozen_turns') and attacker.frozen_turns > 0:
-                self.log_action(f"{attacker.name} is frozen and cannot attack!")
+                self.log_action("%s is frozen and cannot attack!", attacker.name)
                 continue
             
             target = targets[i]
@@ -828,14 +1127,14 @@ class Game:
             if target == 'player':
                 # Direct attack to opponent
                 a.life -= attacker.damage
-                self.log_action(f"{p.name} {attacker.name} hits {a.name} for {attacker.damage}")
+                self.log_action("%s %s hits %s for %s", p.name, attacker.name, a.name, attacker.damage)
                 
                 # Trigger Cazador de Bestias debuff when hitting champion
                 if attacker.ability and 'Debilitar' in attacker.ability:
                     a.max_life = max(1, a.max_life - 1)
                     if a.life > a.max_life:
                         a.life = a.max_life
-                    self.log_action(f"{attacker.name} reduces enemy max life by 1 (now {a.max_life})!")
+                    self.log_action("%s reduces enemy max life by 1 (now %s)!", attacker.name, a.max_life)
                 attacker.attacked_count += 1
                 if attacker.ability == 'Furia' and attacker.attacked_count < 2:
                     pass
@@ -852,14 +1151,14 @@ class Game:
                 # Combat
                 defender.current_health -= attacker.damage
                 attacker.current_health -= defender.damage
-                self.log_action(f"{p.name} {attacker.name} attacks {defender.name}: {attacker.damage} vs {defender.damage}")
+                self.log_action("%s %s attacks %s: %s vs %s", p.name, attacker.name, defender.name, attacker.damage, defender.damage)
                 
                 if defender.current_health <= 0:
-                    self.log_action(f"{defender.name} dies")
+                    self.log_action("%s dies", defender.name)
                     a.active_zone.remove(defender)
                     a.graveyard.append(defender)
                 if attacker.current_health <= 0:
-                    self.log_action(f"{attacker.name} dies")
+                    self.log_action("%s dies", attacker.name)
                     p.active_zone.remove(attacker)
                     p.graveyard.append(attacker)
                 else:
@@ -870,7 +1169,8 @@ class Game:
                         attacker.ready = False
         
         self.check_end()
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
     
     def declare_attacks_with_blockers(self, attacker_indices: List[int], targets: List, blockers: dict, owner: str = 'player'):
         """
@@ -895,7 +1195,7 @@ class Game:
             
             # Frozen cards cannot attack
             if hasattr(attacker, 'frozen_turns') and attacker.frozen_turns > 0:
-                self.log_action(f"{attacker.name} is frozen and cannot attack!")
+                self.log_action("%s is frozen and cannot attack!", attacker.name)
                 continue
             
             target = targets[i]
@@ -909,19 +1209,19 @@ class Game:
                         # Combat between attacker and blocker
                         blocker.current_health -= attacker.damage
                         attacker.current_health -= blocker.damage
-                        self.log_action(f"{blocker.name} blocks {attacker.name}: {attacker.damage} vs {blocker.damage}")
+                        self.log_action("%s blocks %s: %s vs %s", blocker.name, attacker.name, attacker.damage, blocker.damage)
                         
                         # Frozen blockers cannot block (treat as no block)
                         if hasattr(blocker, 'frozen_turns') and blocker.frozen_turns > 0:
-                            self.log_action(f"{blocker.name} is frozen and cannot block {attacker.name}")
+                            self.log_action("%s is frozen and cannot block %s", blocker.name, attacker.name)
                             continue
                         
                         if blocker.current_health <= 0:
-                            self.log_action(f"{blocker.name} dies")
+                            self.log_action("%s dies", blocker.name)
                             a.active_zone.remove(blocker)
                             a.graveyard.append(blocker)
                         if attacker.current_health <= 0:
-                            self.log_action(f"{attacker.name} dies")
+                            self.log_action("%s dies", attacker.name)
                             p.active_zone.remove(attacker)
                             p.graveyard.append(attacker)
                         else:
@@ -936,14 +1236,14 @@ class Game:
             if target == 'player':
                 # Direct attack to opponent
                 a.life -= attacker.damage
-                self.log_action(f"{p.name} {attacker.name} hits {a.name} for {attacker.damage}")
+                self.log_action("%s %s hits %s for %s", p.name, attacker.name, a.name, attacker.damage)
                 
                 # Trigger Cazador de Bestias debuff when hitting champion
                 if attacker.ability and 'Debilitar' in attacker.ability:
                     a.max_life = max(1, a.max_life - 1)
                     if a.life > a.max_life:
                         a.life = a.max_life
-                    self.log_action(f"{attacker.name} reduces enemy max life by 1 (now {a.max_life})!")
+                    self.log_action("%s reduces enemy max life by 1 (now %s)!", attacker.name, a.max_life)
                 
                 attacker.attacked_count += 1
                 if attacker.ability == 'Furia' and attacker.attacked_count < 2:
@@ -961,14 +1261,14 @@ class Game:
                 # Combat
                 defender.current_health -= attacker.damage
                 attacker.current_health -= defender.damage
-                self.log_action(f"{p.name} {attacker.name} attacks {defender.name}: {attacker.damage} vs {defender.damage}")
+                self.log_action("%s %s attacks %s: %s vs %s", p.name, attacker.name, defender.name, attacker.damage, defender.damage)
                 
                 if defender.current_health <= 0:
-                    self.log_action(f"{defender.name} dies")
+                    self.log_action("%s dies", defender.name)
                     a.active_zone.remove(defender)
                     a.graveyard.append(defender)
                 if attacker.current_health <= 0:
-                    self.log_action(f"{attacker.name} dies")
+                    self.log_action("%s dies", attacker.name)
                     p.active_zone.remove(attacker)
                     p.graveyard.append(attacker)
                 else:
@@ -979,7 +1279,8 @@ class Game:
                         attacker.ready = False
         
         self.check_end()
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
 
     def declare_attacks_with_targets(self, attack_targets: dict, owner: str = 'player'):
         """
@@ -991,51 +1292,46 @@ class Game:
         p = self.player
         a = self.ai
         
+        # The AI plans all its blocks jointly (each defender blocks at most once)
+        face_attackers = [(i, p.active_zone[i]) for i, t in attack_targets.items()
+                          if t == 'player' and 0 <= i < len(p.active_zone) and p.active_zone[i].ready
+                          and not getattr(p.active_zone[i], 'frozen_turns', 0) > 0]
+        planned_blocks = {atk_idx: a.active_zone[b] for atk_idx, b in self.ai_choose_blockers(face_attackers).items()}
+        # Resolve attackers up front: indices shift when an earlier attacker dies
+        declared = {atk_idx: p.active_zone[atk_idx] for atk_idx in attack_targets
+                    if 0 <= atk_idx < len(p.active_zone)}
+        
         for atk_idx, target in attack_targets.items():
-            if atk_idx < 0 or atk_idx >= len(p.active_zone):
+            attacker = declared.get(atk_idx)
+            if attacker is None or not any(c is attacker for c in p.active_zone):
                 continue
-            attacker = p.active_zone[atk_idx]
             if not attacker.ready:
                 continue
             
             # Frozen cards cannot attack
             if hasattr(attacker, 'frozen_turns') and attacker.frozen_turns > 0:
-                self.log_action(f"{attacker.name} is frozen and cannot attack!")
+                self.log_action("%s is frozen and cannot attack!", attacker.name)
                 continue
             
             if target == 'player':
-                # Attack player - AI can choose to block (Taunt rules apply)
-                # Note: AI (not player) is defending here, so Ragnar check not needed
+                # Attack player - AI blocks according to its joint plan
+                # (legal_blockers: ready, unfrozen, Volar only by Volar, Ragnar cannot block;
+                # Taunt defenders block first)
                 available = [i for i, c in enumerate(a.active_zone) if c.ready and not (hasattr(c, 'frozen_turns') and c.frozen_turns > 0)]
-                taunt_defenders = [i for i in available if a.active_zone[i].ability and 'Taunt' in a.active_zone[i].ability]
-                
-                # Check Volar
-                can_be_blocked = not (attacker.ability == 'Volar' or (attacker.ability and 'Volar' in attacker.ability))
-                if attacker.ability == 'Volar' or (attacker.ability and 'Volar' in attacker.ability):
-                    volar_defenders = [i for i in available if a.active_zone[i].ability == 'Volar']
-                    if volar_defenders:
-                        can_be_blocked = True
-                        available = volar_defenders
-                
-                # Taunt forces block
-                if taunt_defenders:
-                    choice = self.ai_choose_blocker(attacker, taunt_defenders) if can_be_blocked else None
-                    if choice is not None:
-                        available = [choice]
-                
-                choice = self.ai_choose_blocker(attacker, available) if available and can_be_blocked else None
+                planned = planned_blocks.get(atk_idx)
+                choice = next((i for i in available if a.active_zone[i] is planned), None)
                 
                 if choice is None:
                     # Direct damage to AI player
                     a.life -= attacker.damage
-                    self.log_action(f"Player {attacker.name} hits AI player for {attacker.damage}")
+                    self.log_action("Player %s hits AI player for %s", attacker.name, attacker.damage)
                     
                     # Trigger Cazador de Bestias debuff when hitting champion
                     if attacker.ability and 'Debilitar' in attacker.ability:
                         a.max_life = max(1, a.max_life - 1)
                         if a.life > a.max_life:
                             a.life = a.max_life
-                        self.log_action(f"{attacker.name} reduces enemy max life by 1 (now {a.max_life})!")
+                        self.log_action("%s reduces enemy max life by 1 (now %s)!", attacker.name, a.max_life)
                     
                     attacker.attacked_count += 1
                     if attacker.ability == 'Furia' and attacker.attacked_count < 2:
@@ -1047,22 +1343,20 @@ class Game:
                     defender = a.active_zone[choice]
                     if choice in available:
                         available.remove(choice)
-                    if choice in taunt_defenders:
-                        taunt_defenders.remove(choice)
                     defender.current_health -= attacker.damage
                     attacker.current_health -= defender.damage
-                    self.log_action(f"Player {attacker.name} attacks AI player but {defender.name} blocks: {attacker.damage} vs {defender.damage}")
+                    self.log_action("Player %s attacks AI player but %s blocks: %s vs %s", attacker.name, defender.name, attacker.damage, defender.damage)
                     
                     # Frozen defenders cannot block (should have been filtered, safeguard)
                     if hasattr(defender, 'frozen_turns') and defender.frozen_turns > 0:
-                        self.log_action(f"{defender.name} is frozen and should not have blocked")
+                        self.log_action("%s is frozen and should not have blocked", defender.name)
                     
                     if defender.current_health <= 0:
-                        self.log_action(f"{defender.name} dies")
+                        self.log_action("%s dies", defender.name)
                         a.active_zone.remove(defender)
                         a.graveyard.append(defender)
                     if attacker.current_health <= 0:
-                        self.log_action(f"{attacker.name} dies")
+                        self.log_action("%s dies", attacker.name)
                         p.active_zone.remove(attacker)
                         p.graveyard.append(attacker)
                     else:
@@ -1082,14 +1376,14 @@ class Game:
                 # Direct combat
                 defender.current_health -= attacker.damage
                 attacker.current_health -= defender.damage
-                self.log_action(f"Player {attacker.name} attacks {defender.name}: {attacker.damage} vs {defender.damage}")
+                self.log_action("Player %s attacks %s: %s vs %s", attacker.name, defender.name, attacker.damage, defender.damage)
                 
                 if defender.current_health <= 0:
-                    self.log_action(f"{defender.name} dies")
+                    self.log_action("%s dies", defender.name)
                     a.active_zone.remove(defender)
                     a.graveyard.append(defender)
                 if attacker.current_health <= 0:
-                    self.log_action(f"{attacker.name} dies")
+                    self.log_action("%s dies", attacker.name)
                     p.active_zone.remove(attacker)
                     p.graveyard.append(attacker)
                 else:
@@ -1100,7 +1394,8 @@ class Game:
                         attacker.ready = False
         
         self.check_end()
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
 
     def declare_attacks(self, attacker_indices: List[int], owner: str = 'player'):
         """Legacy method - Process declared attacks with blocking (attacks player by default)."""
@@ -1134,7 +1429,7 @@ class Game:
             
             if choice is None:
                 a.life -= attacker.damage
-                self.log_action(f"Player {attacker.name} hits AI for {attacker.damage}")
+                self.log_action("Player %s hits AI for %s", attacker.name, attacker.damage)
                 attacker.attacked_count += 1
                 if attacker.ability == 'Furia' and attacker.attacked_count < 2:
                     pass
@@ -1148,13 +1443,13 @@ class Game:
                     taunt_defenders.remove(choice)
                 defender.current_health -= attacker.damage
                 attacker.current_health -= defender.damage
-                self.log_action(f"Player {attacker.name} attacks {defender.name}: {attacker.damage} vs {defender.damage}")
+                self.log_action("Player %s attacks %s: %s vs %s", attacker.name, defender.name, attacker.damage, defender.damage)
                 if defender.current_health <= 0:
-                    self.log_action(f"{defender.name} dies")
+                    self.log_action("%s dies", defender.name)
                     a.active_zone.remove(defender)
                     a.graveyard.append(defender)
                 if attacker.current_health <= 0:
-                    self.log_action(f"{attacker.name} dies")
+                    self.log_action("%s dies", attacker.name)
                     p.active_zone.remove(attacker)
                     p.graveyard.append(attacker)
                 else:
@@ -1165,4 +1460,5 @@ class Game:
                         attacker.ready = False
         
         self.check_end()
-        self.on_update()
+        if self.on_update is not None:
+            self.on_update()
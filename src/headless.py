@@ -0,0 +1,80 @@
+"""
+Headless match driver for the TCG game.
+Plays both sides of a Game with DataDrivenAI brains through the public Game
+API, without UI callbacks. Used for batch simulation and benchmarks.
+"""
+
+from typing import Optional
+
+from .models import Card, Deck, Player
+from .game_logic import Game
+from .ai_engine import AIConfig, DataDrivenAI
+
+
+def create_headless_game(player_deck: Deck, ai_deck: Deck, player_champion=None, ai_champion=None,
+                         ai_level: int = 5, headless: bool = True, on_update=None) -> Game:
+    """Create and start a Game ready to be driven by run_headless_game.
+
+    headless=False builds the regular UI-mode Game (on_update still called,
+    log text still built), which is what the benchmark compares against.
+    """
+    player = Player('Player', player_deck, champion=player_champion)
+    ai = Player('AI', ai_deck, champion=ai_champion, ai_config=AIConfig(ai_level))
+    game = Game(player, ai, on_update=on_update, headless=headless)
+    game.start()
+    return game
+
+
+def choose_player_blocker(game: Game, brain: DataDrivenAI, attacker: Card) -> Optional[int]:
+    """ask_blocker callback for the 'player' side, driven by a brain."""
+    zone = game.player.active_zone
+    available = [i for i, c in enumerate(zone)
+                 if c.ready and not getattr(c, 'frozen_turns', 0) > 0]
+    return brain.choose_blocker(attacker, available, zone, game.player.life)
+
+
+def play_player_turn(game: Game, brain: DataDrivenAI):
+    """Play the 'player' side for one turn: troops, spells, then attacks."""
+    p = game.player
+    for card in brain.choose_cards_to_play(p.mana):
+        if card.card_type == 'spell':
+            continue
+        for idx, in_hand in enumerate(p.hand):
+            if in_hand is card:
+                game.play_card(idx)
+                break
+
+    while game.winner is None:
+        decision = brain.choose_spell_to_cast(p.mana, p.active_zone, game.ai.active_zone, p.life, game.ai.life)
+        if not decision:
+            break
+        _, spell_idx, target = decision
+        hand_before = len(p.hand)
+        game.play_card(spell_idx, spell_target_idx=target)
+        if len(p.hand) == hand_before:
+            break
+
+    if game.winner is not None:
+        return
+    attack_targets = {}
+    for atk_idx in brain.choose_attackers(p.active_zone):
+        attack_player, target_idx = brain.choose_attack_target(p.active_zone[atk_idx], game.ai.active_zone, game.ai.life)
+        attack_targets[atk_idx] = 'player' if attack_player else ('card', target_idx)
+    if attack_targets:
+        game.declare_attacks_with_targets(attack_targets)
+
+
+def run_headless_game(game: Game, brain: Optional[DataDrivenAI] = None, max_rounds: int = 50) -> Optional[str]:
+    """Play a started game to the end. Returns 'player', 'ai' or None (round cap)."""
+    if brain is None:
+        brain = DataDrivenAI(game.player, game.ai_brain.config)
+    game.ask_blocker = lambda attacker: choose_player_blocker(game, brain, attacker)
+
+    rounds = 0
+    while game.winner is None and rounds < max_rounds:
+        rounds += 1
+        play_player_turn(game, brain)
+        if game.winner is not None:
+            break
+        game.end_turn()
+    return game.winner
@@ -0,0 +1,137 @@
+"""
+Decoded card image cache for the Tk clients.
+Process-wide LRU keyed by (path, size, rotation) holding the resized PIL image
+and, once a Tk root exists, its PhotoImage. UI refreshes then never touch the
+disk or re-decode a PNG. Entries are evicted least-recently-used once the
+decoded pixels exceed a memory budget.
+
+Widgets must still keep a reference to the PhotoImage they display (as the
+UIs already do per refresh): evicting an entry only drops the cache's own
+reference.
+"""
+
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+# Optional Pillow support (headless/server runtimes run without it)
+try:
+    from PIL import Image, ImageTk
+except Exception:
+    Image = None
+    ImageTk = None
+
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+Key = Tuple[str, Tuple[int, int], int]
+
+
+class _Entry:
+    __slots__ = ('image', 'photo', 'nbytes')
+
+    def __init__(self, image):
+        self.image = image
+        self.photo = None
+        self.nbytes = image.width * image.height * len(image.getbands())
+
+
+class ImageCache:
+    """LRU of resized PIL images and their PhotoImages, bounded by decoded size."""
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._entries: 'OrderedDict[Key, _Entry]' = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self.evictions = 0
+        self._failed = set()  # paths that could not be decoded: not retried
+
+    @staticmethod
+    def available() -> bool:
+        return Image is not None
+
+    def _entry(self, path: str, size: Tuple[int, int], rotate: int = 0) -> Optional[_Entry]:
+        key = (path, tuple(size), rotate)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        if Image is None or not path or path in self._failed:
+            return None
+        try:
+            with Image.open(path) as img:
+                img.load()
+                if rotate:
+                    # Same order as the old UI code: rotate the original, then resize
+                    img = img.rotate(rotate, expand=True)
+                image = img.resize(tuple(size))
+        except Exception:
+            self._failed.add(path)
+            return None
+        self.decodes += 1
+        entry = _Entry(image)
+        self._entries[key] = entry
+        self.nbytes += entry.nbytes
+        self._evict()
+        return entry
+
+    def _evict(self):
+        while self.nbytes > self.budget_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self.nbytes -= old.nbytes * (2 if old.photo is not None else 1)
+            self.evictions += 1
+
+    def get_image(self, path: str, size: Tuple[int, int], rotate: int = 0):
+        """Resized PIL image (shared: copy it before drawing on it), or None."""
+        entry = self._entry(path, size, rotate)
+        return entry.image if entry is not None else None
+
+    def get_photo(self, path: str, size: Tuple[int, int], rotate: int = 0):
+        """ImageTk.PhotoImage for the resized image, or None. Needs a Tk root."""
+        entry = self._entry(path, size, rotate)
+        if entry is None:
+            return None
+        if entry.photo is None:
+            try:
+                entry.photo = ImageTk.PhotoImage(entry.image)
+            except Exception:
+                return None
+            # Tk keeps its own copy of the pixels
+            self.nbytes += entry.nbytes
+            self._evict()
+        return entry.photo
+
+    def warm_up(self, requests: Iterable[Tuple[str, Tuple[int, int], int]], photos: bool = True) -> int:
+        """Decode (path, size, rotate) requests ahead of time. Returns how many were loaded."""
+        loaded = 0
+        for path, size, rotate in requests:
+            if not path:
+                continue
+            ok = self.get_photo(path, size, rotate) if photos else self.get_image(path, size, rotate)
+            loaded += ok is not None
+        return loaded
+
+    def clear(self):
+        """Drop everything (e.g. after the card images were regenerated)."""
+        self._entries.clear()
+        self._failed.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {'entries': len(self._entries), 'bytes': self.nbytes, 'budget_bytes': self.budget_bytes,
+                'hits': self.hits, 'misses': self.misses, 'decodes': self.decodes,
+                'evictions': self.evictions}
+
+
+_default_cache = ImageCache()
+
+
+def get_image_cache() -> ImageCache:
+    """The process-wide cache (used by game_gui)."""
+    return _default_cache
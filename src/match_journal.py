@@ -0,0 +1,329 @@
+"""
+Append-only per-room journal of server matches, and a replayer.
+A server match is fully determined by its decks (before shuffling), its
+champions, the shuffle seed and the stream of validated game actions: the
+game rules draw no random numbers. The server records exactly that, one
+compact JSON line per record:
+
+    header  {"v": 1, "room": ..., "mode": ..., "seed": ..., "created": ...,
+             "champions": [name1, name2], "cards": [[card fields]...],
+             "decks": [[card index...], [card index...]]}
+    action  {"i": 3, "ms": 5120, "r": "player", "a": {"action": "play_card", ...}}
+            (server-made actions, e.g. AFK timeouts, add "sys": "afk")
+    end     {"end": "game_over", "winner": "player", "ms": ...}
+
+new_match_game() and apply_action() are what the server itself runs, so a
+Replayer rebuilds any intermediate state by re-applying the actions on a
+headless Game. It keeps keyframe snapshots every few turns: seeking to turn
+N restores the nearest earlier keyframe and replays only from there.
+"""
+
+import bisect
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .models import Card, Deck, Player
+from .game_logic import Game, GameSnapshot
+from .champions import get_champion_by_name
+
+JOURNAL_VERSION = 1
+
+# Card constructor arguments, in the order journal card records use
+CARD_FIELDS = ('name', 'cost', 'damage', 'health', 'current_health', 'ready', 'in_play', 'card_type',
+               'image_path', 'blocked_this_combat', 'ability', 'ability_desc', 'ability_type',
+               'spell_target', 'spell_effect', 'description', 'attacked_count')
+
+INITIAL_HAND = 5
+
+
+# ----------------------------------------------------------------------------
+# Match setup and actions (shared by the server and the replayer)
+# ----------------------------------------------------------------------------
+
+def new_match_game(deck1: Deck, deck2: Deck, champion1, champion2, seed: int) -> Game:
+    """The server's match start: both decks shuffled with Random(seed), five
+    cards each, the host ('player') starts with 1 mana and the guest with 0
+    (its first turn brings it to 1). Shuffles the decks in place."""
+    rng = random.Random(seed)
+    player1 = Player(name="Player1", deck=deck1, champion=champion1)
+    player2 = Player(name="Player2", deck=deck2, champion=champion2)
+    rng.shuffle(player1.deck.cards)
+    rng.shuffle(player2.deck.cards)
+    for _ in range(INITIAL_HAND):
+        if player1.deck.cards:
+            player1.hand.append(player1.deck.cards.pop(0))
+        if player2.deck.cards:
+            player2.hand.append(player2.deck.cards.pop(0))
+
+    game = Game(player1, player2, headless=True)
+    game.game_started = True
+    game.turn = 'player'
+    game.server_mode = True  # both sides draw when their turn starts
+    player1.max_mana = 1
+    player1.mana = 1
+    player2.max_mana = 0
+    player2.mana = 0
+    return game
+
+
+def normalize_target(target):
+    """'player' or ('card', index) from any wire form ({'type': 'card', 'index': i}, ['card', i]);
+    anything else targets the player, as the server always did."""
+    if isinstance(target, dict) and target.get('type') == 'card':
+        return ('card', target.get('index', 0))
+    if isinstance(target, (list, tuple)) and len(target) == 2 and target[0] == 'card':
+        return ('card', target[1])
+    return 'player'
+
+
+def apply_action(game: Game, role: str, action: Dict[str, Any], pending: Optional[dict] = None) -> Optional[dict]:
+    """Apply an already validated game_action for `role` ('player'/'ai').
+
+    Returns the pending attack: declare_attacks only records it (the
+    defender answers with declare_blockers), every other action passes
+    `pending` through, declare_blockers resolves and clears it.
+    """
+    name = action.get('action')
+    if name == 'play_card':
+        play = game.play_card if role == 'player' else game.play_card_ai
+        play(action.get('card_index', 0), spell_target_idx=action.get('spell_target'))
+    elif name == 'end_turn':
+        game.turn = 'ai' if role == 'player' else 'player'
+        game.start_turn(game.turn)
+    elif name == 'declare_attacks':
+        return {'attackers': list(action.get('attackers', [])),
+                'targets': [normalize_target(t) for t in action.get('targets', [])],
+                'attacker': role}
+    elif name == 'declare_blockers':
+        if pending:
+            # {attacker_idx: blocker_idx}; JSON turns the keys into text
+            blockers = {int(k): v for k, v in action.get('blockers', {}).items()}
+            game.declare_attacks_with_blockers(pending['attackers'], pending['targets'], blockers,
+                                               owner=pending['attacker'])
+        return None
+    elif name == 'activate_ability':
+        game.activate_ability(action.get('card_index', 0), owner=role)
+    elif name == 'surrender':
+        (game.player if role == 'player' else game.ai).life = 0
+        game.check_end()
+    return pending
+
+
+# ----------------------------------------------------------------------------
+# Journal files
+# ----------------------------------------------------------------------------
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, separators=(',', ':'), ensure_ascii=False)
+
+
+def match_header(room_id: str, mode: str, seed: int, deck1: Deck, deck2: Deck, champion1, champion2) -> dict:
+    """Journal header; call it before new_match_game() shuffles the decks.
+    Identical cards are stored once and the decks list their indexes."""
+    cards: List[list] = []
+    index: Dict[tuple, int] = {}
+    decks = []
+    for deck in (deck1, deck2):
+        ids = []
+        for card in deck.cards:
+            fields = tuple(getattr(card, name) for name in CARD_FIELDS)
+            if fields not in index:
+                index[fields] = len(cards)
+                cards.append(list(fields))
+            ids.append(index[fields])
+        decks.append(ids)
+    return {'v': JOURNAL_VERSION, 'room': room_id, 'mode': mode, 'seed': seed, 'created': round(time.time(), 3),
+            'champions': [champion1.name, champion2.name], 'cards': cards, 'decks': decks}
+
+
+class JournalWriter:
+    """Appends one room's records to a JSON-lines file.
+
+    The file stays open for the whole match and records go through its
+    buffer: an action costs a memory copy, and the file is written every
+    `buffering` bytes and on close(), not on every action (the server calls
+    record() on its event loop). A crash loses the unwritten tail; the
+    header always reaches the file. One descriptor per open room.
+    """
+
+    BUFFERING = 16 * 1024
+
+    def __init__(self, path: str, header: dict, buffering: int = BUFFERING):
+        self.path = path
+        self.count = 0
+        self.closed = False
+        self._start = time.monotonic()
+        self._file = open(path, 'w', encoding='utf-8', buffering=buffering)
+        self._file.write(_dumps(header) + '\n')
+        self._file.flush()
+
+    @classmethod
+    def create(cls, directory: str, header: dict) -> 'JournalWriter':
+        os.makedirs(directory, exist_ok=True)
+        name = f"{header['room']}-{int(header['created'] * 1000)}.jsonl"
+        return cls(os.path.join(directory, name), header)
+
+    def _append(self, record: dict):
+        self._file.write(_dumps(record) + '\n')
+
+    def record(self, role: str, action: Dict[str, Any], sys: Optional[str] = None):
+        """Append a validated action (its room_id is dropped)."""
+        if self.closed:
+            return
+        entry = {'i': self.count, 'ms': int((time.monotonic() - self._start) * 1000), 'r': role,
+                 'a': {k: v for k, v in action.items() if k != 'room_id'}}
+        if sys:
+            entry['sys'] = sys
+        self._append(entry)
+        self.count += 1
+
+    def flush(self):
+        """Write the buffered records to the file."""
+        if not self.closed:
+            self._file.flush()
+
+    def close(self, reason: str, winner: Optional[str] = None):
+        if not self.closed:
+            self.closed = True
+            try:
+                self._append({'end': reason, 'winner': winner, 'ms': int((time.monotonic() - self._start) * 1000)})
+            finally:
+                self._file.close()
+
+
+def prune_journals(directory: str, keep: int) -> int:
+    """Delete all but the `keep` most recent journals of `directory` (by
+    modification time); returns how many were deleted."""
+    try:
+        entries = [e for e in os.scandir(directory) if e.name.endswith('.jsonl') and e.is_file()]
+    except FileNotFoundError:
+        return 0
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    removed = 0
+    for entry in entries[max(0, keep):]:
+        try:
+            os.remove(entry.path)
+            removed += 1
+        except OSError:
+            pass  # already gone (another worker pruning the same directory)
+    return removed
+
+
+def load_journal(path: str) -> Tuple[dict, List[dict], Optional[dict]]:
+    """(header, action records, end record or None) of a journal file.
+    A truncated last line (crash mid-write) is ignored."""
+    header: Optional[dict] = None
+    actions: List[dict] = []
+    end = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if header is None:
+                header = record
+            elif 'end' in record:
+                end = record
+            else:
+                actions.append(record)
+    if header is None or header.get('v') != JOURNAL_VERSION:
+        raise ValueError(f'not a match journal: {path}')
+    return header, actions, end
+
+
+# ----------------------------------------------------------------------------
+# Replay
+# ----------------------------------------------------------------------------
+
+class Replayer:
+    """Rebuilds the Game of a journal at any action or turn.
+
+    Positions count applied actions (0 = the initial deal). Turns count
+    from 1 and change whenever an action hands the turn over. The returned
+    Game is the replayer's working copy: valid until the next seek, clone()
+    it to keep it.
+    """
+
+    def __init__(self, header: dict, actions: List[dict], keyframe_interval: int = 5):
+        self.header = header
+        self.actions = actions
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.turn_starts: List[int] = [0]  # position where each turn starts
+        self._keyframes: List[Tuple[int, GameSnapshot, Optional[dict]]] = []
+        self._keyframe_positions: List[int] = []
+        self.game = self._initial_game()
+        self._pending: Optional[dict] = None
+        self.position = 0
+        self._index()
+
+    @classmethod
+    def load(cls, path: str, keyframe_interval: int = 5) -> 'Replayer':
+        header, actions, _ = load_journal(path)
+        return cls(header, actions, keyframe_interval)
+
+    def _initial_game(self) -> Game:
+        header = self.header
+        cards = [Card(**dict(zip(CARD_FIELDS, fields))) for fields in header['cards']]
+        decks = []
+        for ids in header['decks']:
+            deck = Deck([])  # Deck() shuffles: set the recorded order afterwards
+            # A fresh Card per slot: the journal stores identical cards once
+            deck.cards = [cards[i].clone() for i in ids]
+            decks.append(deck)
+        champions = [get_champion_by_name(name) for name in header['champions']]
+        return new_match_game(decks[0], decks[1], champions[0], champions[1], header['seed'])
+
+    def _keyframe(self):
+        self._keyframes.append((self.position, self.game.snapshot(), self._pending))
+        self._keyframe_positions.append(self.position)
+
+    def _step(self):
+        record = self.actions[self.position]
+        self._pending = apply_action(self.game, record['r'], record['a'], self._pending)
+        self.position += 1
+
+    def _index(self):
+        """One full pass: turn boundaries and keyframes."""
+        self._keyframe()
+        turn = self.game.turn
+        while self.position < len(self.actions):
+            self._step()
+            if self.game.turn != turn:
+                turn = self.game.turn
+                self.turn_starts.append(self.position)
+                if (len(self.turn_starts) - 1) % self.keyframe_interval == 0:
+                    self._keyframe()
+
+    @property
+    def turns(self) -> int:
+        return len(self.turn_starts)
+
+    def seek(self, position: int) -> Game:
+        """Game after the first `position` actions."""
+        position = max(0, min(position, len(self.actions)))
+        # Replay forward from where we are unless a keyframe is closer
+        if self.position > position or self._keyframe_after(self.position) <= position:
+            k = bisect.bisect_right(self._keyframe_positions, position) - 1
+            start, snapshot, pending = self._keyframes[k]
+            self.game.restore(snapshot)
+            self._pending = pending
+            self.position = start
+        while self.position < position:
+            self._step()
+        return self.game
+
+    def _keyframe_after(self, position: int) -> int:
+        k = bisect.bisect_right(self._keyframe_positions, position)
+        return self._keyframe_positions[k] if k < len(self._keyframe_positions) else len(self.actions) + 1
+
+    def seek_turn(self, turn: int) -> Game:
+        """Game at the start of turn `turn` (1-based)."""
+        turn = max(1, min(turn, self.turns))
+        return self.seek(self.turn_starts[turn - 1])
+
+    def final(self) -> Game:
+        return self.seek(len(self.actions))
@@ -0,0 +1,256 @@
+"""
+Matchmaking queues for the multiplayer server.
+One queue per mode ('quick', 'custom'...). Every waiting player is a Ticket
+kept in insertion (FIFO) order and, if it carries a rating, in a rating
+band (rating // band_width). Enqueue, dequeue and cancel by sid are O(1);
+finding a partner only looks at the oldest ticket of the bands inside the
+acceptable rating window, so it does not depend on how many are waiting.
+
+The acceptable rating difference starts at base_tolerance and widens with
+the time a ticket has been waiting, up to max_tolerance. Two tickets match
+when their difference fits the wider of their two windows, so long waits
+are eventually paired with whoever is closest. Tickets without a rating
+match anyone (plain FIFO, the old behaviour).
+
+Pairing happens on enqueue and on sweep(): call sweep() every few seconds
+so tickets whose windows widened get paired without new arrivals.
+"""
+
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+
+class Ticket:
+    """A player waiting for a match."""
+    __slots__ = ('sid', 'mode', 'rating', 'payload', 'enqueued_at', 'worker')
+
+    def __init__(self, sid: str, mode: str, rating: Optional[float], payload: Any, enqueued_at: float,
+                 worker: Optional[str] = None):
+        self.sid = sid
+        self.mode = mode
+        self.rating = rating
+        self.payload = payload
+        self.enqueued_at = enqueued_at
+        self.worker = worker  # server worker holding the connection (None = this process)
+
+    def __repr__(self):
+        return f'Ticket({self.sid!r}, {self.mode!r}, rating={self.rating})'
+
+
+Pair = Tuple[Ticket, Ticket]
+
+
+class MatchQueue:
+    """Waiting tickets of one mode, by sid and by rating band."""
+
+    def __init__(self, band_width: float, base_tolerance: float, widen_per_second: float, max_tolerance: float):
+        self.band_width = band_width
+        self.base_tolerance = base_tolerance
+        self.widen_per_second = widen_per_second
+        self.max_tolerance = max_tolerance
+        self._tickets: 'OrderedDict[str, Ticket]' = OrderedDict()
+        self._bands: Dict[Optional[int], 'OrderedDict[str, Ticket]'] = {}
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __contains__(self, sid: str) -> bool:
+        return sid in self._tickets
+
+    def __iter__(self) -> Iterator[Ticket]:
+        return iter(self._tickets.values())
+
+    def _band(self, rating: Optional[float]) -> Optional[int]:
+        return None if rating is None else int(rating // self.band_width)
+
+    def add(self, ticket: Ticket):
+        self._tickets[ticket.sid] = ticket
+        self._bands.setdefault(self._band(ticket.rating), OrderedDict())[ticket.sid] = ticket
+
+    def remove(self, sid: str) -> Optional[Ticket]:
+        ticket = self._tickets.pop(sid, None)
+        if ticket is not None:
+            band_key = self._band(ticket.rating)
+            band = self._bands[band_key]
+            del band[sid]
+            if not band:
+                del self._bands[band_key]
+        return ticket
+
+    def oldest(self) -> Optional[Ticket]:
+        return next(iter(self._tickets.values()), None)
+
+    def _oldest_other(self, exclude: str) -> Optional[Ticket]:
+        for sid, ticket in self._tickets.items():
+            if sid != exclude:
+                return ticket
+        return None
+
+    def tolerance(self, ticket: Ticket, now: float) -> float:
+        """Rating difference `ticket` accepts after waiting until `now`."""
+        waited = max(0.0, now - ticket.enqueued_at)
+        return min(self.max_tolerance, self.base_tolerance + self.widen_per_second * waited)
+
+    def _head(self, band_key: Optional[int], exclude: Optional[str]) -> Optional[Ticket]:
+        band = self._bands.get(band_key)
+        if not band:
+            return None
+        for sid, ticket in band.items():
+            if sid != exclude:
+                return ticket
+        return None
+
+    def find_partner(self, ticket: Ticket, now: float) -> Optional[Ticket]:
+        """Best waiting partner for `ticket` (which may itself be queued), or None.
+
+        Rated: the oldest ticket of the nearest band whose rating fits, else
+        the oldest unrated one. Unrated: the oldest ticket of all.
+        """
+        exclude = ticket.sid
+        if ticket.rating is None:
+            return self._oldest_other(exclude)
+        oldest = self.oldest()
+        if oldest is None:
+            return None
+        # The oldest ticket has the widest window: no partner can be further than that
+        own = self.tolerance(ticket, now)
+        window = max(own, self.tolerance(oldest, now))
+        center = self._band(ticket.rating)
+        reach = int(window // self.band_width) + 1
+        for offset in range(reach + 1):
+            for band_key in ((center,) if offset == 0 else (center - offset, center + offset)):
+                other = self._head(band_key, exclude)
+                if other is not None and abs(other.rating - ticket.rating) <= max(own, self.tolerance(other, now)):
+                    return other
+        return self._head(None, exclude)
+
+    def band_heads(self) -> List[Ticket]:
+        """Oldest ticket of every band, oldest first."""
+        heads = [next(iter(band.values())) for band in self._bands.values()]
+        heads.sort(key=lambda t: t.enqueued_at)
+        return heads
+
+
+class Matchmaker:
+    """Per-mode MatchQueues plus queue-depth and time-to-match metrics.
+
+    Storage goes through a few hooks (_new_queue, _track, _take, cancel,
+    _active_queues, depth...) so a shared implementation can keep the
+    tickets elsewhere (see room_backend.SqliteMatchmaker).
+    """
+
+    def __init__(self, band_width: float = 100, base_tolerance: float = 100, widen_per_second: float = 10,
+                 max_tolerance: float = 1000, clock: Callable[[], float] = time.monotonic,
+                 history: int = 1000, worker: Optional[str] = None):
+        self._settings = (band_width, base_tolerance, widen_per_second, max_tolerance)
+        self.clock = clock
+        self.worker = worker
+        self._queues: Dict[str, MatchQueue] = {}
+        self._where: Dict[str, MatchQueue] = {}
+        self._waits: Deque[float] = deque(maxlen=history)
+        self.matches = 0
+        self.cancels = 0
+
+    def queue(self, mode: str) -> MatchQueue:
+        queue = self._queues.get(mode)
+        if queue is None:
+            queue = self._queues[mode] = self._new_queue(mode)
+        return queue
+
+    def _new_queue(self, mode: str) -> MatchQueue:
+        return MatchQueue(*self._settings)
+
+    def _active_queues(self) -> List[MatchQueue]:
+        return list(self._queues.values())
+
+    def _track(self, ticket: Ticket, queue: MatchQueue):
+        self._where[ticket.sid] = queue
+
+    def __contains__(self, sid: str) -> bool:
+        return sid in self._where
+
+    def enqueue(self, sid: str, mode: str, rating: Optional[float] = None, payload: Any = None) -> Optional[Pair]:
+        """Queue `sid`, or pair it right away.
+
+        Returns (waiting_ticket, new_ticket) when a partner was found (both
+        leave the queues), else None. Queuing again replaces the old ticket.
+        """
+        self.cancel(sid, counted=False)
+        now = self.clock()
+        ticket = Ticket(sid, mode, rating, payload, now, self.worker)
+        queue = self.queue(mode)
+        partner = queue.find_partner(ticket, now)
+        if partner is None:
+            queue.add(ticket)
+            self._track(ticket, queue)
+            return None
+        self._take(partner)
+        self._record(partner, now)
+        self._record(ticket, now)
+        self.matches += 1
+        return partner, ticket
+
+    def cancel(self, sid: str, counted: bool = True) -> Optional[Ticket]:
+        """Remove `sid` from whatever queue it is in (disconnect, cancel button)."""
+        queue = self._where.pop(sid, None)
+        if queue is None:
+            return None
+        if counted:
+            self.cancels += 1
+        return queue.remove(sid)
+
+    def _take(self, ticket: Ticket):
+        self._where.pop(ticket.sid, None)
+        self.queue(ticket.mode).remove(ticket.sid)
+
+    def _record(self, ticket: Ticket, now: float):
+        self._waits.append(now - ticket.enqueued_at)
+
+    def sweep(self) -> List[Pair]:
+        """Pair waiting tickets whose windows have widened enough. Returns the
+        (older, newer) pairs made; both tickets left the queues."""
+        now = self.clock()
+        pairs: List[Pair] = []
+        for queue in self._active_queues():
+            for ticket in queue.band_heads():
+                if ticket.sid not in queue:
+                    continue  # already paired in this sweep
+                partner = queue.find_partner(ticket, now)
+                if partner is None:
+                    continue
+                self._take(ticket)
+                self._take(partner)
+                self._record(ticket, now)
+                self._record(partner, now)
+                self.matches += 1
+                pairs.append((ticket, partner) if ticket.enqueued_at <= partner.enqueued_at else (partner, ticket))
+        return pairs
+
+    def depth(self, mode: Optional[str] = None) -> int:
+        if mode is not None:
+            return len(self._queues.get(mode, ()))
+        return len(self._where)
+
+    def depth_by_mode(self) -> Dict[str, int]:
+        return {mode: len(queue) for mode, queue in self._queues.items()}
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth per mode, longest current wait and time-to-match percentiles (s)."""
+        now = self.clock()
+        waits = sorted(self._waits)
+
+        def pct(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3)
+
+        oldest = [q.oldest() for q in self._active_queues()]
+        return {
+            'depth': self.depth_by_mode(),
+            'waiting': self.depth(),
+            'longest_wait': round(max((now - t.enqueued_at for t in oldest if t is not None), default=0.0), 3),
+            'matches': self.matches,
+            'cancels': self.cancels,
+            'time_to_match': {'count': len(waits), 'p50': pct(0.5), 'p95': pct(0.95), 'max': pct(1.0)},
+        }
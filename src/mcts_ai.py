@@ -0,0 +1,298 @@
+"""
+Monte Carlo Tree Search AI (difficulty tier 11).
+Searches the AI's own turn over the real Game rules: troop plays, spells and
+attack targets. The opponent's hand and both deck orders are hidden, so each
+iteration re-samples them (determinization) before walking the tree. Leaves
+are scored with fast headless rollouts driven by DataDrivenAI on both sides.
+
+MCTSAI answers the same calls as DataDrivenAI, so Game.ai_turn and
+Game.ai_turn_steps drive it unchanged. Every call is one decision with its
+own time budget (AIConfig.search_time_budget).
+"""
+
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .models import Card, Player
+from .ai_engine import AIConfig, DataDrivenAI
+from .headless import choose_player_blocker, play_player_turn
+
+# Tree actions besides plays: move on to the next phase / leave an attacker home
+NEXT_PHASE = ('next',)
+HOLD = 'hold'
+
+PHASES = ('troops', 'spells', 'attacks')
+
+
+def _on_board(card: Card, player: Player) -> bool:
+    """Identity check (Card equality compares stats, not instances)."""
+    return any(c is card for c in player.active_zone)
+
+
+class _Node:
+    """Search tree node. Children are keyed by action tuples."""
+    __slots__ = ('children', 'visits', 'value', 'available')
+
+    def __init__(self):
+        self.children: Dict[tuple, '_Node'] = {}
+        self.visits = 0
+        self.value = 0.0
+        self.available = 0  # ISMCTS: how often this action was legal when its parent was visited
+
+
+class _TurnState:
+    """A determinized game plus where the AI is inside its turn."""
+    __slots__ = ('game', 'phase', 'min_troop_idx', 'attackers', 'opponent_brain')
+
+    def __init__(self, game, phase: str, attackers: List[Card], opponent_brain: DataDrivenAI):
+        self.game = game
+        self.phase = phase
+        self.min_troop_idx = 0  # troops are played in hand order (no duplicate orderings)
+        self.attackers = attackers  # remaining attack-phase cards, in ai_turn order
+        self.opponent_brain = opponent_brain
+
+
+class MCTSAI(DataDrivenAI):
+    """Search-based AI with the DataDrivenAI interface."""
+
+    def __init__(self, player: Player, config: AIConfig, game=None,
+                 time_budget: Optional[float] = None, rollout_rounds: int = 8,
+                 exploration: float = 0.7, max_iterations: Optional[int] = None):
+        super().__init__(player, config)
+        self.game = game
+        self.time_budget = time_budget if time_budget is not None else config.search_time_budget
+        self.rollout_rounds = rollout_rounds
+        self.exploration = exploration
+        self.max_iterations = max_iterations
+        # Opponent model used inside simulations (blocks and rollout turns)
+        self.opponent_config = AIConfig(10)
+        # Search statistics (benchmarks / debugging)
+        self.total_rollouts = 0
+        self.total_search_time = 0.0
+        self.last_iterations = 0
+
+    # ------------------------------------------------------------------
+    # DataDrivenAI interface
+    # ------------------------------------------------------------------
+
+    def choose_cards_to_play(self, available_mana: int) -> List[Card]:
+        """Troops to play this turn: the most visited troop line of the search."""
+        if self.game is None:
+            return super().choose_cards_to_play(available_mana)
+        if not any(c.card_type != 'spell' and c.cost <= available_mana for c in self.player.hand):
+            return []
+        root = self._search('troops')
+        hand = list(self.player.hand)
+        selected = []
+        node = root
+        while node.children:
+            action, node = max(node.children.items(), key=lambda item: item[1].visits)
+            if action[0] != 'troop':
+                break
+            selected.append(hand.pop(action[1]))
+        return selected
+
+    def choose_spell_to_cast(self, available_mana: int, my_zone: List[Card], enemy_zone: List[Card],
+                             my_life: int, enemy_life: int) -> Optional[Tuple[Card, int, object]]:
+        """Next spell of the best line, or None to stop casting."""
+        if self.game is None:
+            return super().choose_spell_to_cast(available_mana, my_zone, enemy_zone, my_life, enemy_life)
+        if not any(c.card_type == 'spell' and c.cost <= available_mana for c in self.player.hand):
+            return None
+        action = self._best_action(self._search('spells'))
+        if action is None or action[0] != 'spell':
+            return None
+        _, idx, target = action
+        if idx >= len(self.player.hand):
+            return None
+        spell = self.player.hand[idx]
+        if spell.card_type != 'spell' or spell.cost > available_mana:
+            return None
+        return (spell, idx, target)
+
+    def choose_attack_target(self, attacker: Card, enemy_cards: List[Card],
+                             enemy_life: int) -> Tuple[bool, Optional[int]]:
+        """Target for one attacker: (True, None) face, (False, idx) troop, (False, None) hold."""
+        if self.game is None or not _on_board(attacker, self.player):
+            return super().choose_attack_target(attacker, enemy_cards, enemy_life)
+        zone = self.player.active_zone
+        pos = next(i for i, c in enumerate(zone) if c is attacker)
+        attackers = [i for i in range(pos, len(zone)) if zone[i].ready]
+        action = self._best_action(self._search('attacks', attackers))
+        if action is None or action[1] == 'player':
+            return (True, None)
+        if action[1] == HOLD:
+            return (False, None)
+        return (False, action[1][1])
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _best_action(self, root: _Node) -> Optional[tuple]:
+        if not root.children:
+            return None
+        return max(root.children.items(), key=lambda item: item[1].visits)[0]
+
+    def _search(self, phase: str, attacker_positions: Optional[List[int]] = None) -> _Node:
+        """Run MCTS from the live game state until the time budget runs out."""
+        root = _Node()
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        iterations = 0
+        while True:
+            state = self._determinize(phase, attacker_positions)
+            if iterations == 0 and len(self._turn_actions(state)) <= 1:
+                # Forced move: nothing to search
+                self._iterate(root, state)
+                iterations = 1
+                break
+            self._iterate(root, state)
+            iterations += 1
+            if time.perf_counter() >= deadline:
+                break
+            if self.max_iterations is not None and iterations >= self.max_iterations:
+                break
+        self.last_iterations = iterations
+        self.total_rollouts += iterations
+        self.total_search_time += time.perf_counter() - start
+        return root
+
+    def _determinize(self, phase: str, attacker_positions: Optional[List[int]]) -> _TurnState:
+        """Clone the live game and re-sample everything the AI cannot see."""
+        game = self.game.clone()
+        me, opponent = game.ai, game.player
+        # Opponent hand comes from the unseen pool (their hand + their deck)
+        pool = opponent.hand + opponent.deck.cards
+        random.shuffle(pool)
+        hand_size = len(opponent.hand)
+        opponent.hand = [c.clone() for c in pool[:hand_size]]
+        opponent.deck.cards = pool[hand_size:]
+        random.shuffle(me.deck.cards)
+        attackers = [me.active_zone[i] for i in (attacker_positions or [])]
+        # The opponent blocks (and later plays) like a level 10 DataDrivenAI
+        opponent_brain = DataDrivenAI(opponent, self.opponent_config)
+        game.ask_blocker = lambda attacker: choose_player_blocker(game, opponent_brain, attacker)
+        return _TurnState(game, phase, attackers, opponent_brain)
+
+    def _turn_actions(self, state: _TurnState) -> List[tuple]:
+        """Actions available to the AI at this point of its turn (ai_turn order)."""
+        game = state.game
+        me = game.ai
+        if game.winner is not None:
+            return []
+        if state.phase == 'troops':
+            actions = [('troop', i) for i in range(state.min_troop_idx, len(me.hand))
+                       if me.hand[i].card_type != 'spell' and me.hand[i].cost <= me.mana]
+            return actions + [NEXT_PHASE]
+        if state.phase == 'spells':
+            actions = []
+            for i, card in enumerate(me.hand):
+                if card.card_type == 'spell' and card.cost <= me.mana:
+                    actions.extend(('spell', i, t) for t in game.spell_targets(card, 'ai'))
+            return actions + [NEXT_PHASE]
+        # Attack phase: one decision for the next ready attacker
+        while state.attackers and not (_on_board(state.attackers[0], me) and state.attackers[0].ready):
+            state.attackers.pop(0)
+        if not state.attackers:
+            return []
+        targets = [('attack', 'player'), ('attack', HOLD)]
+        targets.extend(('attack', ('card', i)) for i in range(len(game.player.active_zone)))
+        return targets
+
+    def _apply(self, state: _TurnState, action: tuple):
+        """Play one tree action on the determinized game."""
+        game = state.game
+        if action == NEXT_PHASE:
+            state.phase = PHASES[PHASES.index(state.phase) + 1]
+            if state.phase == 'attacks':
+                state.attackers = [c for c in game.ai.active_zone if c.ready]
+        elif action[0] == 'troop':
+            game._ai_play_troop(game.ai.hand[action[1]])
+            state.min_troop_idx = action[1]
+        elif action[0] == 'spell':
+            game._ai_cast_spell(game.ai.hand[action[1]], action[2])
+        else:
+            card = state.attackers.pop(0)
+            if action[1] != HOLD:
+                game._ai_resolve_attack(card, action[1])
+                game.check_end()
+
+    def _iterate(self, root: _Node, state: _TurnState):
+        """One MCTS iteration: select/expand in the tree, roll out, back up."""
+        node = root
+        path = [root]
+        while True:
+            actions = self._turn_actions(state)
+            if not actions:
+                break
+            for action in actions:
+                child = node.children.get(action)
+                if child is not None:
+                    child.available += 1
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                action = random.choice(untried)
+                child = node.children[action] = _Node()
+                child.available = 1
+                self._apply(state, action)
+                path.append(child)
+                break
+            log_n = math.log(max(1, node.visits))
+            action = max(actions, key=lambda a: self._ucb(node.children[a], log_n))
+            node = node.children[action]
+            self._apply(state, action)
+            path.append(node)
+
+        reward = self._rollout(state)
+        for n in path:
+            n.visits += 1
+            n.value += reward
+
+    def _ucb(self, node: _Node, log_parent: float) -> float:
+        if node.visits == 0:
+            return float('inf')
+        exploit = node.value / node.visits
+        return exploit + self.exploration * math.sqrt(max(log_parent, math.log(node.available)) / node.visits)
+
+    def _rollout(self, state: _TurnState) -> float:
+        """Finish the AI turn, play on with greedy brains, score for the AI (0..1)."""
+        game = state.game
+        # Any decisions the tree did not reach: finish the turn greedily
+        while game.winner is None and state.phase != 'attacks':
+            self._apply(state, NEXT_PHASE)
+        while game.winner is None and state.attackers:
+            card = state.attackers.pop(0)
+            if _on_board(card, game.ai) and card.ready:
+                game._ai_resolve_attack(card, game._ai_attack_target(card))
+        game.check_end()
+        if game.winner is None:
+            # End of ai_turn
+            game.turn = 'player'
+            game.start_turn('player')
+            for c in game.player.active_zone:
+                c.blocked_this_combat = False
+
+        opponent_brain = state.opponent_brain
+        rounds = 0
+        while game.winner is None and rounds < self.rollout_rounds:
+            rounds += 1
+            play_player_turn(game, opponent_brain)
+            if game.winner is not None:
+                break
+            game.end_turn()
+        return self._score(game)
+
+    def _score(self, game) -> float:
+        """Win/loss, or a life-and-board heuristic when the rollout is cut short."""
+        if game.winner == 'ai':
+            return 1.0
+        if game.winner == 'player':
+            return 0.0
+        me, opp = game.ai, game.player
+        board = sum(c.damage + c.current_health for c in me.active_zone) - \
+            sum(c.damage + c.current_health for c in opp.active_zone)
+        margin = (me.life - opp.life) + 0.5 * board
+        return 1.0 / (1.0 + math.exp(-margin / 8.0))
@@ -4,34 +4,169 @@ Contains Card, Deck, and Player classes.
 """
 
 import random
-from dataclasses import dataclass
-from typing import List, Optional
+import sys
+from typing import Dict, List, Optional
 try:
     import tkinter as tk  # UI available in client runtime
 except Exception:
     tk = None  # Headless/server runtime without Tk
 
+# Static card texts, shared through interned CardTemplates
+TEMPLATE_FIELDS = ('name', 'image_path', 'ability_desc', 'ability_type', 'spell_target',
+                   'spell_effect', 'description')
+# Per-instance slots: play state, plus cost/card_type/ability which the AI reads
+# in every loop (interned strings, so still no per-card copies)
+STATE_FIELDS = ('cost', 'card_type', 'ability', 'damage', 'health', 'current_health', 'ready',
+                'in_play', 'blocked_this_combat', 'attacked_count', 'frozen_turns')
+
+
+class CardTemplate:
+    """Static card data shared by every copy of a card (flyweight).
+
+    Templates are immutable and interned: get one with CardTemplate.get(),
+    which returns the same object for the same data.
+    """
+    __slots__ = TEMPLATE_FIELDS
+
+    _interned: Dict[tuple, 'CardTemplate'] = {}
+
+    def __init__(self, *values):
+        for name, value in zip(TEMPLATE_FIELDS, values):
+            object.__setattr__(self, name, sys.intern(value) if isinstance(value, str) else value)
+
+    @classmethod
+    def get(cls, name: str, image_path: Optional[str] = None, ability_desc: Optional[str] = None,
+            ability_type: Optional[str] = None, spell_target: Optional[str] = None,
+            spell_effect: Optional[str] = None, description: Optional[str] = None) -> 'CardTemplate':
+        key = (name, image_path, ability_desc, ability_type, spell_target, spell_effect, description)
+        template = cls._interned.get(key)
+        if template is None:
+            template = cls._interned[key] = cls(*key)
+        return template
+
+    def replace(self, **changes) -> 'CardTemplate':
+        """Interned template with some fields changed."""
+        values = {name: getattr(self, name) for name in TEMPLATE_FIELDS}
+        values.update(changes)
+        return CardTemplate.get(**values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CardTemplate is immutable; use replace()')
+
+    def __reduce__(self):
+        # Copies and unpickled templates stay interned
+        return (CardTemplate.get, tuple(getattr(self, name) for name in TEMPLATE_FIELDS))
+
+    def __repr__(self):
+        return f'CardTemplate({self.name!r})'
+
+
+def _template_field(name: str) -> property:
+    def get(self):
+        return getattr(self.template, name)
+
+    def set(self, value):
+        self.template = self.template.replace(**{name: value})
+    return property(get, set)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
 
-@dataclass
 class Card:
-    """Represents a card in the game."""
-    name: str
-    cost: int
-    damage: int
-    health: int = 0
-    current_health: int = 0
-    ready: bool = False
-    in_play: bool = False
-    card_type: str = 'troop'  # 'troop', 'spell', 'equipment', 'enchantment', etc.
-    image_path: Optional[str] = None
-    blocked_this_combat: bool = False
-    ability: Optional[str] = None
-    ability_desc: Optional[str] = None
-    ability_type: Optional[str] = None  # 'triggered', 'activated', 'instant'
-    spell_target: Optional[str] = None  # For spells: 'enemy_troop', 'own_troop', 'player', 'all_enemy_troops', etc.
-    spell_effect: Optional[str] = None  # For spells: 'damage', 'heal', 'buff', 'destroy', etc.
-    description: Optional[str] = None  # Card description text (especially for spells)
-    attacked_count: int = 0  # for Furia: track attacks this turn
+    """Represents a card in the game.
+
+    Static texts live in a shared CardTemplate; the instance only holds
+    slotted state. Every field is still read and written as a plain
+    attribute, and vars(card) gives a dict of all fields.
+    """
+    __slots__ = ('template',) + STATE_FIELDS + ('_zuid', '_zsink', '_zrefs')
+
+    def __init__(self, name: str, cost: int, damage: int, health: int = 0, current_health: int = 0,
+                 ready: bool = False, in_play: bool = False,
+                 card_type: str = 'troop',  # 'troop', 'spell', 'equipment', 'enchantment', etc.
+                 image_path: Optional[str] = None, blocked_this_combat: bool = False,
+                 ability: Optional[str] = None, ability_desc: Optional[str] = None,
+                 ability_type: Optional[str] = None,  # 'triggered', 'activated', 'instant'
+                 spell_target: Optional[str] = None,  # For spells: 'enemy_troop', 'own_troop', 'player', 'all_enemy_troops', etc.
+                 spell_effect: Optional[str] = None,  # For spells: 'damage', 'heal', 'buff', 'destroy', etc.
+                 description: Optional[str] = None,  # Card description text (especially for spells)
+                 attacked_count: int = 0):  # for Furia: track attacks this turn
+        self.template = CardTemplate.get(name, image_path, ability_desc, ability_type,
+                                         spell_target, spell_effect, description)
+        self.cost = cost
+        self.card_type = _intern(card_type)
+        self.ability = _intern(ability)
+        self.damage = damage
+        self.health = health
+        self.current_health = current_health
+        self.ready = ready
+        self.in_play = in_play
+        self.blocked_this_combat = blocked_this_combat
+        self.attacked_count = attacked_count
+        self.frozen_turns = 0
+        self._zuid = None  # Zobrist bookkeeping (see zobrist.py)
+        self._zsink = None
+        self._zrefs = 0
+
+    name = _template_field('name')
+    image_path = _template_field('image_path')
+    ability_desc = _template_field('ability_desc')
+    ability_type = _template_field('ability_type')
+    spell_target = _template_field('spell_target')
+    spell_effect = _template_field('spell_effect')
+    description = _template_field('description')
+
+    def get_state(self) -> tuple:
+        """Everything that can change during play, for set_state()."""
+        return (self.template, self.cost, self.card_type, self.ability, self.damage, self.health,
+                self.current_health, self.ready, self.in_play, self.blocked_this_combat,
+                self.attacked_count, self.frozen_turns)
+
+    def set_state(self, state: tuple):
+        (self.template, self.cost, self.card_type, self.ability, self.damage, self.health,
+         self.current_health, self.ready, self.in_play, self.blocked_this_combat,
+         self.attacked_count, self.frozen_turns) = state
+
+    def clone(self) -> 'Card':
+        """Fast copy of the instance state; the template is shared."""
+        new = object.__new__(self.__class__)
+        new._zuid = self._zuid
+        new._zsink = None
+        new._zrefs = 0
+        new.set_state(self.get_state())
+        return new
+
+    @property
+    def __dict__(self) -> dict:
+        """Compatibility view: a fresh {field: value} dict (writes do not stick)."""
+        template = self.template
+        view = {name: getattr(template, name) for name in TEMPLATE_FIELDS}
+        for name in STATE_FIELDS:
+            view[name] = getattr(self, name)
+        return view
+
+    def __eq__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        # Same fields as the old dataclass comparison (frozen_turns was never one)
+        return self.get_state()[:-1] == other.get_state()[:-1]
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'Card(name={self.name!r}, cost={self.cost}, damage={self.damage}, ' \
+               f'health={self.health}, current_health={self.current_health}, ready={self.ready})'
+
+    def __getstate__(self):
+        return (self.get_state(), self._zuid)
+
+    def __setstate__(self, state):
+        self._zuid = state[1]
+        self._zsink = None
+        self._zrefs = 0
+        self.set_state(state[0])
 
 
 class CardWidget(object):
@@ -47,6 +182,8 @@ class CardWidget(object):
 
 class Deck:
     """Represents a deck of cards."""
+    # Set once the card list is shared with a clone: cards are copied on draw
+    _shared = False
     
     def __init__(self, cards: List[Card]):
         self.cards = cards[:]
@@ -55,9 +192,17 @@ class Deck:
     def draw(self) -> Optional[Card]:
         """Draw a card from the deck."""
         if self.cards:
-            return self.cards.pop()
+            card = self.cards.pop()
+            return card.clone() if self._shared else card
         return None
 
+    def clone(self) -> 'Deck':
+        """Copy the deck order, sharing the undrawn Card objects (copy-on-draw)."""
+        new = object.__new__(self.__class__)
+        new.cards = self.cards[:]
+        new._shared = self._shared = True
+        return new
+
     def count(self) -> int:
         """Get the number of cards remaining in the deck."""
         return len(self.cards)
@@ -87,3 +232,20 @@ class Player:
         card = self.deck.draw()
         if card:
             self.hand.append(card)
+
+    def clone(self) -> 'Player':
+        """Independent copy of the player for look-ahead search.
+
+        Cards in hand and on the board are copied (they mutate in play); the
+        graveyard only holds dead cards, so those Card objects are shared.
+        Champion and ai_config are immutable and always shared.
+        """
+        new = object.__new__(self.__class__)
+        state = self.__dict__.copy()
+        state['deck'] = self.deck.clone()
+        state['hand'] = [c.clone() for c in self.hand]
+        state['rest_zone'] = [c.clone() for c in self.rest_zone]
+        state['active_zone'] = [c.clone() for c in self.active_zone]
+        state['graveyard'] = self.graveyard[:]
+        new.__dict__ = state
+        return new
@@ -3,9 +3,13 @@ Client Game Synchronization - Aplica estado del servidor al cliente
 En arquitectura autoritativa, el cliente solo VISUALIZA el estado del servidor
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from ..models import Card
 from ..game_logic import Game
+from ..state_delta import DeltaDecoder
+
+# Campos de carta que cambian durante la partida (el resto viene fijo de la plantilla)
+DYNAMIC_CARD_FIELDS = ('cost', 'damage', 'health', 'current_health', 'ready', 'frozen_turns')
 
 
 class ClientGameSync:
@@ -13,11 +17,17 @@ class ClientGameSync:
     
     def __init__(self, game: Game):
         self.game = game
+        # Acepta snapshots, estados ya decodificados o sobres delta {'v', 'base', 'patch'}
+        self.decoder = DeltaDecoder()
+        self._applied: Dict[str, Any] = {}
+        # Cartas locales por uid del servidor: se actualizan en sitio, no se recrean
+        self._cards: Dict[Any, Card] = {}
     
-    def apply_server_state(self, state: Dict[str, Any]):
+    def apply_server_state(self, state: Dict[str, Any]) -> bool:
         """
-        Aplica el estado completo del servidor al juego local.
+        Aplica el estado del servidor (completo o parche versionado) al juego local.
         El servidor es la fuente de verdad - el cliente solo visualiza.
+        Solo se tocan los lados y cartas que cambiaron.
         
         Args:
             state: Estado del juego desde el servidor con estructura:
@@ -27,18 +37,31 @@ class ClientGameSync:
                     'turn': 'player' | 'ai',
                     'is_my_turn': bool
                 }
+                o un sobre delta de src/state_delta.py con ese estado.
+        
+        Returns:
+            False si el parche no se pudo aplicar (falta su versión base:
+            hay que pedir un snapshot completo al servidor).
         """
         try:
             print(f"🔄 [CLIENT_SYNC] Aplicando estado del servidor...")
+            state = self.decoder.apply(state)
+            if state is None:
+                print(f"   ⚠️ Parche sin su versión base, se necesita snapshot completo")
+                return False
             
             my_state = state.get('my_state', {})
             opp_state = state.get('opponent_state', {})
             
-            # Actualizar mi lado
-            self._update_player_state(self.game.player, my_state, is_mine=True)
-            
-            # Actualizar lado del oponente
-            self._update_player_state(self.game.ai, opp_state, is_mine=False)
+            # Los parches comparten los subestados sin cambios: se saltan
+            if self._changed('my_state', my_state):
+                self._update_player_state(self.game.player, my_state, is_mine=True)
+            if self._changed('opponent_state', opp_state):
+                self._update_player_state(self.game.ai, opp_state, is_mine=False)
+            self._applied = state
+            # Olvidar las cartas que ya no están en mano ni en juego
+            visible = {id(card) for p in (self.game.player, self.game.ai) for card in p.hand + p.active_zone}
+            self._cards = {card_uid: card for card_uid, card in self._cards.items() if id(card) in visible}
             
             # Actualizar turno
             self.game.turn = state.get('turn', 'player')
@@ -49,11 +72,34 @@ class ClientGameSync:
             print(f"   ✅ Estado aplicado - Turn: {self.game.turn}")
             print(f"   Player: {self.game.player.life}HP, {len(self.game.player.hand)} cartas")
             print(f"   AI: {self.game.ai.life}HP, {len(self.game.ai.hand)} cartas")
+            return True
             
         except Exception as e:
             print(f"   ❌ Error aplicando estado: {e}")
             import traceback
             traceback.print_exc()
+            return False
+    
+    def _changed(self, key: str, side: Dict[str, Any]) -> bool:
+        previous = self._applied.get(key)
+        return previous is not side and previous != side
+    
+    def _sync_zone(self, zone: List[Card], cards_data: List[Dict[str, Any]]):
+        """Deja `zone` igual que `cards_data`, reutilizando las cartas por uid."""
+        zone[:] = [self._card_for(card_data) for card_data in cards_data]
+    
+    def _card_for(self, card_data: Dict[str, Any]) -> Card:
+        card_uid = card_data.get('uid')
+        card: Optional[Card] = self._cards.get(card_uid) if card_uid is not None else None
+        if card is None or card.name != card_data.get('name', 'Unknown'):
+            card = self._create_card_from_data(card_data)
+            if card_uid is not None:
+                self._cards[card_uid] = card
+            return card
+        for field in DYNAMIC_CARD_FIELDS:
+            if field in card_data and getattr(card, field) != card_data[field]:
+                setattr(card, field, card_data[field])
+        return card
     
     def _update_player_state(self, player, state: Dict[str, Any], is_mine: bool):
         """Actualiza el estado de un jugador"""
@@ -66,11 +112,7 @@ class ClientGameSync:
             # Es mi lado - actualizo mi mano completa
             hand_data = state.get('hand', [])
             print(f"      📋 Actualizando MI mano: {len(hand_data)} cartas")
-            player.hand.clear()
-            for card_data in hand_data:
-                card = self._create_card_from_data(card_data)
-                player.hand.append(card)
-                print(f"         ✅ Carta añadida: {card.name} (cost={card.cost})")
+            self._sync_zone(player.hand, hand_data)
         else:
             # Es el oponente - solo actualizo cantidad de cartas (ocultas)
             hand_count = state.get('hand_count', 0)
@@ -88,10 +130,7 @@ class ClientGameSync:
         
         # Zona activa (visible para ambos)
         active_data = state.get('active_zone', [])
-        player.active_zone.clear()
-        for card_data in active_data:
-            card = self._create_card_from_data(card_data)
-            player.active_zone.append(card)
+        self._sync_zone(player.active_zone, active_data)
     
     def _create_card_from_data(self, card_data: Dict[str, Any]) -> Card:
         """Crea una instancia de Card desde los datos del servidor"""
@@ -113,5 +152,6 @@ class ClientGameSync:
         
         card.current_health = card_data.get('current_health', card.health)
         card.ready = card_data.get('ready', False)
+        card.frozen_turns = card_data.get('frozen_turns', 0)
         
         return card
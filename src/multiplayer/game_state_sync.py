@@ -15,6 +15,7 @@ from .message_protocol import (
     serialize_player_state
 )
 from .network_manager import NetworkManager
+from ..state_delta import DeltaDecoder
 
 
 class GameStateSync:
@@ -41,6 +42,9 @@ class GameStateSync:
         self.on_opponent_action: Optional[Callable[[str, Dict], None]] = None
         self.on_game_sync: Optional[Callable[[], None]] = None
         
+        # Snapshots may arrive as versioned patches (see src/state_delta.py)
+        self.state_decoder = DeltaDecoder()
+        
         # Register network event handlers
         self._setup_network_handlers()
     
@@ -350,7 +354,15 @@ class GameStateSync:
     # ========================================================================
 
     def _apply_full_game_state(self, data: Dict[str, Any]):
-        """Apply a full game state snapshot (server authoritative)."""
+        """Apply a game state snapshot or versioned patch (server authoritative)."""
+        resync_pending = self.state_decoder.awaiting_full
+        data = self.state_decoder.apply(data)
+        if data is None:
+            # Patch against a version we no longer have: ask for a full snapshot once
+            print("   ⚠️ State patch without its base version")
+            if not resync_pending:
+                self.network.request_initial_state()
+            return
         state = data.get('state', {})
         if not state:
             print("   ⚠️ No 'state' key in game_state_update payload")
@@ -6,6 +6,8 @@ Defines all message types that can be sent between clients through the server.
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 
+from ..zobrist import card_uid
+
 
 # ============================================================================
 # MESSAGE TYPES
@@ -201,9 +203,16 @@ def create_player_disconnected_message(player: str) -> Dict[str, Any]:
 # SERIALIZATION HELPERS
 # ============================================================================
 
-def serialize_card(card) -> Dict[str, Any]:
-    """Convert a Card object to a dictionary for network transmission."""
+def serialize_card(card, catalog=None) -> Dict[str, Any]:
+    """Convert a Card object to a dictionary for network transmission.
+    
+    With a CardCatalog (src/card_catalog.py) the card is sent compact: template
+    id plus dynamic fields; the receiver expands it from its cached catalog.
+    """
+    if catalog is not None:
+        return catalog.encode_card(card)
     return {
+        "uid": card_uid(card),  # stable identity: clients patch the card's widget in place
         "name": card.name,
         "cost": card.cost,
         "damage": card.damage,
@@ -217,7 +226,8 @@ def serialize_card(card) -> Dict[str, Any]:
         "in_play": card.in_play,
         "attacked_count": getattr(card, 'attacked_count', 0),
         "spell_effect": getattr(card, 'spell_effect', None),
-        "spell_target": getattr(card, 'spell_target', None)
+        "spell_target": getattr(card, 'spell_target', None),
+        "frozen_turns": getattr(card, 'frozen_turns', 0)
     }
 
 
@@ -234,13 +244,14 @@ def serialize_champion(champion) -> Optional[Dict[str, Any]]:
     }
 
 
-def serialize_player_state(player, reveal_hand: bool = False) -> Dict[str, Any]:
+def serialize_player_state(player, reveal_hand: bool = False, catalog=None) -> Dict[str, Any]:
     """
     Convert a Player object to a dictionary.
     
     Args:
         player: Player object
         reveal_hand: If True, include actual hand cards. If False, only send hand size.
+        catalog: Optional CardCatalog; cards are then sent as template ids (see serialize_card).
     """
     return {
         "name": player.name,
@@ -248,8 +259,8 @@ def serialize_player_state(player, reveal_hand: bool = False) -> Dict[str, Any]:
         "mana": player.mana,
         "max_mana": player.max_mana,
         "hand_size": len(player.hand),
-        "hand": [serialize_card(c) for c in player.hand] if reveal_hand else None,
-        "active_zone": [serialize_card(c) for c in player.active_zone],
+        "hand": [serialize_card(c, catalog) for c in player.hand] if reveal_hand else None,
+        "active_zone": [serialize_card(c, catalog) for c in player.active_zone],
         "deck_size": len(player.deck.cards),
         "graveyard_size": len(player.graveyard),
         "champion": serialize_champion(player.champion)
@@ -5,9 +5,11 @@ Displays game zones, actions, and chat for two players
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext
-from typing import Optional, Callable, List, Dict, Any
+from typing import Optional, Callable, List, Dict, Any, NamedTuple
 from dataclasses import dataclass
 
+from ..ui_reconciler import KeyedZone
+
 
 @dataclass
 class CardDisplay:
@@ -21,6 +23,16 @@ class CardDisplay:
     can_attack: bool = False
     is_tapped: bool = False
     has_activated_ability: bool = False  # Can activate ability (like Invocar Aliado)
+    uid: Optional[int] = None  # Server card identity (stable while the card exists)
+
+
+class CardWidgetState(NamedTuple):
+    """Everything a card widget shows in its zone; compared between updates."""
+    card: CardDisplay
+    index: int
+    clickable: bool = False
+    selected: int = 0  # times selected as attacker
+    ability_button: bool = False
 
 
 class MultiplayerGameUI:
@@ -103,27 +115,30 @@ class MultiplayerGameUI:
         
         # Cache for preventing unnecessary UI updates
         self._last_update_hash = {
-            'my_hand': '',
-            'my_active': '',
-            'opponent_active': '',
             'my_stats': '',
             'opponent_stats': ''
         }
 
-        # Keep last created widgets for animations
+        # Card widgets on screen, index-aligned with the zone lists (for animations)
         self.my_active_widgets: List[tk.Frame] = []
         self.opponent_active_widgets: List[tk.Frame] = []
         self.my_hand_widgets: List[tk.Frame] = []
-
-        # Track previous card ids per zone to detect spawns/changes
-        self._prev_ids: Dict[str, List[str]] = {
-            'my_active': [],
-            'opponent_active': [],
-            'my_hand': []
+        # Patchable parts of each card widget, and each zone's "empty" label
+        self._card_parts: Dict[tk.Frame, Dict[str, Any]] = {}
+        self._placeholders: Dict[str, Optional[tk.Label]] = {
+            'my_active': None,
+            'opponent_active': None,
+            'my_hand': None
         }
         
         # Build UI first (all widgets initialized here)
         self._build_ui()
+        # Keyed card zones: widgets live as long as their card stays in the zone
+        self._card_zones: Dict[str, KeyedZone] = {
+            'my_active': self._make_card_zone(self.my_active_frame, on_click=self._toggle_attacker, animate_spawns=True),
+            'opponent_active': self._make_card_zone(self.opponent_active_frame, animate_spawns=True),
+            'my_hand': self._make_card_zone(self.my_hand_frame, on_click=self._on_card_clicked)
+        }
         
         # UI elements (initialized in _build_ui, so not Optional)
         # These are typed here for clarity but actually set in _build_ui
@@ -329,8 +344,8 @@ class MultiplayerGameUI:
     # Animation Helpers (non-blocking, using after)
     # ============================================
     def _card_id(self, card: CardDisplay) -> str:
-        """Create a lightweight id for card diffing."""
-        return f"{card.name}|{card.cost}|{card.attack}|{card.defense}|{card.card_type}"
+        """Lightweight id for cards sent without a uid (survives stat changes)."""
+        return f"{card.name}|{card.card_type}"
 
     def _animate_pulse(self, widget, highlight_color: str = '#f1c40f', cycles: int = 3, interval: int = 90):
         """Pulse the background color a few times and restore it."""
@@ -714,132 +729,135 @@ class MultiplayerGameUI:
                 bg='#8e44ad',
                 fg='white'
             ).pack(expand=True)
-        else:
-            # Full card display - case insensitive type check
-            bg_color = '#3498db' if card.card_type.lower() == 'troop' else '#9b59b6'
-            if card.is_tapped:
-                bg_color = '#7f8c8d'  # Gray when tapped
-            
-            card_frame = tk.Frame(parent, bg=bg_color, width=120, height=200, relief=tk.RAISED, borderwidth=2)
+            if clickable and on_click:
+                card_frame.bind('<Button-1>', lambda e: on_click(), add='+')
+            return card_frame
+
+        # Full card display - case insensitive type check
+        bg_color = '#3498db' if card.card_type.lower() == 'troop' else '#9b59b6'
+        card_frame = tk.Frame(parent, bg=bg_color, width=120, height=200, relief=tk.RAISED, borderwidth=2)
+        card_frame.pack_propagate(False)
+        # Parts that later patches touch (see _patch_card_widget)
+        parts: Dict[str, Any] = {
+            'card': card, 'bg': bg_color, 'tinted': [card_frame], 'on_click': None,
+            'selected': 0, 'stats': None, 'attack': None, 'ability_btn': None, 'indicator': None,
+        }
+        self._card_parts[card_frame] = parts
+        card_frame.bind('<Destroy>', lambda e, w=card_frame: self._card_parts.pop(w, None) if e.widget is w else None, add='+')
+
+        # TAPPED indicator and explicit status badge (summoning sick / tapped), shown while tapped
+        parts['sleep'] = tk.Label(card_frame, text="💤", font=('Arial', 16), bg=bg_color, fg='white')
+        parts['not_ready'] = tk.Label(card_frame, text="⏳ Not Ready", font=('Arial', 7, 'bold'), bg=bg_color, fg='#ecf0f1')
+
+        # Mana cost - frame en esquina superior derecha
+        mana_frame = tk.Frame(card_frame, bg=bg_color)
+        mana_frame.pack(anchor='ne', padx=2, pady=2)
+        parts['mana_frame'] = mana_frame
+        
+        mana_label = tk.Label(
+            mana_frame,
+            text=f"💎{card.cost}",
+            font=('Arial', 10, 'bold'),
+            bg=bg_color,
+            fg='white'
+        )
+        mana_label.pack()
+        parts['mana'] = mana_label
+        
+        # Name
+        name_label = tk.Label(
+            card_frame,
+            text=card.name[:13],
+            font=('Arial', 9, 'bold'),
+            bg=bg_color,
+            fg='white',
+            wraplength=110
+        )
+        name_label.pack(pady=(15, 2))
+        parts['tinted'] += [parts['sleep'], parts['not_ready'], mana_frame, mana_label, name_label]
+        
+        # Stats (ALWAYS show for troops, even in hand)
+        # Case-insensitive comparison for card type
+        if card.card_type.lower() == 'troop':
+            print(f"🎨 Creating card widget: {card.name} - ATK:{card.attack} DEF:{card.defense} Type:{card.card_type}")
+            stats = tk.Label(
+                card_frame,
+                text=f"⚔️{card.attack} 🛡️{card.defense}",
+                font=('Arial', 11, 'bold'),
+                bg=bg_color,
+                fg='#f1c40f'
+            )
+            stats.pack(pady=2)
+            parts['stats'] = stats
+            parts['tinted'].append(stats)
             
-            # Add TAPPED indicator if tapped
-            if card.is_tapped:
-                tk.Label(
-                    card_frame,
-                    text="💤",
-                    font=('Arial', 16),
-                    bg=bg_color,
-                    fg='white'
-                ).place(relx=0.5, rely=0.5, anchor='center')
-                # Explicit status badge (summoning sick / tapped)
-                tk.Label(
+            # Abilities display for troops - BEFORE attack indicator
+            if card.abilities:
+                # Build emoji badges + compact ability name
+                badges = self._ability_badges_from_list(card.abilities)
+                ability_display = card.abilities[0].split(':')[0] if card.abilities else ''
+                text = f"{badges} {ability_display[:9]}".strip()
+                ability_label = tk.Label(
                     card_frame,
-                    text="⏳ Not Ready",
-                    font=('Arial', 7, 'bold'),
+                    text=text if text else '🌟',
+                    font=('Arial', 8, 'bold'),
                     bg=bg_color,
-                    fg='#ecf0f1'
-                ).pack(side=tk.BOTTOM, pady=2)
-            card_frame.pack_propagate(False)
-            
-            # Mana cost - frame en esquina superior derecha
-            mana_frame = tk.Frame(card_frame, bg=bg_color)
-            mana_frame.pack(anchor='ne', padx=2, pady=2)
+                    fg='#f39c12'
+                )
+                ability_label.pack(pady=1)
+                parts['tinted'].append(ability_label)
             
-            mana_label = tk.Label(
-                mana_frame,
-                text=f"💎{card.cost}",
-                font=('Arial', 10, 'bold'),
+            # Attack indicator (only in active zone), packed while the card can attack
+            parts['attack'] = tk.Label(
+                card_frame,
+                text="⚡",
+                font=('Arial', 11),
                 bg=bg_color,
-                fg='white'
+                fg='#e74c3c'
             )
-            mana_label.pack()
-            
-            # Name
-            name_label = tk.Label(
+            parts['tinted'].append(parts['attack'])
+        elif card.card_type.lower() == 'spell':
+            # Show spell icon - más pequeño para que no se corte
+            spell_label = tk.Label(
                 card_frame,
-                text=card.name[:13],
-                font=('Arial', 9, 'bold'),
+                text="✨",
+                font=('Arial', 25),
                 bg=bg_color,
-                fg='white',
-                wraplength=110
+                fg='#f39c12'
             )
-            name_label.pack(pady=(15, 2))
-            
-            # Stats (ALWAYS show for troops, even in hand)
-            # Case-insensitive comparison for card type
-            if card.card_type.lower() == 'troop':
-                print(f"🎨 Creating card widget: {card.name} - ATK:{card.attack} DEF:{card.defense} Type:{card.card_type}")
-                stats = tk.Label(
-                    card_frame,
-                    text=f"⚔️{card.attack} 🛡️{card.defense}",
-                    font=('Arial', 11, 'bold'),
-                    bg=bg_color,
-                    fg='#f1c40f'
-                )
-                stats.pack(pady=2)
-                
-                # Abilities display for troops - BEFORE attack indicator
-                if card.abilities:
-                    # Build emoji badges + compact ability name
-                    badges = self._ability_badges_from_list(card.abilities)
-                    ability_display = card.abilities[0].split(':')[0] if card.abilities else ''
-                    text = f"{badges} {ability_display[:9]}".strip()
-                    ability_label = tk.Label(
-                        card_frame,
-                        text=text if text else '🌟',
-                        font=('Arial', 8, 'bold'),
-                        bg=bg_color,
-                        fg='#f39c12'
-                    )
-                    ability_label.pack(pady=1)
-                
-                # Attack indicator (only in active zone)
-                if card.can_attack:
-                    tk.Label(
-                        card_frame,
-                        text="⚡",
-                        font=('Arial', 11),
-                        bg=bg_color,
-                        fg='#e74c3c'
-                    ).pack(pady=0)
-            elif card.card_type.lower() == 'spell':
-                # Show spell icon - más pequeño para que no se corte
-                spell_label = tk.Label(
-                    card_frame,
-                    text="✨",
-                    font=('Arial', 25),
-                    bg=bg_color,
-                    fg='#f39c12'
-                )
-                spell_label.pack(pady=5)
+            spell_label.pack(pady=5)
+            parts['tinted'].append(spell_label)
         
-        if clickable and on_click:
-            # Set cursor only on main frame
-            card_frame.config(cursor='hand2')
-            
-            # Bind click to frame and all children recursively
-            def bind_click_recursive(widget):
-                def on_click_debug(e):
-                    print(f"🖱️ Click detected on widget, calling on_click()")
-                    on_click()
-                widget.bind('<Button-1>', on_click_debug, add='+')
-                for child in widget.winfo_children():
-                    bind_click_recursive(child)
-            
-            bind_click_recursive(card_frame)
-            
-            # Hover effect - only bind to main frame
-            def on_enter(e):
+        # Click and hover go through parts['on_click'], so clickability can be patched later
+        def on_click_debug(e):
+            if parts['on_click'] is not None:
+                print(f"🖱️ Click detected on widget, calling on_click()")
+                parts['on_click']()
+        
+        def bind_click_recursive(widget):
+            widget.bind('<Button-1>', on_click_debug, add='+')
+            for child in widget.winfo_children():
+                bind_click_recursive(child)
+        
+        bind_click_recursive(card_frame)
+        
+        # Hover effect - only bind to main frame
+        def on_enter(e):
+            if parts['on_click'] is not None:
                 card_frame.config(relief=tk.SUNKEN, borderwidth=3)
-            
-            def on_leave(e):
-                card_frame.config(relief=tk.RAISED, borderwidth=2)
-            
-            card_frame.bind('<Enter>', on_enter, add='+')
-            card_frame.bind('<Leave>', on_leave, add='+')
+        
+        def on_leave(e):
+            if parts['on_click'] is not None:
+                if parts['selected']:
+                    card_frame.config(relief=tk.SOLID, borderwidth=4)
+                else:
+                    card_frame.config(relief=tk.RAISED, borderwidth=2)
+        
+        card_frame.bind('<Enter>', on_enter, add='+')
+        card_frame.bind('<Leave>', on_leave, add='+')
         
         # Add tooltips AFTER all other bindings - must be at the end
-        if not is_back and card.abilities:
+        if card.abilities:
             if card.card_type.lower() == 'spell':
                 spell_effects = '\n'.join(card.abilities)
                 print(f"🔮 Creating SPELL tooltip for {card.name}: {spell_effects[:50]}...")
@@ -849,8 +867,184 @@ class MultiplayerGameUI:
                 print(f"🔮 Creating TROOP tooltip for {card.name}: {full_abilities[:50]}...")
                 self._create_tooltip(card_frame, f"⚡ ABILITY:\n{full_abilities}")
         
+        self._set_card_tapped(parts, card.is_tapped)
+        if parts['attack'] is not None and card.can_attack:
+            parts['attack'].pack(pady=0)
+        self._set_card_click(card_frame, on_click if clickable else None)
         return card_frame
     
+    # ============================================
+    # Per-card patches (keyed zone updates)
+    # ============================================
+    
+    def _set_card_tapped(self, parts: Dict[str, Any], tapped: bool):
+        """Gray out a card and show its 💤 / Not Ready badges while tapped."""
+        bg_color = '#7f8c8d' if tapped else parts['bg']
+        for widget in parts['tinted']:
+            widget.config(bg=bg_color)
+        if parts['selected']:
+            parts['tinted'][0].config(bg='#e74c3c')
+        if tapped:
+            parts['sleep'].place(relx=0.5, rely=0.5, anchor='center')
+            parts['not_ready'].pack(side=tk.BOTTOM, pady=2, before=parts['mana_frame'])
+        else:
+            parts['sleep'].place_forget()
+            parts['not_ready'].pack_forget()
+    
+    def _set_card_click(self, card_frame: tk.Frame, on_click: Optional[Callable]):
+        parts = self._card_parts[card_frame]
+        parts['on_click'] = on_click
+        # Set cursor only on main frame
+        card_frame.config(cursor='hand2' if on_click else '')
+        if on_click is None and not parts['selected']:
+            card_frame.config(relief=tk.RAISED, borderwidth=2)
+    
+    def _set_card_selected(self, card_frame: tk.Frame, times_selected: int):
+        """Highlight a selected attacker (xN badge when selected several times, e.g. Furia)."""
+        parts = self._card_parts[card_frame]
+        parts['selected'] = times_selected
+        if times_selected:
+            card_frame.config(borderwidth=4, relief=tk.SOLID, bg='#e74c3c')
+        else:
+            card_frame.config(borderwidth=2, relief=tk.RAISED,
+                              bg='#7f8c8d' if parts['card'].is_tapped else parts['bg'])
+        if times_selected > 1:
+            if parts['indicator'] is None:
+                parts['indicator'] = tk.Label(
+                    card_frame,
+                    font=('Arial', 16, 'bold'),
+                    bg='#e74c3c',
+                    fg='white'
+                )
+            parts['indicator'].config(text=f"x{times_selected}")
+            parts['indicator'].place(relx=0.5, rely=0.5, anchor='center')
+        elif parts['indicator'] is not None:
+            parts['indicator'].place_forget()
+    
+    def _set_ability_button(self, card_frame: tk.Frame, command: Optional[Callable]):
+        """Show the ⚡ activate button (command set) or hide it (None)."""
+        parts = self._card_parts[card_frame]
+        if command is None:
+            if parts['ability_btn'] is not None:
+                parts['ability_btn'].place_forget()
+            return
+        if parts['ability_btn'] is None:
+            parts['ability_btn'] = tk.Button(
+                card_frame,
+                text="⚡",
+                font=('Arial', 10, 'bold'),
+                bg='#f39c12',
+                fg='white',
+                width=2
+            )
+        parts['ability_btn'].config(command=command)
+        parts['ability_btn'].place(relx=0.05, rely=0.05)
+    
+    def _patch_card_widget(self, card_frame: tk.Frame, old: CardDisplay, new: CardDisplay) -> bool:
+        """Apply card changes in place. False if the widget must be rebuilt (other card face)."""
+        parts = self._card_parts.get(card_frame)
+        if parts is None or (old.name, old.card_type, old.abilities) != (new.name, new.card_type, new.abilities):
+            return False
+        parts['card'] = new
+        if old.cost != new.cost:
+            parts['mana'].config(text=f"💎{new.cost}")
+        if parts['stats'] is not None and (old.attack, old.defense) != (new.attack, new.defense):
+            parts['stats'].config(text=f"⚔️{new.attack} 🛡️{new.defense}")
+        if old.is_tapped != new.is_tapped:
+            self._set_card_tapped(parts, new.is_tapped)
+        if parts['attack'] is not None and old.can_attack != new.can_attack:
+            if new.can_attack:
+                parts['attack'].pack(pady=0)
+            else:
+                parts['attack'].pack_forget()
+        return True
+    
+    def _card_keys(self, cards: List[CardDisplay]) -> List[Any]:
+        """Stable per-card keys: the server uid, else name/type plus occurrence."""
+        keys = []
+        seen: Dict[str, int] = {}
+        for card in cards:
+            if card.uid is not None:
+                keys.append(card.uid)
+            else:
+                card_id = self._card_id(card)
+                seen[card_id] = seen.get(card_id, 0) + 1
+                keys.append((card_id, seen[card_id]))
+        return keys
+    
+    def _make_card_zone(self, frame: tk.Frame, on_click: Optional[Callable[[int], None]] = None,
+                        animate_spawns: bool = False) -> KeyedZone:
+        """Keyed zone of card widgets in `frame`; specs are CardWidgetState tuples."""
+        def apply_state(widget, old: Optional['CardWidgetState'], new: 'CardWidgetState'):
+            if old is None or (old.clickable, old.index) != (new.clickable, new.index):
+                self._set_card_click(widget, (lambda idx=new.index: on_click(idx)) if new.clickable and on_click else None)
+            if old is None or old.selected != new.selected:
+                self._set_card_selected(widget, new.selected)
+            if old is None or (old.ability_button, old.index) != (new.ability_button, new.index):
+                self._set_ability_button(widget, (lambda idx=new.index: self.on_activate_ability(idx))
+                                         if new.ability_button else None)
+        
+        def build(state: 'CardWidgetState'):
+            widget = self._create_card_widget(state.card, frame)
+            apply_state(widget, None, state)
+            return widget
+        
+        def create(card: CardDisplay, state: 'CardWidgetState', position: int):
+            widget = build(state)
+            # Highlight new cards (token spawn gets special color)
+            if animate_spawns:
+                if ('mystara' in card.name.lower()) or ('token' in card.name.lower()):
+                    self._animate_token_spawn(widget)
+                else:
+                    self._animate_pulse(widget)
+            return widget
+        
+        def update(widget, card: CardDisplay, old: 'CardWidgetState', new: 'CardWidgetState', position: int):
+            if old.card != new.card and not self._patch_card_widget(widget, old.card, new.card):
+                widget.destroy()
+                return build(new)
+            apply_state(widget, old, new)
+            return widget
+        
+        return KeyedZone(create, update, lambda widget, position: None)
+    
+    def _render_card_zone(self, zone_name: str, frame: tk.Frame, states: List['CardWidgetState'],
+                          empty_text: str, empty_bg: str) -> List[tk.Frame]:
+        """Reconcile one zone's card widgets; returns them in display order."""
+        zone = self._card_zones[zone_name]
+        cards = [state.card for state in states]
+        stats = zone.render(zip(self._card_keys(cards), cards, states))
+        widgets = zone.widgets()
+        placeholder = self._placeholders.get(zone_name)
+        if widgets and placeholder is not None:
+            placeholder.destroy()
+            self._placeholders[zone_name] = None
+        elif not widgets and placeholder is None:
+            placeholder = tk.Label(
+                frame,
+                text=empty_text,
+                font=('Arial', 10, 'italic'),
+                bg=empty_bg,
+                fg='#95a5a6'
+            )
+            placeholder.pack(expand=True)
+            self._placeholders[zone_name] = placeholder
+        if not stats.changed:
+            return widgets
+        # Pack left to right in display order, moving only misplaced widgets
+        packed = frame.pack_slaves()
+        for i, widget in enumerate(widgets):
+            if i < len(packed) and packed[i] is widget:
+                continue
+            if widget in packed:
+                packed.remove(widget)
+            if i < len(packed):
+                widget.pack(side=tk.LEFT, padx=3, pady=5, before=packed[i])
+            else:
+                widget.pack(side=tk.LEFT, padx=3, pady=5)
+            packed.insert(i, widget)
+        return widgets
+    
     def update_opponent_hand(self, card_count: int):
         """Update opponent's hand display (card backs)"""
         # Clear existing
@@ -880,190 +1074,35 @@ class MultiplayerGameUI:
                 fg='white'
             ).pack(expand=True)
     
-    def _get_cards_hash(self, cards: List[CardDisplay]) -> str:
-        """Generate a hash string from card list to detect changes"""
-        if not cards:
-            return "empty"
-        # Include card count in hash to detect additions/removals
-        return f"count:{len(cards)}|" + "|".join([
-            f"{c.name}:{c.cost}:{c.attack}:{c.defense}:{c.is_tapped}"
-            for c in cards
-        ])
-    
     def update_opponent_active(self, cards: List[CardDisplay]):
-        """Update opponent's active zone"""
-        # Check if anything actually changed
-        new_hash = self._get_cards_hash(cards)
-        if new_hash == self._last_update_hash.get('opponent_active', ''):
-            return  # No changes, skip update to prevent flickering
-        self._last_update_hash['opponent_active'] = new_hash
-        
-        # Determine indices that changed/are new for spawn highlight
-        prev_ids = self._prev_ids.get('opponent_active', [])
-        new_ids = [self._card_id(c) for c in cards]
-        changed_indices = {i for i in range(len(new_ids)) if i >= len(prev_ids) or (i < len(prev_ids) and new_ids[i] != prev_ids[i])}
-
-        # Clear existing
-        for widget in self.opponent_active_frame.winfo_children():
-            widget.destroy()
-        
+        """Update opponent's active zone (only cards that changed are touched)"""
         self.opponent_active = cards  # ¡IMPORTANTE! Guardar la lista
-        self.opponent_active_widgets = []
-        
-        if not cards:
-            tk.Label(
-                self.opponent_active_frame,
-                text="No creatures",
-                font=('Arial', 10, 'italic'),
-                bg='#34495e',
-                fg='#95a5a6'
-            ).pack(expand=True)
-            self._prev_ids['opponent_active'] = []
-            return
-        
-        for i, card in enumerate(cards):
-            w = self._create_card_widget(card, self.opponent_active_frame)
-            w.pack(side=tk.LEFT, padx=3, pady=5)
-            self.opponent_active_widgets.append(w)
-            # Highlight new/changed cards (token spawn gets special color)
-            if i in changed_indices:
-                if ('mystara' in card.name.lower()) or ('token' in card.name.lower()):
-                    self._animate_token_spawn(w)
-                else:
-                    self._animate_pulse(w)
-        self._prev_ids['opponent_active'] = new_ids
+        states = [CardWidgetState(card, i) for i, card in enumerate(cards)]
+        self.opponent_active_widgets = self._render_card_zone(
+            'opponent_active', self.opponent_active_frame, states, "No creatures", '#34495e')
     
     def update_my_active(self, cards: List[CardDisplay]):
-        """Update my active zone"""
-        # Check if anything actually changed (include attack mode state in hash)
-        new_hash = self._get_cards_hash(cards) + f":{self.attack_mode}:{len(self.selected_attackers)}"
-        if new_hash == self._last_update_hash.get('my_active', ''):
-            return  # No changes, skip update to prevent flickering
-        self._last_update_hash['my_active'] = new_hash
-        
-        # Determine indices that changed/are new for spawn highlight
-        prev_ids = self._prev_ids.get('my_active', [])
-        new_ids = [self._card_id(c) for c in cards]
-        changed_indices = {i for i in range(len(new_ids)) if i >= len(prev_ids) or (i < len(prev_ids) and new_ids[i] != prev_ids[i])}
-
-        # Clear existing
-        for widget in self.my_active_frame.winfo_children():
-            widget.destroy()
-        
+        """Update my active zone (only cards that changed are touched)"""
         self.my_active = cards
-        self.my_active_widgets = []
-        
-        if not cards:
-            tk.Label(
-                self.my_active_frame,
-                text="No creatures",
-                font=('Arial', 10, 'italic'),
-                bg='#2c3e50',
-                fg='#95a5a6'
-            ).pack(expand=True)
-            self._prev_ids['my_active'] = []
-            return
-        
+        states = []
         for i, card in enumerate(cards):
             # Card is clickable in attack mode if it's not tapped
             clickable = self.attack_mode and not card.is_tapped
-            print(f"🎯 Card {card.name}: attack_mode={self.attack_mode}, is_tapped={card.is_tapped}, clickable={clickable}")
-            
-            # Only pass on_click if card is actually clickable
-            if clickable:
-                on_click = lambda idx=i: self._toggle_attacker(idx)
-            else:
-                on_click = None
-            
-            card_widget = self._create_card_widget(
-                card,
-                self.my_active_frame,
-                clickable=clickable,
-                on_click=on_click
-            )
-            card_widget.pack(side=tk.LEFT, padx=3, pady=5)
-            self.my_active_widgets.append(card_widget)
-            # Highlight new/changed cards (token spawn gets special color)
-            if i in changed_indices:
-                if ('mystara' in card.name.lower()) or ('token' in card.name.lower()):
-                    self._animate_token_spawn(card_widget)
-                else:
-                    self._animate_pulse(card_widget)
-            
-            # Add ability button if card has activated ability and is ready
-            if card.has_activated_ability and not card.is_tapped and self.is_my_turn and not self.attack_mode:
-                ability_btn = tk.Button(
-                    card_widget,
-                    text="⚡",
-                    font=('Arial', 10, 'bold'),
-                    bg='#f39c12',
-                    fg='white',
-                    width=2,
-                    command=lambda idx=i: self.on_activate_ability(idx)
-                )
-                ability_btn.place(relx=0.05, rely=0.05)
-            
-            # Highlight selected attackers
-            if self.attack_mode and i in self.selected_attackers:
-                times_selected = self.selected_attackers.count(i)
-                card_widget.config(borderwidth=4, relief=tk.SOLID, bg='#e74c3c')
-                
-                # If selected multiple times (Furia), add indicator
-                if times_selected > 1:
-                    indicator = tk.Label(
-                        card_widget,
-                        text=f"x{times_selected}",
-                        font=('Arial', 16, 'bold'),
-                        bg='#e74c3c',
-                        fg='white'
-                    )
-                    indicator.place(relx=0.5, rely=0.5, anchor='center')
-        self._prev_ids['my_active'] = new_ids
+            # Highlight selected attackers (Furia can be selected twice)
+            selected = self.selected_attackers.count(i) if self.attack_mode else 0
+            # Ability button if card has activated ability and is ready
+            ability_button = card.has_activated_ability and not card.is_tapped and self.is_my_turn and not self.attack_mode
+            states.append(CardWidgetState(card, i, clickable, selected, ability_button))
+        self.my_active_widgets = self._render_card_zone(
+            'my_active', self.my_active_frame, states, "No creatures", '#2c3e50')
     
     def update_my_hand(self, cards: List[CardDisplay]):
-        """Update my hand"""
-        # Check if anything actually changed (include turn state in hash)
-        new_hash = self._get_cards_hash(cards) + f":{self.is_my_turn}:{self.attack_mode}"
-        if new_hash == self._last_update_hash.get('my_hand', ''):
-            return  # No changes, skip update to prevent flickering
-        self._last_update_hash['my_hand'] = new_hash
-        
-        # Clear existing
-        for widget in self.my_hand_frame.winfo_children():
-            widget.destroy()
-        
+        """Update my hand (only cards that changed are touched)"""
         self.my_hand = cards
-        self.my_hand_widgets = []
-        
-        if not cards:
-            tk.Label(
-                self.my_hand_frame,
-                text="No cards in hand",
-                font=('Arial', 10, 'italic'),
-                bg='#16213e',
-                fg='#95a5a6'
-            ).pack(expand=True)
-            self._prev_ids['my_hand'] = []
-            return
-        
-        for i, card in enumerate(cards):
-            clickable = self.is_my_turn and not self.attack_mode
-            
-            # Only pass on_click if card is actually clickable
-            if clickable:
-                on_click = lambda idx=i: self._on_card_clicked(idx)
-            else:
-                on_click = None
-            
-            w = self._create_card_widget(
-                card,
-                self.my_hand_frame,
-                clickable=clickable,
-                on_click=on_click
-            )
-            w.pack(side=tk.LEFT, padx=3, pady=5)
-            self.my_hand_widgets.append(w)
-        self._prev_ids['my_hand'] = [self._card_id(c) for c in cards]
+        clickable = self.is_my_turn and not self.attack_mode
+        states = [CardWidgetState(card, i, clickable) for i, card in enumerate(cards)]
+        self.my_hand_widgets = self._render_card_zone(
+            'my_hand', self.my_hand_frame, states, "No cards in hand", '#16213e')
     
     # ============================================
     # Action Handlers
@@ -1792,10 +1831,12 @@ class MultiplayerGameUI:
             self.cancel_attack_button.config(state=tk.DISABLED)
 
     def attach_network(self, network):
-        """Attach NetworkManager and register game_over callback."""
+        """Attach NetworkManager and register game_over and reconnection callbacks."""
         self.network = network
         try:
             self.network.on_game_over = lambda w: self._handle_game_over(w)
+            # Reconnection notices arrive on the network thread
+            self.network.on_connection_status = lambda message: self.root.after(0, self.add_system_message, message)
         except Exception:
             pass
     
@@ -1874,5 +1915,6 @@ def card_from_dict(data: dict) -> CardDisplay:
         card_type=data.get('card_type', 'Troop'),
         abilities=data.get('abilities', []),
         can_attack=data.get('can_attack', False),
-        is_tapped=data.get('is_tapped', False)
+        is_tapped=data.get('is_tapped', False),
+        uid=data.get('uid')
     )
@@ -7,6 +7,10 @@ import threading
 import os
 from typing import Callable, Optional, Dict, Any
 
+from ..state_delta import DeltaDecoder, is_envelope
+from ..card_catalog import CatalogCache
+from ..binary_wire import VERSION as BINARY_VERSION, is_binary, pack_action, unpack_blockers, unpack_state
+
 class NetworkManager:
     """Gestiona la conexión de red y comunicación con el servidor"""
     
@@ -26,6 +30,8 @@ class NetworkManager:
         self.connected = False
         self.room_id: Optional[str] = None
         self.player_name: str = "Jugador"
+        # Token del asiento (match_found): tras una reconexión se vuelve a la misma partida
+        self.session_token: Optional[str] = None
         
         # Callbacks
         self.on_match_found: Optional[Callable] = None
@@ -40,6 +46,19 @@ class NetworkManager:
         self.on_chat_message: Optional[Callable] = None  # NEW: Mensajes de chat
         self.on_request_blockers: Optional[Callable] = None  # NEW: Solicitud de bloqueadores
         self.on_game_over: Optional[Callable[[str], None]] = None  # NEW: ganador ('YOU'/'OPPONENT')
+        self.on_connection_status: Optional[Callable[[str], None]] = None  # avisos de reconexión (texto)
+        self.on_spectator_state: Optional[Callable] = None  # vista de espectador (sin manos)
+        self.on_spectate_ended: Optional[Callable] = None  # la partida observada terminó o se cerró
+        # Partida que se está viendo como espectador (None = no se observa ninguna)
+        self.spectating: Optional[str] = None
+        
+        # Estados versionados: el servidor envía parches contra el último estado confirmado
+        self.state_decoder = DeltaDecoder()
+        # Plantillas de carta recibidas del servidor (las cartas llegan como id + campos dinámicos)
+        self.card_catalog = CatalogCache()
+        # El servidor habla binario con nosotros (llegó un estado binario): las acciones también van en binario
+        self.binary_actions = False
+        self._resync_requested = False
         
         # Configurar event handlers
         self._setup_handlers()
@@ -83,7 +102,15 @@ class NetworkManager:
         @self.sio.on('connect')  # type: ignore
         def on_connect():
             self.connected = True
+            # Los ids de plantilla solo valen para esta conexión
+            self.card_catalog.clear()
+            self.binary_actions = False
             print('✅ Conectado al servidor')
+            if self.session_token and self.room_id:
+                # Reconexión automática en mitad de una partida: recuperar el asiento
+                self.resume_session()
+            elif self.spectating:
+                self.spectate(self.spectating)  # seguir viendo la misma partida
         
         @self.sio.on('connect_error')  # type: ignore
         def on_connect_error(data):
@@ -102,6 +129,8 @@ class NetworkManager:
         @self.sio.on('match_found')  # type: ignore
         def on_match_found(data):
             self.room_id = data.get('room_id')
+            self.session_token = data.get('session_token')
+            self.state_decoder.reset()
             print(f'🎮 Partida encontrada: {self.room_id}')
             if self.on_match_found:
                 self.on_match_found(data)
@@ -138,10 +167,36 @@ class NetworkManager:
         
         @self.sio.on('opponent_disconnected')  # type: ignore
         def handle_opponent_disconnected():
+            self.session_token = None
             print('❌ Oponente desconectado')
             if self.on_opponent_disconnected:
                 self.on_opponent_disconnected()
         
+        @self.sio.on('session_resumed')  # type: ignore
+        def on_session_resumed(data):
+            print(f'🔁 De vuelta en la partida {data.get("room_id")}')
+            self._status('Reconnected to the match')
+        
+        @self.sio.on('resume_failed')  # type: ignore
+        def on_resume_failed(data):
+            print(f'⚠️ No se pudo volver a la partida: {data.get("message")}')
+            self.session_token = None
+            self._resync_requested = False
+            self._status('Could not rejoin the match')
+            if self.on_error:
+                self.on_error(data)
+        
+        @self.sio.on('opponent_reconnecting')  # type: ignore
+        def on_opponent_reconnecting(data):
+            grace = int(data.get('grace', 0))
+            print(f'⏳ El rival perdió la conexión, se le esperan {grace}s')
+            self._status(f'Opponent lost connection, waiting up to {grace}s')
+        
+        @self.sio.on('opponent_reconnected')  # type: ignore
+        def on_opponent_reconnected():
+            print('🔁 El rival volvió a la partida')
+            self._status('Opponent reconnected')
+        
         @self.sio.on('error')  # type: ignore
         def on_error(data):
             print(f'⚠️ Error: {data.get("message")}')
@@ -153,8 +208,58 @@ class NetworkManager:
         @self.sio.on('game_state_update')  # type: ignore
         def on_game_state_update(data):
             print(f'📦 Estado del juego recibido del servidor')
+            if is_binary(data):
+                self.binary_actions = True
+                try:
+                    state = unpack_state(data, self.card_catalog)
+                except ValueError as e:
+                    print(f'⚠️ Estado binario inválido: {e}')
+                    state = None
+            else:
+                state = self.state_decoder.apply(data)
+                if state is not None:
+                    state = self.card_catalog.expand(state)
+            if state is None:
+                # Parche contra una versión que no tenemos o carta con una plantilla desconocida:
+                # pedir snapshot completo y catálogo (una vez, hasta que llegue un estado válido)
+                if not self._resync_requested:
+                    print('⚠️ Estado incompleto (hueco de versión o plantilla desconocida), pidiendo snapshot')
+                    self.request_initial_state()
+                return
+            self._resync_requested = False
+            if is_envelope(data):
+                self.sio.emit('state_ack', {'room_id': self.room_id, 'v': data['v']})
             if self.on_game_state_update:
-                self.on_game_state_update(data)
+                self.on_game_state_update(state)
+        
+        @self.sio.on('spectate_started')  # type: ignore
+        def on_spectate_started(data):
+            delay = data.get('delay') or 0
+            print(f'👁️ Viendo la partida {data.get("room_id")} ({data.get("spectators")} espectadores)')
+            self._status(f'Spectating (delay {delay:g}s)' if delay else 'Spectating')
+        
+        @self.sio.on('spectate_failed')  # type: ignore
+        def on_spectate_failed(data):
+            print(f'⚠️ No se puede ver la partida: {data.get("message")}')
+            self.spectating = None
+            if self.on_error:
+                self.on_error(data)
+        
+        @self.sio.on('spectator_state')  # type: ignore
+        def on_spectator_state(data):
+            if self.on_spectator_state:
+                self.on_spectator_state(data)
+        
+        @self.sio.on('spectate_ended')  # type: ignore
+        def on_spectate_ended(data):
+            print(f'👁️ Fin de la partida observada ({data.get("reason")})')
+            self.spectating = None
+            if self.on_spectate_ended:
+                self.on_spectate_ended(data)
+        
+        @self.sio.on('card_catalog')  # type: ignore
+        def on_card_catalog(data):
+            self.card_catalog.update(data)
         
         @self.sio.on('chat_message')  # type: ignore
         def on_chat_message(data):
@@ -167,6 +272,8 @@ class NetworkManager:
         
         @self.sio.on('request_blockers')  # type: ignore
         def on_request_blockers(data):
+            if is_binary(data):
+                data = unpack_blockers(data)
             attackers = data.get('attackers', [])
             targets = data.get('targets', [])
             print(f'🛡️ Solicitud de bloqueadores - {len(attackers)} atacantes')
@@ -181,6 +288,7 @@ class NetworkManager:
 
         @self.sio.on('game_over')  # type: ignore
         def on_game_over(data):
+            self.session_token = None
             winner = 'OPPONENT'
             if isinstance(data, dict) and 'winner' in data:
                 winner = str(data['winner'])
@@ -192,6 +300,13 @@ class NetworkManager:
             else:
                 print(f"[network] game_over received: winner={winner}")
 
+    def _status(self, message: str):
+        if self.on_connection_status:
+            try:
+                self.on_connection_status(message)
+            except Exception:
+                pass
+
     def emit_game_over(self, winner: str):
         """Emite un evento game_over al servidor para sincronizar fin de partida."""
         try:
@@ -230,6 +345,7 @@ class NetworkManager:
     
     def disconnect(self):
         """Desconectar del servidor"""
+        self.session_token = None  # salida voluntaria: no se vuelve a la partida
         if self.connected:
             self.sio.disconnect()
     
@@ -307,9 +423,43 @@ class NetworkManager:
         print(f'📤 [CLIENT] Enviando acción: {action}')
         print(f'   📦 Data completa: {action_data}')
         
-        self.sio.emit('game_action', action_data)
+        payload = pack_action(action_data) if self.binary_actions else None
+        self.sio.emit('game_action', payload if payload is not None else action_data)
         print(f'   ✅ Acción enviada al servidor')
     
+    def request_initial_state(self):
+        """Pedir el estado completo de la sala.
+        
+        Ofrece parches delta, cartas por id de plantilla y codificación binaria;
+        un servidor que no conozca alguna opción sigue mandando JSON normal.
+        """
+        self.state_decoder.reset()
+        self._resync_requested = True
+        self.sio.emit('request_initial_state', {'room_id': self.room_id, 'delta': True, 'templates': True,
+                                                'binary': BINARY_VERSION})
+    
+    def resume_session(self):
+        """Volver al asiento de la partida con el token de match_found (nuevo sid tras reconectar).
+        
+        Ofrece las mismas codificaciones que request_initial_state: el servidor
+        responde session_resumed y un único estado completo.
+        """
+        self.state_decoder.reset()
+        self._resync_requested = True
+        self.sio.emit('resume_session', {'room_id': self.room_id, 'token': self.session_token, 'delta': True,
+                                         'templates': True, 'binary': BINARY_VERSION})
+    
+    def spectate(self, room_id: str):
+        """Ver una partida en curso (vista sin manos por on_spectator_state)"""
+        self.spectating = room_id
+        self.sio.emit('spectate', {'room_id': room_id})
+    
+    def stop_spectating(self):
+        """Dejar de ver la partida"""
+        if self.spectating is not None:
+            self.spectating = None
+            self.sio.emit('stop_spectating')
+    
     def ping(self):
         """Medir latencia"""
         import time
@@ -0,0 +1,377 @@
+"""
+Room and matchmaking state backends for the multiplayer server.
+The server used to keep the waiting players and the room list in module
+globals, which pins it to one worker process. A backend holds what has to
+be shared between workers:
+
+    matchmaker   the matchmaking queues (a matchmaking.Matchmaker)
+    rooms        room_id -> worker hosting it (the Game lives in that worker)
+    mailbox      messages for a worker (relayed emits and events of players
+                 whose connection is on another worker)
+    workers      heartbeats, so the rows of a dead worker can be purged
+
+InProcessBackend keeps everything in this process: one worker, the old
+behaviour. SqliteBackend shares it through a SQLite file (WAL) between the
+workers of one host: matchmaking spans every worker, each room stays on the
+worker that created it and the other worker relays its player's traffic
+through the mailbox. Mailbox messages are pickled tuples: the file must only
+be reachable by the server itself.
+
+Lock waits never block in SQLite's busy handler (a C sleep that would freeze
+every greenlet of the worker): a busy write is retried with time.sleep, which
+the server's gevent monkey-patching turns into a cooperative yield.
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from .matchmaking import Matchmaker, MatchQueue, Ticket
+
+
+class InProcessBackend:
+    """Everything in this process (single worker)."""
+
+    shared = False
+
+    def __init__(self, worker_id: str = 'local', **matchmaking):
+        self.worker_id = worker_id
+        self.matchmaker = Matchmaker(**matchmaking)
+        self._rooms: Dict[str, str] = {}
+        self._mailbox: Deque[tuple] = deque()
+
+    # -- rooms ------------------------------------------------------------------
+
+    def assign_room(self, room_id: str, worker: Optional[str] = None):
+        self._rooms[room_id] = worker or self.worker_id
+
+    def claim_room(self, room_id: str) -> bool:
+        """Register room_id on this worker unless some worker already hosts it."""
+        if room_id in self._rooms:
+            return False
+        self._rooms[room_id] = self.worker_id
+        return True
+
+    def room_worker(self, room_id: str) -> Optional[str]:
+        return self._rooms.get(room_id)
+
+    def release_room(self, room_id: str):
+        self._rooms.pop(room_id, None)
+
+    def room_counts(self) -> Dict[str, int]:
+        """Rooms hosted per worker."""
+        return {self.worker_id: len(self._rooms)} if self._rooms else {}
+
+    # -- mailbox ----------------------------------------------------------------
+
+    def post(self, worker: str, message: tuple):
+        self._mailbox.append(message)
+
+    def fetch(self) -> List[tuple]:
+        """Messages for this worker, oldest first (they are removed)."""
+        messages = list(self._mailbox)
+        self._mailbox.clear()
+        return messages
+
+    # -- workers ----------------------------------------------------------------
+
+    def heartbeat(self):
+        pass
+
+    def purge_stale(self, timeout: float) -> List[str]:
+        return []
+
+    def workers(self) -> List[str]:
+        return [self.worker_id]
+
+    def close(self):
+        pass
+
+
+# ----------------------------------------------------------------------------
+# SQLite (several workers on one host)
+# ----------------------------------------------------------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (sid TEXT PRIMARY KEY, mode TEXT NOT NULL, rating REAL, band INTEGER,
+                                    payload TEXT, enqueued_at REAL NOT NULL, worker TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS tickets_band ON tickets (mode, band, enqueued_at);
+CREATE INDEX IF NOT EXISTS tickets_age ON tickets (mode, enqueued_at);
+CREATE TABLE IF NOT EXISTS rooms (room_id TEXT PRIMARY KEY, worker TEXT NOT NULL, created_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS mailbox (id INTEGER PRIMARY KEY AUTOINCREMENT, worker TEXT NOT NULL, body BLOB NOT NULL);
+CREATE INDEX IF NOT EXISTS mailbox_worker ON mailbox (worker, id);
+CREATE TABLE IF NOT EXISTS workers (worker TEXT PRIMARY KEY, heartbeat REAL NOT NULL);
+"""
+
+_TICKET_COLUMNS = 'sid, mode, rating, payload, enqueued_at, worker'
+
+
+def _ticket(row) -> Ticket:
+    sid, mode, rating, payload, enqueued_at, worker = row
+    return Ticket(sid, mode, rating, json.loads(payload) if payload else None, enqueued_at, worker)
+
+
+class _Database:
+    """One SQLite connection with nestable BEGIN IMMEDIATE transactions.
+
+    The connection has no busy timeout: statements that need the write lock go
+    through write()/transaction(), which wait for it in Python for up to
+    `timeout` seconds (polling with a growing time.sleep).
+    """
+
+    RETRY_MAX_DELAY = 0.05
+
+    def __init__(self, path: str, timeout: float):
+        self.timeout = timeout
+        self.conn = sqlite3.connect(path, timeout=0, isolation_level=None, check_same_thread=False)
+        self._retry(self.conn.execute, 'PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')  # losing the last writes on power loss is fine here
+        self._retry(self.conn.executescript, _SCHEMA)
+        self._depth = 0
+
+    def _retry(self, run, *args):
+        deadline = time.monotonic() + self.timeout
+        delay = 0.001
+        while True:
+            try:
+                return run(*args)
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or time.monotonic() >= deadline:
+                    raise
+            time.sleep(delay)
+            delay = min(delay * 2, self.RETRY_MAX_DELAY)
+
+    def write(self, sql: str, *args):
+        """One statement outside a transaction that needs the write lock."""
+        if self._depth:
+            return self.conn.execute(sql, args)
+        return self._retry(self.conn.execute, sql, args)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        if self._depth:
+            yield self.conn
+            return
+        self._retry(self.conn.execute, 'BEGIN IMMEDIATE')
+        self._depth = 1
+        try:
+            yield self.conn
+        except BaseException:
+            self._depth = 0
+            self.conn.execute('ROLLBACK')
+            raise
+        self._depth = 0
+        self.conn.execute('COMMIT')
+
+    def one(self, sql: str, *args):
+        return self.conn.execute(sql, args).fetchone()
+
+    def all(self, sql: str, *args) -> list:
+        return self.conn.execute(sql, args).fetchall()
+
+
+class SqliteMatchQueue(MatchQueue):
+    """MatchQueue of one mode stored in the tickets table (same pairing rules)."""
+
+    def __init__(self, db: _Database, mode: str, worker: str, *settings):
+        super().__init__(*settings)
+        self._db = db
+        self.mode = mode
+        self.worker = worker
+
+    def __len__(self) -> int:
+        return self._db.one('SELECT COUNT(*) FROM tickets WHERE mode = ?', self.mode)[0]
+
+    def __contains__(self, sid: str) -> bool:
+        return self._db.one('SELECT 1 FROM tickets WHERE sid = ? AND mode = ?', sid, self.mode) is not None
+
+    def __iter__(self) -> Iterator[Ticket]:
+        rows = self._db.all(f'SELECT {_TICKET_COLUMNS} FROM tickets WHERE mode = ? ORDER BY enqueued_at', self.mode)
+        return iter([_ticket(row) for row in rows])
+
+    def add(self, ticket: Ticket):
+        self._db.write(
+            'INSERT OR REPLACE INTO tickets (sid, mode, rating, band, payload, enqueued_at, worker) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            ticket.sid, self.mode, ticket.rating, self._band(ticket.rating),
+            None if ticket.payload is None else json.dumps(ticket.payload), ticket.enqueued_at, ticket.worker)
+
+    def remove(self, sid: str) -> Optional[Ticket]:
+        with self._db.transaction():
+            row = self._db.one(f'SELECT {_TICKET_COLUMNS} FROM tickets WHERE sid = ? AND mode = ?', sid, self.mode)
+            if row is None:
+                return None
+            self._db.conn.execute('DELETE FROM tickets WHERE sid = ?', (sid,))
+        return _ticket(row)
+
+    def oldest(self) -> Optional[Ticket]:
+        row = self._db.one(f'SELECT {_TICKET_COLUMNS} FROM tickets WHERE mode = ? ORDER BY enqueued_at LIMIT 1',
+                           self.mode)
+        return None if row is None else _ticket(row)
+
+    def _oldest_other(self, exclude: str) -> Optional[Ticket]:
+        row = self._db.one(f'SELECT {_TICKET_COLUMNS} FROM tickets WHERE mode = ? AND sid <> ? '
+                           'ORDER BY enqueued_at LIMIT 1', self.mode, exclude)
+        return None if row is None else _ticket(row)
+
+    def _head(self, band_key: Optional[int], exclude: Optional[str]) -> Optional[Ticket]:
+        row = self._db.one(f'SELECT {_TICKET_COLUMNS} FROM tickets WHERE mode = ? AND band IS ? AND sid <> ? '
+                           'ORDER BY enqueued_at LIMIT 1', self.mode, band_key, exclude or '')
+        return None if row is None else _ticket(row)
+
+    def band_heads(self) -> List[Ticket]:
+        """Oldest ticket of every band, oldest first: only those of this worker, so
+        the sweeping worker can always host the match."""
+        # SQLite takes the bare columns from the row holding MIN()
+        rows = self._db.all('SELECT sid, mode, rating, payload, MIN(enqueued_at), worker FROM tickets '
+                            'WHERE mode = ? GROUP BY band', self.mode)
+        heads = [_ticket(row) for row in rows if row[5] == self.worker]
+        heads.sort(key=lambda t: t.enqueued_at)
+        return heads
+
+
+class SqliteMatchmaker(Matchmaker):
+    """Matchmaker over the shared tickets table. Enqueue and sweep run in one
+    write transaction, so two workers can never take the same ticket."""
+
+    def __init__(self, db: _Database, worker: str, **settings):
+        settings.setdefault('clock', time.time)  # enqueue times are compared across processes
+        super().__init__(worker=worker, **settings)
+        self._db = db
+
+    def _new_queue(self, mode: str) -> MatchQueue:
+        return SqliteMatchQueue(self._db, mode, self.worker, *self._settings)
+
+    def _active_queues(self) -> List[MatchQueue]:
+        return [self.queue(mode) for mode, in self._db.all('SELECT DISTINCT mode FROM tickets')]
+
+    def _track(self, ticket: Ticket, queue: MatchQueue):
+        pass  # the row is the index
+
+    def __contains__(self, sid: str) -> bool:
+        return self._db.one('SELECT 1 FROM tickets WHERE sid = ?', sid) is not None
+
+    def enqueue(self, sid: str, mode: str, rating: Optional[float] = None, payload: Any = None):
+        with self._db.transaction():
+            return super().enqueue(sid, mode, rating, payload)
+
+    def sweep(self):
+        with self._db.transaction():
+            return super().sweep()
+
+    def cancel(self, sid: str, counted: bool = True) -> Optional[Ticket]:
+        with self._db.transaction():
+            row = self._db.one('SELECT mode FROM tickets WHERE sid = ?', sid)
+            if row is None:
+                return None
+            if counted:
+                self.cancels += 1
+            return self.queue(row[0]).remove(sid)
+
+    def _take(self, ticket: Ticket):
+        self._db.conn.execute('DELETE FROM tickets WHERE sid = ?', (ticket.sid,))
+
+    def depth(self, mode: Optional[str] = None) -> int:
+        if mode is not None:
+            return len(self.queue(mode))
+        return self._db.one('SELECT COUNT(*) FROM tickets')[0]
+
+    def depth_by_mode(self) -> Dict[str, int]:
+        return dict(self._db.all('SELECT mode, COUNT(*) FROM tickets GROUP BY mode'))
+
+
+class SqliteBackend:
+    """Rooms, matchmaking and mailboxes shared through a SQLite file (one host, several workers)."""
+
+    shared = True
+
+    def __init__(self, path: str, worker_id: str, timeout: float = 5.0, **matchmaking):
+        self.path = path
+        self.worker_id = worker_id
+        self._db = _Database(path, timeout)
+        self.matchmaker = SqliteMatchmaker(self._db, worker_id, **matchmaking)
+        self.heartbeat()
+
+    # -- rooms ------------------------------------------------------------------
+
+    def assign_room(self, room_id: str, worker: Optional[str] = None):
+        self._db.write('INSERT OR REPLACE INTO rooms (room_id, worker, created_at) VALUES (?, ?, ?)',
+                       room_id, worker or self.worker_id, time.time())
+
+    def claim_room(self, room_id: str) -> bool:
+        """Register room_id on this worker unless some worker already hosts it (private room codes)."""
+        cursor = self._db.write('INSERT OR IGNORE INTO rooms (room_id, worker, created_at) VALUES (?, ?, ?)',
+                                room_id, self.worker_id, time.time())
+        return cursor.rowcount == 1
+
+    def room_worker(self, room_id: str) -> Optional[str]:
+        row = self._db.one('SELECT worker FROM rooms WHERE room_id = ?', room_id)
+        return None if row is None else row[0]
+
+    def release_room(self, room_id: str):
+        self._db.write('DELETE FROM rooms WHERE room_id = ?', room_id)
+
+    def room_counts(self) -> Dict[str, int]:
+        return dict(self._db.all('SELECT worker, COUNT(*) FROM rooms GROUP BY worker'))
+
+    # -- mailbox ----------------------------------------------------------------
+
+    def post(self, worker: str, message: tuple):
+        self._db.write('INSERT INTO mailbox (worker, body) VALUES (?, ?)',
+                       worker, pickle.dumps(message, pickle.HIGHEST_PROTOCOL))
+
+    def fetch(self) -> List[tuple]:
+        # Cheap read first: most polls find nothing and should not take the write lock
+        if self._db.one('SELECT 1 FROM mailbox WHERE worker = ? LIMIT 1', self.worker_id) is None:
+            return []
+        with self._db.transaction():
+            rows = self._db.all('SELECT id, body FROM mailbox WHERE worker = ? ORDER BY id', self.worker_id)
+            if rows:
+                self._db.conn.execute('DELETE FROM mailbox WHERE worker = ? AND id <= ?',
+                                      (self.worker_id, rows[-1][0]))
+        return [pickle.loads(body) for _, body in rows]
+
+    # -- workers ----------------------------------------------------------------
+
+    def heartbeat(self):
+        self._db.write('INSERT OR REPLACE INTO workers (worker, heartbeat) VALUES (?, ?)',
+                       self.worker_id, time.time())
+
+    def purge_stale(self, timeout: float) -> List[str]:
+        """Drop workers silent for `timeout` seconds with their tickets, rooms and mail.
+
+        Rows of workers that never registered (a previous deploy) go too.
+        """
+        limit = time.time() - timeout
+        with self._db.transaction() as conn:
+            stale = [w for w, in conn.execute('SELECT worker FROM workers WHERE heartbeat < ?', (limit,))]
+            conn.execute('DELETE FROM workers WHERE heartbeat < ?', (limit,))
+            for table in ('tickets', 'rooms', 'mailbox'):
+                conn.execute(f'DELETE FROM {table} WHERE worker NOT IN (SELECT worker FROM workers)')
+        return stale
+
+    def workers(self) -> List[str]:
+        return [w for w, in self._db.all('SELECT worker FROM workers ORDER BY worker')]
+
+    def close(self):
+        with self._db.transaction() as conn:
+            conn.execute('DELETE FROM workers WHERE worker = ?', (self.worker_id,))
+            for table in ('tickets', 'rooms', 'mailbox'):
+                conn.execute(f'DELETE FROM {table} WHERE worker = ?', (self.worker_id,))
+        self._db.conn.close()
+
+
+def create_backend(kind: str, worker_id: str, path: Optional[str] = None, **matchmaking):
+    """Backend by name: 'memory' (default) or 'sqlite' (path defaults to the temp dir)."""
+    if kind == 'sqlite':
+        path = path or os.path.join(tempfile.gettempdir(), 'mini_tcg_rooms.db')
+        return SqliteBackend(path, worker_id, **matchmaking)
+    if kind not in ('memory', '', None):
+        raise ValueError(f'unknown room backend {kind!r}')
+    return InProcessBackend(worker_id, **matchmaking)
@@ -0,0 +1,107 @@
+"""
+Keyed one-shot timers on a binary heap, for server housekeeping (AFK turn
+timeouts, idle-room eviction, matchmaking expiry).
+Every timer has a key (e.g. ('afk', room_id)); scheduling a key again
+replaces its timer and cancel() drops it, both in O(log n) / O(1) without
+searching the heap: superseded heap entries are skipped when they surface
+and the heap is rebuilt once they outnumber the live timers, so memory stays
+bounded however often timers are pushed back.
+
+The scheduler does not own a thread: the server runs run_due() from a
+greenlet on the gevent hub, sleeping until next_deadline().
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class TimerHeap:
+    """Keyed timers; callbacks run from run_due() in the caller's greenlet."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 on_error: Optional[Callable[[Hashable, Exception], None]] = None):
+        self.clock = clock
+        self.on_error = on_error
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._timers: Dict[Hashable, Tuple[float, int, Callable, tuple]] = {}
+        self._seq = itertools.count()
+        self.fired = 0
+        self.cancelled = 0
+        self.errors = 0
+        self.compactions = 0
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable, *args: Any) -> float:
+        """Run callback(*args) in `delay` seconds, replacing any timer of `key`. Returns the deadline."""
+        deadline = self.clock() + delay
+        seq = next(self._seq)
+        self._timers[key] = (deadline, seq, callback, args)
+        heapq.heappush(self._heap, (deadline, seq, key))
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._timers):
+            self._compact()
+        return deadline
+
+    def cancel(self, key: Hashable) -> bool:
+        if self._timers.pop(key, None) is None:
+            return False
+        self.cancelled += 1
+        return True
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        timer = self._timers.get(key)
+        return None if timer is None else timer[0]
+
+    def _live(self, entry: Tuple[float, int, Hashable]) -> bool:
+        timer = self._timers.get(entry[2])
+        return timer is not None and timer[1] == entry[1]
+
+    def _compact(self):
+        self._heap = [(deadline, seq, key) for key, (deadline, seq, _, _) in self._timers.items()]
+        heapq.heapify(self._heap)
+        self.compactions += 1
+
+    def next_deadline(self) -> Optional[float]:
+        """Deadline of the next live timer, or None."""
+        heap = self._heap
+        while heap and not self._live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Fire every timer whose deadline has passed; returns how many fired.
+
+        A callback may schedule (or reschedule its own key); an exception is
+        counted and passed to on_error, the other timers still run.
+        """
+        now = self.clock() if now is None else now
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if not self._live(entry):
+                continue
+            _, _, callback, args = self._timers.pop(entry[2])
+            fired += 1
+            try:
+                callback(*args)
+            except Exception as e:
+                self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(entry[2], e)
+        self.fired += fired
+        return fired
+
+    def stats(self) -> Dict[str, Any]:
+        kinds: Dict[str, int] = {}
+        for key in self._timers:
+            kind = key[0] if isinstance(key, tuple) and key else 'other'
+            kinds[kind] = kinds.get(kind, 0) + 1
+        return {'scheduled': len(self._timers), 'by_kind': kinds, 'heap': len(self._heap), 'fired': self.fired,
+                'cancelled': self.cancelled, 'errors': self.errors, 'compactions': self.compactions}
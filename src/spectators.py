@@ -0,0 +1,104 @@
+"""
+Spectator feed of a server match.
+Viewers get one hidden-information view for everybody: both boards, life,
+mana, deck and graveyard sizes and the number of cards in each hand, never
+the hand cards themselves. The server builds it once per state change and
+sends it with a single emit to the match's spectator Socket.IO room, so
+the cost of a broadcast does not grow with the number of viewers
+(python-socketio encodes a room emit once and writes the same packet to
+every member).
+
+SpectatorFeed numbers the views and can hold them back for a delay
+(tournament streams), releasing them in order; late joiners get the last
+released view. FanoutStats times the broadcasts (building the view, and
+the emit that encodes it and queues it on every socket).
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+
+def spectator_view(game, encode_card: Callable[[Any], dict]) -> Dict[str, Any]:
+    """Hidden-information view of `game`: hands as counts only."""
+    def side(player) -> Dict[str, Any]:
+        return {
+            'champion': player.champion.name if player.champion else None,
+            'life': player.life,
+            'max_life': player.max_life,
+            'mana': player.mana,
+            'max_mana': player.max_mana,
+            'hand_count': len(player.hand),
+            'active_zone': [encode_card(c) for c in player.active_zone],
+            'deck_count': len(player.deck.cards),
+            'graveyard_count': len(player.graveyard)
+        }
+    return {'player': side(game.player), 'ai': side(game.ai), 'turn': game.turn, 'winner': game.winner}
+
+
+class SpectatorFeed:
+    """Numbered spectator views of one match, optionally delayed."""
+
+    def __init__(self, delay: float = 0.0, clock: Callable[[], float] = time.monotonic,
+                 wall_clock: Callable[[], float] = time.time):
+        self.delay = max(0.0, delay)
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.version = 0
+        self.latest: Optional[Dict[str, Any]] = None  # last released view (late joiners)
+        self._held: Deque[Tuple[float, Dict[str, Any]]] = deque()
+
+    def publish(self, view: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Queue a new view; returns the views to send now (in order)."""
+        self.version += 1
+        view['v'] = self.version
+        self._held.append((self.clock() + self.delay, view))
+        return self.due()
+
+    def due(self) -> List[Dict[str, Any]]:
+        """Views whose delay has passed, stamped with their release time ('ts', epoch s)."""
+        now = self.clock()
+        released = []
+        while self._held and self._held[0][0] <= now:
+            view = self._held.popleft()[1]
+            view['ts'] = self.wall_clock()
+            released.append(view)
+        if released:
+            self.latest = released[-1]
+        return released
+
+    def next_release(self) -> Optional[float]:
+        """When the next held view is due (clock time), or None."""
+        return self._held[0][0] if self._held else None
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+
+class FanoutStats:
+    """Cost of the recent spectator broadcasts (seconds in, milliseconds out)."""
+
+    def __init__(self, history: int = 1000):
+        self.broadcasts = 0
+        self.views_sent = 0
+        self._build: Deque[float] = deque(maxlen=history)
+        self._emit: Deque[float] = deque(maxlen=history)
+
+    def record(self, build: Optional[float], emit: float, viewers: int):
+        """One emit to `viewers`; build is None for views released later by the delay buffer."""
+        self.broadcasts += 1
+        self.views_sent += viewers
+        if build is not None:
+            self._build.append(build)
+        self._emit.append(emit)
+
+    def stats(self) -> Dict[str, Any]:
+        def summary(values: Iterable[float]) -> Dict[str, Optional[float]]:
+            values = sorted(values)
+            if not values:
+                return {'p50': None, 'p95': None, 'max': None}
+            pick = lambda p: round(values[min(len(values) - 1, int(p * len(values)))] * 1000, 3)
+            return {'p50': pick(0.5), 'p95': pick(0.95), 'max': round(values[-1] * 1000, 3)}
+
+        return {'broadcasts': self.broadcasts, 'views_sent': self.views_sent,
+                'build_ms': summary(self._build), 'emit_ms': summary(self._emit)}
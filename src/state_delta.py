@@ -0,0 +1,239 @@
+"""
+Versioned delta encoding for game_state_update payloads.
+The server keeps, per connection (sid), the states it sent by version and the
+last version the client acknowledged. Each update is sent as a patch against
+that acknowledged state, or as a full snapshot when there is none (first
+update, reconnect, resync after a version gap). Clients keep a few recent
+states by version, apply the patch on top of the named base and ack the
+result.
+
+Envelopes (JSON-friendly):
+    {'v': 7, 'full': state}                 full snapshot
+    {'v': 8, 'base': 7, 'patch': patch}     changes since version 7
+
+Patches mirror the state's nesting:
+    's': {key: value}    keys set to a new value
+    'd': [key, ...]      keys removed
+    'p': {key: patch}    nested dicts patched recursively
+    'z': {key: edits}    card lists (dicts with a 'uid') edited per card:
+        'o': [uid, ...]            new order (only if membership/order changed)
+        'a': [card, ...]           cards that entered the zone
+        'u': [[uid, {f: v}], ...]  changed fields of cards that stayed
+                                   ([uid, {f: v}, [f, ...]] if fields were removed)
+Lists whose items carry no uid are simply replaced through 's'.
+"""
+
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# States kept per connection while waiting for acks (server) / as patch bases (client)
+HISTORY = 16
+
+
+def _is_card_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(c, dict) and 'uid' in c for c in value)
+
+
+def _diff_zone(old: List[dict], new: List[dict]) -> Optional[dict]:
+    old_by_uid = {c['uid']: c for c in old}
+    edits: Dict[str, Any] = {}
+    order = [c['uid'] for c in new]
+    if order != [c['uid'] for c in old]:
+        edits['o'] = order
+    added = [c for c in new if c['uid'] not in old_by_uid]
+    if added:
+        edits['a'] = added
+    updated = []
+    for card in new:
+        prev = old_by_uid.get(card['uid'])
+        if prev is None or prev == card:
+            continue
+        fields = {k: v for k, v in card.items() if prev.get(k, v) != v or k not in prev}
+        removed = [k for k in prev if k not in card]
+        updated.append([card['uid'], fields, removed] if removed else [card['uid'], fields])
+    if updated:
+        edits['u'] = updated
+    return edits or None
+
+
+def diff_state(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Patch turning `old` into `new` (empty dict if they are equal)."""
+    patch: Dict[str, Any] = {}
+    for key, value in new.items():
+        if key not in old:
+            patch.setdefault('s', {})[key] = value
+            continue
+        prev = old[key]
+        if prev == value:
+            continue
+        if isinstance(value, dict) and isinstance(prev, dict):
+            patch.setdefault('p', {})[key] = diff_state(prev, value)
+        elif _is_card_list(value) and _is_card_list(prev) and len({c['uid'] for c in value}) == len(value):
+            edits = _diff_zone(prev, value)
+            if edits:
+                patch.setdefault('z', {})[key] = edits
+        else:
+            patch.setdefault('s', {})[key] = value
+    removed = [key for key in old if key not in new]
+    if removed:
+        patch['d'] = removed
+    return patch
+
+
+def _apply_zone(old: List[dict], edits: dict) -> List[dict]:
+    cards = {c['uid']: c for c in old}
+    for card in edits.get('a', ()):
+        cards[card['uid']] = card
+    for uid, fields, *removed in edits.get('u', ()):
+        card = dict(cards[uid])
+        card.update(fields)
+        for key in (removed[0] if removed else ()):
+            card.pop(key, None)
+        cards[uid] = card
+    order = edits.get('o')
+    if order is None:
+        order = [c['uid'] for c in old]
+    return [cards[uid] for uid in order]
+
+
+def apply_patch(state: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """New state = `state` + `patch`. `state` is not modified (unchanged parts are shared)."""
+    result = dict(state)
+    for key in patch.get('d', ()):
+        result.pop(key, None)
+    result.update(patch.get('s', {}))
+    for key, sub in patch.get('p', {}).items():
+        result[key] = apply_patch(result.get(key) or {}, sub)
+    for key, edits in patch.get('z', {}).items():
+        result[key] = _apply_zone(result.get(key) or [], edits)
+    return result
+
+
+def is_envelope(payload) -> bool:
+    return isinstance(payload, dict) and 'v' in payload and ('full' in payload or 'patch' in payload)
+
+
+def payload_size(payload) -> int:
+    """Bytes of the payload as JSON text (what Socket.IO puts on the wire)."""
+    return len(json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+
+class _Peer:
+    __slots__ = ('version', 'acked', 'sent')
+
+    def __init__(self):
+        self.version = 0
+        self.acked: Optional[int] = None
+        self.sent: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+
+
+class DeltaEncoder:
+    """Server side: per-sid versions, acked states and patch/full envelopes."""
+
+    def __init__(self, history: int = HISTORY):
+        self.history = history
+        self._peers: Dict[str, _Peer] = {}
+        self.full_sent = 0
+        self.patches_sent = 0
+
+    def encode(self, sid: str, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Envelope for `state`: a patch against what `sid` acked, else a full snapshot."""
+        peer = self._peers.get(sid)
+        if peer is None:
+            peer = self._peers[sid] = _Peer()
+        peer.version += 1
+        version = peer.version
+        base = peer.sent.get(peer.acked) if peer.acked is not None else None
+        if base is None:
+            envelope = {'v': version, 'full': state}
+            self.full_sent += 1
+        else:
+            envelope = {'v': version, 'base': peer.acked, 'patch': diff_state(base, state)}
+            self.patches_sent += 1
+        peer.sent[version] = state
+        # Unacked history is bounded; the acked base is always kept
+        excess = len(peer.sent) - self.history
+        if excess > 0:
+            for old in [v for v in peer.sent if v != peer.acked][:excess]:
+                del peer.sent[old]
+        return envelope
+
+    def ack(self, sid: str, version: int):
+        """Client `sid` applied `version`; older states are no longer needed."""
+        peer = self._peers.get(sid)
+        if peer is None or version not in peer.sent:
+            return
+        if peer.acked is not None and version < peer.acked:
+            return
+        peer.acked = version
+        for old in [v for v in peer.sent if v < version]:
+            del peer.sent[old]
+
+    def reset(self, sid: str):
+        """Start (or restart, on reconnect / resync) delta updates for `sid`.
+
+        Forgets what the client had: the next update is a full snapshot.
+        """
+        peer = self._peers.get(sid)
+        if peer is None:
+            self._peers[sid] = _Peer()
+        else:
+            peer.acked = None
+            peer.sent.clear()
+
+    def drop(self, sid: str):
+        self._peers.pop(sid, None)
+
+    def __contains__(self, sid: str) -> bool:
+        """True if `sid` negotiated delta updates (see reset)."""
+        return sid in self._peers
+
+
+class DeltaDecoder:
+    """Client side: rebuilds full states from envelopes.
+
+    apply() returns the full state, or None when the patch's base is unknown
+    (version gap): unless `awaiting_full` was already set, the caller should
+    then ask the server for a full snapshot. Plain (non-envelope) states pass
+    through unchanged.
+    """
+
+    def __init__(self, history: int = HISTORY):
+        self.history = history
+        self._states: 'OrderedDict[int, Dict[str, Any]]' = OrderedDict()
+        self.version: Optional[int] = None
+        self.awaiting_full = True
+        self.gaps = 0
+
+    def apply(self, payload) -> Optional[Dict[str, Any]]:
+        if not is_envelope(payload):
+            return payload
+        version = payload['v']
+        if 'full' in payload:
+            # Earlier versions stay usable as patch bases: two snapshots can be in flight
+            # (both seats asking for the initial state) and the server patches against
+            # whichever the client acked. Versions at or above this one belong to an
+            # older numbering (the server forgot the connection) and are dropped.
+            for stale in [v for v in self._states if v >= version]:
+                del self._states[stale]
+            self.awaiting_full = False
+            state = payload['full']
+        else:
+            base = self._states.get(payload.get('base'))
+            if base is None:
+                self.gaps += 1
+                self.awaiting_full = True
+                return None
+            state = apply_patch(base, payload['patch'])
+        self._states[version] = state
+        while len(self._states) > self.history:
+            self._states.popitem(last=False)
+        self.version = version
+        return state
+
+    def reset(self):
+        """Drop all states (new match / resync requested): patches wait for a snapshot."""
+        self._states.clear()
+        self.version = None
+        self.awaiting_full = True
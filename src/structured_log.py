@@ -0,0 +1,221 @@
+"""
+Buffered, level-gated structured logging for the server hot path.
+Log calls only check the level (and the per-room trace set) and append a
+tuple to an in-memory queue: formatting (lazy %-args) and the stdout write
+happen in a background flusher, in one write per interval. The flusher is a
+threading.Thread, which under gevent's monkey patching is a greenlet on the
+hub: there use_writer_pool() hands each batch write to a real-thread pool
+(the server passes gevent's ThreadPoolExecutor). The last records are also
+kept in a ring buffer so recent activity can be inspected (e.g. from the
+admin endpoint) even for lines that were never printed.
+
+Records are printed as logfmt lines:
+    12:00:01.234 INFO  game_action room=room_1 role=player action=play_card msg="..."
+
+Per-room tracing: trace_room(room_id) lets DEBUG records of that room
+through regardless of the global level; it can be switched at runtime.
+Settings come from the environment: LOG_LEVEL (INFO), LOG_BUFFER (4096
+records), LOG_FLUSH_INTERVAL (0.5 s).
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, TextIO
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARN', ERROR: 'ERROR'}
+_LEVELS_BY_NAME = {'DEBUG': DEBUG, 'INFO': INFO, 'WARN': WARNING, 'WARNING': WARNING, 'ERROR': ERROR}
+
+
+def parse_level(value, default: int = INFO) -> int:
+    """Level from a name ('debug', 'INFO'...) or number; `default` if unknown."""
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return _LEVELS_BY_NAME.get(str(value).strip().upper(), default)
+
+
+def _quote(value) -> str:
+    text = str(value)
+    if not text or any(c in text for c in ' "='):
+        return '"' + text.replace('"', '\\"') + '"'
+    return text
+
+
+def format_record(record: tuple) -> str:
+    """One logfmt line for a (ts, level, event, room, msg, args, fields) record."""
+    ts, level, event, room, msg, args, fields = record
+    parts = [time.strftime('%H:%M:%S', time.localtime(ts)) + f'.{int(ts % 1 * 1000):03d}',
+             f'{LEVEL_NAMES.get(level, level):5}', event]
+    if room is not None:
+        parts.append(f'room={_quote(room)}')
+    for key, value in fields.items():
+        parts.append(f'{key}={_quote(value)}')
+    if msg is not None:
+        if args:
+            try:
+                msg = msg % args
+            except (TypeError, ValueError):
+                msg = f'{msg} {args!r}'
+        parts.append(f'msg={_quote(msg)}')
+    return ' '.join(parts)
+
+
+class StructuredLogger:
+    """Level-gated logger writing through a queue, a ring buffer and a flusher thread."""
+
+    def __init__(self, level: int = INFO, capacity: int = 4096, flush_interval: float = 0.5,
+                 stream: Optional[TextIO] = None, background: bool = True, writer_pool=None):
+        self.level = level
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.stream = stream
+        self.background = background
+        self.writer_pool = writer_pool
+        self._pending: Deque[tuple] = deque(maxlen=capacity)
+        self._recent: Deque[tuple] = deque(maxlen=capacity)
+        self._traced: Set[str] = set()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.written = 0
+        self.dropped = 0
+
+    # -- gating ---------------------------------------------------------------
+
+    def enabled(self, level: int, room: Optional[str] = None) -> bool:
+        """True if a record at `level` (for `room`) would be kept. Cheap: use it to
+        skip building expensive arguments."""
+        return level >= self.level or (room is not None and room in self._traced)
+
+    def use_writer_pool(self, executor):
+        """Write batches on `executor` (anything with submit()); the flusher waits for each write."""
+        self.writer_pool = executor
+
+    def set_level(self, level):
+        self.level = parse_level(level, self.level)
+
+    def trace_room(self, room: str, enabled: bool = True):
+        """Let (or stop letting) DEBUG records of `room` through, whatever the level."""
+        if enabled:
+            self._traced.add(room)
+        else:
+            self._traced.discard(room)
+
+    def traced_rooms(self) -> List[str]:
+        return sorted(self._traced)
+
+    # -- logging --------------------------------------------------------------
+
+    def log(self, level: int, event: str, msg: Optional[str] = None, *args,
+            room: Optional[str] = None, **fields):
+        if level >= self.level or (room is not None and room in self._traced):
+            self._append(level, event, msg, args, room, fields)
+
+    # The level methods gate inline: a filtered call costs one comparison
+    def debug(self, event: str, msg: Optional[str] = None, *args, room: Optional[str] = None, **fields):
+        if DEBUG >= self.level or (room is not None and room in self._traced):
+            self._append(DEBUG, event, msg, args, room, fields)
+
+    def info(self, event: str, msg: Optional[str] = None, *args, room: Optional[str] = None, **fields):
+        if INFO >= self.level or (room is not None and room in self._traced):
+            self._append(INFO, event, msg, args, room, fields)
+
+    def warning(self, event: str, msg: Optional[str] = None, *args, room: Optional[str] = None, **fields):
+        if WARNING >= self.level or (room is not None and room in self._traced):
+            self._append(WARNING, event, msg, args, room, fields)
+
+    def error(self, event: str, msg: Optional[str] = None, *args, room: Optional[str] = None, **fields):
+        if ERROR >= self.level or (room is not None and room in self._traced):
+            self._append(ERROR, event, msg, args, room, fields)
+
+    def _append(self, level: int, event: str, msg: Optional[str], args: tuple, room: Optional[str], fields: dict):
+        record = (time.time(), level, event, room, msg, args, fields)
+        if len(self._pending) == self.capacity:
+            self.dropped += 1  # the flusher fell behind: the oldest record is lost
+        self._pending.append(record)
+        self._recent.append(record)
+        if not self.background:
+            self.flush()
+        elif self._thread is None:
+            self._start()
+        elif level >= ERROR:
+            self._wake.set()
+
+    # -- output ---------------------------------------------------------------
+
+    def _start(self):
+        with self._flush_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='structured-log', daemon=True)
+            self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Format and write every pending record now (one write)."""
+        with self._flush_lock:
+            lines = []
+            pending = self._pending
+            while pending:
+                lines.append(format_record(pending.popleft()))
+            if not lines:
+                return
+            self._write(self.stream or sys.stdout, '\n'.join(lines) + '\n')
+            self.written += len(lines)
+
+    def _write(self, stream: TextIO, text: str):
+        def write():
+            stream.write(text)
+            stream.flush()
+
+        try:
+            if self.writer_pool is not None:
+                try:
+                    future = self.writer_pool.submit(write)
+                except RuntimeError:
+                    future = None  # pool already shut down (interpreter exit): write here
+                if future is not None:
+                    future.result()
+                    return
+            write()
+        except Exception:
+            pass
+
+    def recent(self, room: Optional[str] = None, limit: int = 200) -> List[str]:
+        """Last records (formatted), optionally only those of `room`."""
+        records = [r for r in list(self._recent) if room is None or r[3] == room]
+        return [format_record(r) for r in records[-limit:]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {'level': LEVEL_NAMES.get(self.level, self.level), 'traced_rooms': self.traced_rooms(),
+                'pending': len(self._pending), 'written': self.written, 'dropped': self.dropped}
+
+
+_default: Optional[StructuredLogger] = None
+
+
+def get_logger() -> StructuredLogger:
+    """The process-wide logger, configured from the environment on first use."""
+    global _default
+    if _default is None:
+        _default = StructuredLogger(level=parse_level(os.environ.get('LOG_LEVEL', 'INFO')),
+                                    capacity=int(os.environ.get('LOG_BUFFER', 4096)),
+                                    flush_interval=float(os.environ.get('LOG_FLUSH_INTERVAL', 0.5)))
+    return _default
@@ -0,0 +1,119 @@
+"""
+Keyed widget reconciliation for the Tk board.
+A KeyedZone owns the child widgets of one container (hand, AI hand, board
+rows). Each render receives the zone's items as (key, item, spec) triples in
+display order; widgets are created only for new keys, destroyed only for keys that
+left, re-configured only when their spec changed and re-placed only when
+their position changed. Widget toolkits stay out of this module: the zone
+calls back into create/update/place/destroy functions supplied by the UI.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class RenderStats(NamedTuple):
+    created: int
+    updated: int
+    moved: int
+    destroyed: int
+    unchanged: int
+
+    @property
+    def changed(self) -> bool:
+        """True when any widget was created, re-configured, moved or destroyed."""
+        return bool(self.created or self.updated or self.moved or self.destroyed)
+
+
+class _Record:
+    __slots__ = ('widget', 'spec', 'position', 'item')
+
+    def __init__(self, widget, spec, position, item):
+        self.widget = widget
+        self.spec = spec
+        self.position = position
+        self.item = item
+
+
+class KeyedZone:
+    """Reconciles one container's widgets against a keyed list of specs.
+
+    Keys identify an item for as long as it stays in the zone (e.g. id(card));
+    the item itself is kept alongside its widget, so id()-based keys cannot be
+    recycled while displayed. Specs are small comparable values (tuples) with
+    everything the widget shows.
+
+    create(item, spec, position) -> widget
+    update(widget, item, old_spec, new_spec, position) -> widget (the same one,
+        or a replacement if it had to be rebuilt)
+    place(widget, position) puts the widget at its display slot
+    destroy(widget) removes it (default: widget.destroy())
+    """
+
+    def __init__(self, create: Callable[[Any, Any, int], Any], update: Callable[[Any, Any, Any, Any, int], Any],
+                 place: Callable[[Any, int], None], destroy: Optional[Callable[[Any], None]] = None):
+        self._create = create
+        self._update = update
+        self._place = place
+        self._destroy = destroy or (lambda widget: widget.destroy())
+        self._records: Dict[Hashable, _Record] = {}
+        self._order: List[Hashable] = []
+
+    def render(self, entries: Iterable[Tuple[Hashable, Any, Any]]) -> RenderStats:
+        """Bring the container in line with `entries` ([(key, item, spec), ...] in order)."""
+        created = updated = moved = unchanged = 0
+        seen = set()
+        new_order = []
+        for position, (key, item, spec) in enumerate(entries):
+            seen.add(key)
+            new_order.append(key)
+            record = self._records.get(key)
+            if record is None:
+                widget = self._create(item, spec, position)
+                self._place(widget, position)
+                self._records[key] = _Record(widget, spec, position, item)
+                created += 1
+                continue
+            changed = False
+            if record.spec != spec:
+                widget = self._update(record.widget, item, record.spec, spec, position)
+                if widget is not record.widget:
+                    record.widget = widget
+                    record.position = -1  # replacement must be placed
+                record.spec = spec
+                updated += 1
+                changed = True
+            if record.position != position:
+                self._place(record.widget, position)
+                record.position = position
+                moved += 1
+                changed = True
+            record.item = item
+            if not changed:
+                unchanged += 1
+        destroyed = 0
+        for key in self._order:
+            if key not in seen:
+                record = self._records.pop(key, None)
+                if record is not None:
+                    self._destroy(record.widget)
+                    destroyed += 1
+        self._order = new_order
+        return RenderStats(created, updated, moved, destroyed, unchanged)
+
+    def widgets(self) -> List[Any]:
+        """Widgets in display order."""
+        return [self._records[key].widget for key in self._order]
+
+    def specs(self) -> List[Any]:
+        """Specs in display order."""
+        return [self._records[key].spec for key in self._order]
+
+    def clear(self):
+        """Destroy every widget (the next render rebuilds the zone)."""
+        for key in self._order:
+            self._destroy(self._records[key].widget)
+        self._records.clear()
+        self._order = []
+
+    def __len__(self) -> int:
+        return len(self._order)
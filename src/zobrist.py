@@ -0,0 +1,342 @@
+"""
+Zobrist-style state hashing and a transposition table.
+
+Game.enable_hashing() switches a game's players, zones and cards to tracking
+subclasses that keep a 64-bit hash up to date as the rules run: every zone
+move, stat change (damage, health, readiness, frozen turns, attacks), mana
+change and life change XORs its old key out and its new key in. Games that
+never enable hashing pay nothing.
+
+Keys come from a splitmix64 mix of (card uid, feature, value) instead of a
+stored random table, so they need no memory and are identical across clones:
+Card.clone() keeps the uid, so transpositions reached through different move
+orders, or in different clones, hash the same.
+
+Deck and graveyard cards are never modified while they sit there (and are
+shared between clones), so those zones hash membership only; hand, rest and
+active zone cards are tracked field by field.
+"""
+
+import itertools
+from typing import List, NamedTuple, Optional
+
+from .models import Card, Deck, Player
+
+MASK64 = (1 << 64) - 1
+
+# Hashed per-card fields
+CARD_FIELDS = ('damage', 'health', 'current_health', 'ready', 'frozen_turns', 'attacked_count', 'ability')
+PLAYER_FIELDS = ('life', 'max_life', 'mana', 'max_mana')
+TRACKED_ZONES = ('hand', 'rest_zone', 'active_zone')
+MEMBERSHIP_ZONES = ('graveyard', 'deck')
+ZONE_CODES = {name: i for i, name in enumerate(TRACKED_ZONES + MEMBERSHIP_ZONES)}
+SIDES = {'player': 0, 'ai': 1}
+
+_FEATURE_IDS = {name: i + 1 for i, name in enumerate(CARD_FIELDS + PLAYER_FIELDS + ('zone', 'turn', 'winner'))}
+_uids = itertools.count(1)
+_string_ids = {}
+
+
+def _mix(x: int) -> int:
+    """splitmix64 finalizer: a well-spread 64-bit key from any integer."""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def _value_id(value) -> int:
+    if value is None:
+        return 0xFFFFF
+    if isinstance(value, str):
+        sid = _string_ids.get(value)
+        if sid is None:
+            sid = _string_ids[value] = len(_string_ids) + 0x100000
+        return sid
+    return int(value) & 0xFFFFF
+
+
+def feature_key(owner: int, feature: str, value) -> int:
+    """Key for one (owner, feature, value) triple; owner is a card uid or a side."""
+    return _mix((owner << 28) ^ (_FEATURE_IDS[feature] << 21) ^ _value_id(value))
+
+
+def card_uid(card: Card) -> int:
+    """Stable identity for hashing; copied along by Card.clone()."""
+    uid = card._zuid
+    if uid is None:
+        uid = card._zuid = next(_uids)
+    return uid
+
+
+def card_key(card: Card, side: int, zone: str) -> int:
+    """Full contribution of a card sitting in a zone."""
+    uid = card_uid(card)
+    key = feature_key(uid, 'zone', side * 8 + ZONE_CODES[zone])
+    for name in CARD_FIELDS:
+        key ^= feature_key(uid, name, getattr(card, name))
+    return key
+
+
+def turn_key(turn: str) -> int:
+    return feature_key(0, 'turn', SIDES.get(turn, 2))
+
+
+def winner_key(winner: Optional[str]) -> int:
+    return feature_key(0, 'winner', SIDES.get(winner, 2)) if winner else 0
+
+
+class ZobristHasher:
+    """Holds the running hash of one Game (zones, cards, life and mana)."""
+
+    def __init__(self, game):
+        self.value = 0
+        for side_name, player in (('player', game.player), ('ai', game.ai)):
+            self.attach_player(player, SIDES[side_name])
+
+    def attach_player(self, player: Player, side: int):
+        player.__class__ = HashedPlayer
+        d = player.__dict__
+        d['_zsink'] = self
+        d['_zside'] = side
+        for name in PLAYER_FIELDS:
+            self.value ^= feature_key(side, name, d[name])
+        for zone in TRACKED_ZONES + ('graveyard',):
+            d[zone] = HashedZone(self, side, zone, d[zone])
+        deck = player.deck
+        deck.__class__ = HashedDeck
+        deck.__dict__['cards'] = HashedZone(self, side, 'deck', deck.cards)
+
+    def recompute(self, game) -> int:
+        """Hash from scratch (for checks); the same value the incremental updates keep."""
+        value = 0
+        for side_name, player in (('player', game.player), ('ai', game.ai)):
+            side = SIDES[side_name]
+            for name in PLAYER_FIELDS:
+                value ^= feature_key(side, name, getattr(player, name))
+            for zone in TRACKED_ZONES + ('graveyard',):
+                for card in getattr(player, zone):
+                    value ^= card_key(card, side, zone)
+            for card in player.deck.cards:
+                value ^= card_key(card, side, 'deck')
+        return value
+
+
+class HashedCard(Card):
+    """Card that reports stat changes to the hash of the zone holding it."""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if name in CARD_FIELDS:
+            sink = self._zsink
+            if sink is not None and self._zrefs & 1:
+                uid = self._zuid
+                sink.value ^= feature_key(uid, name, getattr(self, name)) ^ feature_key(uid, name, value)
+        object.__setattr__(self, name, value)
+
+    def clone(self) -> Card:
+        """Clones are plain, untracked cards (same uid)."""
+        new = Card.clone(self)
+        new.__class__ = Card
+        return new
+
+
+class HashedZone(list):
+    """List of cards that keeps its owner's hash in sync on every change."""
+
+    def __init__(self, hasher: Optional[ZobristHasher], side: int, zone: str, cards=()):
+        super().__init__(cards)
+        self._hasher = hasher
+        self._side = side
+        self._zone = zone
+        self._track = zone in TRACKED_ZONES
+        for card in self:
+            self._add(card)
+
+    def _add(self, card: Card):
+        hasher = self._hasher
+        if hasher is None:
+            return
+        hasher.value ^= card_key(card, self._side, self._zone)
+        if self._track:
+            if type(card) is Card:
+                card.__class__ = HashedCard
+            card._zsink = hasher
+            card._zrefs += 1
+
+    def _remove(self, card: Card):
+        hasher = self._hasher
+        if hasher is None:
+            return
+        hasher.value ^= card_key(card, self._side, self._zone)
+        if self._track:
+            card._zrefs -= 1
+            if card._zrefs <= 0:
+                card._zsink = None
+
+    def detach(self):
+        """Stop hashing this list (it was replaced in its player)."""
+        for card in self:
+            self._remove(card)
+        self._hasher = None
+
+    def append(self, card):
+        super().append(card)
+        self._add(card)
+
+    def extend(self, cards):
+        cards = list(cards)
+        super().extend(cards)
+        for card in cards:
+            self._add(card)
+
+    def __iadd__(self, cards):
+        self.extend(cards)
+        return self
+
+    def insert(self, index, card):
+        super().insert(index, card)
+        self._add(card)
+
+    def pop(self, index=-1):
+        card = super().pop(index)
+        self._remove(card)
+        return card
+
+    def remove(self, card):
+        # list.remove matches by equality: drop exactly the element it would
+        idx = self.index(card)
+        self._remove(self[idx])
+        super().__delitem__(idx)
+
+    def clear(self):
+        for card in self:
+            self._remove(card)
+        super().clear()
+
+    def __delitem__(self, index):
+        removed = self[index] if isinstance(index, slice) else [self[index]]
+        for card in removed:
+            self._remove(card)
+        super().__delitem__(index)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            old = self[index]
+            value = list(value)
+        else:
+            old = [self[index]]
+        for card in old:
+            self._remove(card)
+        super().__setitem__(index, value)
+        for card in (value if isinstance(index, slice) else [value]):
+            self._add(card)
+
+
+class HashedPlayer(Player):
+    """Player whose life, mana and zone reassignments update the game hash."""
+
+    def __setattr__(self, name, value):
+        d = self.__dict__
+        sink = d.get('_zsink')
+        if sink is not None:
+            side = d['_zside']
+            if name in PLAYER_FIELDS:
+                sink.value ^= feature_key(side, name, d[name]) ^ feature_key(side, name, value)
+            elif name in TRACKED_ZONES or name == 'graveyard':
+                old = d.get(name)
+                if isinstance(old, HashedZone):
+                    old.detach()
+                value = HashedZone(sink, side, name, value)
+        object.__setattr__(self, name, value)
+
+    def clone(self) -> Player:
+        """Clones are plain, untracked players."""
+        new = Player.clone(self)
+        new.__class__ = Player
+        new.__dict__.pop('_zsink', None)
+        new.__dict__.pop('_zside', None)
+        return new
+
+
+class HashedDeck(Deck):
+    """Deck whose card list hashes membership."""
+
+    def __setattr__(self, name, value):
+        if name == 'cards':
+            old = self.__dict__.get('cards')
+            if isinstance(old, HashedZone):
+                hasher, side = old._hasher, old._side
+                old.detach()
+                value = HashedZone(hasher, side, 'deck', value)
+        object.__setattr__(self, name, value)
+
+    def clone(self) -> Deck:
+        new = Deck.clone(self)
+        new.__class__ = Deck
+        return new
+
+
+# ==================== TRANSPOSITION TABLE ====================
+
+class TTEntry(NamedTuple):
+    key: int
+    value: float
+    depth: int
+    best_move: object
+    generation: int
+
+
+class TranspositionTable:
+    """Bounded hash -> evaluation cache for search AIs.
+
+    2**size_bits buckets of two slots. Slot 0 is depth-preferred (kept unless
+    the new entry searched at least as deep, or the old one is from an
+    earlier search generation); slot 1 always takes the newest entry.
+    """
+
+    def __init__(self, size_bits: int = 16):
+        self.buckets = 1 << size_bits
+        self.mask = self.buckets - 1
+        self.slots: List[Optional[TTEntry]] = [None] * (2 * self.buckets)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        """Age existing entries: they become the first to be replaced."""
+        self.generation += 1
+
+    def probe(self, key: int, min_depth: int = 0) -> Optional[TTEntry]:
+        """Entry for `key` searched at least `min_depth` deep, or None."""
+        base = (key & self.mask) * 2
+        for entry in (self.slots[base], self.slots[base + 1]):
+            if entry is not None and entry.key == key and entry.depth >= min_depth:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int, value: float, depth: int = 0, best_move=None):
+        base = (key & self.mask) * 2
+        entry = TTEntry(key, value, depth, best_move, self.generation)
+        preferred = self.slots[base]
+        self.stores += 1
+        if preferred is None or preferred.key == key or preferred.generation != self.generation \
+                or depth >= preferred.depth:
+            if preferred is not None and preferred.key != key:
+                self.replacements += 1
+            self.slots[base] = entry
+            return
+        if self.slots[base + 1] is not None and self.slots[base + 1].key != key:
+            self.replacements += 1
+        self.slots[base + 1] = entry
+
+    def __len__(self) -> int:
+        return sum(1 for e in self.slots if e is not None)
+
+    def clear(self):
+        self.slots = [None] * (2 * self.buckets)
+        self.generation = 0
@@ -0,0 +1,59 @@
+"""
+Tests for the shared card image index.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.asset_index import CardAssetIndex, get_asset_index, normalize_card_name
+from src.cards import build_random_deck
+
+
+def _touch(folder, name):
+    with open(os.path.join(folder, name), 'wb') as f:
+        f.write(b'\x89PNG')
+
+
+def test_index_resolves_names_variants_and_icons():
+    """Exact names, spaces vs underscores, variants, icons and prefix matches resolve from one scan."""
+    with tempfile.TemporaryDirectory() as folder:
+        for name in ('archer_1.png', 'archer_0.png', 'archer_0_icon.png', 'Curación Mayor.png',
+                     'curación.png', 'goblin_king_0.png', 'card_back.png', 'notes.txt'):
+            _touch(folder, name)
+        index = CardAssetIndex([folder])
+        assert index.image_for('Archer') == os.path.join(folder, 'archer_0.png')
+        assert index.icon_for('Archer') == os.path.join(folder, 'archer_0_icon.png')
+        assert index.image_for('Curación') == os.path.join(folder, 'curación.png')
+        assert index.image_for('curación_mayor') == os.path.join(folder, 'Curación Mayor.png')
+        assert index.image_for('Goblin') == os.path.join(folder, 'goblin_king_0.png')
+        assert index.card_back() == os.path.join(folder, 'card_back.png')
+        assert index.image_for('Dragon') is None
+        assert len(index) == 6
+        assert index.scans == 1
+
+        # New files are only seen after invalidation (or a detected folder change)
+        _touch(folder, 'dragon_0.png')
+        assert index.image_for('Dragon') is None
+        index.invalidate()
+        assert index.image_for('Dragon') == os.path.join(folder, 'dragon_0.png')
+        assert index.scans == 2
+        assert not index.refresh_if_changed()
+
+
+def test_deck_building_scans_once():
+    """Building decks resolves images without re-listing the asset folder."""
+    index = get_asset_index()
+    build_random_deck(40)
+    scans = index.scans
+    for card in build_random_deck(40).cards:
+        assert card.image_path == index.image_for(card.name)
+    assert index.scans == scans
+    assert normalize_card_name('  Bola_de  Fuego ') == 'bola de fuego'
+
+
+if __name__ == '__main__':
+    test_index_resolves_names_variants_and_icons()
+    test_deck_building_scans_once()
+    print("✅ Asset index tests passed")
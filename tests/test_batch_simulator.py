@@ -0,0 +1,80 @@
+"""
+Tests for the lockstep batch simulator against GameSimulator.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.batch_simulator import BatchGameSimulator
+from src.cards import TROOP_TEMPLATES, SPELL_TEMPLATES
+from src.champions import CHAMPION_LIST
+from src.game_analysis import GameSimulator
+from src.models import Card, Deck, Player
+
+
+def _python_deck(ids, health):
+    """Build the Deck GameSimulator would play from batch deck arrays (draw order)."""
+    cards = []
+    for cid, hp in zip(ids.tolist(), health.tolist()):
+        if cid < len(TROOP_TEMPLATES):
+            name, cost, dmg, ability, ability_desc, ability_type = TROOP_TEMPLATES[cid]
+            cards.append(Card(name=name, cost=cost, damage=dmg, health=hp, current_health=hp,
+                              card_type='troop', ability=ability, ability_desc=ability_desc,
+                              ability_type=ability_type))
+        else:
+            name, cost, dmg, spell_target, spell_effect, description = SPELL_TEMPLATES[cid - len(TROOP_TEMPLATES)]
+            cards.append(Card(name=name, cost=cost, damage=dmg, health=0, current_health=0,
+                              card_type='spell', spell_target=spell_target,
+                              spell_effect=spell_effect, description=description))
+    deck = Deck([])
+    deck.cards = cards[::-1]  # Deck.draw pops from the end
+    return deck
+
+
+def _reference_game(sim, champ1, champ2, deck1, deck2):
+    """Same loop as GameSimulator.simulate_match, with fixed decks."""
+    p1 = Player('P1', deck1, champ1)
+    p2 = Player('P2', deck2, champ2)
+    turns = 0
+    while p1.life > 0 and p2.life > 0 and turns < 50:
+        turns += 1
+        sim._simulate_turn(p1, p2)
+        if p2.life <= 0:
+            break
+        sim._simulate_turn(p2, p1)
+    return p1.life > 0, turns
+
+
+def test_batch_matches_game_simulator_game_by_game():
+    """Every champion pairing gives the same winner and length on identical decks."""
+    batch = BatchGameSimulator(seed=7)
+    reference = GameSimulator()
+    for i, champ1 in enumerate(CHAMPION_LIST):
+        for champ2 in CHAMPION_LIST[i:]:
+            ids, health = batch.random_decks(40)
+            p1_won, turns = batch.simulate_decks(champ1, champ2, ids, health)
+            for g in range(ids.shape[0]):
+                expected = _reference_game(reference, champ1, champ2,
+                                           _python_deck(ids[g, 0], health[g, 0]),
+                                           _python_deck(ids[g, 1], health[g, 1]))
+                assert (bool(p1_won[g]), int(turns[g])) == expected, (champ1.name, champ2.name, g)
+
+
+def test_simulate_matchup_counts_every_game():
+    """Batches split and add up to the requested number of games."""
+    batch = BatchGameSimulator(batch_size=64, seed=1)
+    champ1, champ2 = CHAMPION_LIST[0], CHAMPION_LIST[1]
+    result = batch.simulate_matchup(champ1, champ2, 150)
+    assert result[champ1.name] + result[champ2.name] == 150
+    assert result['turns'] >= 150
+
+
+if __name__ == '__main__':
+    test_batch_matches_game_simulator_game_by_game()
+    test_simulate_matchup_counts_every_game()
+    print("✅ Batch simulator tests passed")
@@ -0,0 +1,89 @@
+"""
+Tests for the struct-packed binary encoding of game traffic.
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.binary_wire import (pack_action, pack_blockers, pack_state, state_cards, unpack_action,
+                             unpack_blockers, unpack_state)
+from src.card_catalog import CardCatalog, CatalogCache, full_card
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+
+
+def _json_state(game, side):
+    # Shape of get_game_state_for_player in server/app.py, cards expanded
+    me, opp = (game.player, game.ai) if side == 'player' else (game.ai, game.player)
+    return {
+        'my_state': {'life': me.life, 'max_life': getattr(me, 'max_life', me.life), 'mana': me.mana,
+                     'max_mana': me.max_mana, 'hand': [full_card(c) for c in me.hand],
+                     'active_zone': [full_card(c) for c in me.active_zone],
+                     'deck_count': len(me.deck.cards), 'graveyard_count': len(me.graveyard)},
+        'opponent_state': {'life': opp.life, 'max_life': getattr(opp, 'max_life', opp.life), 'mana': opp.mana,
+                           'max_mana': opp.max_mana, 'hand_count': len(opp.hand),
+                           'active_zone': [full_card(c) for c in opp.active_zone],
+                           'deck_count': len(opp.deck.cards), 'graveyard_count': len(opp.graveyard)},
+        'turn': game.turn,
+        'is_my_turn': game.turn == side,
+    }
+
+
+def test_states_decode_like_the_json_path():
+    """Every state of real games decodes to the same dict the JSON path delivers."""
+    random.seed(3)
+    catalog = CardCatalog()
+    caches = {'player': CatalogCache(), 'ai': CatalogCache()}
+    checked = []
+
+    def on_update():
+        for side, cache in caches.items():
+            payload = pack_state(game, side, catalog)
+            templates = catalog.pending_cards(side, state_cards(game, side))
+            if templates:
+                cache.update(templates)
+            assert unpack_state(payload, cache) == _json_state(game, side)
+            checked.append(len(payload))
+
+    for _ in range(3):
+        game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                    random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST))
+        game.on_update = on_update
+        run_headless_game(game)
+    assert len(checked) > 50
+
+    # Unknown templates ask for a resync instead of guessing
+    assert state_cards(game, 'player')
+    assert unpack_state(pack_state(game, 'player', catalog), CatalogCache()) is None
+
+
+def test_blockers_and_actions_roundtrip():
+    """request_blockers and game_action come back as the JSON path delivers them."""
+    payload = pack_blockers([0, 2], ['player', ('card', 1)])
+    assert unpack_blockers(payload) == {'attackers': [0, 2], 'targets': ['player', ['card', 1]]}
+
+    actions = [
+        {'action': 'play_card', 'card_index': 3, 'spell_target': None, 'room_id': 'room_1'},
+        {'action': 'play_card', 'card_index': 0, 'spell_target': -1, 'room_id': 'room_1'},
+        {'action': 'end_turn', 'room_id': 'sala ñ'},
+        {'action': 'declare_attacks', 'attackers': [0, 1], 'room_id': 'r',
+         'targets': ['player', {'type': 'card', 'index': 2}]},
+        {'action': 'declare_blockers', 'blockers': {0: 1, 2: 0}, 'room_id': 'r'},
+        {'action': 'activate_ability', 'card_index': 1, 'room_id': 'r'},
+        {'action': 'surrender', 'room_id': 'r'},
+    ]
+    for action in actions:
+        assert unpack_action(pack_action(action)) == action
+    # Anything outside the fixed layouts stays JSON
+    assert pack_action({'action': 'champion_info', 'champion': 'X', 'room_id': 'r'}) is None
+    assert pack_action({'action': 'end_turn', 'room_id': 'r', 'extra': 1}) is None
+    assert pack_action({'action': 'play_card', 'card_index': -5, 'room_id': 'r'}) is None
+
+
+if __name__ == '__main__':
+    test_states_decode_like_the_json_path()
+    test_blockers_and_actions_roundtrip()
+    print("✅ Binary wire tests passed")
@@ -0,0 +1,152 @@
+"""
+Tests for the bot seat: two bots play full server matches through the
+same action path the server uses.
+"""
+
+import sys
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_engine import DataDrivenAI
+from src.bot_player import BotPlayer, BotPool, face_attackers
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.match_journal import apply_action, new_match_game
+
+
+def _play(level1, level2, seed, max_actions=2000):
+    random.seed(seed)
+    game = new_match_game(build_random_deck(size=40), build_random_deck(size=40),
+                          CHAMPION_LIST[seed % len(CHAMPION_LIST)], CHAMPION_LIST[(seed + 1) % len(CHAMPION_LIST)], seed)
+    bots = {'player': BotPlayer(level1), 'ai': BotPlayer(level2)}
+    side = {'player': game.player, 'ai': game.ai}
+    other = {'player': 'ai', 'ai': 'player'}
+    bots['player'].new_turn()
+    kinds = set()
+    for _ in range(max_actions):
+        role = game.turn
+        action = bots[role].next_action(side[role], side[other[role]])
+        kinds.add(action['action'])
+        pending = apply_action(game, role, action)
+        if pending is not None:
+            defender = other[role]
+            attackers = face_attackers(side[role], pending['attackers'], pending['targets'])
+            candidates = {i: game.block_candidates(card, role) for i, card in attackers}
+            answer = bots[defender].choose_blockers(side[defender], attackers, candidates)
+            assert all(b in candidates[a] for a, b in answer['blockers'].items())
+            apply_action(game, defender, answer, pending)
+        if game.winner is not None:
+            return game, kinds
+        if action['action'] == 'end_turn':
+            bots[game.turn].new_turn()
+    raise AssertionError('match did not finish')
+
+
+def test_bots_finish_matches():
+    """Bots at several levels always bring a match to a winner, using every kind of action."""
+    seen = set()
+    for seed, (level1, level2) in enumerate([(1, 10), (5, 5), (10, 3), (7, 2)]):
+        game, kinds = _play(level1, level2, seed)
+        assert game.winner in ('player', 'ai')
+        seen |= kinds
+    assert {'play_card', 'declare_attacks', 'end_turn'} <= seen
+
+
+def test_turn_action_cap():
+    """A bot whose actions are ignored still ends its turn."""
+    random.seed(1)
+    game = new_match_game(build_random_deck(size=40), build_random_deck(size=40), CHAMPION_LIST[0], CHAMPION_LIST[1], 1)
+    bot = BotPlayer(5)
+    bot.new_turn()
+    game.player.mana = game.player.max_mana = 10
+    actions = [bot.next_action(game.player, game.ai) for _ in range(BotPlayer.MAX_ACTIONS_PER_TURN + 1)]
+    assert actions[-1] == {'action': 'end_turn'}
+
+
+def test_pool_measures_and_falls_back():
+    """Decisions run on the executor; late or failing ones return the fallback."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pool = BotPool(executor, timeout=0.2)
+        assert pool.decide(lambda a, b: a + b, 2, 3, fallback=0) == 5
+        assert pool.decide(time.sleep, 1, fallback='late') == 'late'
+        assert pool.decide(lambda: 1 / 0, fallback='safe') == 'safe'
+    stats = pool.stats()
+    assert (stats['decisions'], stats['timeouts'], stats['errors'], stats['in_flight']) == (1, 1, 1, 0)
+    assert stats['think_ms']['p50'] is not None and stats['wait_ms']['max'] >= stats['think_ms']['max']
+
+
+def test_mcts_decision_budget():
+    """MCTS searches for several attackers share one decision budget; fork() leaves the seat alone."""
+    random.seed(2)
+    game = new_match_game(build_random_deck(size=40), build_random_deck(size=40), CHAMPION_LIST[0], CHAMPION_LIST[1], 2)
+    game.turn = 'ai'  # server bots always hold the 'ai' seat, which MCTS plays
+    zone = game.ai.active_zone
+    for card in [c for c in game.ai.deck.cards if c.card_type != 'spell'][:4]:
+        game.ai.deck.cards.remove(card)
+        card.ready = True
+        zone.append(card)
+    game.ai.mana = 0
+    bot = BotPlayer(11, decision_budget=0.4)
+    bot.new_turn()
+    worker = bot.fork()
+    start = time.perf_counter()
+    view = game.clone()  # what the server hands to the pool
+    action = worker.next_action(view.ai, view.player, view)
+    elapsed = time.perf_counter() - start
+    assert action['action'] == 'declare_attacks' and len(action['attackers']) == len(action['targets'])
+    assert elapsed < 0.4 + 0.3, elapsed  # one budget, not 0.5 s per attacker
+    assert (bot._turn_actions, bot._attacked) == (0, False)
+    assert (worker._turn_actions, worker._attacked) == (1, True)
+
+
+
+class _HoldingBrain(DataDrivenAI):
+    """Attacks with everything but answers "hold" ((False, None)) for the cards in `held`."""
+
+    def __init__(self, player, config, held):
+        super().__init__(player, config)
+        self.held = held
+
+    def choose_spell_to_cast(self, *args):
+        return None
+
+    def choose_cards_to_play(self, mana):
+        return []
+
+    def choose_attackers(self, zone):
+        return list(range(len(zone)))
+
+    def choose_attack_target(self, attacker, enemy_cards, enemy_life):
+        return (False, None) if attacker in self.held else (True, None)
+
+
+def test_held_attackers_stay_home():
+    """An attacker the brain holds is not declared (it used to attack face); all held: end_turn."""
+    random.seed(3)
+    game = new_match_game(build_random_deck(size=40), build_random_deck(size=40), CHAMPION_LIST[0], CHAMPION_LIST[1], 3)
+    zone = game.ai.active_zone
+    for card in [c for c in game.ai.deck.cards if c.card_type != 'spell'][:3]:
+        game.ai.deck.cards.remove(card)
+        card.ready = True
+        zone.append(card)
+    bot = BotPlayer(11)
+    bot._brain = lambda me, game=None: _HoldingBrain(me, bot.config, held=[zone[0], zone[2]])
+    bot.new_turn()
+    action = bot.next_action(game.ai, game.player, game)
+    assert action == {'action': 'declare_attacks', 'attackers': [1], 'targets': ['player']}
+
+    bot._brain = lambda me, game=None: _HoldingBrain(me, bot.config, held=list(zone))
+    bot.new_turn()
+    assert bot.next_action(game.ai, game.player, game) == {'action': 'end_turn'}
+
+
+if __name__ == '__main__':
+    test_bots_finish_matches()
+    test_turn_action_cap()
+    test_pool_measures_and_falls_back()
+    test_mcts_decision_budget()
+    test_held_attackers_stay_home()
+    print("✅ Bot player tests passed")
@@ -0,0 +1,71 @@
+"""
+Tests for the template-id card encoding of server payloads.
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.card_catalog import CardCatalog, CatalogCache, full_card
+from src.cards import build_random_deck
+from src.state_delta import DeltaDecoder, DeltaEncoder
+
+
+def _cards(seed):
+    random.seed(seed)
+    cards = build_random_deck(40).cards
+    for i, card in enumerate(cards[:10]):
+        card.ready = bool(i % 2)
+        card.current_health = max(card.health - i % 3, 0)
+        card.damage += i % 2
+        card.frozen_turns = i % 4 == 0
+    return cards
+
+
+def test_compact_cards_expand_to_full_cards():
+    """Expanding compact cards gives back exactly the full wire dicts."""
+    catalog, cache = CardCatalog(), CatalogCache()
+    cards = _cards(1)
+    state = {'hand': [catalog.encode_card(c) for c in cards], 'turn': 'ai'}
+    assert cache.expand(state) is None and cache.missing == 1  # catalog not received yet
+
+    templates = catalog.pending('sid', state)
+    cache.update(templates)
+    assert cache.expand(state) == {'hand': [full_card(c) for c in cards], 'turn': 'ai'}
+    assert len(templates['templates']) == len({c['t'] for c in state['hand']})
+    # Entries go once per connection; a resync or a new connection sends them again
+    assert catalog.pending('sid', state) is None
+    catalog.reset('sid')
+    assert catalog.pending('sid', state) == templates
+    assert catalog.pending('other', state) == templates
+
+    # Untouched copies of a card are only uid + template id
+    played = {c.name for c in cards[:10]}
+    fresh = [c for c in cards[10:] if c.name not in played]
+    assert fresh and set(catalog.encode_card(fresh[0])) == {'uid', 't'}
+
+
+def test_compact_cards_through_delta_updates():
+    """Fields going back to their defaults are removed from the client's copy too."""
+    catalog, cache = CardCatalog(), CatalogCache()
+    encoder, decoder = DeltaEncoder(), DeltaDecoder()
+    encoder.reset('sid')
+    cards = _cards(2)[:6]
+    for step in range(12):
+        for i, card in enumerate(cards):
+            card.ready = (step + i) % 3 == 0
+            card.current_health = card.health - (step + i) % 2
+        state = {'active_zone': [catalog.encode_card(c) for c in cards]}
+        templates = catalog.pending('sid', state)
+        if templates:
+            cache.update(templates)
+        envelope = encoder.encode('sid', state)
+        assert cache.expand(decoder.apply(envelope)) == {'active_zone': [full_card(c) for c in cards]}
+        encoder.ack('sid', envelope['v'])
+
+
+if __name__ == '__main__':
+    test_compact_cards_expand_to_full_cards()
+    test_compact_cards_through_delta_updates()
+    print("✅ Card catalog tests passed")
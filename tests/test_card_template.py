@@ -0,0 +1,54 @@
+"""
+Tests for shared card templates and slotted per-card state.
+"""
+
+import sys
+import os
+import copy
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck, create_card
+
+
+def test_cards_share_interned_templates():
+    """Copies of a card share one template; per-card state stays separate."""
+    a = create_card('Goblin', 1, 2, health=3)
+    b = create_card('Goblin', 1, 2, health=3)
+    assert a.template is b.template
+    assert a == b
+    a.current_health -= 1
+    assert a != b
+    try:
+        a.unknown_attribute = 1
+        assert False, 'slotted cards should reject unknown attributes'
+    except AttributeError:
+        pass
+
+    # Writing a template field re-points only this card at another interned template
+    b.description = 'Custom text'
+    assert b.template is not a.template
+    assert a.description is None and b.description == 'Custom text'
+    assert create_card('Goblin', 1, 2, description='Custom text').template is b.template
+
+
+def test_compatibility_view_clone_and_copy():
+    """vars(), clone, copy and pickle keep every field."""
+    for card in build_random_deck(40).cards:
+        card.frozen_turns = 2
+        view = vars(card)
+        assert view['name'] == card.name and view['frozen_turns'] == 2
+        assert set(view) >= {'name', 'cost', 'damage', 'health', 'current_health', 'ready',
+                             'card_type', 'ability', 'ability_desc', 'spell_target', 'description'}
+        for twin in (card.clone(), copy.deepcopy(card), pickle.loads(pickle.dumps(card))):
+            assert vars(twin) == view
+            assert twin.template is card.template
+        clone = card.clone()
+        clone.damage += 5
+        assert card.damage == view['damage']
+
+
+if __name__ == '__main__':
+    test_cards_share_interned_templates()
+    test_compatibility_view_clone_and_copy()
+    print("✅ Card template tests passed")
@@ -0,0 +1,119 @@
+"""
+Tests for the joint combat solver.
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck
+from src.combat_solver import enforce_taunt, evaluate_blocks, solve_blocks
+from src.headless import create_headless_game
+from src.models import Card
+
+
+def _creature(rng, name='C'):
+    dmg = rng.randint(1, 7)
+    hp = rng.randint(1, 8)
+    return Card(name, rng.randint(1, 5), dmg, health=hp, current_health=hp, ready=True)
+
+
+def _brute_force(attackers, defenders, life, candidates):
+    """Best score over every injective blocker map."""
+    best = float('-inf')
+
+    def walk(i, blocks, used):
+        nonlocal best
+        if i == len(attackers):
+            best = max(best, evaluate_blocks(blocks, attackers, defenders, life))
+            return
+        atk_idx = attackers[i][0]
+        walk(i + 1, blocks, used)
+        for b in candidates[atk_idx]:
+            if b not in used:
+                blocks[atk_idx] = b
+                walk(i + 1, blocks, used | {b})
+                del blocks[atk_idx]
+
+    walk(0, {}, frozenset())
+    return best
+
+
+def test_solver_is_optimal_on_small_boards():
+    """Matches exhaustive search and never reuses a defender."""
+    rng = random.Random(11)
+    for _ in range(200):
+        attackers = [(i, _creature(rng)) for i in range(rng.randint(1, 5))]
+        defenders = [_creature(rng) for _ in range(rng.randint(0, 5))]
+        life = rng.randint(1, 25)
+        candidates = {i: [d for d in range(len(defenders)) if rng.random() < 0.8] for i, _ in attackers}
+        blocks = solve_blocks(attackers, defenders, life, candidates)
+        assert len(set(blocks.values())) == len(blocks)
+        assert all(b in candidates[a] for a, b in blocks.items())
+        score = evaluate_blocks(blocks, attackers, defenders, life)
+        assert abs(score - _brute_force(attackers, defenders, life, candidates)) < 1e-9
+
+
+def test_solver_blocks_lethal_and_stays_fast_on_big_boards():
+    """Avoids lethal when possible; 8 vs 8 resolves quickly."""
+    attackers = [(0, Card('A', 3, 6, health=6, current_health=6, ready=True)),
+                 (1, Card('B', 3, 6, health=6, current_health=6, ready=True))]
+    defenders = [Card('Wall', 2, 1, health=1, current_health=1, ready=True)]
+    assert solve_blocks(attackers, defenders, life=10) in ({0: 0}, {1: 0})
+
+    rng = random.Random(5)
+    attackers = [(i, _creature(rng)) for i in range(8)]
+    defenders = [_creature(rng) for _ in range(8)]
+    start = time.perf_counter()
+    blocks = solve_blocks(attackers, defenders, life=20)
+    assert time.perf_counter() - start < 0.5
+    assert len(set(blocks.values())) == len(blocks)
+
+
+def test_ai_defender_uses_each_blocker_once():
+    """Game.declare_attacks_with_targets applies the joint plan."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40), ai_level=10)
+    game.player.active_zone = [Card('Knight', 3, 5, health=5, current_health=5, ready=True) for _ in range(3)]
+    game.ai.active_zone = [Card('Golem', 5, 9, health=9, current_health=9, ready=True)]
+    game.ai.champion = None
+    plan = game.ai_choose_blockers(list(enumerate(game.player.active_zone)))
+    assert len(plan) == 1 and list(plan.values()) == [0]
+    life_before = game.ai.life
+    game.declare_attacks_with_targets({0: 'player', 1: 'player', 2: 'player'})
+    assert game.ai.life == life_before - 10  # one Knight blocked, two hit
+
+
+def test_taunt_defender_must_block():
+    """A Taunt defender blocks even when another blocker would be the better trade."""
+    giant = Card('Giant', 6, 9, health=9, current_health=9, ready=True)
+    bear = Card('Bear', 1, 1, health=1, current_health=1, ready=True)
+    ox = Card('Ox', 5, 1, health=4, current_health=4, ready=True)
+    wall = Card('Wall', 5, 1, health=4, current_health=4, ready=True, ability='Taunt')
+    attackers = [(0, giant)]
+    candidates = {0: [0, 1]}
+    assert solve_blocks(attackers, [bear, ox], 30, candidates) == {0: 0}  # the Bear chumps
+    assert solve_blocks(attackers, [bear, wall], 30, candidates) == {0: 1}
+    # Greedy plans get the Taunt defender swapped in
+    assert enforce_taunt({}, attackers, [bear, wall], candidates) == {0: 1}
+    assert enforce_taunt({0: 0}, attackers, [bear, wall], candidates) == {0: 1}
+    assert enforce_taunt({}, attackers, [bear, wall], {0: [0]}) == {}  # cannot reach it
+
+    for level in (1, 10):
+        game = create_headless_game(build_random_deck(40), build_random_deck(40), ai_level=level)
+        game.player.active_zone = [Card('Giant', 6, 9, health=9, current_health=9, ready=True)]
+        game.ai.active_zone = [Card('Wall', 2, 1, health=2, current_health=2, ready=True, ability='Taunt')]
+        game.ai.champion = None
+        life_before = game.ai.life
+        game.declare_attacks_with_targets({0: 'player'})
+        assert game.ai.life == life_before, level
+        assert not game.ai.active_zone, level  # the Wall took the hit and died
+
+
+if __name__ == '__main__':
+    test_solver_is_optimal_on_small_boards()
+    test_solver_blocks_lethal_and_stays_fast_on_big_boards()
+    test_ai_defender_uses_each_blocker_once()
+    test_taunt_defender_must_block()
+    print("✅ Combat solver tests passed")
@@ -0,0 +1,102 @@
+"""
+Tests for Game.clone() / snapshot() / restore().
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck
+from src.champions import get_champion_by_name
+from src.headless import create_headless_game, play_player_turn
+from src.ai_engine import DataDrivenAI
+
+
+def _zone_state(player):
+    return {zone: [dict(c.__dict__) for c in getattr(player, zone)]
+            for zone in ('hand', 'rest_zone', 'active_zone', 'graveyard')}
+
+
+def _mid_game():
+    game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                get_champion_by_name('Brutus'), get_champion_by_name('Mystara'))
+    brain = DataDrivenAI(game.player, game.ai_brain.config)
+    game.ask_blocker = lambda attacker: None
+    for _ in range(4):
+        play_player_turn(game, brain)
+        game.end_turn()
+    if game.player.active_zone:
+        game.player.active_zone[0].frozen_turns = 2
+        game.player.active_zone[0].attacked_count = 1
+    return game
+
+
+def test_clone_reproduces_state_exactly():
+    """Zones (with frozen_turns and attacked_count), life and mana match the original."""
+    game = _mid_game()
+    clone = game.clone()
+    for original, copy in ((game.player, clone.player), (game.ai, clone.ai)):
+        assert _zone_state(copy) == _zone_state(original)
+        assert (copy.life, copy.mana, copy.max_mana) == (original.life, original.mana, original.max_mana)
+        assert [c.__dict__ for c in copy.deck.cards] == [c.__dict__ for c in original.deck.cards]
+    assert clone.turn == game.turn
+    assert clone.ai_brain.player is clone.ai
+    assert clone.on_update is None
+
+
+def test_clone_is_independent():
+    """Playing on the clone (including drawing shared deck cards) leaves the original untouched."""
+    game = _mid_game()
+    before = (_zone_state(game.player), _zone_state(game.ai), game.player.life, game.ai.life,
+              [dict(c.__dict__) for c in game.player.deck.cards])
+    clone = game.clone()
+    brain = DataDrivenAI(clone.player, clone.ai_brain.config)
+    clone.ask_blocker = lambda attacker: None
+    for _ in range(3):
+        play_player_turn(clone, brain)
+        for card in clone.player.hand + clone.player.active_zone:
+            card.damage += 5
+        clone.end_turn()
+    after = (_zone_state(game.player), _zone_state(game.ai), game.player.life, game.ai.life,
+             [dict(c.__dict__) for c in game.player.deck.cards])
+    assert after == before
+
+
+def test_snapshot_restore_rewinds():
+    """restore() brings back the snapshot state and can be used repeatedly."""
+    game = _mid_game()
+    snap = game.snapshot()
+    expected = (_zone_state(game.player), _zone_state(game.ai), game.player.life, game.ai.life)
+    for _ in range(2):
+        brain = DataDrivenAI(game.player, game.ai_brain.config)
+        play_player_turn(game, brain)
+        game.end_turn()
+        game.restore(snap)
+        assert (_zone_state(game.player), _zone_state(game.ai), game.player.life, game.ai.life) == expected
+        assert game.ai_brain.player is game.ai
+
+
+def test_restore_rewinds_logs():
+    """action_log and the recently played lists come back to their snapshot contents."""
+    game = _mid_game()
+    game.log_enabled = True
+    game.log_action("before snapshot")
+    snap = game.snapshot()
+    expected = (game.action_log[:], game.ai_played[:], game.player_played[:])
+    for _ in range(2):
+        brain = DataDrivenAI(game.player, game.ai_brain.config)
+        play_player_turn(game, brain)
+        game.log_action("after snapshot")
+        game.ai_played.append(game.ai.deck.cards[0])
+        game.end_turn()
+        game.restore(snap)
+        assert (game.action_log, game.ai_played, game.player_played) == expected
+        assert game.action_log[-1] == "before snapshot"
+
+
+if __name__ == '__main__':
+    test_clone_reproduces_state_exactly()
+    test_clone_is_independent()
+    test_snapshot_restore_rewinds()
+    test_restore_rewinds_logs()
+    print("✅ Clone tests passed")
@@ -0,0 +1,41 @@
+"""
+Tests for the headless Game mode and match driver.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck
+from src.champions import get_champion_by_name
+from src.headless import create_headless_game, run_headless_game
+
+
+def test_headless_game_plays_to_completion():
+    """Headless games finish without UI callbacks and record a winner."""
+    for _ in range(20):
+        game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                    get_champion_by_name('Brutus'), get_champion_by_name('Lumina'))
+        assert game.on_update is None
+        winner = run_headless_game(game)
+        assert winner in ('player', 'ai', None)
+        if winner == 'player':
+            assert game.ai.life == 0
+        elif winner == 'ai':
+            assert game.player.life == 0
+        # No log text is built unless someone enables it
+        assert game.action_log == []
+
+
+def test_headless_log_can_be_enabled():
+    """Turning log_enabled on restores the formatted action log."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40))
+    game.log_enabled = True
+    game.log_action("%s plays %s (Cost %s).", 'Player', 'Goblin', 1)
+    assert game.action_log[-1] == "Player plays Goblin (Cost 1)."
+
+
+if __name__ == '__main__':
+    test_headless_game_plays_to_completion()
+    test_headless_log_can_be_enabled()
+    print("✅ Headless tests passed")
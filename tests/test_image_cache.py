@@ -0,0 +1,45 @@
+"""
+Tests for the decoded card image cache.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.image_cache import Image, ImageCache
+
+
+def test_cache_decodes_once_and_respects_budget():
+    """Repeated lookups hit memory; the LRU stays under its byte budget."""
+    if not ImageCache.available():
+        # Headless runtime without Pillow: lookups degrade to None, never raise
+        cache = ImageCache()
+        assert cache.get_image('missing.png', (64, 96)) is None
+        assert cache.warm_up([('missing.png', (64, 96), 0)], photos=False) == 0
+        return
+    with tempfile.TemporaryDirectory() as folder:
+        paths = []
+        for i in range(6):
+            path = os.path.join(folder, f'card_{i}.png')
+            Image.new('RGB', (200, 300), color=(i * 40, 0, 0)).save(path)
+            paths.append(path)
+        one = 64 * 96 * 3
+        cache = ImageCache(budget_bytes=4 * one)
+        assert cache.warm_up([(p, (64, 96), 0) for p in paths[:3]], photos=False) == 3
+        decodes = cache.decodes
+        for _ in range(5):
+            for p in paths[:3]:
+                assert cache.get_image(p, (64, 96)).size == (64, 96)
+        assert cache.decodes == decodes
+        assert cache.get_image(paths[0], (64, 96), rotate=90) is not None  # separate entry
+        for p in paths[3:]:
+            cache.get_image(p, (64, 96))
+        assert cache.nbytes <= cache.budget_bytes
+        assert cache.evictions >= 3
+        assert cache.get_image(os.path.join(folder, 'nope.png'), (64, 96)) is None
+
+
+if __name__ == '__main__':
+    test_cache_decodes_once_and_respects_budget()
+    print("✅ Image cache tests passed")
@@ -0,0 +1,124 @@
+"""
+Tests for Game.legal_actions() and make_action()/unmake_action().
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game
+from src.models import Card
+
+
+def _full_state(game):
+    state = [game.winner]
+    for p in (game.player, game.ai):
+        state.append((p.life, p.max_life, p.mana, p.max_mana,
+                      [id(c) for c in p.deck.cards],
+                      [(id(c), dict(c.__dict__)) for c in p.hand + p.active_zone + p.graveyard]))
+    return state
+
+
+def _walk(game, depth, rng):
+    """Random tree walk: every unmake must restore the exact position."""
+    if depth == 0:
+        return
+    before = _full_state(game)
+    actions = game.legal_actions(with_blocks=True)
+    for action in rng.sample(actions, min(3, len(actions))):
+        game.make_action(action)
+        _walk(game, depth - 1, rng)
+        game.unmake_action()
+        assert _full_state(game) == before, action
+
+
+def test_make_unmake_restores_position():
+    """Walking the move tree and unmaking leaves zones, cards, life and mana untouched."""
+    rng = random.Random(3)
+    for _ in range(15):
+        game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                    rng.choice(CHAMPION_LIST), rng.choice(CHAMPION_LIST))
+        game.ask_blocker = lambda attacker: None
+        for _ in range(rng.randint(2, 5)):
+            game.player.max_mana = game.player.mana = 6
+            _walk(game, 3, rng)
+            # Advance the real game a little
+            for _ in range(3):
+                actions = game.legal_actions()
+                if actions:
+                    game.make_action(actions[0])
+            game._undo_stack.clear()
+            if game.winner:
+                break
+            game.end_turn()
+
+
+def test_legal_actions_respect_mana_targets_and_readiness():
+    """Unaffordable cards, frozen attackers and blockers are filtered like the UI does."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40))
+    game.player.hand = [Card('Golem', 5, 9, health=9),
+                        Card('Rayo', 2, 3, card_type='spell', spell_target='enemy_or_player', spell_effect='damage'),
+                        Card('Destierro', 4, 0, card_type='spell', spell_target='enemy', spell_effect='destroy')]
+    game.player.mana = 4
+    ready = Card('Knight', 3, 5, health=5, current_health=5, ready=True)
+    frozen = Card('Archer', 2, 3, health=3, current_health=3, ready=True)
+    frozen.frozen_turns = 1
+    game.player.active_zone = [ready, frozen]
+    game.ai.active_zone = [Card('Wall', 2, 1, health=1, current_health=1, ready=True)]
+
+    actions = game.legal_actions()
+    plays = {(a.index, a.target) for a in actions if a.kind == 'play'}
+    assert plays == {(1, 'player'), (1, 0), (2, 0)}  # Golem too expensive
+    attacks = {(a.index, a.target) for a in actions if a.kind == 'attack'}
+    assert attacks == {(0, 'player'), (0, ('card', 0))}  # frozen Archer cannot attack
+
+    blocks = [a.blocker for a in game.legal_actions(with_blocks=True)
+              if a.kind == 'attack' and a.target == 'player']
+    assert blocks == [None, 0]
+
+
+
+def test_legal_actions_only_for_side_to_move():
+    """Plays, abilities and attacks are listed for the side whose turn it is, the same for both sides."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40))
+    for p in (game.player, game.ai):
+        p.hand = [Card('Knight', 3, 5, health=5)]
+        p.mana = 3
+        p.active_zone = [Card('Archer', 2, 3, health=3, current_health=3, ready=True)]
+    assert game.turn == 'player'
+    assert game.legal_actions('ai') == []
+    assert {a.kind for a in game.legal_actions('player')} == {'play', 'attack'}
+    game.turn = 'ai'
+    assert game.legal_actions('player') == []
+    assert {(a.owner, a.kind) for a in game.legal_actions()} == {('ai', 'play'), ('ai', 'attack')}
+
+
+def test_taunt_defender_must_block():
+    """With a Taunt defender able to block, blocking with it is the only legal answer to a lone attacker."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40))
+    game.player.active_zone = [Card('Knight', 3, 5, health=5, current_health=5, ready=True),
+                               Card('Eagle', 2, 2, health=2, current_health=2, ready=True, ability='Volar')]
+    game.ai.active_zone = [Card('Archer', 2, 3, health=3, current_health=3, ready=True),
+                           Card('Wall', 2, 1, health=1, current_health=1, ready=True, ability='Taunt'),
+                           Card('Hawk', 1, 1, health=1, current_health=1, ready=True, ability='Volar')]
+    knight, eagle = game.player.active_zone
+    assert game.legal_blockers(knight) == [1]
+    assert game.legal_blockers(eagle) == [None, 2]  # the Wall cannot block a flyer
+    assert game.block_candidates(knight) == [0, 1, 2]  # a joint block may use the others on other attackers
+    blocks = {(a.index, a.blocker) for a in game.legal_actions(with_blocks=True)
+              if a.kind == 'attack' and a.target == 'player'}
+    assert blocks == {(0, 1), (1, None), (1, 2)}
+
+    game.ai.active_zone[1].frozen_turns = 1  # a frozen Taunt defender cannot block: free choice again
+    assert game.legal_blockers(knight) == [None, 0, 2]
+
+
+if __name__ == '__main__':
+    test_make_unmake_restores_position()
+    test_legal_actions_respect_mana_targets_and_readiness()
+    test_legal_actions_only_for_side_to_move()
+    test_taunt_defender_must_block()
+    print("✅ Legal move tests passed")
@@ -0,0 +1,73 @@
+"""
+Tests for MassiveSimulator's process-pool mode (shards and merged results).
+"""
+
+import sys
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import massive_simulator
+from massive_simulator import CHAMPION_LIST, MassiveSimulator, _merge_card_stats, _simulate_shard
+
+
+def test_shards_cover_every_game_once():
+    """Every (matchup, game) lands in exactly one shard, and shards are balanced."""
+    matchups = len(CHAMPION_LIST) * (len(CHAMPION_LIST) - 1) // 2
+    for games_per_matchup in (1, 3, 7):
+        sim = MassiveSimulator(games_per_matchup=games_per_matchup)
+        expected = sorted((i, j, g) for i in range(len(CHAMPION_LIST)) for j in range(i + 1, len(CHAMPION_LIST))
+                          for g in range(1, games_per_matchup + 1))
+        for num_shards in (1, 2, 5, 100):
+            shards = sim._build_shards(num_shards)
+            games = sorted((i, j, g) for segments in shards for i, j, first, last in segments
+                           for g in range(first, last + 1))
+            assert games == expected
+            sizes = [sum(last - first + 1 for _, _, first, last in segments) for segments in shards]
+            assert len(shards) == min(num_shards, matchups * games_per_matchup)
+            assert max(sizes) - min(sizes) <= 1
+
+
+def test_parallel_run_merges_shards():
+    """A seeded 2-worker run reports every game and the same totals as running its shards one by one."""
+    cwd = os.getcwd()
+    real_time = massive_simulator.time
+    # No 5-second "Ctrl+C to cancel" pause
+    massive_simulator.time = SimpleNamespace(sleep=lambda seconds: None, time=time.time)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            sim = MassiveSimulator(games_per_matchup=2, workers=2, seed=11)
+            results = sim.run_massive_simulation()
+
+            matchups = len(CHAMPION_LIST) * (len(CHAMPION_LIST) - 1) // 2
+            assert sim.game_count == sim.total_games == matchups * 2
+            assert len(results) == matchups
+            for key, entry in results.items():
+                champ1, champ2 = key.split(' vs ')
+                assert entry['games'] == 2 and entry[champ1] + entry[champ2] == 2
+
+            expected_stats = {}
+            for shard_id, segments in enumerate(sim._build_shards(sim.workers * 4)):
+                shard = _simulate_shard((shard_id, segments, 2, sim.total_target, 'check', 11 + shard_id))
+                _merge_card_stats(expected_stats, shard['card_stats'])
+            assert sim.card_stats == expected_stats
+
+            with open(sim._card_stats_path, encoding='utf-8') as f:
+                rows = f.read().splitlines()
+            assert rows[0] == 'card,drawn,played,destroyed'
+            assert len(rows) - 1 == len(expected_stats)
+            run_logs = [name for name in os.listdir('data')
+                        if name.startswith('MASSIVE_LOGS_') and not name.startswith('MASSIVE_LOGS_check')]
+            assert len(run_logs) == len(sim._build_shards(sim.workers * 4))  # one log per shard
+    finally:
+        massive_simulator.time = real_time
+        os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    test_shards_cover_every_game_once()
+    test_parallel_run_merges_shards()
+    print("✅ Massive simulator tests passed")
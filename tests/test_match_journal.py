@@ -0,0 +1,130 @@
+"""
+Tests for the per-room match journal and its replayer.
+"""
+
+import sys
+import os
+import random
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.match_journal import (JournalWriter, Replayer, apply_action, load_journal, match_header, new_match_game,
+                               prune_journals)
+
+
+def _fingerprint(game):
+    """Everything visible about a position (card uids differ between runs)."""
+    def side(p):
+        zone = lambda cards: [(c.name, c.damage, c.current_health, c.ready, c.frozen_turns) for c in cards]
+        return (p.life, p.mana, p.max_mana, zone(p.hand), zone(p.active_zone), [c.name for c in p.deck.cards],
+                len(p.graveyard))
+    return (game.turn, game.winner, side(game.player), side(game.ai))
+
+
+def _play_scripted_match(game, journal, max_turns=40):
+    """Both sides play the first affordable troop, attack the player with everything, never block."""
+    starts = [_fingerprint(game)]
+    pending = None
+
+    def act(role, action):
+        nonlocal pending
+        pending = apply_action(game, role, action, pending)
+        journal.record(role, dict(action, room_id='room'))
+
+    for _ in range(max_turns):
+        role = game.turn
+        me = game.player if role == 'player' else game.ai
+        for i, card in enumerate(me.hand):
+            if card.card_type == 'troop' and card.cost <= me.mana:
+                act(role, {'action': 'play_card', 'card_index': i})
+                break
+        attackers = [i for i, c in enumerate(me.active_zone) if c.ready]
+        if attackers and game.winner is None:
+            act(role, {'action': 'declare_attacks', 'attackers': attackers, 'targets': ['player'] * len(attackers)})
+            act('ai' if role == 'player' else 'player', {'action': 'declare_blockers', 'blockers': {}})
+        if game.winner is not None:
+            break
+        act(role, {'action': 'end_turn'})
+        starts.append(_fingerprint(game))
+    return starts
+
+
+def _new_match(tmp, seed=7):
+    random.seed(seed)
+    deck1, deck2 = build_random_deck(size=40), build_random_deck(size=40)
+    champion1, champion2 = CHAMPION_LIST[0], CHAMPION_LIST[1]
+    header = match_header('game_test', 'quick', 1234, deck1, deck2, champion1, champion2)
+    journal = JournalWriter.create(tmp, header)
+    return new_match_game(deck1, deck2, champion1, champion2, 1234), journal
+
+
+def test_replay_matches_live_game():
+    """Replaying the journal rebuilds every turn start and the final position."""
+    with tempfile.TemporaryDirectory() as tmp:
+        game, journal = _new_match(tmp)
+        starts = _play_scripted_match(game, journal)
+        journal.close('game_over', game.winner)
+
+        header, actions, end = load_journal(journal.path)
+        assert len(actions) == journal.count and end['end'] == 'game_over'
+        assert len(header['cards']) < 80  # identical cards stored once
+
+        replay = Replayer.load(journal.path, keyframe_interval=3)
+        assert _fingerprint(replay.final()) == _fingerprint(game)
+        assert replay.turns == len(starts)
+        for turn in (len(starts), 1, 5, 4, 9, 2):  # backwards and forwards
+            assert _fingerprint(replay.seek_turn(turn)) == starts[turn - 1]
+
+
+def test_truncated_journal_still_loads():
+    """A crash mid-write leaves a partial last line, which is skipped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        game, journal = _new_match(tmp, seed=3)
+        _play_scripted_match(game, journal, max_turns=4)
+        journal.flush()
+        with open(journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"i": 99, "ms": 1, "r": "pla')
+        header, actions, end = load_journal(journal.path)
+        assert end is None and len(actions) == journal.count
+        assert 'room_id' not in actions[0]['a']
+        Replayer(header, actions).final()
+
+
+def test_writer_buffers_until_close():
+    """Actions stay in the writer's buffer; close() writes them and releases the file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        game, journal = _new_match(tmp, seed=5)
+        assert load_journal(journal.path)[1] == []  # the header is on disk from the start
+        _play_scripted_match(game, journal, max_turns=2)
+        assert journal.count and load_journal(journal.path)[1] == []
+        journal.close('game_over', game.winner)
+        assert journal._file.closed
+        header, actions, end = load_journal(journal.path)
+        assert len(actions) == journal.count and end['end'] == 'game_over'
+        journal.record('player', {'action': 'end_turn'})  # after close: ignored
+        journal.close('disconnect')
+        assert load_journal(journal.path)[2]['end'] == 'game_over'
+
+
+def test_prune_keeps_newest_journals():
+    """prune_journals deletes the oldest journals beyond the limit and nothing else."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(5):
+            path = os.path.join(tmp, f'game_{i}.jsonl')
+            open(path, 'w').close()
+            os.utime(path, (1000 + i, 1000 + i))
+        open(os.path.join(tmp, 'notes.txt'), 'w').close()
+        assert prune_journals(tmp, 2) == 3
+        assert sorted(os.listdir(tmp)) == ['game_3.jsonl', 'game_4.jsonl', 'notes.txt']
+        assert prune_journals(tmp, 2) == 0
+        assert prune_journals(os.path.join(tmp, 'missing'), 2) == 0
+
+
+if __name__ == '__main__':
+    test_replay_matches_live_game()
+    test_truncated_journal_still_loads()
+    test_writer_buffers_until_close()
+    test_prune_keeps_newest_journals()
+    print("✅ Match journal tests passed")
@@ -0,0 +1,89 @@
+"""
+Tests for the indexed matchmaking queues.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.matchmaking import Matchmaker
+
+
+class _Clock:
+    """Manual clock for wait-time dependent tests."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fifo_modes_and_cancel():
+    """Unrated tickets pair first-come first-served within their own mode."""
+    clock = _Clock()
+    mm = Matchmaker(clock=clock)
+    assert mm.enqueue('a', 'quick', payload={'player_name': 'A'}) is None
+    assert mm.enqueue('b', 'custom') is None
+    waiting, newcomer = mm.enqueue('c', 'quick')
+    assert (waiting.sid, newcomer.sid) == ('a', 'c') and waiting.payload == {'player_name': 'A'}
+    assert mm.depth() == 1 and mm.depth('custom') == 1 and 'b' in mm
+
+    assert mm.enqueue('d', 'custom') is not None
+    assert mm.depth() == 0
+
+    mm.enqueue('g', 'quick')
+    assert mm.cancel('g').sid == 'g' and mm.cancel('g') is None
+    assert mm.depth() == 0
+
+    mm.enqueue('h', 'quick')  # queuing again replaces the old ticket
+    assert mm.depth('quick') == 1
+    waiting, newcomer = mm.enqueue('i', 'quick')
+    assert (waiting.sid, newcomer.sid) == ('h', 'i')
+    assert mm.metrics()['cancels'] == 1
+
+
+def test_rating_bands_widen_with_wait():
+    """Far ratings wait; the window widens over time and sweep() pairs them."""
+    clock = _Clock()
+    mm = Matchmaker(band_width=100, base_tolerance=100, widen_per_second=10, max_tolerance=1000, clock=clock)
+    assert mm.enqueue('low', 'quick', rating=1000) is None
+    assert mm.enqueue('high', 'quick', rating=1500) is None
+    assert mm.sweep() == []
+
+    # A close rating is preferred over the older, further ticket
+    waiting, newcomer = mm.enqueue('near', 'quick', rating=1450)
+    assert waiting.sid == 'high' and newcomer.sid == 'near'
+
+    mm.enqueue('high', 'quick', rating=1500)
+    clock.now = 30.0  # 'low' now accepts 100 + 300 = 400: still too far
+    assert mm.sweep() == []
+    clock.now = 41.0  # 'low' accepts 510
+    pairs = mm.sweep()
+    assert [(a.sid, b.sid) for a, b in pairs] == [('low', 'high')]
+    assert mm.depth() == 0
+
+    metrics = mm.metrics()
+    assert metrics['matches'] == 2 and metrics['time_to_match']['count'] == 4
+    assert metrics['time_to_match']['max'] == 41.0
+
+
+def test_unrated_matches_anyone_and_many_waiting():
+    """Unrated tickets take the oldest waiter; thousands of far ratings stay cheap."""
+    clock = _Clock()
+    mm = Matchmaker(clock=clock)
+    for i in range(5000):
+        mm.enqueue(f'p{i}', 'quick', rating=i * 250)  # 250 apart: nobody matches
+    assert mm.depth('quick') == 5000
+    waiting, _ = mm.enqueue('anyone', 'quick')
+    assert waiting.sid == 'p0'
+    waiting, _ = mm.enqueue('x', 'quick', rating=250 * 2500 + 30)
+    assert waiting.sid == 'p2500'
+    assert mm.metrics()['depth'] == {'quick': 4998}
+
+
+if __name__ == '__main__':
+    test_fifo_modes_and_cancel()
+    test_rating_bands_widen_with_wait()
+    test_unrated_matches_anyone_and_many_waiting()
+    print("✅ Matchmaking tests passed")
@@ -0,0 +1,49 @@
+"""
+Tests for the MCTS difficulty tier.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_engine import AIConfig, DataDrivenAI, MCTS_LEVEL
+from src.cards import build_random_deck
+from src.champions import get_champion_by_name
+from src.headless import create_headless_game, run_headless_game
+from src.mcts_ai import MCTSAI
+
+
+def test_mcts_tier_plugs_into_game():
+    """AIConfig(11) gives the game an MCTSAI brain that plays full games."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                get_champion_by_name('Brutus'), get_champion_by_name('Ragnar'),
+                                ai_level=MCTS_LEVEL)
+    assert isinstance(game.ai_brain, MCTSAI)
+    game.ai_brain.time_budget = 0.01
+    winner = run_headless_game(game, DataDrivenAI(game.player, AIConfig(10)))
+    assert winner in ('player', 'ai', None)
+    assert game.ai_brain.total_rollouts > 0
+
+
+def test_mcts_search_leaves_live_game_untouched():
+    """Searching only touches determinized clones of the game."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40), ai_level=MCTS_LEVEL)
+    brain = game.ai_brain
+    brain.max_iterations = 50
+    brain.time_budget = 10.0
+    game.ai.mana = game.ai.max_mana = 5
+    before = ([dict(c.__dict__) for c in game.ai.hand + game.player.hand],
+              [id(c) for c in game.player.deck.cards], game.player.life, game.ai.life)
+    troops = brain.choose_cards_to_play(game.ai.mana)
+    assert brain.last_iterations <= 50
+    assert all(c in game.ai.hand and c.card_type != 'spell' for c in troops)
+    assert sum(c.cost for c in troops) <= 5
+    after = ([dict(c.__dict__) for c in game.ai.hand + game.player.hand],
+             [id(c) for c in game.player.deck.cards], game.player.life, game.ai.life)
+    assert after == before
+
+
+if __name__ == '__main__':
+    test_mcts_tier_plugs_into_game()
+    test_mcts_search_leaves_live_game_untouched()
+    print("✅ MCTS tests passed")
@@ -0,0 +1,125 @@
+"""
+Tests for resume_session on the Socket.IO server (Flask-SocketIO test client).
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+os.environ['JOURNAL_DIR'] = 'off'
+os.environ['BOT_FILL_AFTER'] = '0'
+os.environ['ROOM_BACKEND'] = 'memory'
+
+server = None
+
+
+def _load_server():
+    """Import server.app on first use, not at collection: it gevent-patches the
+    whole process (monkey.patch_all), which breaks process pools in other tests."""
+    global server
+    if server is None:
+        from server import app
+        server = app
+    return server
+
+
+def _events(client):
+    """{event name: [first argument of each]} received since the last call."""
+    received = {}
+    for message in client.get_received():
+        received.setdefault(message['name'], []).append(message['args'][0] if message['args'] else None)
+    return received
+
+
+def _start_match():
+    """Two clients paired by Quick Match: (host, guest, host's match_found)."""
+    _load_server()
+    first = server.socketio.test_client(server.app)
+    second = server.socketio.test_client(server.app)
+    first.emit('find_match', {'player_name': 'First'})
+    second.emit('find_match', {'player_name': 'Second'})
+    found = {client: _events(client)['match_found'][0] for client in (first, second)}
+    host, guest = (first, second) if found[first]['is_host'] else (second, first)
+    assert found[host]['is_host'] and not found[guest]['is_host']
+    assert found[host]['room_id'] in server.active_rooms
+    return host, guest, found[host]
+
+
+def _sid(client):
+    """Socket.IO sid the server sees for a test client (request.sid)."""
+    return server.socketio.server.manager.sid_from_eio_sid(client.eio_sid, '/')
+
+
+def _close(*clients):
+    for client in clients:
+        if client.is_connected():
+            client.disconnect()
+
+
+def test_resume_with_seat_token():
+    """The host reconnects with its token: same seat, one snapshot, the rival is told."""
+    host, guest, found = _start_match()
+    room_id = found['room_id']
+    host.disconnect()
+    assert 'opponent_reconnecting' in _events(guest)
+    assert 'player' in server.active_rooms[room_id]['away']
+
+    back = server.socketio.test_client(server.app)
+    back.emit('resume_session', {'room_id': room_id, 'token': found['session_token']})
+    received = _events(back)
+    assert received['session_resumed'] == [{'room_id': room_id, 'is_host': True, 'mode': 'quick'}]
+    assert len(received['game_state_update']) == 1
+    assert received['game_state_update'][0]['is_my_turn']
+    assert 'opponent_reconnected' in _events(guest)
+    room = server.active_rooms[room_id]
+    assert not room['away'] and ('reconnect', room_id, 'player') not in server.timers
+    assert room['player_map'][_sid(back)] == 'player'
+
+    # The seat is playable again from the new connection
+    back.emit('game_action', {'room_id': room_id, 'action': 'end_turn'})
+    assert 'error' not in _events(back)
+    assert server.active_rooms[room_id]['game'].turn == 'ai'
+    _close(back, guest)
+
+
+def test_resume_with_bad_token():
+    """A wrong token, the rival's room without a token or an unknown room: resume_failed, nothing changes."""
+    host, guest, found = _start_match()
+    room_id = found['room_id']
+    host.disconnect()
+    _events(guest)
+    intruder = server.socketio.test_client(server.app)
+    for attempt in ({'room_id': room_id, 'token': 'not-the-token'},
+                    {'room_id': room_id},
+                    {'room_id': 'game_missing', 'token': found['session_token']}):
+        intruder.emit('resume_session', attempt)
+        received = _events(intruder)
+        assert 'resume_failed' in received and 'session_resumed' not in received
+    room = server.active_rooms[room_id]
+    assert _sid(intruder) not in room['player_map'] and 'player' in room['away']
+    assert _events(guest) == {}
+    _close(intruder, guest)
+
+
+def test_resume_after_seat_expired():
+    """Past RECONNECT_GRACE the room is closed: the rival is told and the token no longer works."""
+    host, guest, found = _start_match()
+    room_id = found['room_id']
+    host.disconnect()
+    assert ('reconnect', room_id, 'player') in server.timers
+    server.timers.run_due(now=float('inf'))  # the grace period ran out
+    assert room_id not in server.active_rooms
+    assert 'opponent_disconnected' in _events(guest)
+
+    back = server.socketio.test_client(server.app)
+    back.emit('resume_session', {'room_id': room_id, 'token': found['session_token']})
+    assert 'resume_failed' in _events(back)
+    _close(back, guest)
+
+
+if __name__ == '__main__':
+    test_resume_with_seat_token()
+    test_resume_with_bad_token()
+    test_resume_after_seat_expired()
+    print("✅ Resume session tests passed")
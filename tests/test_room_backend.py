@@ -0,0 +1,145 @@
+"""
+Tests for the room/matchmaking state backends (in-process and shared SQLite).
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import types
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import room_backend
+from src.room_backend import InProcessBackend, SqliteBackend, create_backend
+
+
+class _Clock:
+    """Manual clock shared by the two 'workers'."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _two_workers(path, clock):
+    return (SqliteBackend(path, 'w1', clock=clock), SqliteBackend(path, 'w2', clock=clock))
+
+
+def test_in_process_backend():
+    """The default backend keeps today's single-worker behaviour."""
+    backend = create_backend('memory', 'w1')
+    assert isinstance(backend, InProcessBackend) and not backend.shared
+    assert backend.matchmaker.enqueue('a', 'quick') is None
+    waiting, newcomer = backend.matchmaker.enqueue('b', 'quick')
+    assert (waiting.sid, newcomer.sid) == ('a', 'b')
+    backend.assign_room('game_1')
+    assert backend.room_worker('game_1') == 'w1' and backend.room_counts() == {'w1': 1}
+    backend.release_room('game_1')
+    assert backend.room_worker('game_1') is None
+
+
+def test_matchmaking_spans_workers():
+    """A ticket queued on one worker is paired by another; cancel and depth are shared."""
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = _Clock()
+        w1, w2 = _two_workers(os.path.join(tmp, 'rooms.db'), clock)
+        assert w1.matchmaker.enqueue('a', 'custom', payload={'deck': [1, 2]}) is None
+        assert w2.matchmaker.enqueue('x', 'quick') is None
+        assert w1.matchmaker.depth() == 2 and w2.matchmaker.depth_by_mode() == {'custom': 1, 'quick': 1}
+        assert 'x' in w1.matchmaker
+
+        waiting, newcomer = w2.matchmaker.enqueue('b', 'custom')
+        assert (waiting.sid, waiting.worker, waiting.payload) == ('a', 'w1', {'deck': [1, 2]})
+        assert (newcomer.sid, newcomer.worker) == ('b', 'w2')
+        assert w1.matchmaker.cancel('x').sid == 'x' and w2.matchmaker.cancel('x') is None
+        assert w1.matchmaker.depth() == 0
+
+        # Rating bands and widening behave as in memory; each worker sweeps its own tickets
+        w1.matchmaker.enqueue('low', 'quick', rating=1000)
+        clock.now += 1
+        w2.matchmaker.enqueue('high', 'quick', rating=1500)
+        assert w1.matchmaker.sweep() == [] and w2.matchmaker.sweep() == []
+        clock.now += 40
+        pairs = w2.matchmaker.sweep()
+        assert [(a.sid, b.sid) for a, b in pairs] == [('low', 'high')]
+        assert w1.matchmaker.depth() == 0
+        w1.close()
+        w2.close()
+
+
+def test_rooms_mailbox_and_stale_workers():
+    """Room directory, ordered per-worker mailboxes and purge of dead workers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = _Clock()
+        w1, w2 = _two_workers(os.path.join(tmp, 'rooms.db'), clock)
+        w1.assign_room('game_1')
+        assert w2.room_worker('game_1') == 'w1' and w2.room_counts() == {'w1': 1}
+
+        w2.post('w1', ('emit', 'sid1', 'game_state_update', b'\x01\x01'))
+        w2.post('w1', ('dispatch', 'sid1', 'state_ack', {'v': 3}))
+        assert w2.fetch() == []
+        assert w1.fetch() == [('emit', 'sid1', 'game_state_update', b'\x01\x01'),
+                              ('dispatch', 'sid1', 'state_ack', {'v': 3})]
+        assert w1.fetch() == []
+
+        w2.matchmaker.enqueue('waiting', 'quick')
+        w2._db.conn.execute("UPDATE workers SET heartbeat = 0 WHERE worker = 'w2'")
+        w1.heartbeat()
+        assert w1.purge_stale(30) == ['w2']
+        assert w1.workers() == ['w1'] and w1.matchmaker.depth() == 0
+        w1.close()
+
+
+def test_private_room_codes_are_claimed_once():
+    """A room code belongs to the first worker that claims it."""
+    memory = create_backend('memory', 'w1')
+    assert memory.claim_room('ABC123') and not memory.claim_room('ABC123')
+    with tempfile.TemporaryDirectory() as tmp:
+        w1, w2 = _two_workers(os.path.join(tmp, 'rooms.db'), _Clock())
+        assert w2.claim_room('ABC123')
+        assert not w1.claim_room('ABC123') and w1.room_worker('ABC123') == 'w2'
+        w2.release_room('ABC123')
+        assert w1.claim_room('ABC123')
+        w1.close()
+        w2.close()
+
+
+def test_lock_waits_yield_instead_of_blocking():
+    """A busy write waits in Python (time.sleep, cooperative under gevent) and gives up after the timeout."""
+    sleeps = []
+    clock = types.SimpleNamespace(time=time.time, monotonic=time.monotonic,
+                                  sleep=lambda s: (sleeps.append(s), time.sleep(s)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rooms.db')
+        backend = SqliteBackend(path, 'w1', timeout=0.3)
+        other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        real_time, room_backend.time = room_backend.time, clock
+        try:
+            other.execute('BEGIN IMMEDIATE')
+            try:
+                backend.post('w1', ('emit', 'sid', 'x', None))
+                raise AssertionError('write went through a held lock')
+            except sqlite3.OperationalError:
+                pass
+            assert len(sleeps) > 3
+
+            threading.Timer(0.1, other.execute, ('COMMIT',)).start()
+            backend.post('w1', ('emit', 'sid', 'x', None))
+            assert backend.fetch() == [('emit', 'sid', 'x', None)]
+        finally:
+            room_backend.time = real_time
+            other.close()
+        backend.close()
+
+
+if __name__ == '__main__':
+    test_in_process_backend()
+    test_matchmaking_spans_workers()
+    test_rooms_mailbox_and_stale_workers()
+    test_private_room_codes_are_claimed_once()
+    test_lock_waits_yield_instead_of_blocking()
+    print("✅ Room backend tests passed")
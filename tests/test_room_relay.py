@@ -0,0 +1,113 @@
+"""
+Tests for relaying players between server workers (two SQLite backends, one database).
+
+server.app plays the player's worker; a second SqliteBackend on the same
+database stands in for the worker that hosted the previous match.
+"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+os.environ.setdefault('LOG_LEVEL', 'ERROR')
+os.environ['JOURNAL_DIR'] = 'off'
+os.environ['BOT_FILL_AFTER'] = '0'
+os.environ['ROOM_BACKEND'] = 'memory'
+
+from src.room_backend import SqliteBackend
+
+server = None
+
+
+def _load_server():
+    """Import server.app on first use, not at collection: it gevent-patches the
+    whole process (monkey.patch_all), which breaks process pools in other tests."""
+    global server
+    if server is None:
+        from server import app
+        server = app
+    return server
+
+
+def _events(client):
+    """{event name: [first argument of each]} received since the last call."""
+    received = {}
+    for message in client.get_received():
+        received.setdefault(message['name'], []).append(message['args'][0] if message['args'] else None)
+    return received
+
+
+def _sid(client):
+    """Socket.IO sid the server sees for a test client (request.sid)."""
+    return server.socketio.server.manager.sid_from_eio_sid(client.eio_sid, '/')
+
+
+def _deliver(backend):
+    """Run this worker's mailbox once, as _broker_loop does."""
+    for message in backend.fetch():
+        server._broker_message(message)
+
+
+def test_rematch_before_old_room_closes():
+    """A rematch on this worker inside the old room's 0.5 s close: events stay here, the late detach is harmless."""
+    _load_server()
+    # Background loops (if not running yet) start without a mailbox: this test delivers it by hand
+    server._ensure_background_tasks()
+    saved = (server.room_backend, server.matchmaker)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'rooms.db')
+        here = SqliteBackend(path, server.WORKER_ID)
+        there = SqliteBackend(path, 'other-worker')
+        server.room_backend, server.matchmaker = here, here.matchmaker
+        first = server.socketio.test_client(server.app)
+        second = server.socketio.test_client(server.app)
+        try:
+            # `first` played as the remote guest of a match hosted by the other worker
+            there.assign_room('game_oldroom', 'other-worker')
+            there.post(server.WORKER_ID, ('attach', _sid(first), 'other-worker'))
+            _deliver(here)
+            assert server.relayed_players[_sid(first)] == 'other-worker'
+
+            # Game over there; before its delayed close_room both players queue again here
+            first.emit('find_match', {'player_name': 'First'})
+            second.emit('find_match', {'player_name': 'Second'})
+            found = _events(first)['match_found'][0]
+            _events(second)
+            room_id = found['room_id']
+            assert room_id in server.active_rooms and _sid(first) not in server.relayed_players
+
+            first.emit('request_initial_state', {'room_id': room_id})
+            assert 'game_state_update' in _events(first)
+            assert there.fetch() == []  # nothing was relayed to the old room's worker
+
+            # The old room finally closes there; its detach must not touch the new match
+            there.post(server.WORKER_ID, ('detach', _sid(first), 'other-worker'))
+            _deliver(here)
+            room = server.active_rooms[room_id]
+            turn = room['game'].turn
+            mover = first if room['player_map'][_sid(first)] == turn else second
+            mover.emit('game_action', {'room_id': room_id, 'action': 'end_turn'})
+            assert 'error' not in _events(mover)
+            assert room['game'].turn != turn
+
+            # A late detach from an older room leaves a newer relay to another worker in place
+            there.post(server.WORKER_ID, ('attach', _sid(second), 'third-worker'))
+            there.post(server.WORKER_ID, ('detach', _sid(second), 'other-worker'))
+            _deliver(here)
+            assert server.relayed_players[_sid(second)] == 'third-worker'
+            there.post(server.WORKER_ID, ('detach', _sid(second), 'third-worker'))
+            _deliver(here)
+            assert _sid(second) not in server.relayed_players
+        finally:
+            for client in (first, second):
+                if client.is_connected():
+                    client.disconnect()
+            server.room_backend, server.matchmaker = saved
+            here.close()
+            there.close()
+
+
+if __name__ == '__main__':
+    test_rematch_before_old_room_closes()
+    print("✅ Room relay tests passed")
@@ -0,0 +1,82 @@
+"""
+Tests for the keyed timer heap used for server housekeeping.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.scheduler import TimerHeap
+
+
+class _Clock:
+    """Manual clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_schedule_replace_cancel_and_order():
+    """Timers fire in deadline order; rescheduling replaces, cancel drops."""
+    clock = _Clock()
+    timers = TimerHeap(clock=clock)
+    fired = []
+    timers.schedule(('afk', 'r1'), 10, fired.append, 'afk r1')
+    timers.schedule(('idle', 'r1'), 5, fired.append, 'idle r1')
+    timers.schedule(('queue', 's1'), 7, fired.append, 'queue s1')
+    timers.schedule(('afk', 'r1'), 20, fired.append, 'afk r1 again')  # pushed back
+    assert timers.cancel(('queue', 's1')) and not timers.cancel(('queue', 's1'))
+    assert len(timers) == 2 and timers.next_deadline() == 5
+
+    clock.now = 12
+    assert timers.run_due() == 1 and fired == ['idle r1']
+    assert timers.next_deadline() == 20 and ('afk', 'r1') in timers
+    clock.now = 20
+    timers.run_due()
+    assert fired == ['idle r1', 'afk r1 again'] and len(timers) == 0
+    assert timers.next_deadline() is None
+
+
+def test_callbacks_reschedule_and_errors():
+    """A callback can re-arm its own key; a failing one does not stop the rest."""
+    clock = _Clock()
+    errors = []
+    timers = TimerHeap(clock=clock, on_error=lambda key, e: errors.append((key, str(e))))
+    runs = []
+
+    def tick():
+        runs.append(clock.now)
+        if len(runs) < 3:
+            timers.schedule('tick', 1, tick)
+
+    def boom():
+        raise RuntimeError('boom')
+
+    timers.schedule('tick', 1, tick)
+    timers.schedule('boom', 1, boom)
+    for step in range(1, 5):
+        clock.now = step
+        timers.run_due()
+    assert runs == [1, 2, 3] and errors == [('boom', 'boom')]
+    assert timers.stats()['errors'] == 1 and timers.stats()['fired'] == 4
+
+
+def test_heap_stays_bounded():
+    """Pushing the same timers back many times compacts the heap."""
+    clock = _Clock()
+    timers = TimerHeap(clock=clock)
+    for step in range(10000):
+        timers.schedule(('idle', step % 10), 60, lambda: None)
+    stats = timers.stats()
+    assert stats['scheduled'] == 10 and stats['heap'] <= 128 and stats['compactions'] > 0
+    assert stats['by_kind'] == {'idle': 10}
+
+
+if __name__ == '__main__':
+    test_schedule_replace_cancel_and_order()
+    test_callbacks_reschedule_and_errors()
+    test_heap_stays_bounded()
+    print("✅ Scheduler tests passed")
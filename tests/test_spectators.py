@@ -0,0 +1,83 @@
+"""
+Tests for the spectator view and the (optionally delayed) spectator feed.
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.match_journal import new_match_game
+from src.spectators import FanoutStats, SpectatorFeed, spectator_view
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _game():
+    random.seed(4)
+    game = new_match_game(build_random_deck(size=40), build_random_deck(size=40), CHAMPION_LIST[0], CHAMPION_LIST[1], 4)
+    game.player.active_zone.append(game.player.deck.cards.pop())
+    return game
+
+
+def test_view_hides_hands():
+    """Both boards are visible, hands only as counts."""
+    game = _game()
+    view = spectator_view(game, lambda c: {'name': c.name})
+    assert view['player']['hand_count'] == len(game.player.hand) == 5
+    assert 'hand' not in view['player'] and 'hand' not in view['ai']
+    assert view['player']['active_zone'] == [{'name': game.player.active_zone[0].name}]
+    assert view['ai']['champion'] == CHAMPION_LIST[1].name and view['turn'] == 'player'
+
+
+def test_feed_without_delay():
+    """No delay: every view is released at once, numbered, and kept for late joiners."""
+    feed = SpectatorFeed(wall_clock=lambda: 123.0)
+    first = feed.publish({'turn': 'player'})
+    second = feed.publish({'turn': 'ai'})
+    assert [v['v'] for v in first + second] == [1, 2]
+    assert feed.latest is second[0] and second[0]['ts'] == 123.0 and len(feed) == 0
+
+
+def test_feed_delay_releases_in_order():
+    """Delayed views come out in order once their delay has passed."""
+    clock = _Clock()
+    feed = SpectatorFeed(delay=30, clock=clock)
+    assert feed.publish({'n': 1}) == []
+    clock.now = 10
+    assert feed.publish({'n': 2}) == []
+    assert feed.latest is None and feed.next_release() == 30
+    clock.now = 35
+    assert [v['n'] for v in feed.due()] == [1]
+    clock.now = 60
+    assert [v['n'] for v in feed.due()] == [2]
+    assert feed.latest['n'] == 2 and feed.next_release() is None
+
+
+def test_fanout_stats():
+    """Broadcast timings are reported in milliseconds with the views sent."""
+    stats = FanoutStats(history=2)
+    assert stats.stats()['emit_ms'] == {'p50': None, 'p95': None, 'max': None}
+    for build, emit in ((0.001, 0.010), (0.002, 0.020), (0.003, 0.030)):
+        stats.record(build, emit, 1000)
+    report = stats.stats()
+    assert report['broadcasts'] == 3 and report['views_sent'] == 3000
+    assert report['emit_ms']['max'] == 30.0 and report['build_ms']['p50'] == 3.0  # only the last 2 kept
+    stats.record(None, 0.040, 1000)
+    assert stats.stats()['build_ms']['max'] == 3.0 and stats.stats()['emit_ms']['max'] == 40.0
+
+
+if __name__ == '__main__':
+    test_view_hides_hands()
+    test_feed_without_delay()
+    test_feed_delay_releases_in_order()
+    test_fanout_stats()
+    print("✅ Spectator tests passed")
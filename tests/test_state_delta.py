@@ -0,0 +1,123 @@
+"""
+Tests for versioned delta encoding of game_state_update payloads.
+"""
+
+import sys
+import os
+import copy
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+from src.state_delta import DeltaDecoder, DeltaEncoder, apply_patch, diff_state, payload_size
+from src.zobrist import card_uid
+
+
+def _card(card):
+    # Same fields as serialize_card in server/app.py
+    return {'uid': card_uid(card), 'name': card.name, 'cost': card.cost, 'damage': card.damage,
+            'health': card.health, 'current_health': card.current_health, 'ready': card.ready,
+            'card_type': card.card_type, 'ability': card.ability, 'ability_desc': card.ability_desc,
+            'description': card.description}
+
+
+def _state(game, side):
+    me, opp = (game.player, game.ai) if side == 'player' else (game.ai, game.player)
+    return {
+        'my_state': {'life': me.life, 'mana': me.mana, 'max_mana': me.max_mana,
+                     'hand': [_card(c) for c in me.hand],
+                     'active_zone': [_card(c) for c in me.active_zone],
+                     'deck_count': len(me.deck.cards)},
+        'opponent_state': {'life': opp.life, 'mana': opp.mana, 'hand_count': len(opp.hand),
+                           'active_zone': [_card(c) for c in opp.active_zone],
+                           'deck_count': len(opp.deck.cards)},
+        'turn': game.turn,
+    }
+
+
+def _recorded_states(seed):
+    random.seed(seed)
+    states = []
+    game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST))
+    # Headless games skip UI hooks; record a state at every point the server would send one
+    game.on_update = lambda: states.append(_state(game, 'player'))
+    run_headless_game(game)
+    return states
+
+
+def test_patch_roundtrip():
+    """diff_state/apply_patch rebuild every state of real games exactly."""
+    for seed in range(5):
+        states = _recorded_states(seed)
+        for old, new in zip(states, states[1:]):
+            frozen = copy.deepcopy(old)
+            assert apply_patch(old, diff_state(old, new)) == new
+            assert old == frozen  # base state is not modified
+        assert diff_state(states[-1], states[-1]) == {}
+
+
+def test_acks_gaps_and_resync():
+    """Patches follow the acked version; lost acks still decode; gaps ask for a snapshot."""
+    states = _recorded_states(7)
+    encoder, decoder = DeltaEncoder(), DeltaDecoder()
+    encoder.reset('sid')
+    full_bytes = sent_bytes = 0
+    for i, state in enumerate(states):
+        envelope = encoder.encode('sid', state)
+        assert decoder.apply(envelope) == state
+        if i % 3 != 2:  # some acks are lost or late: patches grow but stay decodable
+            encoder.ack('sid', envelope['v'])
+        full_bytes += payload_size(state)
+        sent_bytes += payload_size(envelope)
+    assert encoder.full_sent == 1 and encoder.patches_sent == len(states) - 1
+    assert sent_bytes * 2 < full_bytes
+
+    # A patch whose base the client dropped is refused until a snapshot arrives
+    envelope = encoder.encode('sid', states[0])
+    decoder.reset()
+    assert decoder.apply(envelope) is None and decoder.awaiting_full
+    encoder.reset('sid')
+    envelope = encoder.encode('sid', states[1])
+    assert 'full' in envelope and decoder.apply(envelope) == states[1]
+    assert not decoder.awaiting_full
+
+    # Clients that never negotiated deltas keep getting plain states
+    assert 'other' not in encoder
+    assert decoder.apply(states[2]) is states[2]
+
+
+def test_two_snapshots_in_flight():
+    """A patch against the first of two unacked snapshots still decodes."""
+    states = _recorded_states(3)
+    encoder, decoder = DeltaEncoder(), DeltaDecoder()
+    encoder.reset('sid')
+    # Both seats ask for the initial state: two snapshots go out before any ack
+    first = encoder.encode('sid', states[0])
+    second = encoder.encode('sid', states[1])
+    assert 'full' in first and 'full' in second
+    assert decoder.apply(first) == states[0]
+    encoder.ack('sid', first['v'])
+    assert decoder.apply(second) == states[1]
+    third = encoder.encode('sid', states[2])
+    assert third['base'] == first['v']
+    assert decoder.apply(third) == states[2] and decoder.gaps == 0
+
+    # The server forgot the connection: its numbering restarts and old versions are dropped
+    restarted = DeltaEncoder()
+    restarted.reset('sid')
+    envelope = restarted.encode('sid', states[3])
+    assert envelope['v'] == 1 and decoder.apply(envelope) == states[3]
+    patch = restarted.encode('sid', states[4])
+    assert 'full' in patch  # nothing acked yet on the new numbering
+    restarted.ack('sid', 1)
+    assert decoder.apply(restarted.encode('sid', states[4])) == states[4]
+
+
+if __name__ == '__main__':
+    test_patch_roundtrip()
+    test_acks_gaps_and_resync()
+    test_two_snapshots_in_flight()
+    print("✅ State delta tests passed")
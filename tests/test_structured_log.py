@@ -0,0 +1,105 @@
+"""
+Tests for the buffered structured logger used by the server.
+"""
+
+import sys
+import os
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.structured_log import DEBUG, INFO, StructuredLogger
+
+
+class _Counted:
+    """Argument that records when it is formatted."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return 'counted'
+
+
+def test_levels_rooms_and_lazy_formatting():
+    """Filtered records cost nothing; kept ones are formatted only on flush."""
+    out = io.StringIO()
+    log = StructuredLogger(level=INFO, stream=out, flush_interval=3600)  # flushed by hand below
+    arg = _Counted()
+
+    log.debug('state_sent', 'hand %s', arg, room='room_1')
+    assert arg.formatted == 0 and log.stats()['pending'] == 0
+
+    log.trace_room('room_1')
+    assert log.enabled(DEBUG, 'room_1') and not log.enabled(DEBUG, 'room_2')
+    log.debug('state_sent', 'hand %s', arg, room='room_1', sid='ab12')
+    log.debug('state_sent', 'hand %s', arg, room='room_2')
+    log.info('match_created', room='room_2', host='Ragnar el Bravo')
+    assert arg.formatted == 0 and out.getvalue() == ''
+
+    log.flush()
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 2 and arg.formatted == 1
+    assert 'DEBUG state_sent room=room_1 sid=ab12 msg="hand counted"' in lines[0]
+    assert 'INFO  match_created room=room_2 host="Ragnar el Bravo"' in lines[1]
+
+    # Ring buffer keeps what was written, filterable by room
+    assert len(log.recent()) == 2 and len(log.recent('room_1')) == 1
+    log.trace_room('room_1', enabled=False)
+    log.set_level('debug')
+    assert log.enabled(DEBUG) and log.traced_rooms() == []
+
+
+def test_background_flush_and_overflow():
+    """The flusher thread writes batches; a full queue drops the oldest records."""
+    out = io.StringIO()
+    log = StructuredLogger(level=INFO, capacity=4, flush_interval=0.01, stream=out)
+    for i in range(3):
+        log.info('tick', i=i)
+    deadline = time.time() + 2
+    while log.written < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    assert [line.split()[-1] for line in out.getvalue().splitlines()] == ['i=0', 'i=1', 'i=2']
+
+    slow = StructuredLogger(level=INFO, capacity=4, stream=io.StringIO(), flush_interval=3600)
+    for i in range(6):
+        slow.info('tick', i=i)
+    assert slow.dropped == 2 and slow.stats()['pending'] == 4
+
+
+
+class _ThreadRecorder(io.StringIO):
+    """Stream that notes which thread each write came from."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def write(self, text):
+        self.threads.append(threading.get_ident())
+        return super().write(text)
+
+
+def test_writer_pool_writes_off_the_flusher():
+    """With a writer pool the batch is written on the pool's thread; a shut-down pool falls back to a direct write."""
+    out = _ThreadRecorder()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        log = StructuredLogger(level=INFO, stream=out, flush_interval=3600, writer_pool=pool)
+        log.info('tick', i=0)
+        log.flush()
+    assert out.getvalue().split()[-1] == 'i=0' and log.written == 1
+    assert out.threads and threading.get_ident() not in out.threads
+
+    log.info('tick', i=1)
+    log.flush()  # the pool is shut down, as at interpreter exit
+    assert out.getvalue().split()[-1] == 'i=1' and out.threads[-1] == threading.get_ident()
+
+
+if __name__ == '__main__':
+    test_levels_rooms_and_lazy_formatting()
+    test_background_flush_and_overflow()
+    test_writer_pool_writes_off_the_flusher()
+    print("✅ Structured log tests passed")
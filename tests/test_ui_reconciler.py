@@ -0,0 +1,83 @@
+"""
+Tests for the keyed widget reconciler behind the Tk board.
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ui_reconciler import KeyedZone
+
+
+class _Widget:
+    """Stand-in widget recording what the zone did to it."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.position = None
+        self.updates = 0
+        self.alive = True
+
+    def destroy(self):
+        self.alive = False
+
+
+def _zone(log):
+    def create(item, spec, position):
+        log.append(('create', item))
+        return _Widget(spec)
+
+    def update(widget, item, old, new, position):
+        log.append(('update', item))
+        widget.spec = new
+        widget.updates += 1
+        return widget
+
+    def place(widget, position):
+        widget.position = position
+
+    return KeyedZone(create, update, place)
+
+
+def test_unchanged_items_keep_their_widgets():
+    """Only new, changed, moved and removed items touch widgets."""
+    log = []
+    zone = _zone(log)
+    cards = ['a', 'b', 'c']
+    stats = zone.render([(c, c, (c, 1)) for c in cards])
+    assert stats.created == 3 and stats.changed
+    first = zone.widgets()
+    log.clear()
+
+    stats = zone.render([(c, c, (c, 1)) for c in cards])
+    assert not stats.changed and stats.unchanged == 3 and log == []
+    assert zone.widgets() == first
+
+    # One damage tick on 'b': a single in-place update
+    stats = zone.render([('a', 'a', ('a', 1)), ('b', 'b', ('b', 0)), ('c', 'c', ('c', 1))])
+    assert (stats.created, stats.updated, stats.moved, stats.destroyed) == (0, 1, 0, 0)
+    assert log == [('update', 'b')] and zone.widgets()[1] is first[1]
+
+
+def test_enter_leave_and_reorder():
+    """Leaving items are destroyed, survivors move, newcomers are created."""
+    log = []
+    zone = _zone(log)
+    zone.render([(c, c, (c,)) for c in 'abcd'])
+    a, b, c, d = zone.widgets()
+    stats = zone.render([(k, k, (k,)) for k in 'dbe'])
+    assert (stats.created, stats.updated, stats.moved, stats.destroyed) == (1, 0, 1, 2)
+    assert not a.alive and not c.alive and b.alive and d.alive
+    assert zone.widgets()[:2] == [d, b]
+    assert [w.position for w in zone.widgets()] == [0, 1, 2]
+    assert zone.specs() == [('d',), ('b',), ('e',)]
+
+    zone.clear()
+    assert len(zone) == 0 and not d.alive
+    assert zone.render([('b', 'b', ('b',))]).created == 1
+
+
+if __name__ == '__main__':
+    test_unchanged_items_keep_their_widgets()
+    test_enter_leave_and_reorder()
+    print("✅ UI reconciler tests passed")
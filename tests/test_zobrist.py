@@ -0,0 +1,110 @@
+"""
+Tests for incremental Zobrist hashing and the transposition table.
+"""
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ai_engine import DataDrivenAI
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import choose_player_blocker, create_headless_game, play_player_turn
+from src.models import Card
+from src.zobrist import TranspositionTable
+
+
+def _check(game):
+    assert game.zobrist.value == game.zobrist.recompute(game)
+
+
+def test_incremental_hash_tracks_full_games():
+    """After every turn of real games the running hash equals a full recompute."""
+    rng = random.Random(8)
+    for _ in range(10):
+        game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                    rng.choice(CHAMPION_LIST), rng.choice(CHAMPION_LIST))
+        game.enable_hashing()
+        brain = DataDrivenAI(game.player, game.ai_brain.config)
+        game.ask_blocker = lambda attacker, g=game, b=brain: choose_player_blocker(g, b, attacker)
+        seen = set()
+        for _ in range(40):
+            play_player_turn(game, brain)
+            _check(game)
+            seen.add(game.state_hash())
+            if game.winner is not None:
+                break
+            game.end_turn()
+            _check(game)
+            if game.winner is not None:
+                break
+        assert len(seen) > 1
+
+
+def test_make_unmake_and_clone_keep_hash():
+    """Unmake restores the hash; clones hash the same and do not touch the original."""
+    rng = random.Random(2)
+    game = create_headless_game(build_random_deck(40), build_random_deck(40))
+    game.ask_blocker = lambda attacker: None
+    game.player.max_mana = game.player.mana = 6
+    before = game.state_hash()
+    for action in game.legal_actions(with_blocks=True):
+        game.make_action(action)
+        _check(game)
+        game.unmake_action()
+        assert game.state_hash() == before
+        _check(game)
+
+    twin = game.clone()
+    assert twin.state_hash() == before
+    actions = twin.legal_actions()
+    twin.make_action(rng.choice(actions))
+    twin.player.life -= 1
+    assert twin.state_hash() != before
+    assert game.state_hash() == before
+    _check(game)
+    _check(twin)
+
+
+def test_transpositions_hash_equal():
+    """Playing two troops in either order reaches the same hash."""
+    game = create_headless_game(build_random_deck(40), build_random_deck(40))
+    game.player.hand = [Card('Knight', 1, 2, health=2), Card('Archer', 1, 1, health=1)]
+    game.player.mana = game.player.max_mana = 2
+    game.enable_hashing()
+    first, second = game.clone(), game.clone()
+    first.play_card(0)
+    first.play_card(0)
+    second.play_card(1)
+    second.play_card(0)
+    first.player.active_zone.reverse()
+    assert first.state_hash() == second.state_hash()
+    assert first.state_hash() != game.state_hash()
+
+
+def test_transposition_table_replacement():
+    """Depth-preferred slot keeps deep results; the second slot takes the rest."""
+    tt = TranspositionTable(size_bits=2)
+    tt.store(1, 0.5, depth=5)
+    tt.store(5, 0.1, depth=1)  # same bucket, shallower: goes to the always-replace slot
+    assert tt.probe(1).value == 0.5
+    assert tt.probe(5).value == 0.1
+    tt.store(9, 0.9, depth=0)  # evicts 5, not the deep entry
+    assert tt.probe(5) is None
+    assert tt.probe(1, min_depth=5) is not None
+    assert tt.probe(1, min_depth=6) is None
+    tt.new_search()
+    tt.store(13, 0.3, depth=0)  # old generation: deep entry can go now
+    assert tt.probe(1) is None
+    assert tt.probe(13).value == 0.3
+    assert len(tt) <= 2 * tt.buckets
+    assert tt.replacements == 2
+
+
+if __name__ == '__main__':
+    test_incremental_hash_tracks_full_games()
+    test_make_unmake_and_clone_keep_hash()
+    test_transpositions_hash_equal()
+    test_transposition_table_replacement()
+    print("✅ Zobrist tests passed")
@@ -0,0 +1,47 @@
+"""
+Benchmark: partidas por segundo de GameSimulator vs BatchGameSimulator
+Mide el mismo matchup con el simulador de referencia y el simulador por lotes.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.batch_simulator import BatchGameSimulator
+from src.champions import get_champion_by_name
+from src.game_analysis import GameSimulator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del simulador por lotes')
+    parser.add_argument('--games', type=int, default=2000, help='Partidas del simulador de referencia')
+    parser.add_argument('--batch-games', type=int, default=100000, help='Partidas del simulador por lotes')
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    champ1 = get_champion_by_name('Brutus')
+    champ2 = get_champion_by_name('Mystara')
+
+    random.seed(args.seed)
+    reference = GameSimulator()
+    start = time.perf_counter()
+    ref_wins = sum(reference.simulate_match(champ1, champ2)['winner'] == champ1.name for _ in range(args.games))
+    ref_rate = args.games / (time.perf_counter() - start)
+
+    batch = BatchGameSimulator(batch_size=args.batch_size, seed=args.seed)
+    start = time.perf_counter()
+    result = batch.simulate_matchup(champ1, champ2, args.batch_games)
+    batch_rate = args.batch_games / (time.perf_counter() - start)
+
+    print(f"{champ1.name} vs {champ2.name}")
+    print(f"  GameSimulator:      {ref_rate:10.0f} partidas/seg  WR {ref_wins / args.games * 100:5.1f}%")
+    print(f"  BatchGameSimulator: {batch_rate:10.0f} partidas/seg  WR {result[champ1.name] / args.batch_games * 100:5.1f}%")
+    print(f"  Aceleración: x{batch_rate / ref_rate:.1f}")
+
+
+if __name__ == '__main__':
+    main()
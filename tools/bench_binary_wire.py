@@ -0,0 +1,123 @@
+"""
+Benchmark: codificación binaria (struct) contra JSON para el tráfico de partida
+Graba partidas headless y, para cada actualización, mide en el servidor
+construir el dict + json.dumps (camino actual) contra pack_state directamente
+desde el Game, y en el cliente json.loads (+ expandir plantillas) contra
+unpack_state. También compara request_blockers y game_action.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.binary_wire import (pack_action, pack_blockers, pack_state, state_cards, unpack_action,
+                             unpack_blockers, unpack_state)
+from src.card_catalog import CardCatalog, CatalogCache, full_card
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+
+
+def game_state(game, side: str, serialize_card=full_card) -> dict:
+    # Misma forma que get_game_state_for_player en server/app.py (que necesita Flask para importarse)
+    me, opp = (game.player, game.ai) if side == 'player' else (game.ai, game.player)
+    return {
+        'my_state': {'life': me.life, 'max_life': getattr(me, 'max_life', me.life), 'mana': me.mana,
+                     'max_mana': me.max_mana, 'hand': [serialize_card(c) for c in me.hand],
+                     'active_zone': [serialize_card(c) for c in me.active_zone],
+                     'deck_count': len(me.deck.cards), 'graveyard_count': len(me.graveyard)},
+        'opponent_state': {'life': opp.life, 'max_life': getattr(opp, 'max_life', opp.life), 'mana': opp.mana,
+                           'max_mana': opp.max_mana, 'hand_count': len(opp.hand),
+                           'active_zone': [serialize_card(c) for c in opp.active_zone],
+                           'deck_count': len(opp.deck.cards), 'graveyard_count': len(opp.graveyard)},
+        'turn': game.turn,
+        'is_my_turn': game.turn == side,
+    }
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+class Timer:
+    def __init__(self):
+        self.totals = {}
+        self.sizes = {}
+
+    def run(self, name: str, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.totals.setdefault(name, []).append(time.perf_counter() - start)
+        return result
+
+    def size(self, name: str, payload: bytes):
+        self.sizes.setdefault(name, []).append(len(payload))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark binario contra JSON')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    catalog = CardCatalog()
+    caches = {'player': CatalogCache(), 'ai': CatalogCache()}
+    t = Timer()
+
+    def on_update():
+        for side, cache in caches.items():
+            text = t.run('json full enc', lambda: _dumps(game_state(game, side)))
+            compact = t.run('json compact enc', lambda: _dumps(game_state(game, side, catalog.encode_card)))
+            packed = t.run('binary enc', pack_state, game, side, catalog)
+            templates = catalog.pending_cards(side, state_cards(game, side))
+            if templates:
+                cache.update(templates)
+            t.run('json full dec', json.loads, text)
+            t.run('json compact dec', lambda: cache.expand(json.loads(compact)))
+            t.run('binary dec', unpack_state, packed, cache)
+            t.size('json full', text)
+            t.size('json compact', compact)
+            t.size('binary', packed)
+
+    for _ in range(args.games):
+        game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                    random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST))
+        game.on_update = on_update
+        run_headless_game(game)
+
+    updates = len(t.sizes['binary'])
+    print(f"{args.games} partidas, {updates} game_state_update (dos jugadores)")
+    print(f"{'':16}{'bytes':>8}{'enc µs':>9}{'enc/s':>10}{'dec µs':>9}{'dec/s':>10}")
+    for label, key in (('JSON', 'json full'), ('JSON plantillas', 'json compact'), ('binario', 'binary')):
+        enc = statistics.mean(t.totals[key + ' enc']) * 1e6
+        dec = statistics.mean(t.totals[key + ' dec']) * 1e6
+        print(f"{label:16}{statistics.mean(t.sizes[key]):8.0f}{enc:9.1f}{1e6 / enc:10.0f}{dec:9.1f}{1e6 / dec:10.0f}")
+
+    # Mensajes pequeños: request_blockers y game_action
+    blockers = ([0, 1, 3], ['player', ('card', 0), ('card', 2)])
+    action = {'action': 'declare_attacks', 'attackers': [0, 1, 3], 'room_id': 'room_12345',
+              'targets': ['player', {'type': 'card', 'index': 0}, 'player']}
+    rounds = 20000
+    for label, payload, enc_json, enc_bin, dec_bin in (
+            ('request_blockers', blockers, lambda: _dumps({'attackers': blockers[0], 'targets': blockers[1]}),
+             lambda: pack_blockers(*blockers), unpack_blockers),
+            ('game_action', action, lambda: _dumps(action), lambda: pack_action(action), unpack_action)):
+        text, packed = enc_json(), enc_bin()
+        row = []
+        for fn in (enc_json, lambda: json.loads(text), enc_bin, lambda: dec_bin(packed)):
+            start = time.perf_counter()
+            for _ in range(rounds):
+                fn()
+            row.append((time.perf_counter() - start) / rounds * 1e6)
+        print(f"{label}: JSON {len(text)} B enc {row[0]:.1f} µs dec {row[1]:.1f} µs | "
+              f"binario {len(packed)} B enc {row[2]:.1f} µs dec {row[3]:.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: memoria por carta / por partida y ritmo de creación de cartas
+Compara Card (plantilla compartida + estado con __slots__) con una réplica
+del antiguo dataclass con __dict__ por instancia.
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+from src.models import Card, Deck
+
+
+@dataclass
+class LegacyCard:
+    """Réplica del Card anterior (dataclass de 17 campos con __dict__)."""
+    name: str
+    cost: int
+    damage: int
+    health: int = 0
+    current_health: int = 0
+    ready: bool = False
+    in_play: bool = False
+    card_type: str = 'troop'
+    image_path: Optional[str] = None
+    blocked_this_combat: bool = False
+    ability: Optional[str] = None
+    ability_desc: Optional[str] = None
+    ability_type: Optional[str] = None
+    spell_target: Optional[str] = None
+    spell_effect: Optional[str] = None
+    description: Optional[str] = None
+    attacked_count: int = 0
+
+
+def _card_kwargs(decks):
+    rows = []
+    for deck in decks:
+        for card in deck.cards:
+            row = dict(vars(card))
+            row.pop('frozen_turns')
+            rows.append(row)
+    return rows
+
+
+def _bytes_per_card(cls, rows) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cards = [cls(**row) for row in rows]
+    if cls is LegacyCard:
+        for c in cards:
+            c.frozen_turns = 0  # se añadía en juego a muchas cartas
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del cards
+    return used / len(rows)
+
+
+def _cards_per_second(cls, rows) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        cls(**row)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def _game_memory(cls, setups) -> float:
+    """Pico de memoria (bytes) de una partida completa, mazos incluidos."""
+    peaks = []
+    for rows1, rows2, champ1, champ2 in setups:
+        tracemalloc.start()
+        deck1 = Deck([cls(**row) for row in rows1])
+        deck2 = Deck([cls(**row) for row in rows2])
+        game = create_headless_game(deck1, deck2, champ1, champ2)
+        run_headless_game(game)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de memoria de cartas')
+    parser.add_argument('--decks', type=int, default=500)
+    parser.add_argument('--games', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    rows = _card_kwargs(build_random_deck(40) for _ in range(args.decks))
+    setups = [(_card_kwargs([build_random_deck(40)]), _card_kwargs([build_random_deck(40)]),
+               random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST)) for _ in range(args.games)]
+
+    print(f"Cartas: {len(rows)}  Partidas: {args.games}")
+    print(f"{'':24}{'dataclass':>14}{'plantilla+slots':>18}")
+    legacy, compact = _bytes_per_card(LegacyCard, rows), _bytes_per_card(Card, rows)
+    print(f"{'bytes por carta':24}{legacy:14.0f}{compact:18.0f}   x{legacy / compact:.2f}")
+    legacy, compact = _cards_per_second(LegacyCard, rows), _cards_per_second(Card, rows)
+    print(f"{'cartas creadas/seg':24}{legacy:14.0f}{compact:18.0f}")
+    random.seed(args.seed + 1)
+    legacy = _game_memory(LegacyCard, setups)
+    random.seed(args.seed + 1)
+    compact = _game_memory(Card, setups)
+    print(f"{'pico KB por partida':24}{legacy / 1024:14.1f}{compact / 1024:18.1f}   x{legacy / compact:.2f}")
+
+
+if __name__ == '__main__':
+    main()
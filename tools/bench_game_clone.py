@@ -0,0 +1,56 @@
+"""
+Benchmark: coste de Game.clone() y snapshot/restore vs copy.deepcopy
+Mide una partida a mitad de juego (varios turnos jugados con DataDrivenAI).
+"""
+
+import argparse
+import copy
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.ai_engine import DataDrivenAI
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, play_player_turn
+
+
+def _mid_game(turns: int, seed: int):
+    random.seed(seed)
+    game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST))
+    brain = DataDrivenAI(game.player, game.ai_brain.config)
+    game.ask_blocker = lambda attacker: None
+    for _ in range(turns):
+        if game.winner is not None:
+            break
+        play_player_turn(game, brain)
+        game.end_turn()
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de Game.clone()')
+    parser.add_argument('--turns', type=int, default=5, help='Turnos jugados antes de clonar')
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    game = _mid_game(args.turns, args.seed)
+    snap = game.snapshot()
+    cards = sum(len(p.hand) + len(p.active_zone) + len(p.deck.cards) for p in (game.player, game.ai))
+    print(f"Estado tras {args.turns} turnos ({cards} cartas vivas)")
+
+    deep_n = max(1, args.number // 20)
+    for label, fn, n in (('copy.deepcopy', lambda: copy.deepcopy(game), deep_n),
+                         ('Game.clone()', game.clone, args.number),
+                         ('Game.snapshot()', game.snapshot, args.number),
+                         ('Game.restore()', lambda: game.restore(snap), args.number)):
+        per_call = timeit.timeit(fn, number=n) / n
+        print(f"  {label:<16} {per_call * 1e6:10.1f} µs")
+
+
+if __name__ == '__main__':
+    main()
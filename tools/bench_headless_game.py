@@ -0,0 +1,79 @@
+"""
+Benchmark: partidas por segundo del motor headless vs el Game de UI
+Compara Game(headless=True) con el Game clásico conducido con on_update no-op.
+Los prints DEBUG del modo clásico van a /dev/null (escrituras reales, como un log
+redirigido) o, con --stdout, a la salida real (terminal o pipe).
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src import game_logic
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+
+
+class _SilentMessageBox:
+    """Sin display no hay diálogos: el modo clásico se mide con un stub como en el servidor."""
+    def showinfo(self, *args, **kwargs):
+        return None
+
+
+def _prepare_decks(games: int, seed: int):
+    """Construye los mazos fuera del tiempo medido (mismo set para ambos modos)."""
+    random.seed(seed)
+    return [(build_random_deck(40), build_random_deck(40),
+             random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST)) for _ in range(games)]
+
+
+def run_mode(games: int, headless: bool, seed: int, real_stdout: bool = False) -> float:
+    """Devuelve partidas/segundo para un modo (stdout a /dev/null salvo real_stdout)."""
+    setups = _prepare_decks(games, seed)
+    random.seed(seed + 1)
+    with contextlib.ExitStack() as stack:
+        if not real_stdout:
+            devnull = stack.enter_context(open(os.devnull, 'w'))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        start = time.perf_counter()
+        for deck1, deck2, champ1, champ2 in setups:
+            game = create_headless_game(deck1, deck2, champ1, champ2, headless=headless,
+                                        on_update=None if headless else (lambda: None))
+            run_headless_game(game)
+        sys.stdout.flush()
+        elapsed = time.perf_counter() - start
+    return games / elapsed if elapsed > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del motor headless')
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--repeat', type=int, default=5, help='rondas alternas por modo (se toma la mejor)')
+    parser.add_argument('--stdout', action='store_true',
+                        help='prints DEBUG a la salida real (terminal/pipe) en vez de /dev/null')
+    args = parser.parse_args()
+
+    game_logic.messagebox = _SilentMessageBox()
+
+    classic = headless = 0.0
+    for _ in range(max(1, args.repeat)):
+        classic = max(classic, run_mode(args.games, headless=False, seed=args.seed, real_stdout=args.stdout))
+        headless = max(headless, run_mode(args.games, headless=True, seed=args.seed, real_stdout=args.stdout))
+
+    print(f"Partidas por modo: {args.games} x {max(1, args.repeat)} rondas, la mejor "
+          f"(stdout: {'real' if args.stdout else os.devnull})")
+    print(f"  Game clásico (on_update no-op): {classic:10.1f} partidas/seg")
+    print(f"  Game headless:                  {headless:10.1f} partidas/seg")
+    if classic > 0:
+        print(f"  Aceleración: x{headless / classic:.2f}")
+
+
+if __name__ == '__main__':
+    main()
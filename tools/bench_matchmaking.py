@@ -0,0 +1,79 @@
+"""
+Benchmark: colas de matchmaking indexadas contra la lista lineal anterior
+Con N jugadores esperando (mezcla de modos quick/custom), mide el coste de
+una llegada que busca rival y de una desconexión: la lista recorría
+waiting_players buscando el modo y la reconstruía al desconectar; el
+Matchmaker usa colas por modo indexadas por sid y bandas de rating.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.matchmaking import Matchmaker
+
+
+def bench_list(waiting_count: int, ops: int) -> tuple:
+    # Camino anterior de server/app.py: la cola llena de 'custom', llegan 'quick'
+    waiting = [{'sid': f'c{i}', 'mode': 'custom'} for i in range(waiting_count)]
+    start = time.perf_counter()
+    for i in range(ops):
+        match = None
+        for j, w in enumerate(waiting):
+            if w['mode'] == 'quick':
+                match = waiting.pop(j)
+                break
+        if match is None:
+            waiting.append({'sid': f'q{i}', 'mode': 'quick'})
+    arrive = (time.perf_counter() - start) / ops
+    start = time.perf_counter()
+    for i in range(ops):
+        sid = f'c{i}'
+        waiting[:] = [p for p in waiting if p['sid'] != sid]
+    leave = (time.perf_counter() - start) / ops
+    return arrive, leave
+
+
+def bench_matchmaker(waiting_count: int, ops: int, rated: bool) -> tuple:
+    # Sin rating: igual que la lista. Con rating: todos en 'quick', separados 250
+    # puntos (nadie empareja aún) y llegan ratings al azar dentro del rango
+    rng = random.Random(1)
+    mm = Matchmaker()
+    for i in range(waiting_count):
+        mm.enqueue(f'c{i}', 'quick' if rated else 'custom', i * 250 if rated else None)
+    start = time.perf_counter()
+    for i in range(ops):
+        mm.enqueue(f'q{i}', 'quick', rng.uniform(0, waiting_count * 250) if rated else None)
+    arrive = (time.perf_counter() - start) / ops
+    start = time.perf_counter()
+    for i in range(ops):
+        mm.cancel(f'c{i}')
+    leave = (time.perf_counter() - start) / ops
+    start = time.perf_counter()
+    mm.sweep()
+    sweep = time.perf_counter() - start
+    return arrive, leave, sweep, mm.metrics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--waiting', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--ops', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'esperando':>10} {'lista llegada':>14} {'lista desc.':>12} {'mm llegada':>11} "
+          f"{'mm desc.':>9} {'rated llegada':>14} {'sweep (ms)':>11}")
+    for n in args.waiting:
+        list_arrive, list_leave = bench_list(n, args.ops)
+        mm_arrive, mm_leave, _, _ = bench_matchmaker(n, args.ops, rated=False)
+        rated_arrive, _, sweep, metrics = bench_matchmaker(n, args.ops, rated=True)
+        print(f"{n:>10} {list_arrive * 1e6:>12.1f}µs {list_leave * 1e6:>10.1f}µs {mm_arrive * 1e6:>9.1f}µs "
+              f"{mm_leave * 1e6:>7.1f}µs {rated_arrive * 1e6:>12.1f}µs {sweep * 1e3:>11.2f}")
+    print(f"métricas (rated, última fila): {metrics}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: IA MCTS (nivel 11) contra DataDrivenAI nivel 10
+Informa rollouts/segundo y win rate; como referencia juega también nivel 10
+contra nivel 10 con los mismos mazos y campeones.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.ai_engine import AIConfig, DataDrivenAI, MCTS_LEVEL
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+
+
+def _prepare_setups(games: int, seed: int):
+    random.seed(seed)
+    return [(build_random_deck(40), build_random_deck(40),
+             random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST)) for _ in range(games)]
+
+
+def run_series(ai_level: int, games: int, seed: int, budget: float):
+    """Juega la serie; devuelve (victorias de la IA, rollouts, segundos de búsqueda)."""
+    wins = rollouts = 0
+    search_time = 0.0
+    for n, (deck1, deck2, champ1, champ2) in enumerate(_prepare_setups(games, seed)):
+        random.seed(seed + n)
+        game = create_headless_game(deck1, deck2, champ1, champ2, ai_level=ai_level)
+        if ai_level >= MCTS_LEVEL:
+            game.ai_brain.time_budget = budget
+        winner = run_headless_game(game, DataDrivenAI(game.player, AIConfig(10)))
+        wins += winner == 'ai'
+        if ai_level >= MCTS_LEVEL:
+            rollouts += game.ai_brain.total_rollouts
+            search_time += game.ai_brain.total_search_time
+    return wins, rollouts, search_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la IA MCTS')
+    parser.add_argument('--games', type=int, default=40)
+    parser.add_argument('--budget', type=float, default=0.05, help='Segundos de búsqueda por decisión')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    mcts_wins, rollouts, search_time = run_series(MCTS_LEVEL, args.games, args.seed, args.budget)
+    elapsed = time.perf_counter() - start
+    base_wins, _, _ = run_series(10, args.games, args.seed, args.budget)
+
+    print(f"Partidas: {args.games} (rival: DataDrivenAI nivel 10, presupuesto {args.budget:.3f}s/decisión)")
+    print(f"  Rollouts/seg:            {rollouts / search_time if search_time else 0:10.0f}")
+    print(f"  Win rate MCTS:           {mcts_wins / args.games * 100:9.1f}%")
+    print(f"  Win rate nivel 10 (ref): {base_wins / args.games * 100:9.1f}%")
+    print(f"  Tiempo total MCTS:       {elapsed:9.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: coste en el servidor de enviar cada cambio de estado a N espectadores
+Juega partidas headless, guarda una copia del Game en cada acción y mide, por
+cambio de estado, dos formas de difundirlo: construir y serializar la vista
+para cada espectador (un emit por sid, como send_game_state_to_players con los
+jugadores) o construirla y serializarla una vez (spectator_view + un solo
+emit a la sala de espectadores, que python-socketio codifica una vez y
+escribe en cada socket; la escritura se cuenta como una referencia al mismo
+paquete por espectador). No incluye el coste de red.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+from src.card_catalog import full_card
+from src.spectators import SpectatorFeed, spectator_view
+
+
+def record_games(games: int, seed: int) -> list:
+    """Copia del Game en cada actualización de `games` partidas headless"""
+    random.seed(seed)
+    states = []
+    for _ in range(games):
+        game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                    random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST))
+        game.on_update = lambda: states.append(game.clone())
+        run_headless_game(game)
+    return states
+
+
+def per_viewer(game, viewers: int) -> int:
+    sent = 0
+    for _ in range(viewers):
+        view = spectator_view(game, full_card)
+        sent += len(json.dumps(view, separators=(',', ':')))
+    return sent
+
+
+def shared(game, viewers: int, feed: SpectatorFeed) -> int:
+    sent = 0
+    for view in feed.publish(spectator_view(game, full_card)):
+        packet = json.dumps(view, separators=(',', ':'))
+        queues = [packet] * viewers  # el mismo paquete en la cola de cada socket
+        sent += len(packet) * len(queues)
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--viewers', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--games', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    states = record_games(args.games, args.seed)
+    print(f"{len(states)} cambios de estado de {args.games} partidas")
+    print(f"{'espectadores':>12} {'por sid ms':>11} {'una vez ms':>11} {'x':>7} {'bytes/vista':>12}")
+    for viewers in args.viewers:
+        naive, once, sizes = [], [], []
+        feed = SpectatorFeed()
+        for game in states:
+            start = time.perf_counter()
+            per_viewer(game, viewers)
+            naive.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            total = shared(game, viewers, feed)
+            once.append(time.perf_counter() - start)
+            sizes.append(total / viewers)
+        naive_ms = statistics.mean(naive) * 1e3
+        once_ms = statistics.mean(once) * 1e3
+        print(f"{viewers:>12} {naive_ms:>11.3f} {once_ms:>11.3f} {naive_ms / once_ms:>6.0f}x "
+              f"{statistics.mean(sizes):>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
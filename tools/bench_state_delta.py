@@ -0,0 +1,116 @@
+"""
+Benchmark: bytes por acción de game_state_update, estado completo contra parches
+Juega partidas headless y, en cada acción (on_update), construye el estado que
+enviaría el servidor (misma forma que get_game_state_for_player) para los dos
+jugadores. Compara el JSON del estado completo con las cartas por id de
+plantilla (CardCatalog, contando los eventos card_catalog) y con los sobres de
+DeltaEncoder, con un porcentaje configurable de acks perdidos.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game, run_headless_game
+from src.card_catalog import CardCatalog, CatalogCache, full_card
+from src.state_delta import DeltaDecoder, DeltaEncoder, payload_size
+
+
+def game_state(game, side: str, serialize_card=full_card) -> dict:
+    # Misma forma que get_game_state_for_player en server/app.py (que necesita Flask para importarse)
+    me, opp = (game.player, game.ai) if side == 'player' else (game.ai, game.player)
+    return {
+        'my_state': {'life': me.life, 'max_life': getattr(me, 'max_life', me.life), 'mana': me.mana,
+                     'max_mana': me.max_mana, 'hand': [serialize_card(c) for c in me.hand],
+                     'active_zone': [serialize_card(c) for c in me.active_zone],
+                     'deck_count': len(me.deck.cards), 'graveyard_count': len(me.graveyard)},
+        'opponent_state': {'life': opp.life, 'max_life': getattr(opp, 'max_life', opp.life), 'mana': opp.mana,
+                           'max_mana': opp.max_mana, 'hand_count': len(opp.hand),
+                           'active_zone': [serialize_card(c) for c in opp.active_zone],
+                           'deck_count': len(opp.deck.cards), 'graveyard_count': len(opp.graveyard)},
+        'turn': game.turn,
+        'is_my_turn': game.turn == side,
+    }
+
+
+def record_states(games: int, seed: int, catalog: CardCatalog) -> list:
+    """Lista de partidas; cada una es la lista de estados por acción:
+    (jugador, rival) completos y (jugador, rival) con cartas compactas."""
+    random.seed(seed)
+    recorded = []
+    for _ in range(games):
+        states = []
+        game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                    random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST))
+        game.on_update = lambda: states.append(
+            ((game_state(game, 'player'), game_state(game, 'ai')),
+             (game_state(game, 'player', catalog.encode_card), game_state(game, 'ai', catalog.encode_card))))
+        run_headless_game(game)
+        recorded.append(states)
+    return recorded
+
+
+def run_mode(recorded: list, compact: bool, delta: bool, catalog: CardCatalog, lost_acks: float, seed: int):
+    """Bytes por actualización (incluye el catálogo enviado antes) y ms de codificación."""
+    rng = random.Random(seed)
+    encoder = DeltaEncoder()
+    sizes, encode_ms = [], []
+    for g, states in enumerate(recorded):
+        sids = (f'{g}-player', f'{g}-ai')
+        decoders = {sid: DeltaDecoder() for sid in sids}
+        caches = {sid: CatalogCache() for sid in sids}
+        for sid in sids:
+            encoder.reset(sid)
+            catalog.reset(sid)
+        for full_pair, compact_pair in states:
+            for sid, full, state in zip(sids, full_pair, compact_pair if compact else full_pair):
+                start = time.perf_counter()
+                size = 0
+                if compact:
+                    templates = catalog.pending(sid, state)
+                    if templates:
+                        caches[sid].update(templates)
+                        size += payload_size(templates)
+                payload = encoder.encode(sid, state) if delta else state
+                encode_ms.append((time.perf_counter() - start) * 1000)
+                # El cliente reconstruye exactamente el estado completo
+                assert caches[sid].expand(decoders[sid].apply(payload)) == full
+                if delta and rng.random() >= lost_acks:
+                    encoder.ack(sid, payload['v'])
+                sizes.append(size + payload_size(payload))
+    return sizes, encode_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de estados delta')
+    parser.add_argument('--games', type=int, default=20)
+    parser.add_argument('--lost-acks', type=float, default=0.1, help='Fracción de acks que no llegan')
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    catalog = CardCatalog()
+    recorded = record_states(args.games, args.seed, catalog)
+    modes = (('estado completo', False, False), ('plantillas', True, False),
+             ('delta', False, True), ('plantillas + delta', True, True))
+    results = [(label, *run_mode(recorded, compact, delta, catalog, args.lost_acks, args.seed))
+               for label, compact, delta in modes]
+
+    full = statistics.mean(results[0][1])
+    print(f"{args.games} partidas, {len(results[0][1])} actualizaciones (dos jugadores), "
+          f"{args.lost_acks:.0%} de acks perdidos; {len(catalog)} plantillas")
+    print(f"{'':20}{'bytes/acción':>14}{'p95':>8}{'total KB':>10}{'reducción':>11}{'encode ms':>11}")
+    for label, sizes, encode_ms in results:
+        mean = statistics.mean(sizes)
+        p95 = statistics.quantiles(sizes, n=20)[-1]
+        print(f"{label:20}{mean:14.0f}{p95:8.0f}{sum(sizes) / 1024:10.1f}"
+              f"{1 - mean / full:10.0%} {statistics.mean(encode_ms):10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: tiempo por frame de update_ui en un tablero 10 contra 10
+Compara el renderizado con reconciliación por claves (por defecto) con la
+reconstrucción completa de widgets en cada actualización (REBUILD_EVERY_FRAME).
+Necesita pantalla (Tk); con Pillow se miden también las imágenes.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src import game_gui
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.headless import create_headless_game
+
+
+def _board(cards: int, hand: int, seed: int):
+    """Partida con `cards` tropas en cada zona activa y `hand` cartas en cada mano."""
+    random.seed(seed)
+    game = create_headless_game(build_random_deck(40), build_random_deck(40),
+                                random.choice(CHAMPION_LIST), random.choice(CHAMPION_LIST))
+    for p in (game.player, game.ai):
+        troops = [c for c in p.deck.cards if c.card_type != 'spell']
+        p.active_zone.extend(troops[:cards])
+        p.hand[:] = p.deck.cards[cards:cards + hand]
+        for i, c in enumerate(p.active_zone):
+            c.ready = i % 2 == 0
+    return game
+
+
+def _frames(root, game, frames: int, mutate) -> list:
+    times = []
+    for i in range(frames):
+        mutate(game, i)
+        start = time.perf_counter()
+        game.on_update()
+        root.update_idletasks()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def _damage_tick(game, i):
+    card = game.ai.active_zone[i % len(game.ai.active_zone)]
+    card.current_health = card.health - (i % 3)
+
+
+def _tap_toggle(game, i):
+    card = game.player.active_zone[i % len(game.player.active_zone)]
+    card.ready = not card.ready
+
+
+def _hand_churn(game, i):
+    # una carta sale de la mano y entra otra
+    p = game.player
+    p.deck.cards.append(p.hand.pop(0))
+    p.hand.append(p.deck.cards.pop(0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de update_ui')
+    parser.add_argument('--cards', type=int, default=10, help='Tropas por lado en juego')
+    parser.add_argument('--hand', type=int, default=7)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1234)
+    args = parser.parse_args()
+
+    root = tk.Tk()
+    root.geometry('1100x700')
+    for name in ('player_life_var', 'ai_life_var', 'player_mana_var', 'player_deck_var',
+                 'ai_deck_var', 'status_var'):
+        setattr(game_gui, name, tk.StringVar())
+    game_gui.root = root
+    game = _board(args.cards, args.hand, args.seed)
+    game_gui.make_ui(game)
+    root.update()
+
+    print(f"Tablero {args.cards} vs {args.cards}, mano {args.hand}, {args.frames} frames "
+          f"(Pillow: {'sí' if game_gui.PIL_AVAILABLE else 'no'})")
+    print(f"{'escenario':18}{'reconstruir ms':>16}{'p95':>8}{'por claves ms':>16}{'p95':>8}{'mejora':>9}")
+    scenarios = (('sin cambios', lambda g, i: None), ('tick de daño', _damage_tick),
+                 ('girar carta', _tap_toggle), ('mano entra/sale', _hand_churn))
+    for label, mutate in scenarios:
+        row = []
+        for rebuild in (True, False):
+            game_gui.REBUILD_EVERY_FRAME = rebuild
+            game.on_update()  # estado de partida igual para ambos modos
+            times = _frames(root, game, args.frames, mutate)
+            row.append((statistics.mean(times), statistics.quantiles(times, n=20)[-1]))
+        (old, old95), (new, new95) = row
+        print(f"{label:18}{old:16.2f}{old95:8.2f}{new:16.2f}{new95:8.2f}   x{old / new:.1f}")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
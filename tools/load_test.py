@@ -0,0 +1,472 @@
+"""
+Prueba de carga: N bots python-socketio contra un servidor local
+Cada bot entra en la cola (find_match o find_custom_match), juega partidas
+completas con BotPlayer (DataDrivenAI: cartas, hechizos, declare_attacks y
+declare_blockers) y mide la latencia de cada evento: desde el game_action
+hasta el game_state_update que lo refleja (declare_attacks: hasta que el
+defensor recibe request_blockers). Por nivel de concurrencia imprime p50,
+p95 y p99 por acción, acciones/s, partidas/s y tasa de errores.
+
+Con --spectators N, N clientes más ven la primera partida del nivel (sus
+jugadores esperan a que todos estén dentro) y se mide el retraso de cada
+spectator_state: desde que el servidor la libera ('ts') hasta que llega.
+
+    python tools/load_test.py --spawn --clients 10 50 100 --games 2
+    python tools/load_test.py --url http://localhost:5000 --mode mixed --encoding binary
+    python tools/load_test.py --spawn --clients 2 --spectators 1000
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import engineio  # type: ignore
+import socketio  # type: ignore
+
+from src.models import Card, Deck, Player
+from src.bot_player import BotPlayer
+from src.cards import build_random_deck
+from src.champions import CHAMPION_LIST
+from src.match_journal import CARD_FIELDS
+from src.state_delta import DeltaDecoder, is_envelope
+from src.card_catalog import CatalogCache
+from src.binary_wire import VERSION as BINARY_VERSION, is_binary, pack_action, unpack_blockers, unpack_state
+
+# Campos de carta que acepta find_custom_match (los que manda NetworkManager)
+CUSTOM_CARD_FIELDS = ('name', 'cost', 'damage', 'health', 'card_type', 'ability', 'ability_desc', 'ability_type',
+                      'spell_target', 'spell_effect', 'description')
+
+
+def percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+class Stats:
+    """Métricas compartidas por los bots de un nivel de concurrencia"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}       # {acción: [segundos]}
+        self.queue_waits = []
+        self.attacks = {}       # {room_id: instante del declare_attacks} (lo cierra el defensor)
+        self.sent = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.games = 0
+        self.error_messages = {}
+        # Espectadores (--spectators): partida observada y retraso de cada vista recibida
+        self.watch_room = None
+        self.room_found = threading.Event()
+        self.watching = threading.Event()  # todos los espectadores dentro: la partida puede empezar
+        self.spectator_lag = []
+        self.spectators_in = 0
+        self.spectators_done = 0
+        self.watch_ended = threading.Event()  # todos recibieron spectate_ended (tras las vistas retenidas)
+
+    def record(self, action, seconds):
+        with self.lock:
+            self.latency.setdefault(action, []).append(seconds)
+
+    def error(self, message):
+        with self.lock:
+            self.errors += 1
+            self.error_messages[message] = self.error_messages.get(message, 0) + 1
+
+
+def _cards(dicts):
+    cards = []
+    for data in dicts:
+        card = Card(**{name: data[name] for name in CARD_FIELDS if name in data})
+        card.frozen_turns = data.get('frozen_turns', 0)
+        cards.append(card)
+    return cards
+
+
+def _side(state, mine):
+    """Player con lo que ve este asiento (la mano del rival no se conoce)"""
+    player = Player('bot', Deck([]))
+    player.life = state['life']
+    player.max_life = state.get('max_life', state['life'])
+    player.mana = state['mana']
+    player.max_mana = state['max_mana']
+    player.active_zone = _cards(state['active_zone'])
+    if mine:
+        player.hand = _cards(state['hand'])
+    # DataDrivenAI solo mira cuántas quedan (hechizos de robar)
+    player.deck.cards = [None] * state.get('deck_count', 0)
+    return player
+
+
+def _blocker_candidates(attackers, my_zone, can_block):
+    """Game.legal_blockers desde el estado del cliente: listas, sin congelar, Volar contra Volar"""
+    candidates = {}
+    for index, attacker in attackers:
+        ready = [i for i, c in enumerate(my_zone) if c.ready and not c.frozen_turns > 0] if can_block else []
+        if attacker.ability and 'Volar' in attacker.ability:
+            ready = [i for i in ready if my_zone[i].ability == 'Volar']
+        candidates[index] = ready
+    return candidates
+
+
+class _InOrderEngineIO(engineio.Client):
+    """engineio.Client que entrega cada mensaje en el hilo lector, en orden de llegada
+    
+    El original abre un hilo por mensaje: card_catalog y los game_state_update seguidos
+    se cruzaban (plantillas que aún no estaban, estados aplicados fuera de orden).
+    """
+
+    def _trigger_event(self, event, *args, **kwargs):
+        if event == 'message':
+            kwargs['run_async'] = False
+        return super()._trigger_event(event, *args, **kwargs)
+
+
+class InOrderClient(socketio.Client):
+    def _engineio_client_class(self):
+        return _InOrderEngineIO
+
+
+class LoadBot:
+    """Un cliente: cola, partida completa con BotPlayer y vuelta a la cola hasta `games` partidas"""
+
+    def __init__(self, name, url, stats, mode, level, encoding, games, game_timeout):
+        self.name = name
+        self.url = url
+        self.stats = stats
+        self.mode = mode
+        self.bot = BotPlayer(level)
+        self.encoding = encoding
+        self.games = games
+        self.game_timeout = game_timeout
+        self.sio = InOrderClient(reconnection=False)
+        self.decoder = DeltaDecoder()
+        self.catalog = CatalogCache()
+        self.room_id = None
+        self.state = None
+        self.can_block = True
+        self.my_turn = False
+        self.sent = None  # (acción, instante) a la espera de su estado
+        self.queued_at = 0.0
+        self.game_done = threading.Event()
+        self._setup()
+
+    def _setup(self):
+        sio = self.sio
+
+        @sio.on('match_found')
+        def on_match_found(data):
+            self.stats.queue_waits.append(time.perf_counter() - self.queued_at)
+            self.room_id = data['room_id']
+            with self.stats.lock:
+                if self.stats.watch_room is None:
+                    self.stats.watch_room = self.room_id
+                    self.stats.room_found.set()
+            if self.stats.watch_room == self.room_id and not self.stats.watching.wait(self.game_timeout):
+                self.stats.error('los espectadores no entraron a tiempo')
+            self.can_block = data.get('my_champion', {}).get('ability_type') != 'all_furia'
+            self.my_turn = False
+            # El decoder conserva la partida anterior: el rival puede pedir su estado inicial antes
+            # que nosotros y lo que nos llega entonces es un parche contra lo último que confirmamos
+            options = {'room_id': self.room_id}
+            if self.encoding == 'delta':
+                options.update(delta=True, templates=True)
+            elif self.encoding == 'binary':
+                options['binary'] = BINARY_VERSION
+            sio.emit('request_initial_state', options)
+
+        @sio.on('card_catalog')
+        def on_card_catalog(data):
+            self.catalog.update(data)
+
+        @sio.on('game_state_update')
+        def on_state(data):
+            now = time.perf_counter()
+            if is_binary(data):
+                state = unpack_state(data, self.catalog)
+            else:
+                state = self.decoder.apply(data)
+                state = self.catalog.expand(state) if state is not None else None
+                if state is not None and is_envelope(data):
+                    sio.emit('state_ack', {'room_id': self.room_id, 'v': data['v']})
+            if state is None:
+                self.stats.error('estado incompleto')
+                return
+            if state == self.state:
+                # La partida no cambió: el servidor reenvía el snapshot a los dos asientos
+                # cada vez que uno pide el inicial. Ni responde a la acción en vuelo ni hay que
+                # volver a jugar sobre él
+                return
+            if self.sent is not None:
+                self.stats.record(self.sent[0], now - self.sent[1])
+                self.sent = None
+            self.state = state
+            self._on_state(state)
+
+        @sio.on('request_blockers')
+        def on_request_blockers(data):
+            if is_binary(data):
+                data = unpack_blockers(data)
+            started = self.stats.attacks.pop(self.room_id, None)
+            if started is not None:
+                self.stats.record('declare_attacks', time.perf_counter() - started)
+            self._block(data)
+
+        @sio.on('error')
+        def on_error(data):
+            self.sent = None  # la acción rechazada no tendrá estado con el que emparejarla
+            self.stats.error(str(data.get('message')) if isinstance(data, dict) else str(data))
+
+        @sio.on('game_over')
+        def on_game_over(data):
+            self.game_done.set()
+
+        @sio.on('opponent_disconnected')
+        def on_opponent_disconnected():
+            self.stats.error('opponent_disconnected')
+            self.game_done.set()
+
+    def _send(self, action):
+        if not self.sio.connected:
+            return  # estado que llegó mientras run() desconectaba
+        action['room_id'] = self.room_id
+        if action['action'] == 'declare_attacks':
+            self.stats.attacks[self.room_id] = time.perf_counter()
+        else:
+            self.sent = (action['action'], time.perf_counter())
+        with self.stats.lock:
+            self.stats.sent += 1
+        payload = pack_action(action) if self.encoding == 'binary' else None
+        self.sio.emit('game_action', payload if payload is not None else action)
+
+    def _on_state(self, state):
+        me, opponent = state['my_state'], state['opponent_state']
+        if me['life'] <= 0 or opponent['life'] <= 0:
+            if not self.game_done.is_set() and opponent['life'] <= 0:
+                # Como el cliente real: quien ve la partida terminada la cierra
+                self.sio.emit('game_over', {'room_id': self.room_id, 'winner': self.name})
+            return
+        if state['is_my_turn']:
+            if not self.my_turn:
+                self.bot.new_turn()
+            self.my_turn = True
+            self._send(self.bot.next_action(_side(me, True), _side(opponent, False)))
+        else:
+            self.my_turn = False
+
+    def _block(self, data):
+        if self.state is None:
+            return
+        me = _side(self.state['my_state'], True)
+        enemy_zone = _cards(self.state['opponent_state']['active_zone'])
+        targets = data.get('targets', [])
+        attackers = [(index, enemy_zone[index]) for i, index in enumerate(data.get('attackers', []))
+                     if index < len(enemy_zone) and (targets[i] if i < len(targets) else 'player') == 'player']
+        candidates = _blocker_candidates(attackers, me.active_zone, self.can_block)
+        self._send(self.bot.choose_blockers(me, attackers, candidates))
+
+    def _queue(self):
+        self.queued_at = time.perf_counter()
+        mode = self.mode if self.mode != 'mixed' else random.choice(('quick', 'custom'))
+        if mode == 'custom':
+            deck = [{name: getattr(c, name) for name in CUSTOM_CARD_FIELDS} for c in build_random_deck(size=40).cards]
+            champion = {'name': random.choice(CHAMPION_LIST).name}
+            self.sio.emit('find_custom_match', {'player_name': self.name, 'deck': deck, 'champion': champion})
+        else:
+            self.sio.emit('find_match', {'player_name': self.name})
+
+    def run(self):
+        try:
+            self.sio.connect(self.url, transports=['websocket'], wait_timeout=10)
+        except Exception as e:
+            self.stats.error(f'connect: {e}')
+            return
+        try:
+            for _ in range(self.games):
+                self.game_done.clear()
+                self.state = None
+                self.sent = None
+                self._queue()
+                if self.game_done.wait(self.game_timeout):
+                    with self.stats.lock:
+                        self.stats.games += 1
+                else:
+                    with self.stats.lock:
+                        self.stats.timeouts += 1
+                    break
+        finally:
+            self.sio.disconnect()
+
+
+class Spectator:
+    """Cliente que solo mira la partida de stats.watch_room"""
+
+    def __init__(self, url, stats, expected):
+        self.url = url
+        self.stats = stats
+        self.expected = expected
+        self.sio = socketio.Client(reconnection=False)
+
+        @self.sio.on('spectate_started')
+        def on_started(data):
+            with stats.lock:
+                stats.spectators_in += 1
+                if stats.spectators_in == expected:
+                    stats.watching.set()
+
+        @self.sio.on('spectator_state')
+        def on_view(data):
+            lag = time.time() - data['ts']
+            with stats.lock:
+                stats.spectator_lag.append(lag)
+
+        @self.sio.on('spectate_ended')
+        def on_ended(data):
+            with stats.lock:
+                stats.spectators_done += 1
+                if stats.spectators_done == stats.spectators_in:
+                    stats.watch_ended.set()
+
+        @self.sio.on('spectate_failed')
+        def on_failed(data):
+            stats.error(f"spectate: {data.get('message')}")
+
+    def connect(self):
+        try:
+            self.sio.connect(self.url, transports=['websocket'], wait_timeout=10)
+            return True
+        except Exception as e:
+            self.stats.error(f'connect: {e}')
+            return False
+
+
+def watch_first_game(url, stats, count, timeout):
+    """Conecta `count` espectadores y, cuando aparece la primera partida, entran todos"""
+    spectators = [Spectator(url, stats, count) for _ in range(count)]
+    connected = [s for s in spectators if s.connect()]
+    if len(connected) < count:
+        stats.watching.set()  # no bloquear la partida por los que fallaron
+    if stats.room_found.wait(timeout):
+        for spectator in connected:
+            spectator.sio.emit('spectate', {'room_id': stats.watch_room})
+    return connected
+
+
+def run_level(url, clients, args):
+    stats = Stats()
+    watchers = []
+    if args.spectators:
+        watcher = threading.Thread(target=lambda: watchers.extend(
+            watch_first_game(url, stats, args.spectators, args.game_timeout)), daemon=True)
+        watcher.start()
+    else:
+        stats.watching.set()
+    bots = [LoadBot(f'bot{i}', url, stats, args.mode, args.level, args.encoding, args.games, args.game_timeout)
+            for i in range(clients)]
+    threads = [threading.Thread(target=bot.run, daemon=True) for bot in bots]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+        time.sleep(args.ramp / max(1, clients))
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if args.spectators:
+        watcher.join()
+        if not stats.watch_ended.wait(args.game_timeout):  # con SPECTATOR_DELAY el final llega más tarde
+            stats.error('spectate_ended no llegó')
+        for spectator in watchers:
+            spectator.sio.disconnect()
+    return stats, elapsed
+
+
+def report(clients, stats, elapsed):
+    samples = [s for values in stats.latency.values() for s in values]
+    rate = stats.errors / max(1, stats.sent)
+    print(f"\n== {clients} clientes: {stats.games} partidas en {elapsed:.1f} s "
+          f"({stats.games / elapsed:.2f} partidas/s, {len(samples) / elapsed:.0f} acciones/s)")
+    print(f"   acciones {stats.sent}, errores {stats.errors} ({rate:.2%}), partidas sin terminar {stats.timeouts}, "
+          f"espera en cola p50 {(percentile(stats.queue_waits, 0.5) or 0) * 1e3:.0f} ms")
+    print(f"   {'acción':<18} {'n':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for action, values in sorted(stats.latency.items()) + [('(todas)', samples)]:
+        if values:
+            print(f"   {action:<18} {len(values):>7} {percentile(values, 0.5) * 1e3:>8.1f} "
+                  f"{percentile(values, 0.95) * 1e3:>8.1f} {percentile(values, 0.99) * 1e3:>8.1f} "
+                  f"{max(values) * 1e3:>8.1f}")
+    if stats.spectators_in:
+        lag = stats.spectator_lag
+        print(f"   espectadores {stats.spectators_in}: {len(lag)} vistas recibidas, retraso p50 "
+              f"{(percentile(lag, 0.5) or 0) * 1e3:.1f} ms, p95 {(percentile(lag, 0.95) or 0) * 1e3:.1f} ms, "
+              f"p99 {(percentile(lag, 0.99) or 0) * 1e3:.1f} ms, max {max(lag, default=0) * 1e3:.1f} ms")
+    for message, count in sorted(stats.error_messages.items(), key=lambda item: -item[1])[:5]:
+        print(f"   error x{count}: {message}")
+
+
+def server_fanout(url):
+    """Coste de las difusiones a espectadores medido en el servidor (GET /)"""
+    try:
+        fanout = json.loads(urllib.request.urlopen(url + '/', timeout=5).read()).get('spectators')
+    except (OSError, ValueError):
+        return
+    if isinstance(fanout, dict) and fanout.get('broadcasts'):
+        build, emit = fanout['build_ms'], fanout['emit_ms']
+        print(f"   servidor: {fanout['broadcasts']} difusiones, {fanout['views_sent']} vistas; construir vista "
+              f"p50 {build['p50']} ms, emit a la sala p50 {emit['p50']} ms, p95 {emit['p95']} ms, max {emit['max']} ms")
+
+
+def spawn_server(port):
+    """Arranca server/app.py en `port` y espera a que responda"""
+    env = dict(os.environ, PORT=str(port), LOG_LEVEL=os.environ.get('LOG_LEVEL', 'WARN'))
+    process = subprocess.Popen([sys.executable, str(Path(__file__).parent.parent / 'server' / 'app.py')], env=env)
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url + '/', timeout=1).read()
+            return process, url
+        except OSError:
+            time.sleep(0.3)
+    process.kill()
+    raise SystemExit('el servidor no arrancó en 30 s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--spawn', action='store_true', help='arrancar server/app.py local (en --port)')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--clients', type=int, nargs='+', default=[10, 50, 100], help='niveles de concurrencia')
+    parser.add_argument('--games', type=int, default=1, help='partidas por cliente')
+    parser.add_argument('--mode', choices=('quick', 'custom', 'mixed'), default='quick')
+    parser.add_argument('--encoding', choices=('json', 'delta', 'binary'), default='json')
+    parser.add_argument('--level', type=int, default=5, help='nivel AIConfig de los bots (1-10)')
+    parser.add_argument('--ramp', type=float, default=2.0, help='segundos para conectar a todos los clientes')
+    parser.add_argument('--game-timeout', type=float, default=120.0)
+    parser.add_argument('--spectators', type=int, default=0, help='espectadores de la primera partida de cada nivel')
+    args = parser.parse_args()
+
+    process, url = spawn_server(args.port) if args.spawn else (None, args.url)
+    try:
+        print(f"servidor {url}, modo {args.mode}, codificación {args.encoding}, bots nivel {args.level}")
+        for clients in args.clients:
+            stats, elapsed = run_level(url, clients + clients % 2, args)
+            report(clients + clients % 2, stats, elapsed)
+            if args.spectators:
+                server_fanout(url)
+    finally:
+        if process is not None:
+            process.terminate()
+
+
+if __name__ == '__main__':
+    main()
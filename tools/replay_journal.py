@@ -0,0 +1,85 @@
+"""
+Reproduce una partida del servidor desde su diario (JOURNAL_DIR)
+Sin --turn imprime un resumen por turno (vidas, maná, cartas en mesa y
+acciones); con --turn N muestra el estado al empezar el turno N. --bench
+compara saltar a cada turno desde el keyframe más cercano con rehacer la
+partida entera desde el reparto inicial.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.match_journal import Replayer, load_journal
+
+
+def _side(player) -> str:
+    return (f"vida {player.life:>2} maná {player.mana}/{player.max_mana} mano {len(player.hand)} "
+            f"mesa {len(player.active_zone)} mazo {len(player.deck.cards)}")
+
+
+def summary(replay: Replayer):
+    for turn in range(1, replay.turns + 1):
+        start = replay.turn_starts[turn - 1]
+        end = replay.turn_starts[turn] if turn < replay.turns else len(replay.actions)
+        game = replay.seek_turn(turn)
+        actions = [a['a'].get('action') + ('*' if a.get('sys') else '') for a in replay.actions[start:end]]
+        print(f"turno {turn:>3} ({game.turn:>6})  player: {_side(game.player)} | ai: {_side(game.ai)}")
+        print(f"            {', '.join(actions) or '-'}")
+
+
+def show_turn(replay: Replayer, turn: int):
+    game = replay.seek_turn(turn)
+    print(f"turno {turn} de {replay.turns}: juega {game.turn}, ganador {game.winner}")
+    for role, player in (('player', game.player), ('ai', game.ai)):
+        print(f"  {role}: {_side(player)}")
+        print(f"    mano: {', '.join(c.name for c in player.hand) or '-'}")
+        print(f"    mesa: {', '.join(f'{c.name} {c.damage}/{c.current_health}' for c in player.active_zone) or '-'}")
+
+
+def bench(path: str, keyframe_interval: int):
+    header, actions, _ = load_journal(path)
+    start = time.perf_counter()
+    replay = Replayer(header, actions, keyframe_interval)
+    index = time.perf_counter() - start
+    turns = list(range(1, replay.turns + 1))
+    start = time.perf_counter()
+    for turn in reversed(turns):  # hacia atrás: siempre desde un keyframe
+        replay.seek_turn(turn)
+    seek = (time.perf_counter() - start) / len(turns)
+    start = time.perf_counter()
+    for turn in turns:
+        Replayer(header, actions[:replay.turn_starts[turn - 1]], keyframe_interval=len(actions) + 1)
+    full = (time.perf_counter() - start) / len(turns)
+    print(f"{len(actions)} acciones, {replay.turns} turnos, keyframe cada {keyframe_interval} turnos")
+    print(f"índice (una pasada): {index * 1e3:.2f} ms")
+    print(f"salto a un turno:    {seek * 1e3:.3f} ms (keyframe + acciones hasta el turno)")
+    print(f"rehacer desde 0:     {full * 1e3:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('journal', help='fichero .jsonl de JOURNAL_DIR')
+    parser.add_argument('--turn', type=int, help='estado al empezar este turno (desde 1)')
+    parser.add_argument('--keyframes', type=int, default=5, help='turnos entre keyframes')
+    parser.add_argument('--bench', action='store_true')
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.journal, args.keyframes)
+        return
+    header, actions, end = load_journal(args.journal)
+    replay = Replayer(header, actions, args.keyframes)
+    print(f"sala {header['room']} ({header['mode']}), semilla {header['seed']}, "
+          f"{' vs '.join(header['champions'])}, {len(actions)} acciones")
+    print(f"fin: {end['end']}, ganador {end['winner']}" if end else "fin: (sin cerrar)")
+    if args.turn is not None:
+        show_turn(replay, args.turn)
+    else:
+        summary(replay)
+
+
+if __name__ == '__main__':
+    main()